@@ -0,0 +1,57 @@
+"""add_notification_campaigns
+
+Revision ID: a6c3e9f04b21
+Revises: f4b8d2e61a97
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a6c3e9f04b21"
+down_revision: Union[str, None] = "f4b8d2e61a97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create campaign table and link notifications to campaigns."""
+    op.create_table(
+        "notification_campaigns",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("message", sa.String(length=500), nullable=False),
+        sa.Column("segments", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("targeted_count", sa.Integer(), nullable=False),
+        sa.Column("created_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index(op.f("ix_notification_campaigns_id"), "notification_campaigns", ["id"], unique=False)
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.add_column(sa.Column("campaign_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_notifications_campaign_id_notification_campaigns",
+            "notification_campaigns",
+            ["campaign_id"],
+            ["id"],
+        )
+        batch_op.create_index("ix_notifications_campaign_user", ["campaign_id", "user_id"], unique=True)
+
+
+def downgrade() -> None:
+    """Drop campaign table and the notification link."""
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.drop_index("ix_notifications_campaign_user")
+        batch_op.drop_constraint("fk_notifications_campaign_id_notification_campaigns", type_="foreignkey")
+        batch_op.drop_column("campaign_id")
+    op.drop_index(op.f("ix_notification_campaigns_id"), table_name="notification_campaigns")
+    op.drop_table("notification_campaigns")
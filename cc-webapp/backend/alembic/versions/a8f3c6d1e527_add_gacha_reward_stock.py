@@ -0,0 +1,37 @@
+"""add_gacha_reward_stock
+
+Revision ID: a8f3c6d1e527
+Revises: c5e9a2f7d413
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8f3c6d1e527"
+down_revision: Union[str, None] = "c5e9a2f7d413"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the sharded gacha reward stock table."""
+    op.create_table(
+        "gacha_reward_stock",
+        sa.Column("rarity", sa.String(length=50), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("allocated", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("remaining", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("granted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("rarity", "shard"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the gacha reward stock table."""
+    op.drop_table("gacha_reward_stock")
@@ -0,0 +1,40 @@
+"""add_game_config_versions
+
+Revision ID: b3e6f1a8c924
+Revises: a8f3c6d1e527
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e6f1a8c924"
+down_revision: Union[str, None] = "a8f3c6d1e527"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create shared storage for published game config versions."""
+    op.create_table(
+        "game_config_versions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("rules", sa.JSON(), nullable=False),
+        sa.Column("source", sa.String(length=100), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_game_config_versions_id"), "game_config_versions", ["id"], unique=False)
+    op.create_index(op.f("ix_game_config_versions_version"), "game_config_versions", ["version"], unique=True)
+
+
+def downgrade() -> None:
+    """Drop shared game config version storage."""
+    op.drop_index(op.f("ix_game_config_versions_version"), table_name="game_config_versions")
+    op.drop_index(op.f("ix_game_config_versions_id"), table_name="game_config_versions")
+    op.drop_table("game_config_versions")
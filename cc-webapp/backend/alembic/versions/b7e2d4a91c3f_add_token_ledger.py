@@ -0,0 +1,71 @@
+"""add_token_ledger
+
+Revision ID: b7e2d4a91c3f
+Revises: 4c54145429eb
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2d4a91c3f"
+down_revision: Union[str, None] = "4c54145429eb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create token ledger tables and checkpoint existing balances."""
+    op.create_table(
+        "token_ledger",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("balance_after", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(length=50), nullable=False),
+        sa.Column("action_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["action_id"], ["user_actions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_token_ledger_id"), "token_ledger", ["id"], unique=False)
+    op.create_index("ix_token_ledger_user_id_id", "token_ledger", ["user_id", "id"], unique=False)
+
+    op.create_table(
+        "token_balance_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("last_entry_id", sa.Integer(), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_token_balance_snapshots_id"), "token_balance_snapshots", ["id"], unique=False)
+    op.create_index(
+        "ix_token_balance_snapshots_user_id_last_entry_id",
+        "token_balance_snapshots",
+        ["user_id", "last_entry_id"],
+        unique=False,
+    )
+
+    # Opening checkpoint so balances accrued before the ledger existed reconcile
+    op.execute(
+        "INSERT INTO token_balance_snapshots (user_id, last_entry_id, balance, created_at) "
+        "SELECT id, 0, COALESCE(cyber_token_balance, 0), CURRENT_TIMESTAMP FROM users"
+    )
+
+
+def downgrade() -> None:
+    """Drop token ledger tables."""
+    op.drop_index("ix_token_balance_snapshots_user_id_last_entry_id", table_name="token_balance_snapshots")
+    op.drop_index(op.f("ix_token_balance_snapshots_id"), table_name="token_balance_snapshots")
+    op.drop_table("token_balance_snapshots")
+    op.drop_index("ix_token_ledger_user_id_id", table_name="token_ledger")
+    op.drop_index(op.f("ix_token_ledger_id"), table_name="token_ledger")
+    op.drop_table("token_ledger")
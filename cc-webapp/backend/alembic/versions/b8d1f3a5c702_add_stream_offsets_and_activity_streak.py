@@ -0,0 +1,42 @@
+"""add_stream_offsets_and_activity_streak
+
+Revision ID: b8d1f3a5c702
+Revises: a6c3e9f04b21
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d1f3a5c702"
+down_revision: Union[str, None] = "a6c3e9f04b21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create consumer offset table and daily activity streak columns."""
+    op.create_table(
+        "stream_offsets",
+        sa.Column("consumer_group", sa.String(length=100), nullable=False),
+        sa.Column("topic", sa.String(length=200), nullable=False),
+        sa.Column("partition", sa.Integer(), nullable=False),
+        sa.Column("offset", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("consumer_group", "topic", "partition"),
+    )
+    with op.batch_alter_table("user_streaks") as batch_op:
+        batch_op.add_column(sa.Column("activity_streak", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("last_active_day", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop consumer offset table and daily activity streak columns."""
+    with op.batch_alter_table("user_streaks") as batch_op:
+        batch_op.drop_column("last_active_day")
+        batch_op.drop_column("activity_streak")
+    op.drop_table("stream_offsets")
@@ -0,0 +1,35 @@
+"""add_user_gacha_state
+
+Revision ID: c3f8a1d2e6b4
+Revises: b7e2d4a91c3f
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d2e6b4"
+down_revision: Union[str, None] = "b7e2d4a91c3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the persistent gacha state table."""
+    op.create_table(
+        "user_gacha_states",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("pull_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("history", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the persistent gacha state table."""
+    op.drop_table("user_gacha_states")
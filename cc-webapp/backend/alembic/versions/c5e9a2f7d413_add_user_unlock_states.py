@@ -0,0 +1,77 @@
+"""add_user_unlock_states
+
+Revision ID: c5e9a2f7d413
+Revises: b8d1f3a5c702
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Dict, Optional, Sequence, Tuple, Union
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e9a2f7d413"
+down_revision: Union[str, None] = "b8d1f3a5c702"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _stage(reward_value: Optional[str]) -> Optional[int]:
+    # "3" (unlock API) 또는 "{content_id}_{stage}" (RewardService) 형식
+    value = (reward_value or "").rsplit("_", 1)[-1]
+    return int(value) if value.isdigit() else None
+
+
+def upgrade() -> None:
+    """Create per-user unlock state, backfill it from CONTENT_UNLOCK rewards and index reward history."""
+    unlock_states = op.create_table(
+        "user_unlock_states",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("highest_stage", sa.Integer(), nullable=False),
+        sa.Column("last_unlocked_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index(
+        "ix_user_rewards_user_type_awarded",
+        "user_rewards",
+        ["user_id", "reward_type", "awarded_at"],
+        unique=False,
+    )
+
+    # reward_value 형식이 섞여 있어 SQL이 아닌 Python에서 단계 파싱
+    highest: Dict[int, Tuple[int, Optional[datetime]]] = {}
+    rewards = sa.table(
+        "user_rewards",
+        sa.column("user_id", sa.Integer),
+        sa.column("reward_type", sa.String),
+        sa.column("reward_value", sa.String),
+        sa.column("awarded_at", sa.DateTime),
+    )
+    rows = op.get_bind().execute(
+        sa.select(rewards.c.user_id, rewards.c.reward_value, rewards.c.awarded_at).where(
+            rewards.c.reward_type == "CONTENT_UNLOCK"
+        )
+    )
+    for user_id, reward_value, awarded_at in rows:
+        stage = _stage(reward_value)
+        if stage is not None and stage > highest.get(user_id, (0, None))[0]:
+            highest[user_id] = (stage, awarded_at)
+    now = datetime.utcnow()
+    op.bulk_insert(
+        unlock_states,
+        [
+            {"user_id": user_id, "highest_stage": stage, "last_unlocked_at": at, "updated_at": now}
+            for user_id, (stage, at) in highest.items()
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Drop per-user unlock state and the reward history index."""
+    op.drop_index("ix_user_rewards_user_type_awarded", table_name="user_rewards")
+    op.drop_table("user_unlock_states")
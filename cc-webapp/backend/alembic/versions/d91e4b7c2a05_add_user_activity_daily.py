@@ -0,0 +1,54 @@
+"""add_user_activity_daily
+
+Revision ID: d91e4b7c2a05
+Revises: c3f8a1d2e6b4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d91e4b7c2a05"
+down_revision: Union[str, None] = "c3f8a1d2e6b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create daily activity buckets and backfill the RFM window from user_actions."""
+    op.create_table(
+        "user_activity_daily",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("action_count", sa.Integer(), nullable=False),
+        sa.Column("monetary", sa.Float(), nullable=False),
+        sa.Column("last_action_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+    op.create_index("ix_user_activity_daily_day", "user_activity_daily", ["day"], unique=False)
+
+    # Only the last 35 days are needed (30-day RFM window plus retention slack)
+    cutoff = datetime.combine(datetime.utcnow().date() - timedelta(days=35), datetime.min.time())
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO user_activity_daily (user_id, day, action_count, monetary, last_action_at)
+            SELECT user_id, DATE(timestamp), COUNT(id), COALESCE(SUM(value), 0), MAX(timestamp)
+            FROM user_actions
+            WHERE timestamp >= :cutoff
+            GROUP BY user_id, DATE(timestamp)
+            """
+        ).bindparams(cutoff=cutoff)
+    )
+
+
+def downgrade() -> None:
+    """Drop daily activity buckets."""
+    op.drop_index("ix_user_activity_daily_day", table_name="user_activity_daily")
+    op.drop_table("user_activity_daily")
@@ -0,0 +1,43 @@
+"""add_rfm_threshold_versions
+
+Revision ID: e2a7c5f19d38
+Revises: d91e4b7c2a05
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a7c5f19d38"
+down_revision: Union[str, None] = "d91e4b7c2a05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create versioned RFM threshold storage."""
+    op.create_table(
+        "rfm_threshold_versions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("thresholds", sa.JSON(), nullable=False),
+        sa.Column("sketches", sa.JSON(), nullable=False),
+        sa.Column("sample_size", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_rfm_threshold_versions_id"), "rfm_threshold_versions", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_rfm_threshold_versions_version"), "rfm_threshold_versions", ["version"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Drop versioned RFM threshold storage."""
+    op.drop_index(op.f("ix_rfm_threshold_versions_version"), table_name="rfm_threshold_versions")
+    op.drop_index(op.f("ix_rfm_threshold_versions_id"), table_name="rfm_threshold_versions")
+    op.drop_table("rfm_threshold_versions")
@@ -0,0 +1,29 @@
+"""add_notification_pending_index
+
+Revision ID: f4b8d2e61a97
+Revises: e2a7c5f19d38
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f4b8d2e61a97"
+down_revision: Union[str, None] = "e2a7c5f19d38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index pending notifications by user in claim order."""
+    op.create_index(
+        "ix_notifications_user_pending", "notifications", ["user_id", "is_sent", "created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the pending notification index."""
+    op.drop_index("ix_notifications_user_pending", table_name="notifications")
@@ -2,17 +2,25 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 # from apscheduler.schedulers.background import BackgroundScheduler # if not using asyncio for FastAPI
 from .utils.segment_utils import compute_rfm_and_update_segments
+from .services.ledger_service import LedgerService
+from .services.rfm_threshold_service import RFMThresholdService
+from .repositories.game_state import flush_game_state
+from .services.game_config import reload_game_config
 # Ensure database.py defines SessionLocal. If it's not created yet, this import will fail at runtime.
 # For now, assuming database.py and SessionLocal will be available.
 from .database import SessionLocal
 from datetime import datetime, timedelta
 import logging # For better logging from scheduler
+import os
 
 # Configure logging for APScheduler for better visibility
 logging.basicConfig()
 logging.getLogger('apscheduler').setLevel(logging.INFO)
 
 
+RFM_REFRESH_MINUTES = int(os.getenv("RFM_REFRESH_MINUTES", "5"))
+GAME_CONFIG_POLL_SECONDS = int(os.getenv("GAME_CONFIG_POLL_SECONDS", "5"))
+
 # Using AsyncIOScheduler as FastAPI is async
 scheduler = AsyncIOScheduler(timezone="UTC") # Or your preferred timezone
 
@@ -31,13 +39,59 @@ def job_function():
         if db:
             db.close()
 
+def ledger_snapshot_job():
+    """Checkpoint token balances so ledger reads stay O(recent entries)."""
+    db = None
+    try:
+        db = SessionLocal()
+        LedgerService().take_snapshots(db)
+    except Exception:
+        logging.exception("APScheduler ledger_snapshot_job error")
+    finally:
+        if db:
+            db.close()
+
+def rfm_threshold_job():
+    """Rebuild RFM quantile sketches and publish a new threshold version."""
+    db = None
+    try:
+        db = SessionLocal()
+        RFMThresholdService().refresh(db)
+    except Exception:
+        logging.exception("APScheduler rfm_threshold_job error")
+    finally:
+        if db:
+            db.close()
+
+def game_state_flush_job():
+    """Persist write-behind game state even when no new writes trigger a flush."""
+    try:
+        flush_game_state()
+    except Exception:
+        logging.exception("APScheduler game_state_flush_job error")
+
+def game_config_reload_job():
+    """Publish GAME_CONFIG_FILE when it changes and adopt versions other workers published."""
+    try:
+        reload_game_config()
+    except Exception:
+        logging.exception("APScheduler game_config_reload_job error")
+
 def start_scheduler():
     if scheduler.running:
         print(f"[{datetime.utcnow()}] APScheduler: Scheduler already running.")
         return
 
-    # Schedule to run daily at 2 AM UTC
-    scheduler.add_job(job_function, 'cron', hour=2, minute=0, misfire_grace_time=3600) # Misfire grace time of 1hr
+    # RFM segments read the incremental activity buckets, so refresh every few minutes
+    scheduler.add_job(job_function, 'interval', minutes=RFM_REFRESH_MINUTES, max_instances=1)
+    # Distribution-aware RFM thresholds, hourly
+    scheduler.add_job(rfm_threshold_job, 'interval', hours=1, max_instances=1)
+    # Token ledger snapshots every 10 minutes
+    scheduler.add_job(ledger_snapshot_job, 'interval', minutes=10, max_instances=1)
+    # Write-behind game state flush
+    scheduler.add_job(game_state_flush_job, 'interval', seconds=5, max_instances=1)
+    # Game config file watch (mtime poll; unchanged files are not re-read)
+    scheduler.add_job(game_config_reload_job, 'interval', seconds=GAME_CONFIG_POLL_SECONDS, max_instances=1)
 
     # Run once on startup for local testing/verification (5 seconds after app start)
     # This helps confirm the job setup without waiting for 2 AM.
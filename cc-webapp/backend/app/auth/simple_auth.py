@@ -17,6 +17,18 @@ import string
 # HTTP Bearer security scheme (optional, for future token-based auth)
 security = HTTPBearer(auto_error=False)
 
+# 랭크 계층 (알 수 없는 랭크는 STANDARD 취급)
+RANK_LEVELS = {
+    "VIP": 3,
+    "PREMIUM": 2,
+    "STANDARD": 1
+}
+
+
+def rank_level(rank: Optional[str]) -> int:
+    """랭크 문자열을 숫자 레벨로 변환"""
+    return RANK_LEVELS.get(rank, 1)
+
 class SimpleAuth:
     @staticmethod
     def generate_invite_code() -> str:
@@ -60,16 +72,7 @@ class SimpleAuth:
     @staticmethod
     def check_rank_access(user_rank: str, required_rank: str) -> bool:
         """랭크 기반 접근 제어"""
-        rank_hierarchy = {
-            "VIP": 3,
-            "PREMIUM": 2, 
-            "STANDARD": 1
-        }
-        
-        user_level = rank_hierarchy.get(user_rank, 1)
-        required_level = rank_hierarchy.get(required_rank, 1)
-        
-        return user_level >= required_level
+        return rank_level(user_rank) >= rank_level(required_rank)
     
     @staticmethod
     def check_combined_access(user_rank: str, user_segment_level: int, 
@@ -100,6 +103,12 @@ def require_user(current_user_id: Optional[int] = Depends(get_current_user)) ->
         )
     return current_user_id
 
+def require_admin(current_user_id: int = Depends(require_user)) -> int:
+    """관리자 전용 엔드포인트용 의존성 (단순 관리자 확인: user_id 1만 허용)"""
+    if current_user_id != 1:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user_id
+
 # 테스트를 위한 간단한 사용자 ID 반환 함수
 def get_current_user_id(
     current_user_id: Optional[int] = Depends(get_current_user)
@@ -1,28 +1,256 @@
-"""SQLAlchemy engine and session configuration."""
+"""SQLAlchemy engine and session configuration.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+Pooling is configured through environment variables (defaults in brackets):
+
+- ``DB_POOL_SIZE`` [5], ``DB_MAX_OVERFLOW`` [10], ``DB_POOL_TIMEOUT`` [30s]
+- ``DB_POOL_RECYCLE`` [1800s], ``DB_POOL_PRE_PING`` [1]
+- ``DB_STATEMENT_TIMEOUT_MS`` [0 = off; PostgreSQL and MySQL]
+- ``DB_SQLITE_WAL`` [1], ``DB_SQLITE_BUSY_TIMEOUT_MS`` [5000] for file-based SQLite
+- ``DATABASE_REPLICA_URLS``: comma-separated read replicas used by ``get_read_db``
+"""
+
+import itertools
+import logging
 import os
+import threading
+import time
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 try:
-    engine = create_engine(DATABASE_URL, connect_args=connect_args)
-    # Attempt initial connection to validate URL during tests
-    with engine.connect():
-        pass
-except Exception:
-    # Fallback to local SQLite file if primary DB is unreachable
-    fallback_url = "sqlite:///./fallback.db"
-    engine = create_engine(fallback_url, connect_args={"check_same_thread": False})
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # Optional dependency
+    Counter = Gauge = Histogram = None
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# 게임/토큰 핫패스에서 AsyncSession 사용 여부
+USE_ASYNC_DB = os.getenv("DB_ASYNC", "0") == "1"
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+aiomysql"}
+
+if Gauge is not None:
+    POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out", ["engine"])
+    POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["engine"])
+    POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size", ["engine"])
+    POOL_WAIT_SECONDS = Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled connection",
+        ["engine"],
+        buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+    )
+    POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that hit DB_POOL_TIMEOUT", ["engine"])
+else:
+    POOL_CHECKED_OUT = POOL_SIZE = POOL_OVERFLOW = POOL_WAIT_SECONDS = POOL_TIMEOUTS = None
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that records checkout wait time and pool timeouts."""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if POOL_TIMEOUTS is not None:
+                POOL_TIMEOUTS.labels(engine=self.metrics_name).inc()
+            logger.warning("DB pool %s exhausted (size=%s, overflow=%s)", self.metrics_name, self.size(), self.overflow())
+            raise
+        finally:
+            if POOL_WAIT_SECONDS is not None:
+                POOL_WAIT_SECONDS.labels(engine=self.metrics_name).observe(time.perf_counter() - started)
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def pool_options(url) -> dict:
+    """Pool keyword arguments for ``create_engine`` from the ``DB_POOL_*`` settings."""
+    options = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+    }
+    if not _is_memory_sqlite(url):
+        # 인메모리 SQLite는 SingletonThreadPool을 유지 (연결마다 별도 DB가 되므로)
+        options.update(
+            pool_size=_env_int("DB_POOL_SIZE", 5),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        )
+    return options
+
+
+def configure_connections(engine: Engine) -> None:
+    """Install per-connection settings: SQLite pragmas or a statement timeout."""
+    backend = engine.url.get_backend_name()
+    statement_timeout = _env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+
+    if backend == "sqlite" and not _is_memory_sqlite(engine.url):
+        wal = os.getenv("DB_SQLITE_WAL", "1") == "1"
+        busy_timeout = _env_int("DB_SQLITE_BUSY_TIMEOUT_MS", 5000)
+
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                if wal:
+                    # WAL: 읽기가 쓰기를 막지 않으며 커밋마다 fsync 하지 않아도 된다
+                    cursor.execute("PRAGMA journal_mode=WAL")
+                    cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute(f"PRAGMA busy_timeout={busy_timeout}")
+            finally:
+                cursor.close()
+
+    elif statement_timeout and backend in ("postgresql", "mysql"):
+        statement = (
+            f"SET statement_timeout = {statement_timeout}"
+            if backend == "postgresql"
+            else f"SET SESSION max_execution_time = {statement_timeout}"
+        )
+
+        @event.listens_for(engine, "connect")
+        def _statement_timeout(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(statement)
+            finally:
+                cursor.close()
+            if backend == "postgresql":
+                # SET은 트랜잭션 안에서 실행되므로 커밋해야 첫 롤백 때 되돌려지지 않는다
+                dbapi_connection.commit()
+
+
+def _register_pool_metrics(engine: Engine, name: str) -> None:
+    if POOL_CHECKED_OUT is None or not isinstance(engine.pool, QueuePool):
+        return
+    # engine.pool은 dispose() 때 새로 만들어지므로 매 수집 시점에 다시 읽는다
+    POOL_CHECKED_OUT.labels(engine=name).set_function(lambda: engine.pool.checkedout())
+    POOL_SIZE.labels(engine=name).set_function(lambda: engine.pool.size())
+    POOL_OVERFLOW.labels(engine=name).set_function(lambda: max(engine.pool.overflow(), 0))
+
+
+def create_db_engine(url: str, name: str = "primary") -> Engine:
+    """
+    Create an engine with the configured pool, connection settings and metrics.
+
+    Args:
+        url (str): SQLAlchemy database URL
+        name (str): ``engine`` label for the pool metrics
+
+    Returns:
+        Engine: Configured engine (no connection is opened yet)
+    """
+    parsed = make_url(url)
+    options = pool_options(parsed)
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    if "pool_size" in options:
+        # 라벨을 클래스에 담아 dispose()로 풀이 재생성돼도 유지되게 한다
+        options["poolclass"] = type("InstrumentedQueuePool", (InstrumentedQueuePool,), {"metrics_name": name})
+    db_engine = create_engine(parsed, **options)
+    configure_connections(db_engine)
+    _register_pool_metrics(db_engine, name)
+    return db_engine
+
+
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engines = [create_db_engine(url, f"replica{i}") for i, url in enumerate(REPLICA_URLS)]
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+_replica_lock = threading.Lock()
+
 
 def get_db():
     db = SessionLocal()
-    print(f"Using DB: {engine.url}")
     try:
         yield db
     finally:
         db.close()
+
+
+def ReadSessionLocal() -> Session:
+    """Session on the next read replica (round robin), or the primary without replicas.
+
+    Replicas may lag the primary; only use it where slightly stale reads are fine.
+    """
+    if _replica_cycle is None:
+        return SessionLocal()
+    with _replica_lock:
+        replica = next(_replica_cycle)
+    return Session(bind=replica, autoflush=False)
+
+
+def get_read_db():
+    """Dependency for read-only endpoints; see ``ReadSessionLocal``."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def to_async_url(url) -> str:
+    """Swap a sync driver for its asyncio counterpart (aiosqlite, asyncpg, aiomysql)."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    """Lazily create the ``AsyncEngine`` for the database ``engine`` points at."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = make_url(to_async_url(engine.url))
+        _async_engine = create_async_engine(url, **pool_options(url))
+        configure_connections(_async_engine.sync_engine)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    """Return a new ``AsyncSession``.
+
+    Objects are not expired on commit: reloading them would need implicit IO,
+    which ``AsyncSession`` does not allow.
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_sessionmaker = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (called on shutdown)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_sessionmaker = None
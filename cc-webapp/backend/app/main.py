@@ -51,7 +51,9 @@ from app.routers import (
     corporate,  # 추가
     users,  # 추가
     recommendation,  # 추가된 임포트
-    doc_titles  # 추가
+    doc_titles,  # 추가
+    tokens,  # 토큰 원장
+    game_config,  # 게임 규칙 설정
 )
 
 # --- Sentry Initialization (Placeholder - should be configured properly with DSN) ---
@@ -80,17 +82,43 @@ else:
 
 from contextlib import asynccontextmanager
 
+from app.database import dispose_async_engine
+from app.repositories.action_writer import action_writer
+from app.repositories.game_state import flush_game_state
+from app.services.action_event_producer import action_producer
+from app.services.container import get_service_container
+from app.services.notification_dispatcher import notification_dispatcher
+from app.websockets.chat import manager as websocket_manager
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
+    # 상태 없는 서비스는 요청마다 만들지 않고 여기서 한 번 만든다 (DB 세션만 요청 단위)
+    app.state.services = get_service_container()
     if os.getenv("DISABLE_SCHEDULER") != "1":
         print("FastAPI startup event: Initializing job scheduler...")
         start_scheduler()
+    await websocket_manager.start()
+    await notification_dispatcher.start()
+    await action_producer.start()
+    if action_writer is not None:
+        await action_writer.start()
     yield
     # Shutdown logic
     print("FastAPI shutdown event: Shutting down scheduler...")
     if scheduler.running:
         scheduler.shutdown(wait=False)
+    # 쓰기 지연 중인 게임 상태(스트릭/가챠)를 DB에 반영
+    flush_game_state()
+    # 배치 대기 중인 user_actions 행 기록
+    if action_writer is not None:
+        await action_writer.close()
+    # 버퍼에 남은 액션 이벤트 전송 (실패분은 디스크 스풀)
+    await action_producer.close()
+    # 소켓 큐에서 버려지는 알림 프레임의 대기 상태 복구를 디스패처가 마저 기다리도록 소켓을 먼저 닫는다
+    await websocket_manager.close()
+    await notification_dispatcher.close()
+    await dispose_async_engine()
 
 app = FastAPI(
     lifespan=lifespan,
@@ -151,6 +179,8 @@ app.include_router(actions.router, prefix="/api")  # 추가
 app.include_router(corporate.router, prefix="/api")  # 추가
 app.include_router(users.router, prefix="/api")  # 추가
 app.include_router(recommendation.router, prefix="/api")  # 추가된 라우터 등록
+app.include_router(tokens.router, prefix="/api")  # 토큰 거래 내역
+app.include_router(game_config.router, prefix="/api")  # 게임 규칙 설정 (관리자)
 app.include_router(doc_titles.router)  # prefix 없이 등록하여 /docs/titles 직접 접근 가능
 
 
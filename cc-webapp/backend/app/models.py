@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, Text # Added Boolean, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Boolean, Text, Index # Added Boolean, Text
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.types import JSON
@@ -37,14 +37,58 @@ class UserAction(Base):
     
     user = relationship("User", back_populates="actions")
 
+class UserActivityDaily(Base):
+    """Per-user daily activity bucket, maintained by ``GameRepository.record_action``.
+
+    RFM reads the last 30 buckets per user instead of rescanning ``user_actions``.
+    """
+
+    __tablename__ = "user_activity_daily"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    action_count = Column(Integer, nullable=False, default=0)
+    monetary = Column(Float, nullable=False, default=0.0)
+    last_action_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (Index("ix_user_activity_daily_day", "day"),)
+
+class RFMThresholdVersion(Base):
+    """Published RFM score thresholds with the quantile sketches they came from."""
+
+    __tablename__ = "rfm_threshold_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, unique=True, index=True)
+    thresholds = Column(JSON, nullable=False)
+    sketches = Column(JSON, nullable=False)
+    sample_size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class GameConfigVersion(Base):
+    """Published game rule snapshots; the unique version orders them across workers."""
+
+    __tablename__ = "game_config_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, unique=True, index=True)
+    rules = Column(JSON, nullable=False)
+    source = Column(String(100), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class UserSegment(Base):
     __tablename__ = "user_segments"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True, index=True)
     rfm_group = Column(String(50), nullable=False)
     risk_profile = Column(String(50), nullable=False)
     name = Column(String(50), nullable=True)
+    streak_count = Column(Integer, nullable=True)
+    recency_score = Column(Integer, nullable=True)
+    frequency_score = Column(Integer, nullable=True)
+    monetary_score = Column(Integer, nullable=True)
+    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship
     user = relationship("User", back_populates="segment", uselist=False) # One-to-one
@@ -82,6 +126,27 @@ class UserReward(Base):
     # Relationship
     user = relationship("User", back_populates="rewards")
 
+    __table_args__ = (
+        # 사용자별 보상 이력 (유형별 최신순) 조회
+        Index("ix_user_rewards_user_type_awarded", "user_id", "reward_type", "awarded_at"),
+    )
+
+
+class UserUnlockState(Base):
+    """Highest content stage each user has unlocked.
+
+    Maintained next to every ``CONTENT_UNLOCK`` reward so gating reads one
+    row by primary key instead of scanning and parsing reward history.
+    """
+
+    __tablename__ = "user_unlock_states"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    highest_stage = Column(Integer, nullable=False, default=0)
+    last_unlocked_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class AdultContent(Base):
     __tablename__ = "adult_content"
 
@@ -106,9 +171,33 @@ class Notification(Base):
     is_sent = Column(Boolean, default=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     sent_at = Column(DateTime, nullable=True)
+    campaign_id = Column(Integer, ForeignKey("notification_campaigns.id"), nullable=True)
 
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # 사용자별 미발송 알림을 생성 순으로 배치 claim
+        Index("ix_notifications_user_pending", "user_id", "is_sent", "created_at"),
+        # 캠페인당 사용자 1건 (campaign_id가 NULL인 일반 알림은 제약 대상 아님)
+        Index("ix_notifications_campaign_user", "campaign_id", "user_id", unique=True),
+    )
+
+class NotificationCampaign(Base):
+    """Segment-targeted notification fan-out; ``name`` identifies a campaign across reruns."""
+
+    __tablename__ = "notification_campaigns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, unique=True)
+    message = Column(String(500), nullable=False)
+    segments = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed
+    targeted_count = Column(Integer, nullable=False, default=0)
+    created_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
 # New Models
 
 class FlashOffer(Base):
@@ -163,11 +252,63 @@ class UserStreak(Base):
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
     win_streak = Column(Integer, default=0)
     loss_streak = Column(Integer, default=0)
+    # 연속 활동 일수 (액션 스트림 컨슈머가 갱신)
+    activity_streak = Column(Integer, default=0)
+    last_active_day = Column(Date, nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User")
 
 
+class StreamOffset(Base):
+    """Last offset applied to the database per consumer group and partition.
+
+    Written in the same transaction as the rows a batch produces, so a batch
+    redelivered after a crash is recognised and skipped.
+    """
+
+    __tablename__ = "stream_offsets"
+
+    consumer_group = Column(String(100), primary_key=True)
+    topic = Column(String(200), primary_key=True)
+    partition = Column(Integer, primary_key=True)
+    offset = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class UserGachaState(Base):
+    """Gacha pity counter and recent history per user.
+
+    ``user_id`` carries no foreign key: some services also cache aggregate
+    data under the reserved id 0.
+    """
+
+    __tablename__ = "user_gacha_states"
+
+    user_id = Column(Integer, primary_key=True)
+    pull_count = Column(Integer, nullable=False, default=0)
+    history = Column(JSON, nullable=False, default=list)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class GachaRewardStock(Base):
+    """Limited gacha reward stock, split over shard rows per rarity.
+
+    Reservations decrement one shard row with a conditional ``UPDATE`` so
+    concurrent pulls of a popular rarity lock different rows. Every shard
+    keeps ``allocated == remaining + granted``.
+    """
+
+    __tablename__ = "gacha_reward_stock"
+
+    rarity = Column(String(50), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    allocated = Column(Integer, nullable=False, default=0)
+    remaining = Column(Integer, nullable=False, default=0)
+    granted = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class TokenTransfer(Base):
     __tablename__ = "token_transfers"
 
@@ -181,6 +322,39 @@ class TokenTransfer(Base):
     to_user = relationship("User", foreign_keys=[to_user_id])
 
 
+
+class TokenLedgerEntry(Base):
+    """Append-only record of every cyber token balance change."""
+    __tablename__ = "token_ledger"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    amount = Column(Integer, nullable=False)  # signed delta
+    balance_after = Column(Integer, nullable=False)
+    reason = Column(String(50), nullable=False)  # e.g. SLOT_SPIN_BET, SLOT_SPIN_PAYOUT
+    action_id = Column(Integer, ForeignKey("user_actions.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Keyset pagination and "entries after checkpoint" scans per user
+        Index("ix_token_ledger_user_id_id", "user_id", "id"),
+    )
+
+
+class TokenBalanceSnapshot(Base):
+    """Checkpoint of a user's balance covering ledger entries up to last_entry_id."""
+    __tablename__ = "token_balance_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    last_entry_id = Column(Integer, nullable=False, default=0)
+    balance = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_token_balance_snapshots_user_id_last_entry_id", "user_id", "last_entry_id"),
+    )
+
 class Game(Base):
     __tablename__ = "games"
 
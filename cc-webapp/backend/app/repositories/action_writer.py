@@ -0,0 +1,342 @@
+"""Write-behind batching of ``user_actions`` rows."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError, OperationalError, SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..utils.sql_utils import bulk_insert
+from .activity_repository import ActivityRepository
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # Optional dependency
+    Counter = Gauge = Histogram = None
+
+logger = logging.getLogger(__name__)
+
+if Counter is not None:
+    ACTION_WRITES = Counter(
+        "action_writer_rows_total", "User action rows by write-behind outcome", ["outcome"]
+    )
+    ACTION_WRITER_PENDING = Gauge("action_writer_pending", "User action rows waiting to be written")
+    ACTION_WRITER_FLUSH_SECONDS = Histogram(
+        "action_writer_flush_seconds", "Time to bulk-insert one batch of user actions"
+    )
+else:
+    ACTION_WRITES = ACTION_WRITER_PENDING = ACTION_WRITER_FLUSH_SECONDS = None
+
+PendingAction = Tuple[int, str, float, datetime]  # (user_id, action_type, value, timestamp)
+
+_AFTER_COMMIT_KEY = "action_writer.after_commit"  # Session.info 키: 커밋 대기 행
+
+
+class ActionWriter:
+    """
+    Coalesces ``UserAction`` rows from all requests into bulk inserts.
+
+    ``submit`` only appends to an in-memory buffer; a background task writes
+    the buffer every ``interval`` seconds, or as soon as ``batch_size`` rows
+    are waiting, with one bulk insert plus one activity-bucket upsert per
+    batch. The buffer is bounded by ``max_pending``: when it is full (or the
+    writer is not running) ``submit`` returns False and the caller writes the
+    row synchronously, so load sheds to the old path instead of losing data.
+    Rows that belong to a caller's transaction go through ``submit_after_commit``
+    and are only queued once that transaction commits.
+    A batch that fails on a connection-level error is put back and retried on
+    the next tick. Any other failure is bisected so the good rows are still
+    written; a row that fails on its own is logged and dropped (dead-lettered)
+    instead of blocking the buffer. ``close`` flushes everything that is still
+    buffered.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        interval: float = 0.05,
+        batch_size: int = 1000,
+        max_pending: int = 50_000,
+        activity: Optional[ActivityRepository] = None,
+    ) -> None:
+        """
+        Args:
+            session_factory (Optional[Callable[[], Session]]): Session factory, defaults to SessionLocal
+            interval (float): Maximum seconds a row waits before being written
+            batch_size (int): Rows per insert; reaching it triggers an early flush
+            max_pending (int): Buffer bound beyond which callers write synchronously
+            activity (Optional[ActivityRepository]): Activity bucket repository
+        """
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.activity = activity or ActivityRepository()
+        self._buffer: Deque[PendingAction] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._accepting = False
+        self.stats = {
+            name: 0 for name in ("queued", "written", "rejected", "failed", "dead_lettered", "batches")
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def _count(self, outcome: str, amount: int = 1) -> None:
+        if amount:
+            self.stats[outcome] += amount
+            if ACTION_WRITES is not None:
+                ACTION_WRITES.labels(outcome=outcome).inc(amount)
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from app.database import SessionLocal
+
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def submit(self, user_id: int, action_type: str, value: float, timestamp: datetime) -> bool:
+        """
+        Queue one action row. Safe to call from worker threads.
+
+        Returns:
+            bool: False if the writer is stopped or full and the caller must write the row itself
+        """
+        with self._lock:
+            accepted = self._accepting and len(self._buffer) < self.max_pending
+            if accepted:
+                self._buffer.append((user_id, action_type, value, timestamp))
+                size = len(self._buffer)
+        if not accepted:
+            if self._accepting:
+                self._count("rejected")
+            return False
+        self._count("queued")
+        if size >= self.batch_size:
+            self._wake()
+        return True
+
+    def submit_after_commit(
+        self, db: Session, user_id: int, action_type: str, value: float, timestamp: datetime
+    ) -> bool:
+        """
+        Queue one action row once ``db`` commits; the row is dropped if it rolls back.
+
+        If the buffer is full at commit time the row is written right away in
+        a separate session.
+
+        Returns:
+            bool: False if the writer is stopped and the caller must write the row itself
+        """
+        if not self._accepting:
+            return False
+        if not db.in_transaction():
+            db.begin()  # 롤백이 이 행을 버릴 수 있도록 트랜잭션에 묶는다
+        pending = db.info.get(_AFTER_COMMIT_KEY)
+        if pending is None:
+            pending = db.info[_AFTER_COMMIT_KEY] = []
+            event.listen(db, "after_commit", self._after_commit)
+            event.listen(db, "after_soft_rollback", self._after_rollback)
+        pending.append((user_id, action_type, value, timestamp))
+        return True
+
+    def _after_commit(self, db: Session) -> None:
+        pending = db.info.get(_AFTER_COMMIT_KEY)
+        if not pending:
+            return
+        rows = list(pending)
+        pending.clear()
+        rejected = [row for row in rows if not self.submit(*row)]
+        if rejected:
+            try:
+                self._write(rejected)
+                self._count("written", len(rejected))
+            except SQLAlchemyError as exc:
+                logger.error("Failed to write %s committed user actions: %s", len(rejected), exc)
+                self._count("failed", len(rejected))
+
+    @staticmethod
+    def _after_rollback(db: Session, previous_transaction) -> None:
+        if previous_transaction.nested:
+            return  # 세이브포인트 롤백은 바깥 트랜잭션의 행을 버리지 않는다
+        pending = db.info.get(_AFTER_COMMIT_KEY)
+        if pending:
+            pending.clear()
+
+    def _wake(self) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wakeup.set()
+        else:
+            # 동기 엔드포인트(스레드풀)에서 호출된 경우
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            with self._lock:
+                self._accepting = True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._buffer:
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as exc:
+                    logger.error("Action write-behind flush failed: %s", exc)
+
+    async def close(self) -> None:
+        """Stop accepting rows and write everything still buffered."""
+        with self._lock:
+            self._accepting = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._buffer:
+            await asyncio.to_thread(self.flush)
+        if self._buffer:
+            logger.error("%s user actions could not be written at shutdown", len(self._buffer))
+
+    def flush(self) -> int:
+        """
+        Write buffered rows in ``batch_size`` chunks, one commit per chunk.
+
+        Returns:
+            int: Rows written; stops at the first connection-level failure,
+            whose rows are re-queued
+        """
+        written = 0
+        with self._flush_lock:
+            while self._buffer:
+                batch = self._take()
+                try:
+                    self._write(batch)
+                    done, retry = len(batch), []
+                except SQLAlchemyError as exc:
+                    logger.error("Failed to write %s user actions: %s", len(batch), exc)
+                    self._count("failed", len(batch))
+                    done, retry = (0, batch) if self._transient(exc) else self._salvage(batch, exc)
+                written += done
+                self._count("written", done)
+                if done:
+                    self.stats["batches"] += 1
+                if retry:
+                    with self._lock:
+                        self._buffer.extendleft(reversed(retry))
+                    break
+        if ACTION_WRITER_PENDING is not None:
+            ACTION_WRITER_PENDING.set(len(self._buffer))
+        return written
+
+    @staticmethod
+    def _transient(exc: SQLAlchemyError) -> bool:
+        """Connection-level failures are retried as a whole; anything else is a bad row."""
+        return isinstance(exc, (OperationalError, DisconnectionError, PoolTimeoutError)) or bool(
+            getattr(exc, "connection_invalidated", False)
+        )
+
+    def _salvage(self, batch: List[PendingAction], exc: SQLAlchemyError) -> Tuple[int, List[PendingAction]]:
+        """
+        Bisect a batch that failed on bad data and write what can be written.
+
+        Returns:
+            Tuple[int, List[PendingAction]]: Rows written, and rows to re-queue
+            because a connection-level error interrupted the split
+        """
+        if len(batch) == 1:
+            logger.error("Dead-lettering user action %s: %s", batch[0], exc)
+            self._count("dead_lettered")
+            return 0, []
+        written = 0
+        retry: List[PendingAction] = []
+        middle = len(batch) // 2
+        for part in (batch[:middle], batch[middle:]):
+            if retry:
+                retry.extend(part)
+                continue
+            try:
+                self._write(part)
+                written += len(part)
+            except SQLAlchemyError as part_exc:
+                if self._transient(part_exc):
+                    retry.extend(part)
+                else:
+                    part_written, part_retry = self._salvage(part, part_exc)
+                    written += part_written
+                    retry.extend(part_retry)
+        return written, retry
+
+    def _take(self) -> List[PendingAction]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _write(self, batch: List[PendingAction]) -> None:
+        started = time.perf_counter()
+        db = self._session()
+        try:
+            bulk_insert(
+                db,
+                models.UserAction,
+                [
+                    {"user_id": user_id, "action_type": action_type, "value": value, "timestamp": at}
+                    for user_id, action_type, value, at in batch
+                ],
+                ["user_id", "action_type", "value", "timestamp"],
+            )
+            self.activity.record_many(db, [(user_id, value, at) for user_id, _, value, at in batch])
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        if ACTION_WRITER_FLUSH_SECONDS is not None:
+            ACTION_WRITER_FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+
+def create_action_writer() -> Optional[ActionWriter]:
+    """Build the writer if ``ACTION_WRITE_BEHIND=1``; tuned by ``ACTION_WRITE_BEHIND_*``."""
+    if os.getenv("ACTION_WRITE_BEHIND", "0") != "1":
+        return None
+    return ActionWriter(
+        interval=int(os.getenv("ACTION_WRITE_BEHIND_INTERVAL_MS", "50")) / 1000,
+        batch_size=int(os.getenv("ACTION_WRITE_BEHIND_BATCH_SIZE", "1000")),
+        max_pending=int(os.getenv("ACTION_WRITE_BEHIND_MAX_PENDING", "50000")),
+    )
+
+
+# 프로세스 공용 라이터 (비활성화 시 None)
+action_writer = create_action_writer()
@@ -0,0 +1,158 @@
+"""Rolling per-user activity aggregates used for RFM segmentation."""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..utils.sql_utils import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+RFM_WINDOW_DAYS = 30
+
+
+class ActivitySummary(NamedTuple):
+    """Recency/frequency/monetary inputs for one user over the RFM window."""
+
+    last_action_at: Optional[datetime]
+    frequency: int
+    monetary: float
+
+
+def window_start(now: datetime, days: int = RFM_WINDOW_DAYS) -> date:
+    """First daily bucket included in a ``days``-long window ending at ``now``."""
+    return (now - timedelta(days=days)).date()
+
+
+class ActivityRepository:
+    """Maintains ``user_activity_daily`` buckets.
+
+    Each recorded action bumps one ``(user_id, day)`` row with an atomic
+    upsert, so concurrent writers never lose increments and readers only touch
+    at most ``RFM_WINDOW_DAYS`` rows per user. ``monetary`` accumulates the
+    magnitude of action values: game actions are recorded as ``-bet``, and
+    RFM scores spend, so a larger stake must rank higher.
+    """
+
+    RETENTION_DAYS = RFM_WINDOW_DAYS + 5
+
+    def record(self, db: Session, user_id: int, value: float, at: datetime) -> None:
+        """Add one action to the user's bucket for ``at``'s day. Does not commit."""
+        self.record_many(db, [(user_id, value, at)])
+
+    def record_many(self, db: Session, actions: Iterable[Tuple[int, float, datetime]]) -> int:
+        """
+        Add a batch of ``(user_id, value, at)`` actions with one upsert.
+
+        Actions are pre-aggregated per ``(user_id, day)`` so each bucket is
+        written once per call; ``monetary`` adds ``abs(value)`` and
+        ``last_action_at`` only moves forward. Does not commit.
+
+        Returns:
+            int: Number of buckets written
+        """
+        buckets: Dict[Tuple[int, date], dict] = {}
+        for user_id, value, at in actions:
+            spend = abs(float(value or 0.0))
+            bucket = buckets.get((user_id, at.date()))
+            if bucket is None:
+                buckets[(user_id, at.date())] = {
+                    "user_id": user_id,
+                    "day": at.date(),
+                    "action_count": 1,
+                    "monetary": spend,
+                    "last_action_at": at,
+                }
+            else:
+                bucket["action_count"] += 1
+                bucket["monetary"] += spend
+                bucket["last_action_at"] = max(bucket["last_action_at"], at)
+        bulk_upsert(
+            db,
+            models.UserActivityDaily,
+            list(buckets.values()),
+            ["user_id", "day"],
+            [],
+            increment=["action_count", "monetary"],
+            # 늦게 도착한 배치(쓰기 지연, 스트림 재처리)가 최근 시각을 되돌리지 않도록
+            greatest=["last_action_at"],
+        )
+        return len(buckets)
+
+    def advance_streaks(self, db: Session, active_days: Dict[int, Iterable[date]]) -> Dict[int, int]:
+        """
+        Extend each user's consecutive-active-day streak with ``active_days``.
+
+        Days older than the stored ``last_active_day`` are late events and do
+        not change the streak; a gap of more than one day restarts it at 1.
+        Does not commit.
+
+        Args:
+            active_days (Dict[int, Iterable[date]]): Days with activity per user
+
+        Returns:
+            Dict[int, int]: New ``activity_streak`` per user
+        """
+        if not active_days:
+            return {}
+        Streak = models.UserStreak
+        stored = {
+            user_id: (streak or 0, last_day)
+            for user_id, streak, last_day in db.query(
+                Streak.user_id, Streak.activity_streak, Streak.last_active_day
+            ).filter(Streak.user_id.in_(list(active_days)))
+        }
+        now = datetime.utcnow()
+        rows = []
+        for user_id, days in active_days.items():
+            streak, last_day = stored.get(user_id, (0, None))
+            for day in sorted(set(days)):
+                if last_day is None or day > last_day + timedelta(days=1):
+                    streak = 1
+                elif day == last_day + timedelta(days=1):
+                    streak += 1
+                else:
+                    continue
+                last_day = day
+            rows.append(
+                {"user_id": user_id, "activity_streak": streak, "last_active_day": last_day, "updated_at": now}
+            )
+        bulk_upsert(
+            db, Streak, rows, ["user_id"], ["activity_streak", "last_active_day", "updated_at"]
+        )
+        return {row["user_id"]: row["activity_streak"] for row in rows}
+
+    def get_summary(
+        self, db: Session, user_id: int, days: int = RFM_WINDOW_DAYS, now: Optional[datetime] = None
+    ) -> ActivitySummary:
+        """Aggregate the user's buckets inside the window."""
+        Daily = models.UserActivityDaily
+        last_action_at, frequency, monetary = (
+            db.query(
+                func.max(Daily.last_action_at),
+                func.coalesce(func.sum(Daily.action_count), 0),
+                func.coalesce(func.sum(Daily.monetary), 0.0),
+            )
+            .filter(Daily.user_id == user_id, Daily.day >= window_start(now or datetime.utcnow(), days))
+            .one()
+        )
+        return ActivitySummary(last_action_at, int(frequency), float(monetary))
+
+    def prune(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Delete buckets older than ``RETENTION_DAYS`` and commit."""
+        cutoff = window_start(now or datetime.utcnow(), self.RETENTION_DAYS)
+        try:
+            deleted = db.execute(
+                delete(models.UserActivityDaily).where(models.UserActivityDaily.day < cutoff)
+            ).rowcount
+            db.commit()
+        except SQLAlchemyError as exc:
+            logger.error("Failed to prune activity buckets: %s", exc)
+            db.rollback()
+            raise
+        return deleted
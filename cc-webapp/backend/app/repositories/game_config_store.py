@@ -0,0 +1,63 @@
+"""Shared storage for published game config versions (``GAME_CONFIG_BACKEND=sql``)."""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+
+class SQLGameConfigStore:
+    """Append-only ``game_config_versions`` table shared by every worker.
+
+    The unique ``version`` column is the cross-process compare-and-swap: two
+    workers publishing on top of the same version race on one insert and
+    the loser re-reads the winner's row.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None) -> None:
+        if session_factory is None:
+            from ..database import SessionLocal
+
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+
+    def latest(self) -> Optional[models.GameConfigVersion]:
+        """Return the newest stored version, or None if nothing was published yet."""
+        db = self.session_factory()
+        try:
+            return (
+                db.query(models.GameConfigVersion)
+                .order_by(models.GameConfigVersion.version.desc())
+                .first()
+            )
+        finally:
+            db.close()
+
+    def append(self, version: int, rules: Dict[str, Dict[str, Any]], source: str) -> bool:
+        """
+        Store ``rules`` as ``version``.
+
+        Args:
+            version (int): Must be one above the latest stored version
+            rules (Dict[str, Dict[str, Any]]): Plain JSON rules document
+            source (str): Who published it
+
+        Returns:
+            bool: False if another worker already stored this version
+        """
+        db = self.session_factory()
+        try:
+            db.add(models.GameConfigVersion(version=version, rules=rules, source=source[:100]))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            logger.info("Game config version %s was published by another worker", version)
+            return False
+        finally:
+            db.close()
@@ -1,67 +1,117 @@
 """Game state repository with PostgreSQL persistence."""
 
 import logging
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import models
+from .action_writer import ActionWriter, action_writer
+from .activity_repository import ActivityRepository, ActivitySummary
+from .game_state import GameStateBackend, get_game_state_backend
+from .segment_cache import SegmentCache, segment_cache
 
 logger = logging.getLogger(__name__)
 
-# In-memory fallbacks
-_streak_cache: dict[int, int] = {}
-_gacha_count_cache: dict[int, int] = {}
-_gacha_history_cache: dict[int, List[str]] = {}
-
 
 class GameRepository:
-    """Data access layer for game state using DB."""
+    """Data access layer for game state using DB.
+
+    Streaks and gacha state live in a pluggable ``GameStateBackend``; by default
+    the process-wide backend chosen by ``GAME_STATE_BACKEND``. Action rows go
+    through the process-wide ``ActionWriter`` when ``ACTION_WRITE_BEHIND=1``.
+    Segment lookups are served from the process-wide ``SegmentCache``.
+    """
+
+    def __init__(
+        self,
+        state: Optional[GameStateBackend] = None,
+        activity: Optional[ActivityRepository] = None,
+        writer: Optional[ActionWriter] = None,
+        segments: Optional[SegmentCache] = None,
+    ) -> None:
+        self.state = state if state is not None else get_game_state_backend()
+        self.activity = activity or ActivityRepository()
+        self.writer = writer if writer is not None else action_writer
+        self.segments = segments if segments is not None else segment_cache
 
     def get_streak(self, user_id: int) -> int:
-        """Return the current win streak for the user."""
-        return _streak_cache.get(user_id, 0)
+        """Return the user's current losing streak."""
+        return self.state.get_streak(user_id)
 
     def set_streak(self, user_id: int, value: int) -> None:
         """Persist the user's streak value."""
-        _streak_cache[user_id] = value
+        self.state.set_streak(user_id, value)
 
     def get_gacha_count(self, user_id: int) -> int:
         """Get how many gacha pulls the user has performed."""
-        return _gacha_count_cache.get(user_id, 0)
+        return self.state.get_gacha_state(user_id)[0]
 
     def set_gacha_count(self, user_id: int, value: int) -> None:
         """Set the user's gacha pull count."""
-        _gacha_count_cache[user_id] = value
+        self.state.set_gacha_state(user_id, count=value)
 
     def get_gacha_history(self, user_id: int) -> List[str]:
         """Return last 10 gacha results for the user."""
-        return _gacha_history_cache.get(user_id, [])
+        return self.state.get_gacha_state(user_id)[1]
 
     def set_gacha_history(self, user_id: int, history: List[str]) -> None:
         """Save recent gacha history for the user."""
-        _gacha_history_cache[user_id] = history
+        self.state.set_gacha_state(user_id, history=history)
 
     def get_user_segment(self, db: Session, user_id: int) -> str:
-        """Fetch the user's segment label from the database."""
+        """Fetch the user's segment label, reading through the segment cache."""
         try:
-            seg = (
-                db.query(models.UserSegment)
-                .filter(models.UserSegment.user_id == user_id)
-                .first()
-            )
-            return "Low" if seg is None or seg.rfm_group is None else str(seg.rfm_group)
+            rfm_group = self.segments.get_or_load(user_id, lambda: self._load_segment(db, user_id))
+            return "Low" if rfm_group is None else rfm_group
         except SQLAlchemyError as exc:
             logger.error("Error fetching user segment: %s", exc)
             db.rollback()
             return "Low"
 
-    def record_action(self, db: Session, user_id: int, action_type: str, value: float) -> models.UserAction:
-        """Record a user action in the database."""
-        action = models.UserAction(user_id=user_id, action_type=action_type, value=value)
+    @staticmethod
+    def _load_segment(db: Session, user_id: int) -> Optional[str]:
+        seg = (
+            db.query(models.UserSegment)
+            .filter(models.UserSegment.user_id == user_id)
+            .first()
+        )
+        return None if seg is None or seg.rfm_group is None else str(seg.rfm_group)
+
+    def get_activity_summary(self, db: Session, user_id: int) -> ActivitySummary:
+        """Return the user's RFM inputs from the rolling activity aggregates."""
+        return self.activity.get_summary(db, user_id)
+
+    def record_action(
+        self, db: Session, user_id: int, action_type: str, value: float, commit: bool = True
+    ) -> models.UserAction:
+        """Record a user action in the database.
+
+        The user's daily activity bucket is bumped in the same transaction.
+        With ``commit=False`` the rows are only flushed so they join the
+        caller's transaction (used by the settlement service).
+
+        If a running write-behind ``writer`` accepts the row, it is written
+        later in a batch and the returned action is transient (``id`` is
+        None); the bucket is then bumped by the writer instead. With
+        ``commit=False`` the row is handed to the writer only once the
+        caller's transaction commits, so a rolled-back round leaves no row.
+        """
+        action = models.UserAction(
+            user_id=user_id, action_type=action_type, value=value, timestamp=datetime.utcnow()
+        )
+        if self._write_behind(db, action, commit):
+            return action
         try:
             db.add(action)
+            db.flush()
+            self.activity.record(db, user_id, value, action.timestamp)
+            if not commit:
+                return action
             db.commit()
             db.refresh(action)
             return action
@@ -69,3 +119,64 @@ class GameRepository:
             logger.error("Failed to record action: %s", exc)
             db.rollback()
             raise
+
+    def _write_behind(self, db: Session, action: models.UserAction, commit: bool) -> bool:
+        """Hand the row to the write-behind writer; False if it must be written inline."""
+        if self.writer is None:
+            return False
+        row = (action.user_id, action.action_type, action.value, action.timestamp)
+        if commit:
+            return self.writer.submit(*row)
+        return self.writer.submit_after_commit(db, *row)
+
+
+class AsyncGameRepository(GameRepository):
+    """``GameRepository`` for an ``AsyncSession``.
+
+    Methods that touch the database are coroutines; streak and gacha state
+    come from the same (sync) ``GameStateBackend`` as the sync repository, so
+    the async services call those through the threadpool. The
+    activity-bucket upsert reuses the sync SQL through ``AsyncSession.run_sync``.
+    """
+
+    async def get_user_segment(self, db: AsyncSession, user_id: int) -> str:
+        """Fetch the user's segment label, reading through the segment cache."""
+        hit, rfm_group = self.segments.get(user_id)
+        if hit:
+            return "Low" if rfm_group is None else rfm_group
+        try:
+            rfm_group = await db.scalar(
+                select(models.UserSegment.rfm_group).where(models.UserSegment.user_id == user_id)
+            )
+            rfm_group = None if rfm_group is None else str(rfm_group)
+            self.segments.set(user_id, rfm_group)
+            return "Low" if rfm_group is None else rfm_group
+        except SQLAlchemyError as exc:
+            logger.error("Error fetching user segment: %s", exc)
+            await db.rollback()
+            return "Low"
+
+    async def get_activity_summary(self, db: AsyncSession, user_id: int) -> ActivitySummary:
+        """Return the user's RFM inputs from the rolling activity aggregates."""
+        return await db.run_sync(self.activity.get_summary, user_id)
+
+    async def record_action(
+        self, db: AsyncSession, user_id: int, action_type: str, value: float, commit: bool = True
+    ) -> models.UserAction:
+        """Record a user action; same semantics as ``GameRepository.record_action``."""
+        action = models.UserAction(
+            user_id=user_id, action_type=action_type, value=value, timestamp=datetime.utcnow()
+        )
+        if self._write_behind(db.sync_session, action, commit):
+            return action
+        try:
+            db.add(action)
+            await db.flush()
+            await db.run_sync(self.activity.record, user_id, value, action.timestamp)
+            if commit:
+                await db.commit()
+            return action
+        except SQLAlchemyError as exc:
+            logger.error("Failed to record action: %s", exc)
+            await db.rollback()
+            raise
@@ -0,0 +1,317 @@
+"""Pluggable backends for per-user game state (streaks, gacha pity and history)."""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..utils.sql_utils import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+GachaState = Tuple[int, List[str]]
+
+DEFAULT_CACHE_SIZE = 10_000
+
+
+class GameStateBackend:
+    """Interface for storing per-user game counters."""
+
+    def get_streak(self, user_id: int) -> int:
+        raise NotImplementedError
+
+    def set_streak(self, user_id: int, value: int) -> None:
+        raise NotImplementedError
+
+    def get_gacha_state(self, user_id: int) -> GachaState:
+        """Return ``(pull_count, history)`` for the user."""
+        raise NotImplementedError
+
+    def set_gacha_state(self, user_id: int, count: Optional[int] = None, history: Optional[List[str]] = None) -> None:
+        """Update the pull count and/or history, leaving the other untouched."""
+        raise NotImplementedError
+
+    def flush(self) -> int:
+        """Persist pending writes. Returns the number of rows written."""
+        return 0
+
+
+class InMemoryGameStateBackend(GameStateBackend):
+    """Process-local state kept in a bounded LRU.
+
+    Suitable for tests and single-process development only: state is not shared
+    between workers and entries evicted from the LRU are forgotten.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_streak(self, user_id: int) -> int:
+        return self._lookup(("streak", user_id)) or 0
+
+    def set_streak(self, user_id: int, value: int) -> None:
+        self._store(("streak", user_id), value)
+
+    def get_gacha_state(self, user_id: int) -> GachaState:
+        count, history = self._lookup(("gacha", user_id)) or (0, [])
+        return count, list(history)
+
+    def set_gacha_state(self, user_id: int, count: Optional[int] = None, history: Optional[List[str]] = None) -> None:
+        with self._lock:
+            current_count, current_history = self.get_gacha_state(user_id)
+            self._store(
+                ("gacha", user_id),
+                (
+                    current_count if count is None else count,
+                    current_history if history is None else list(history),
+                ),
+            )
+
+
+class SQLGameStateBackend(InMemoryGameStateBackend):
+    """Write-behind cache over ``user_streaks`` and ``user_gacha_states``.
+
+    Reads are served from the LRU and fall back to a primary-key lookup; clean
+    entries older than ``ttl`` seconds are re-read so other workers' writes
+    become visible. Writes only touch the LRU and mark the key dirty. Dirty keys
+    are upserted in one batch when ``max_dirty`` is reached, when
+    ``flush_interval`` seconds have passed since the last flush, when a dirty
+    entry blocks eviction, and on explicit ``flush()`` (scheduler job and
+    shutdown).
+
+    The LRU lock only guards the in-memory maps: loads and upserts run outside
+    it, so a database round trip never stalls other users' spins. A flush
+    swaps the dirty set out under the lock; keys in flight stay pinned (not
+    reloaded or evicted) until their upsert commits.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        flush_interval: float = 1.0,
+        max_dirty: int = 500,
+        ttl: float = 5.0,
+    ) -> None:
+        super().__init__(max_entries)
+        if session_factory is None:
+            from ..database import SessionLocal
+
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.ttl = ttl
+        self._loaded_at: Dict[Hashable, float] = {}
+        self._dirty: set = set()
+        self._flushing: set = set()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    def _pinned(self, key: Hashable) -> bool:
+        return key in self._dirty or key in self._flushing
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None and (
+                self._pinned(key) or time.monotonic() - self._loaded_at.get(key, 0.0) < self.ttl
+            ):
+                self._entries.move_to_end(key)
+                return value
+            started = time.monotonic()
+
+        loaded = self._load(key)
+
+        with self._lock:
+            value = self._entries.get(key)
+            # 로드하는 동안 다른 스레드가 쓰거나 더 새로 읽은 값이 있으면 그 값을 쓴다
+            if value is not None and (self._pinned(key) or self._loaded_at.get(key, 0.0) > started):
+                self._entries.move_to_end(key)
+                return value
+            self._entries[key] = loaded
+            self._entries.move_to_end(key)
+            self._loaded_at[key] = time.monotonic()
+            blocked = self._evict()
+        if blocked:
+            self._flush(blocking=False)
+        return loaded
+
+    def _put(self, key: Hashable, value: Any) -> bool:
+        """Store a dirty value; caller holds the lock. Returns True if a flush is due."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._loaded_at[key] = time.monotonic()
+        self._dirty.add(key)
+        blocked = self._evict()
+        return (
+            blocked
+            or len(self._dirty) >= self.max_dirty
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            due = self._put(key, value)
+        if due:
+            self._flush(blocking=False)
+
+    def set_gacha_state(self, user_id: int, count: Optional[int] = None, history: Optional[List[str]] = None) -> None:
+        key = ("gacha", user_id)
+        partial = count is None or history is None
+        while True:
+            if partial:
+                self._lookup(key)  # 필요하면 잠금 밖에서 로드
+            with self._lock:
+                current = self._entries.get(key)
+                if current is None and partial:
+                    continue  # 로드 직후 축출됨: 다시 로드
+                current_count, current_history = current or (0, [])
+                due = self._put(
+                    key,
+                    (
+                        current_count if count is None else count,
+                        list(current_history) if history is None else list(history),
+                    ),
+                )
+            break
+        if due:
+            self._flush(blocking=False)
+
+    def _evict(self) -> bool:
+        """Drop clean LRU entries over the limit; caller holds the lock.
+
+        Returns:
+            bool: True if a dirty entry is in the way and needs a flush first
+        """
+        while len(self._entries) > self.max_entries:
+            key = next(iter(self._entries))
+            if self._pinned(key):
+                # DB 장애 시 미저장 상태를 버리지 않고 일시적으로 한도를 넘긴다
+                return True
+            self._entries.popitem(last=False)
+            self._loaded_at.pop(key, None)
+        return False
+
+    def _load(self, key: Hashable) -> Any:
+        kind, user_id = key
+        db = self.session_factory()
+        try:
+            if kind == "streak":
+                row = db.get(models.UserStreak, user_id)
+                return (row.loss_streak or 0) if row else 0
+            row = db.get(models.UserGachaState, user_id)
+            return (row.pull_count or 0, list(row.history or [])) if row else (0, [])
+        except SQLAlchemyError as exc:
+            logger.error("Failed to load %s state for user %s: %s", kind, user_id, exc)
+            return 0 if kind == "streak" else (0, [])
+        finally:
+            db.close()
+
+    def flush(self) -> int:
+        """Upsert every dirty key in one transaction. Returns rows written."""
+        return self._flush(blocking=True)
+
+    def _flush(self, blocking: bool) -> int:
+        # 요청 경로에서는 이미 진행 중인 flush를 기다리지 않는다
+        if not self._flush_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            with self._lock:
+                self._last_flush = time.monotonic()
+                if not self._dirty:
+                    return 0
+                snapshot = {key: self._entries[key] for key in self._dirty}
+                self._flushing, self._dirty = self._dirty, set()
+
+            now = datetime.utcnow()
+            streaks, gacha = [], []
+            for (kind, user_id), value in snapshot.items():
+                if kind == "streak":
+                    streaks.append({"user_id": user_id, "loss_streak": value, "updated_at": now})
+                else:
+                    gacha.append(
+                        {"user_id": user_id, "pull_count": value[0], "history": value[1], "updated_at": now}
+                    )
+
+            db = self.session_factory()
+            try:
+                bulk_upsert(db, models.UserStreak, streaks, ["user_id"], ["loss_streak", "updated_at"])
+                bulk_upsert(
+                    db, models.UserGachaState, gacha, ["user_id"], ["pull_count", "history", "updated_at"]
+                )
+                db.commit()
+                written = len(streaks) + len(gacha)
+            except SQLAlchemyError as exc:
+                logger.error("Failed to flush game state (%s rows): %s", len(snapshot), exc)
+                db.rollback()
+                written = 0
+            finally:
+                db.close()
+
+            with self._lock:
+                if not written:
+                    # 실패한 키는 다시 dirty로 (그 사이 갱신된 값은 LRU에 있다)
+                    self._dirty |= self._flushing
+                self._flushing = set()
+                if written:
+                    self._evict()
+            return written
+        finally:
+            self._flush_lock.release()
+
+
+_default_backend: Optional[GameStateBackend] = None
+_default_lock = threading.Lock()
+
+
+def get_game_state_backend() -> GameStateBackend:
+    """Return the process-wide backend selected by ``GAME_STATE_BACKEND`` (memory|sql)."""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            max_entries = int(os.getenv("GAME_STATE_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+            if os.getenv("GAME_STATE_BACKEND", "memory").lower() == "sql":
+                _default_backend = SQLGameStateBackend(
+                    max_entries=max_entries,
+                    flush_interval=float(os.getenv("GAME_STATE_FLUSH_INTERVAL", "1.0")),
+                    ttl=float(os.getenv("GAME_STATE_CACHE_TTL", "5.0")),
+                )
+            else:
+                _default_backend = InMemoryGameStateBackend(max_entries)
+        return _default_backend
+
+
+def flush_game_state() -> int:
+    """Flush the default backend if one has been created."""
+    return _default_backend.flush() if _default_backend is not None else 0
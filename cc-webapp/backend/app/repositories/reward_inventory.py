@@ -0,0 +1,381 @@
+"""Shared stock of limited gacha rewards (``GACHA_REWARD_POOL``)."""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARDS = 8
+
+
+def load_reward_pool() -> Dict[str, int]:
+    """Parse ``GACHA_REWARD_POOL`` (``{"Legendary": 5, ...}``); empty means unlimited."""
+    pool_json = os.getenv("GACHA_REWARD_POOL")
+    if pool_json:
+        try:
+            data = json.loads(pool_json)
+            return {str(k): int(v) for k, v in data.items()}
+        except Exception as e:  # noqa: BLE001
+            logger.error("Invalid GACHA_REWARD_POOL: %s", e)
+    return {}
+
+
+def _report_row(rarity: str, allocated: int, remaining: int, granted: int, shards: int, negative: int) -> dict:
+    return {
+        "rarity": rarity,
+        "allocated": allocated,
+        "remaining": remaining,
+        "granted": granted,
+        "shards": shards,
+        # 0이 아니면 재고가 예약 경로 밖에서 바뀐 것
+        "drift": allocated - remaining - granted,
+        "oversold": granted > allocated or negative > 0,
+    }
+
+
+class RewardInventory:
+    """Interface for the reward stock shared by every ``GachaService``.
+
+    An empty stock means rewards are unlimited. Once a stock is configured,
+    rarities missing from it have no stock at all.
+    """
+
+    def limited(self) -> bool:
+        """Whether a stock is configured (False means every reservation succeeds)."""
+        raise NotImplementedError
+
+    def stock(self) -> Dict[str, int]:
+        """Remaining stock per rarity."""
+        raise NotImplementedError
+
+    def set_stock(self, pool: Mapping[str, int]) -> None:
+        """Replace the whole allocation with ``pool``; granted counts restart at 0."""
+        raise NotImplementedError
+
+    def seed(self, pool: Mapping[str, int]) -> None:
+        """Allocate ``pool`` only if no stock has been configured yet."""
+        if pool and not self.limited():
+            self.set_stock(pool)
+
+    def reserve(self, wanted: Mapping[str, int], db: Optional[Session] = None) -> Dict[str, int]:
+        """
+        Atomically take up to ``wanted`` units per rarity.
+
+        Args:
+            wanted (Mapping[str, int]): Units wanted per rarity
+            db (Optional[Session]): Transaction to join; the reservation is
+                undone if it rolls back. Without one the reservation commits
+                on its own.
+
+        Returns:
+            Dict[str, int]: Units actually granted per rarity (never more than wanted)
+        """
+        raise NotImplementedError
+
+    def release(self, counts: Mapping[str, int], db: Optional[Session] = None) -> None:
+        """Return reserved but unused units to the stock."""
+        raise NotImplementedError
+
+    def reconcile(self) -> List[dict]:
+        """
+        Per-rarity stock report.
+
+        Returns:
+            List[dict]: ``{"rarity", "allocated", "remaining", "granted",
+            "shards", "drift", "oversold"}`` per rarity; ``drift`` is
+            ``allocated - remaining - granted`` and should be 0
+        """
+        raise NotImplementedError
+
+
+class InMemoryRewardInventory(RewardInventory):
+    """Process-local stock guarded by a lock.
+
+    Shared by the services of one process only, and reservations are not
+    undone when the caller's transaction rolls back; for tests and
+    single-process development.
+    """
+
+    def __init__(self, pool: Optional[Mapping[str, int]] = None) -> None:
+        self._lock = threading.Lock()
+        self._allocated: Dict[str, int] = {}
+        self._remaining: Dict[str, int] = {}
+        self._granted: Dict[str, int] = {}
+        if pool:
+            self.set_stock(pool)
+
+    def limited(self) -> bool:
+        return bool(self._remaining)
+
+    def stock(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._remaining)
+
+    def set_stock(self, pool: Mapping[str, int]) -> None:
+        with self._lock:
+            self._allocated = {str(name): int(units) for name, units in pool.items()}
+            self._remaining = dict(self._allocated)
+            self._granted = dict.fromkeys(self._allocated, 0)
+
+    def reserve(self, wanted: Mapping[str, int], db: Optional[Session] = None) -> Dict[str, int]:
+        with self._lock:
+            if not self._remaining:
+                return dict(wanted)
+            granted = {}
+            for rarity, units in wanted.items():
+                take = min(units, max(self._remaining.get(rarity, 0), 0))
+                if take:
+                    self._remaining[rarity] -= take
+                    self._granted[rarity] += take
+                granted[rarity] = take
+            return granted
+
+    def release(self, counts: Mapping[str, int], db: Optional[Session] = None) -> None:
+        with self._lock:
+            for rarity, units in counts.items():
+                if units and rarity in self._remaining:
+                    self._remaining[rarity] += units
+                    self._granted[rarity] -= units
+
+    def reconcile(self) -> List[dict]:
+        with self._lock:
+            return [
+                _report_row(
+                    rarity,
+                    allocated,
+                    self._remaining[rarity],
+                    self._granted[rarity],
+                    1,
+                    int(self._remaining[rarity] < 0),
+                )
+                for rarity, allocated in sorted(self._allocated.items())
+            ]
+
+
+class SQLRewardInventory(RewardInventory):
+    """Stock in ``gacha_reward_stock``, split over ``shards`` rows per rarity.
+
+    A reservation reads which shards still have stock (plain read, no locks)
+    and takes units from them in random order with conditional ``UPDATE``s
+    (``remaining >= n``), so stock can never go negative and concurrent pulls
+    of the same rarity mostly lock different rows. A 10-pull is one read
+    plus one update per distinct rarity drawn. Whether a stock is configured
+    at all is cached for ``ttl`` seconds so unlimited pools cost no queries.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        shards: int = DEFAULT_SHARDS,
+        ttl: float = 5.0,
+    ) -> None:
+        if session_factory is None:
+            from ..database import SessionLocal
+
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.shards = max(shards, 1)
+        self.ttl = ttl
+        self._rarities: Optional[Set[str]] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _run(self, db: Optional[Session], work: Callable[[Session], object]):
+        """Run ``work`` in ``db``'s transaction, or in an own committed session."""
+        if db is not None:
+            return work(db)
+        own = self.session_factory()
+        try:
+            result = work(own)
+            own.commit()
+            return result
+        except SQLAlchemyError:
+            own.rollback()
+            raise
+        finally:
+            own.close()
+
+    def _configured(self) -> Set[str]:
+        with self._lock:
+            if self._rarities is None or time.monotonic() - self._loaded_at >= self.ttl:
+                Stock = models.GachaRewardStock
+                # 조회 실패는 그대로 전파: 무제한으로 간주하면 초과 지급된다
+                self._rarities = set(self._run(None, lambda db: db.scalars(select(Stock.rarity).distinct()).all()))
+                self._loaded_at = time.monotonic()
+            return self._rarities
+
+    def limited(self) -> bool:
+        return bool(self._configured())
+
+    def stock(self) -> Dict[str, int]:
+        Stock = models.GachaRewardStock
+        rows = self._run(
+            None, lambda db: db.execute(select(Stock.rarity, func.sum(Stock.remaining)).group_by(Stock.rarity)).all()
+        )
+        return {rarity: int(remaining) for rarity, remaining in rows}
+
+    def set_stock(self, pool: Mapping[str, int]) -> None:
+        Stock = models.GachaRewardStock
+        now = datetime.utcnow()
+        rows = []
+        for rarity, units in pool.items():
+            base, extra = divmod(int(units), self.shards)
+            for shard in range(self.shards):
+                allocated = base + (1 if shard < extra else 0)
+                rows.append(
+                    {
+                        "rarity": str(rarity),
+                        "shard": shard,
+                        "allocated": allocated,
+                        "remaining": allocated,
+                        "granted": 0,
+                        "updated_at": now,
+                    }
+                )
+
+        def replace(db: Session) -> None:
+            db.query(Stock).delete(synchronize_session=False)
+            if rows:
+                db.execute(Stock.__table__.insert(), rows)
+
+        self._run(None, replace)
+        with self._lock:
+            self._rarities = {str(rarity) for rarity in pool}
+            self._loaded_at = time.monotonic()
+
+    def _take(self, db: Session, rarity: str, shard: int, units: int) -> bool:
+        Stock = models.GachaRewardStock
+        stmt = (
+            update(Stock)
+            .where(Stock.rarity == rarity, Stock.shard == shard, Stock.remaining >= units)
+            .values(
+                remaining=Stock.remaining - units,
+                granted=Stock.granted + units,
+                updated_at=datetime.utcnow(),
+            )
+        )
+        return db.execute(stmt).rowcount == 1
+
+    def reserve(self, wanted: Mapping[str, int], db: Optional[Session] = None) -> Dict[str, int]:
+        configured = self._configured()
+        if not configured:
+            return dict(wanted)
+        Stock = models.GachaRewardStock
+        names = [rarity for rarity, units in wanted.items() if units > 0 and rarity in configured]
+
+        def work(session: Session) -> Dict[str, int]:
+            candidates: Dict[str, List[Tuple[int, int]]] = {}
+            if names:
+                rows = session.execute(
+                    select(Stock.rarity, Stock.shard, Stock.remaining).where(
+                        Stock.rarity.in_(names), Stock.remaining > 0
+                    )
+                )
+                for rarity, shard, remaining in rows:
+                    candidates.setdefault(rarity, []).append((shard, remaining))
+
+            granted = dict.fromkeys(wanted, 0)
+            for rarity, shards in candidates.items():
+                need = wanted[rarity]
+                random.shuffle(shards)
+                for shard, remaining in shards:
+                    take = min(need - granted[rarity], remaining)
+                    if take and self._take(session, rarity, shard, take):
+                        granted[rarity] += take
+                    if granted[rarity] == need:
+                        break
+                # 읽은 뒤 다른 요청이 같은 shard를 줄였다면 남은 만큼 한 개씩 가져온다
+                for shard, _ in shards:
+                    while granted[rarity] < need and self._take(session, rarity, shard, 1):
+                        granted[rarity] += 1
+            return granted
+
+        return self._run(db, work)
+
+    def release(self, counts: Mapping[str, int], db: Optional[Session] = None) -> None:
+        Stock = models.GachaRewardStock
+        counts = {rarity: units for rarity, units in counts.items() if units > 0}
+        if not counts:
+            return
+
+        def work(session: Session) -> None:
+            shards: Dict[str, List[int]] = {}
+            for rarity, shard in session.execute(
+                select(Stock.rarity, Stock.shard).where(Stock.rarity.in_(list(counts)))
+            ):
+                shards.setdefault(rarity, []).append(shard)
+            for rarity, units in counts.items():
+                if rarity not in shards:
+                    continue
+                session.execute(
+                    update(Stock)
+                    .where(Stock.rarity == rarity, Stock.shard == random.choice(shards[rarity]))
+                    .values(
+                        remaining=Stock.remaining + units,
+                        granted=Stock.granted - units,
+                        updated_at=datetime.utcnow(),
+                    )
+                )
+
+        self._run(db, work)
+
+    def reconcile(self) -> List[dict]:
+        """Per-rarity stock report; plain reads only, safe alongside live pulls."""
+        Stock = models.GachaRewardStock
+        query = (
+            select(
+                Stock.rarity,
+                func.sum(Stock.allocated),
+                func.sum(Stock.remaining),
+                func.sum(Stock.granted),
+                func.count(Stock.shard),
+                func.sum(case((Stock.remaining < 0, 1), else_=0)),
+            )
+            .group_by(Stock.rarity)
+            .order_by(Stock.rarity)
+        )
+        rows = self._run(None, lambda db: db.execute(query).all())
+        return [
+            _report_row(rarity, int(allocated), int(remaining), int(granted), int(shards), int(negative or 0))
+            for rarity, allocated, remaining, granted, shards, negative in rows
+        ]
+
+
+_default_inventory: Optional[RewardInventory] = None
+_default_lock = threading.Lock()
+
+
+def get_reward_inventory() -> RewardInventory:
+    """Return the process-wide inventory selected by ``GACHA_INVENTORY_BACKEND`` (memory|sql).
+
+    The first call seeds it from ``GACHA_REWARD_POOL``; a stock already
+    stored in the database is left as is.
+    """
+    global _default_inventory
+    with _default_lock:
+        if _default_inventory is None:
+            if os.getenv("GACHA_INVENTORY_BACKEND", "memory").lower() == "sql":
+                inventory: RewardInventory = SQLRewardInventory(
+                    shards=int(os.getenv("GACHA_STOCK_SHARDS", DEFAULT_SHARDS)),
+                    ttl=float(os.getenv("GACHA_STOCK_CACHE_TTL", "5.0")),
+                )
+            else:
+                inventory = InMemoryRewardInventory()
+            try:
+                inventory.seed(load_reward_pool())
+            except SQLAlchemyError as exc:
+                logger.error("Failed to seed gacha reward stock: %s", exc)
+            _default_inventory = inventory
+        return _default_inventory
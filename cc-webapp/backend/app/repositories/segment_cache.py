@@ -0,0 +1,205 @@
+"""Read-through cache for ``user_segments.rfm_group`` lookups."""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # Optional dependency
+    redis = None
+
+try:
+    from prometheus_client import Counter
+except ImportError:  # Optional dependency
+    Counter = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60.0
+DEFAULT_CACHE_SIZE = 10_000
+
+if Counter is not None:
+    SEGMENT_CACHE_LOOKUPS = Counter(
+        "segment_cache_lookups_total", "User segment cache lookups by tier and outcome", ["tier", "outcome"]
+    )
+else:
+    SEGMENT_CACHE_LOOKUPS = None
+
+CacheLookup = Tuple[bool, Optional[str]]  # (hit, rfm_group)
+
+
+class RedisSegmentTier:
+    """Shared tier so workers reuse each other's lookups.
+
+    Missing segments are stored as an empty string so they are cached too.
+    Redis errors are logged and treated as misses; the database stays the
+    source of truth.
+    """
+
+    def __init__(self, url: str, ttl: float = DEFAULT_TTL, prefix: str = "segment:") -> None:
+        if redis is None:
+            raise RuntimeError("redis package is not installed")
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}{user_id}"
+
+    def get(self, user_id: int) -> CacheLookup:
+        try:
+            value = self.client.get(self._key(user_id))
+        except redis.RedisError as exc:
+            logger.warning("Segment cache read failed: %s", exc)
+            return False, None
+        if value is None:
+            return False, None
+        return True, value.decode() or None
+
+    def set(self, user_id: int, rfm_group: Optional[str]) -> None:
+        try:
+            self.client.set(self._key(user_id), rfm_group or "", px=int(self.ttl * 1000))
+        except redis.RedisError as exc:
+            logger.warning("Segment cache write failed: %s", exc)
+
+    def delete(self, user_ids: Optional[Iterable[int]] = None) -> None:
+        try:
+            if user_ids is None:
+                keys = list(self.client.scan_iter(f"{self.prefix}*"))
+            else:
+                keys = [self._key(user_id) for user_id in user_ids]
+            if keys:
+                self.client.delete(*keys)
+        except redis.RedisError as exc:
+            logger.warning("Segment cache invalidation failed: %s", exc)
+
+
+class SegmentCache:
+    """
+    TTL + LRU cache of each user's RFM group, shared by every segment reader.
+
+    Segments only change when the RFM job runs, which invalidates the users
+    it rewrites; ``ttl`` bounds staleness for other writers and for workers
+    whose local tier did not see the invalidation. A missing segment is
+    cached as None so users without one do not hit the database either.
+    An optional shared tier (Redis) is consulted on a local miss.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        shared: Optional[RedisSegmentTier] = None,
+    ) -> None:
+        """
+        Args:
+            ttl (float): Seconds a local entry is served before it is reloaded
+            max_entries (int): Local LRU bound
+            shared (Optional[RedisSegmentTier]): Cross-worker tier, if configured
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: "OrderedDict[int, Tuple[float, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {name: 0 for name in ("hits", "shared_hits", "misses", "invalidations")}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, stat: str, tier: str, outcome: str) -> None:
+        self.stats[stat] += 1
+        if SEGMENT_CACHE_LOOKUPS is not None:
+            SEGMENT_CACHE_LOOKUPS.labels(tier=tier, outcome=outcome).inc()
+
+    def get(self, user_id: int) -> CacheLookup:
+        """
+        Look the user up without touching the database.
+
+        Returns:
+            CacheLookup: ``(True, rfm_group)`` on a hit, ``(False, None)`` on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self._count("hits", "local", "hit")
+                return True, entry[1]
+        if self.shared is not None:
+            hit, rfm_group = self.shared.get(user_id)
+            if hit:
+                self._count("shared_hits", "shared", "hit")
+                self._store(user_id, rfm_group)
+                return True, rfm_group
+        self._count("misses", "local" if self.shared is None else "shared", "miss")
+        return False, None
+
+    def set(self, user_id: int, rfm_group: Optional[str]) -> None:
+        """Cache a freshly loaded group in both tiers."""
+        self._store(user_id, rfm_group)
+        if self.shared is not None:
+            self.shared.set(user_id, rfm_group)
+
+    def _store(self, user_id: int, rfm_group: Optional[str]) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, rfm_group)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, user_id: int, load: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Return the cached group, calling ``load`` and caching its result on a miss.
+
+        Args:
+            user_id (int): User to look up
+            load (Callable[[], Optional[str]]): Database lookup returning the group or None
+
+        Returns:
+            Optional[str]: The user's RFM group, None if the user has no segment
+        """
+        hit, rfm_group = self.get(user_id)
+        if hit:
+            return rfm_group
+        rfm_group = load()
+        self.set(user_id, rfm_group)
+        return rfm_group
+
+    def invalidate(self, user_ids: Optional[Iterable[int]] = None) -> None:
+        """Drop the given users (or everyone) from both tiers."""
+        if user_ids is not None:
+            user_ids = list(user_ids)
+        with self._lock:
+            if user_ids is None:
+                self._entries.clear()
+            else:
+                for user_id in user_ids:
+                    self._entries.pop(user_id, None)
+        if self.shared is not None:
+            self.shared.delete(user_ids)
+        self.stats["invalidations"] += 1
+
+
+def create_segment_cache() -> SegmentCache:
+    """Build the cache from ``SEGMENT_CACHE_TTL``, ``SEGMENT_CACHE_SIZE`` and ``SEGMENT_CACHE_URL``."""
+    ttl = float(os.getenv("SEGMENT_CACHE_TTL", str(DEFAULT_TTL)))
+    shared = None
+    url = os.getenv("SEGMENT_CACHE_URL")
+    if url:
+        if redis is None:
+            logger.warning("SEGMENT_CACHE_URL is set but redis is not installed; using the local tier only")
+        else:
+            shared = RedisSegmentTier(url, ttl=ttl)
+    return SegmentCache(
+        ttl=ttl,
+        max_entries=int(os.getenv("SEGMENT_CACHE_SIZE", str(DEFAULT_CACHE_SIZE))),
+        shared=shared,
+    )
+
+
+# 프로세스 공용 세그먼트 캐시
+segment_cache = create_segment_cache()
@@ -0,0 +1,74 @@
+"""Per-user content unlock state."""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..utils.sql_utils import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+
+def parse_unlock_stage(reward_value: Optional[str]) -> Optional[int]:
+    """
+    Extract the stage number from a ``CONTENT_UNLOCK`` reward value.
+
+    Accepts both formats in use: ``"3"`` (unlock API) and
+    ``"{content_id}_{stage}"`` (``RewardService.grant_content_unlock``).
+
+    Returns:
+        Optional[int]: The stage, or None if the value carries no numeric stage
+    """
+    value = (reward_value or "").rsplit("_", 1)[-1]
+    return int(value) if value.isdigit() else None
+
+
+class UnlockRepository:
+    """
+    Reads and advances ``user_unlock_states``.
+
+    ``get_highest_stage`` is a primary-key lookup; ``record_unlock`` is a
+    single upsert that only ever raises the stored stage, so it can run in
+    the same transaction as the ``UserReward`` row it accompanies.
+    """
+
+    def get_highest_stage(self, db: Session, user_id: int) -> int:
+        """Return the highest stage the user has unlocked (0 if none)."""
+        state = db.get(models.UserUnlockState, user_id)
+        return state.highest_stage if state is not None else 0
+
+    def record_unlock(
+        self, db: Session, user_id: int, stage: int, unlocked_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Raise the user's highest unlocked stage to ``stage``. Does not commit.
+
+        Args:
+            db (Session): Session whose transaction also writes the reward row
+            user_id (int): User who unlocked the stage
+            stage (int): Unlocked stage; lower than the stored stage is a no-op
+            unlocked_at (Optional[datetime]): Unlock time, defaults to now
+        """
+        now = datetime.utcnow()
+        bulk_upsert(
+            db,
+            models.UserUnlockState,
+            [
+                {
+                    "user_id": user_id,
+                    "highest_stage": stage,
+                    "last_unlocked_at": unlocked_at or now,
+                    "updated_at": now,
+                }
+            ],
+            ["user_id"],
+            ["updated_at"],
+            greatest=["highest_stage", "last_unlocked_at"],
+        )
+        # 세션에 이미 로드된 이전 상태가 있으면 다시 읽도록 만료
+        state = db.identity_map.get(db.identity_key(models.UserUnlockState, user_id))
+        if state is not None:
+            db.expire(state)
@@ -1,36 +1,11 @@
-import os
-import json
 from fastapi import APIRouter, Depends, HTTPException
 # from sqlalchemy.orm import Session # Will be needed later
-try:
-    from confluent_kafka import Producer
-except ImportError:  # In case library is not installed during lightweight tests
-    Producer = None
 # from .. import models, schemas, database # Assuming these exist and will be used later
 from datetime import datetime
 
-router = APIRouter()
-
-# Kafka Producer Configuration
-KAFKA_BROKER = os.getenv("KAFKA_BROKER", "localhost:9092")
-KAFKA_ENABLED = os.getenv("KAFKA_ENABLED", "0") == "1"
-conf = {"bootstrap.servers": KAFKA_BROKER}
-producer = None
-if KAFKA_ENABLED and Producer is not None:
-    try:
-        producer = Producer(conf)
-    except Exception as e:
-        print(f"Kafka producer init failed: {e}")
-        producer = None
-TOPIC_USER_ACTIONS = "topic_user_actions"
+from ..services.action_event_producer import TOPIC_USER_ACTIONS, action_producer
 
-def delivery_report(err, msg):
-    """ Called once for each message produced to indicate delivery result.
-        Triggered by poll() or flush(). """
-    if err is not None:
-        print(f'Message delivery failed: {err}')
-    else:
-        print(f'Message delivered to {msg.topic()} [{msg.partition()}] at offset {msg.offset()}')
+router = APIRouter()
 
 # Example placeholder for a database session dependency - to be implemented later
 # def get_db():
@@ -62,25 +37,8 @@ async def create_action(user_id: int, action_type: str): # Simplified for now, m
         "action_timestamp": action_timestamp
     }
 
-    if producer:
-        try:
-            producer.produce(
-                TOPIC_USER_ACTIONS,
-                key=str(user_id),
-                value=json.dumps(payload).encode("utf-8"),
-                callback=delivery_report,
-            )
-            producer.poll(0)
-            print(
-                f"Produced message to Kafka topic {TOPIC_USER_ACTIONS}: {payload}"
-            )
-        except BufferError:
-            print(
-                f"Kafka local queue full ({len(producer)} messages), messages will be dropped."
-            )
-    else:
-        print(f"Kafka disabled - action logged locally: {payload}")
-    # producer.flush() # Optional: wait for all messages to be delivered. Can be blocking.
+    # 요청 경로에서는 버퍼에 적재만 하고, 배치 전송/스풀은 백그라운드에서 처리
+    action_producer.publish(payload, key=str(user_id))
 
     # return db_action # Or a schema.Action if returning DB object
     return {"message": "Action logged and potentially published to Kafka", "data": payload}
@@ -7,6 +7,8 @@ import logging
 from ..services.cj_ai_service import CJAIService
 from ..auth.simple_auth import get_current_user_id
 from ..models import User
+from ..services.notification_dispatcher import notification_dispatcher
+from ..websockets.chat import manager
 
 router = APIRouter(
     prefix="/api/chat",
@@ -14,9 +16,6 @@ router = APIRouter(
     responses={401: {"description": "Unauthorized"}},
 )
 
-# In-memory storage for active connections
-active_connections: Dict[int, WebSocket] = {}
-
 @router.websocket("/ws/{user_id}")
 async def chat_websocket(
     websocket: WebSocket,
@@ -30,21 +29,23 @@ async def chat_websocket(
     # 실제 구현에서는 websocket.query_params에서 토큰을 가져와 검증
         
     try:
-        await websocket.accept()
-        active_connections[user_id] = websocket
+        await manager.connect(websocket, user_id)
+        # 접속 즉시 밀린 알림을 푸시
+        notification_dispatcher.wake(user_id)
         
         while True:
             data = await websocket.receive_text()            # Process message with CJ AI Service
             response = await cj_service.process_chat_message(data)
             
-            await websocket.send_text(response)
+            # 응답도 연결별 송신 큐를 거쳐 전송 (느린 클라이언트가 수신 루프를 막지 않음)
+            await manager.send_personal_message(response, websocket)
             
     except Exception as e:
         logging.error(f"WebSocket error for user {user_id}: {str(e)}")
         
     finally:
-        if user_id in active_connections:
-            del active_connections[user_id]
+        if websocket in manager:
+            manager.disconnect(websocket)
 
 @router.get("/status/{user_id}")
 async def get_connection_status(
@@ -55,9 +56,8 @@ async def get_connection_status(
     if current_user_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized for this user_id")
         
-    is_connected = user_id in active_connections
     return {
         "user_id": user_id,
-        "connected": is_connected,
-        "connection_count": len(active_connections)
+        "connected": manager.is_connected(user_id),
+        "connection_count": manager.connection_count
     }
@@ -137,6 +137,9 @@ async def update_gacha_config(
     config: GachaConfig,
     service: GachaService = Depends(get_service),
 ):
-    """가챠 설정 갱신"""
-    service.update_config(rarity_table=config.rarity_table, reward_pool=config.reward_pool)
+    """가챠 설정 갱신 (확률 테이블은 게임 설정의 새 버전으로 게시됨)"""
+    try:
+        service.update_config(rarity_table=config.rarity_table, reward_pool=config.reward_pool)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
     return GachaConfig(**service.get_config())
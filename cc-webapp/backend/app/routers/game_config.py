@@ -0,0 +1,76 @@
+"""게임 규칙 설정(버전 관리, 무중단 교체) 관리자 API"""
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..auth.simple_auth import require_admin
+from ..services.game_config import ConfigVersionConflict, GameConfigRegistry, get_game_config
+
+router = APIRouter(prefix="/admin/game-config", tags=["admin"])
+
+
+class GameConfigUpdate(BaseModel):
+    rules: Dict[str, Dict[str, Any]]
+    expected_version: Optional[int] = None  # 지정하면 이 버전일 때만 적용 (compare-and-swap)
+    replace: bool = False  # True면 지정하지 않은 기존 재정의를 버린다
+
+
+class GameConfigResponse(BaseModel):
+    version: int
+    source: str
+    created_at: str
+    rules: Dict[str, Dict[str, Any]]
+
+
+def get_registry() -> GameConfigRegistry:
+    """게임 설정 레지스트리 의존성"""
+    return get_game_config()
+
+
+@router.get("", response_model=GameConfigResponse)
+async def get_config(
+    _: int = Depends(require_admin),
+    registry: GameConfigRegistry = Depends(get_registry),
+):
+    """현재 게임 설정 버전 조회"""
+    return GameConfigResponse(**registry.current.to_dict())
+
+
+@router.put("", response_model=GameConfigResponse)
+async def update_config(
+    body: GameConfigUpdate,
+    _: int = Depends(require_admin),
+    registry: GameConfigRegistry = Depends(get_registry),
+):
+    """검증 후 새 설정 버전을 게시 (진행 중인 요청은 이전 버전으로 끝난다)
+
+    ``GAME_CONFIG_BACKEND=sql``이면 공유 저장소에 기록되어 다른 워커는 다음 폴링에서 같은 버전을 받는다.
+    """
+    publish = registry.publish if body.replace else registry.update
+    try:
+        config = publish(body.rules, source="admin", expected_version=body.expected_version)
+    except ConfigVersionConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except SQLAlchemyError:
+        raise HTTPException(status_code=503, detail="Game config store unavailable")
+    return GameConfigResponse(**config.to_dict())
+
+
+@router.post("/reload", response_model=GameConfigResponse)
+async def reload_config(
+    _: int = Depends(require_admin),
+    registry: GameConfigRegistry = Depends(get_registry),
+):
+    """``GAME_CONFIG_FILE``을 다시 읽어 게시"""
+    if not registry.path:
+        raise HTTPException(status_code=404, detail="GAME_CONFIG_FILE is not set")
+    try:
+        registry.reload(force=True)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return GameConfigResponse(**registry.current.to_dict())
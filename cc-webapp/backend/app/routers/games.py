@@ -1,12 +1,16 @@
 """게임 관련 API 엔드포인트"""
 
+import inspect
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
-from ..database import get_db
+from ..database import USE_ASYNC_DB, get_async_db, get_db
 from ..auth.simple_auth import require_user
+from ..services.container import ServiceContainer, get_services
 from ..services.game_service import GameService
 from ..repositories.game_repository import GameRepository
 
@@ -52,19 +56,30 @@ class RPSPlayResponse(BaseModel):
     balance: int
 
 # 의존성 주입
-def get_game_service() -> GameService:
-    """게임 서비스 의존성"""
-    return GameService()
+def get_game_service(services: ServiceContainer = Depends(get_services)) -> GameService:
+    """게임 서비스 의존성: 앱 전역 싱글턴 (DB_ASYNC=1 이면 AsyncSession 기반 서비스)"""
+    return services.game_service
+
+
+# DB_ASYNC=1 이면 AsyncSession, 아니면 동기 Session
+game_db = get_async_db if USE_ASYNC_DB else get_db
+
+
+async def _play(method, *args):
+    """비동기 서비스는 await, 동기 서비스는 스레드풀에서 실행해 이벤트 루프를 막지 않는다."""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await run_in_threadpool(method, *args)
 
 @router.post("/slot/spin", response_model=SlotSpinResponse)
 async def spin_slot(
     current_user_id: int = Depends(require_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(game_db),
     game_service: GameService = Depends(get_game_service)
 ):
     """슬롯 머신 스핀"""
     try:
-        result = game_service.slot_spin(current_user_id, db)
+        result = await _play(game_service.slot_spin, current_user_id, db)
         return SlotSpinResponse(
             result=result.result,
             tokens_change=result.tokens_change,
@@ -81,17 +96,18 @@ async def spin_slot(
 async def spin_roulette(
     request: RouletteSpinRequest,
     current_user_id: int = Depends(require_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(game_db),
     game_service: GameService = Depends(get_game_service)
 ):
     """룰렛 스핀"""
     try:
-        result = game_service.roulette_spin(
-            current_user_id, 
-            request.bet_amount, 
-            request.bet_type, 
-            request.value, 
-            db
+        result = await _play(
+            game_service.roulette_spin,
+            current_user_id,
+            request.bet_amount,
+            request.bet_type,
+            request.value,
+            db,
         )
         return RouletteSpinResponse(
             winning_number=result.winning_number,
@@ -109,12 +125,12 @@ async def spin_roulette(
 async def pull_gacha(
     request: GachaPullRequest,
     current_user_id: int = Depends(require_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(game_db),
     game_service: GameService = Depends(get_game_service)
 ):
     """가챠 뽑기"""
     try:
-        result = game_service.gacha_pull(current_user_id, request.count, db)
+        result = await _play(game_service.gacha_pull, current_user_id, request.count, db)
         return GachaPullResponse(
             results=result.results,
             tokens_change=result.tokens_change,
@@ -129,16 +145,17 @@ async def pull_gacha(
 async def play_rps(
     request: RPSPlayRequest,
     current_user_id: int = Depends(require_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(game_db),
     game_service: GameService = Depends(get_game_service)
 ):
     """가위바위보 게임"""
     try:
-        result = game_service.rps_play(
-            current_user_id, 
-            request.choice, 
-            request.bet_amount, 
-            db
+        result = await _play(
+            game_service.rps_play,
+            current_user_id,
+            request.choice,
+            request.bet_amount,
+            db,
         )
         return RPSPlayResponse(
             user_choice=result.user_choice,
@@ -1,20 +1,30 @@
 # cc-webapp/backend/app/routers/notification.py
-from fastapi import APIRouter, Depends, HTTPException, Path
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 from datetime import datetime
 
 from .. import models
+from ..auth.simple_auth import require_admin
 from ..database import get_db
+from ..services.campaign_service import CampaignService
+from ..services.notification_dispatcher import notification_dispatcher
 from ..services.notification_service import NotificationService
 from ..services.user_service import UserService
 
 router = APIRouter()
 
+# 롱폴 중 알림 생성 신호를 놓쳐도(다른 워커에서 생성 등) 이 간격으로 DB 재확인
+LONG_POLL_RECHECK_SECONDS = 5.0
+LONG_POLL_MAX_WAIT_SECONDS = 30.0
+
 # Dependency provider for NotificationService
 def get_notification_service(db: Session = Depends(get_db)):
-    return NotificationService(db=db)
+    return NotificationService(db=db, dispatcher=notification_dispatcher)
 
 # Dependency provider for UserService
 def get_user_service(db: Session = Depends(get_db)):
@@ -30,6 +40,26 @@ class PendingNotificationResponse(BaseModel):
     sent_at: Optional[datetime] = None
 
 
+class PendingNotificationBatchResponse(BaseModel):
+    notifications: List[PendingNotificationResponse]
+
+
+class CampaignRequest(BaseModel):
+    name: str = Field(..., max_length=100)
+    message: str = Field(..., max_length=500)
+    segments: List[str] = Field(..., min_length=1)
+
+
+class CampaignResponse(BaseModel):
+    campaign_id: int
+    targeted: int
+    created: int
+    skipped: int
+    chunks: int
+    elapsed: float
+    per_second: float
+
+
 @router.get(
     "/notification/pending/{user_id}", # Path maintained from original
     response_model=PendingNotificationResponse,
@@ -66,6 +96,66 @@ async def get_pending_notification(
     # The router just needs to return the data.
     return PendingNotificationResponse.model_validate(notification) # Pydantic V2
 
+@router.get(
+    "/notification/pending/{user_id}/batch",
+    response_model=PendingNotificationBatchResponse,
+    tags=["notification"]
+)
+async def get_pending_notifications_batch(
+    user_id: int = Path(..., title="The ID of the user to check for pending notifications", ge=1),
+    limit: int = Query(NotificationService.DEFAULT_BATCH_SIZE, ge=1, le=500),
+    wait: float = Query(0, ge=0, le=LONG_POLL_MAX_WAIT_SECONDS, description="Seconds to hold the request open while nothing is pending"),
+    service: NotificationService = Depends(get_notification_service),
+    user_service: UserService = Depends(get_user_service)
+):
+    """
+    Long-poll fallback for clients without a WebSocket.
+
+    Claims up to ``limit`` pending notifications (oldest first) and marks them
+    as sent in one statement. If none are pending, the request is held for up
+    to ``wait`` seconds and returns as soon as a notification is created for
+    the user.
+    """
+    # 동기 세션 조회는 스레드풀에서 실행해 대기 중인 다른 롱폴을 막지 않는다
+    try:
+        await run_in_threadpool(user_service.get_user_or_error, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    deadline = time.monotonic() + wait
+    notifications = await run_in_threadpool(service.claim_pending, [user_id], limit=limit)
+    while not notifications:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        await notification_dispatcher.wait_for(user_id, min(remaining, LONG_POLL_RECHECK_SECONDS))
+        notifications = await run_in_threadpool(service.claim_pending, [user_id], limit=limit)
+
+    return PendingNotificationBatchResponse(
+        notifications=[PendingNotificationResponse.model_validate(n) for n in notifications]
+    )
+
+@router.post(
+    "/notification/campaigns",
+    response_model=CampaignResponse,
+    tags=["notification"]
+)
+def run_notification_campaign(
+    request: CampaignRequest,
+    _: int = Depends(require_admin),
+    service: NotificationService = Depends(get_notification_service),
+):
+    """
+    Notify every user in the given RFM segments (e.g. ``["Whale"]``). Admin only.
+
+    Re-posting the same ``name`` only notifies users who have not received the
+    campaign yet.
+    """
+    result = CampaignService(service.db, notification_service=service).run(
+        request.name, request.message, request.segments
+    )
+    return CampaignResponse(**result._asdict(), per_second=result.per_second)
+
 # Example of how to create a notification (optional, for testing or direct use if needed)
 # class NotificationCreateRequest(BaseModel):
 #     user_id: int
@@ -8,10 +8,8 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.services.rfm_service import RFMService, RFMScore
-from app.services.ltv_service import LTVService
-from app.services.personalization_service import PersonalizationService
-from app.repositories.game_repository import GameRepository
+from app.services.container import ServiceContainer, get_services
+from app.services.rfm_service import RFMScore
 
 router = APIRouter(prefix="/personalization", tags=["personalization"])
 
@@ -41,13 +39,9 @@ class UserProfile(BaseModel):
 async def get_recommendations(
     user_id: int = Depends(get_user_from_token),
     db: Session = Depends(get_db),
+    services: ServiceContainer = Depends(get_services),
 ):
-    game_repository = GameRepository()
-    rfm_service = RFMService(db, game_repository)
-    ltv_service = LTVService(db, game_repository)
-    personalization = PersonalizationService(db, game_repository)
-
-    rfm = rfm_service.calculate_rfm(user_id)
+    rfm = services.rfm_service(db).calculate_rfm(user_id)
     segment = rfm.segment
     ltv = {"prediction": 0.0}  # Placeholder
     recs = [
@@ -66,15 +60,11 @@ async def get_recommendations(
 async def get_user_profile(
     user_id: int = Depends(get_user_from_token),
     db: Session = Depends(get_db),
+    services: ServiceContainer = Depends(get_services),
 ):
-    game_repository = GameRepository()
-    rfm_service = RFMService(db, game_repository)
-    ltv_service = LTVService(db, game_repository)
-    personalization = PersonalizationService(db, game_repository)
-
-    rfm = rfm_service.calculate_rfm(user_id)
+    rfm = services.rfm_service(db).calculate_rfm(user_id)
     segment = str(rfm.segment)
-    ltv = ltv_service.predict_ltv(user_id)
+    ltv = services.ltv_service(db).predict_ltv(user_id)
     
     # Determine churn risk based on RFM score
     rfm_score = float(rfm.rfm_score)
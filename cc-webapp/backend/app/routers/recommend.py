@@ -1,19 +1,26 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Dict, Any, Optional
 
+from ..services.container import ServiceContainer, get_services
 from ..services.recommendation_service import RecommendationService
 
 router = APIRouter(prefix="/recommend", tags=["recommend"])
 
+
+def get_recommendation_service(services: ServiceContainer = Depends(get_services)) -> RecommendationService:
+    """추천 서비스 의존성 (앱 전역 싱글턴)"""
+    return services.recommendation_service
+
+
 @router.get("/personalized")
 async def get_personalized_recommendations(
     user_id: int = Query(..., description="사용자 ID"),
     emotion: Optional[str] = Query(None, description="현재 감정 상태"),
-    segment: Optional[str] = Query(None, description="사용자 세그먼트")
+    segment: Optional[str] = Query(None, description="사용자 세그먼트"),
+    service: RecommendationService = Depends(get_recommendation_service),
 ):
     """개인화된 게임 추천"""
     try:
-        service = RecommendationService()
         recommendations = service.get_personalized_recommendations(
             user_id=user_id,
             emotion=emotion,
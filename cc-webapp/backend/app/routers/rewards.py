@@ -8,7 +8,7 @@ from datetime import datetime
 
 # Assuming models and database session setup are in these locations
 from .. import models  # This should import UserReward and User
-from ..database import get_db
+from ..database import get_read_db
 from ..services.user_service import UserService
 
 router = APIRouter()
@@ -47,8 +47,8 @@ async def get_user_rewards(
     user_id: int = Path(..., title="The ID of the user to get rewards for", ge=1),
     page: int = Query(1, ge=1, description="Page number, 1-indexed"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
-    db: Session = Depends(get_db),
-    user_service: UserService = Depends(lambda db=Depends(get_db): UserService(db))
+    db: Session = Depends(get_read_db),
+    user_service: UserService = Depends(lambda db=Depends(get_read_db): UserService(db))
 ):
     """
     Retrieves a paginated list of rewards for a specific user.
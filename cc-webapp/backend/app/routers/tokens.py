@@ -0,0 +1,46 @@
+"""토큰 원장 관련 API 엔드포인트"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ..auth.simple_auth import require_user
+from ..database import get_read_db
+from ..services.token_service import TokenService
+
+router = APIRouter(prefix="/tokens", tags=["tokens"])
+
+
+class TokenTransactionItem(BaseModel):
+    id: int
+    amount: int
+    balance_after: int
+    reason: str
+    action_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class TokenHistoryResponse(BaseModel):
+    transactions: List[TokenTransactionItem]
+    next_before_id: Optional[int] = None  # 다음 페이지 조회용 커서
+
+
+def get_token_service(db: Session = Depends(get_read_db)) -> TokenService:
+    """토큰 서비스 의존성 (조회 전용이므로 읽기 복제본 사용)"""
+    return TokenService(db)
+
+
+@router.get("/history", response_model=TokenHistoryResponse)
+async def get_token_history(
+    limit: int = Query(20, ge=1, le=100),
+    before_id: Optional[int] = Query(None, ge=1, description="이 원장 ID보다 오래된 내역만 조회"),
+    current_user_id: int = Depends(require_user),
+    token_service: TokenService = Depends(get_token_service),
+):
+    """토큰 거래 내역 조회 (최신순, 커서 기반 페이지네이션)"""
+    transactions = token_service.get_transaction_history(current_user_id, limit, before_id)
+    next_before_id = transactions[-1]["id"] if len(transactions) == limit else None
+    return TokenHistoryResponse(transactions=transactions, next_before_id=next_before_id)
@@ -1,14 +1,13 @@
 # cc-webapp/backend/app/routers/unlock.py
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc # Correct import for desc
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 import logging # For logging
 
 from .. import models  # Should import User, UserReward, AdultContent, UserSegment
 from ..database import get_db
-from ..services.user_service import UserService
+from ..services.access_profile import SEGMENT_LEVELS, AccessProfileLoader
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -17,8 +16,8 @@ router = APIRouter()
 MAX_UNLOCK_STAGE = 3 # Define this based on your content stages. Consider making it configurable.
 
 # --- Dependencies ---
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
-    return UserService(db)
+def get_access_profiles(db: Session = Depends(get_db)) -> AccessProfileLoader:
+    return AccessProfileLoader(db)
 
 # --- Pydantic Models ---
 class UnlockResponse(BaseModel):
@@ -34,47 +33,29 @@ class UnlockResponse(BaseModel):
 # --- Helper Functions ---
 def get_segment_level(rfm_group: str | None) -> int:
     """Maps RFM group string to a numerical level."""
-    if rfm_group == "Whale":
-        return 3
-    elif rfm_group == "Medium":
-        return 2
-    elif rfm_group == "Low":
-        return 1
-    logger.debug(f"Unknown RFM group '{rfm_group}' received, defaulting to level 0.")
-    return 0 # Default for None or Unknown RFM groups
+    if rfm_group not in SEGMENT_LEVELS:
+        logger.debug(f"Unknown RFM group '{rfm_group}' received, defaulting to level 0.")
+    return SEGMENT_LEVELS.get(rfm_group, 0) # Default for None or Unknown RFM groups
 
 # --- API Endpoint ---
 @router.get("/unlock", response_model=UnlockResponse, tags=["unlock", "content"])
 async def attempt_content_unlock(
     user_id: int = Query(..., description="ID of the user attempting to unlock content"),
     db: Session = Depends(get_db),
-    user_service: UserService = Depends(get_user_service)
+    profiles: AccessProfileLoader = Depends(get_access_profiles)
 ):
-    # 1. Fetch User record with unified error handling
-    try:
-        user_service.get_user_or_error(user_id)
-    except ValueError as e:
+    # 1-2. Build the access profile once: user existence, rank, segment level and last unlocked stage
+    #      (the stage comes from user_unlock_states, not a scan of user_rewards)
+    profile = profiles.get(user_id)
+    if not profile.exists:
         logger.warning(f"Attempt to unlock content for non-existent user_id: {user_id}")
-        raise HTTPException(status_code=404, detail=str(e))    # 2. Query for the latest UserReward with reward_type="CONTENT_UNLOCK"
-    latest_unlock_reward = db.query(models.UserReward).filter(
-        models.UserReward.user_id == user_id,
-        models.UserReward.reward_type == "CONTENT_UNLOCK"
-    ).order_by(desc(models.UserReward.awarded_at)).first() # Order by awarded_at to get the latest    last_stage_unlocked = 0
-    if latest_unlock_reward is not None and getattr(latest_unlock_reward, 'reward_value', None) is not None:
-        try:
-            # Assuming reward_value stores the stage number as a string
-            last_stage_unlocked = int(str(latest_unlock_reward.reward_value))
-        except (ValueError, TypeError):
-            logger.error(
-                f"Could not parse last_stage_unlocked from UserReward.reward_value='{latest_unlock_reward.reward_value}' for user {user_id}. Defaulting to 0."
-            )
-            # This indicates a data integrity issue or a different storage format than expected.
-            last_stage_unlocked = 0 # Default to 0 if parsing fails
+        raise HTTPException(status_code=404, detail="존재하지 않는 사용자")
+    last_stage_unlocked = profile.highest_unlocked_stage
 
     logger.info(f"User {user_id}: Last stage unlocked = {last_stage_unlocked}.")
 
     # 3. Compute next_stage
-    next_stage_to_unlock = last_stage_unlocked + 1
+    next_stage_to_unlock = profile.next_stage
     if next_stage_to_unlock > MAX_UNLOCK_STAGE:
         logger.info(f"User {user_id}: All stages already unlocked (last stage {last_stage_unlocked}, max stage {MAX_UNLOCK_STAGE}).")
         raise HTTPException(status_code=400, detail="All content stages already unlocked or no further stages available.")
@@ -84,14 +65,11 @@ async def attempt_content_unlock(
     if not adult_content_item:
         logger.error(f"Content for stage {next_stage_to_unlock} not found in adult_content table.")
         raise HTTPException(status_code=404, detail=f"Content for stage {next_stage_to_unlock} not found.")    # 5. Verify user segment meets required_segment_level on AdultContent
-    user_segment = db.query(models.UserSegment).filter(models.UserSegment.user_id == user_id).first()
-
-    current_user_segment_level = 0  # Default to lowest if no segment info
-    if not user_segment:
+    current_user_segment_level = profile.segment_level  # 0 if no segment info
+    if profile.rfm_group is None:
         logger.warning(f"User segment data for user_id {user_id} not found. Assuming lowest segment level (0).")
     else:
-        current_user_segment_level = get_segment_level(getattr(user_segment, 'rfm_group', None))
-        logger.info(f"User {user_id}: Current segment level = {current_user_segment_level} (from RFM group '{getattr(user_segment, 'rfm_group', None)}').")
+        logger.info(f"User {user_id}: Current segment level = {current_user_segment_level} (from RFM group '{profile.rfm_group}').")
 
     required_content_level = getattr(adult_content_item, 'required_segment_level', 0)
     logger.info(f"Content stage {next_stage_to_unlock} requires segment level {required_content_level}.")
@@ -116,7 +94,9 @@ async def attempt_content_unlock(
         trigger_action_id=None # This unlock is direct
     )
     db.add(new_reward)
+    profiles.unlocks.record_unlock(db, user_id, next_stage_to_unlock, new_reward.awarded_at)
     db.commit()
+    profiles.invalidate(user_id)
     db.refresh(new_reward)
     # db.refresh(adult_content_item) # Not strictly necessary as we're not changing adult_content_item
 
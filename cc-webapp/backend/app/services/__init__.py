@@ -6,6 +6,7 @@ from .user_segment_service import UserSegmentService
 from .slot_service import SlotService
 from .roulette_service import RouletteService
 from .gacha_service import GachaService
+from .settlement_service import SettlementService
 
 
 # Optionally, make other services available for easier import if structured this way
@@ -34,6 +35,7 @@ __all__ = [
     "SlotService",
     "RouletteService",
     "GachaService",
+    "SettlementService",
 
     # "UserService",
     # "AuthService",
@@ -0,0 +1,125 @@
+"""
+사용자 접근 프로필 - 성인/VIP 콘텐츠 게이팅용
+랭크, 세그먼트 레벨, 최고 해금 단계, VIP 티어를 요청당 한 번만 조회한다.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.auth.simple_auth import rank_level
+from app.models import User, UserSegment
+from app.repositories.segment_cache import SegmentCache, segment_cache
+from app.repositories.unlock_repository import UnlockRepository
+from app.services.adult_content_service import STAGE_DETAILS, ContentStageEnum
+
+logger = logging.getLogger(__name__)
+
+# RFM 그룹 → 세그먼트 레벨 (세그먼트 없음/알 수 없음은 0)
+SEGMENT_LEVELS: Dict[str, int] = {
+    "Low": 1,
+    "Medium": 2,
+    "Whale": 3,
+}
+
+# Define VIP Tiers (could be more dynamic, e.g., from DB config)
+VIP_TIERS: Dict[str, Dict[str, Any]] = {
+    "Whale": {"tier_name": "Ultimate VIP", "discount_percentage": 0.15, "min_segment_order": STAGE_DETAILS[ContentStageEnum.VIP]["index"]},
+    # Add other VIP tiers if they are distinct from RFM groups
+    # min_segment_order indicates the access level this VIP tier inherently grants
+}
+
+
+@dataclass(frozen=True)
+class AccessProfile:
+    """Everything content gating needs about one user; all checks are O(1)."""
+
+    user_id: int
+    exists: bool
+    rank: str = "STANDARD"
+    rank_level: int = 1
+    rfm_group: Optional[str] = None
+    segment_level: int = 0
+    highest_unlocked_stage: int = 0
+    vip_tier: Optional[Dict[str, Any]] = None
+
+    @property
+    def next_stage(self) -> int:
+        return self.highest_unlocked_stage + 1
+
+    def has_rank(self, required_rank: str) -> bool:
+        """랭크 기반 접근 제어"""
+        return self.exists and self.rank_level >= rank_level(required_rank)
+
+    def check_access(self, required_rank: str, required_segment_level: int) -> bool:
+        """랭크 + RFM 세그먼트 조합 접근 제어"""
+        return self.has_rank(required_rank) and self.segment_level >= required_segment_level
+
+    def can_access_content(self, content: Any) -> bool:
+        """``AdultContent`` 행의 요구 랭크/세그먼트 레벨 충족 여부"""
+        return self.check_access(
+            getattr(content, "required_rank", None) or "STANDARD",
+            getattr(content, "required_segment_level", None) or 0,
+        )
+
+
+class AccessProfileLoader:
+    """
+    Builds each user's ``AccessProfile`` once and reuses it.
+
+    Meant to live for one request (one per ``Session``), so rank and unlock
+    changes from other requests are always seen; the segment part reads
+    through the shared ``SegmentCache``. Call ``invalidate`` after writing
+    anything the profile is built from within the same request.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        segments: Optional[SegmentCache] = None,
+        unlocks: Optional[UnlockRepository] = None,
+    ) -> None:
+        self.db = db
+        self.segments = segments if segments is not None else segment_cache
+        self.unlocks = unlocks or UnlockRepository()
+        self._profiles: Dict[int, AccessProfile] = {}
+
+    def get(self, user_id: int) -> AccessProfile:
+        profile = self._profiles.get(user_id)
+        if profile is None:
+            profile = self._profiles[user_id] = self._build(user_id)
+        return profile
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        if user_id is None:
+            self._profiles.clear()
+        else:
+            self._profiles.pop(user_id, None)
+
+    def _build(self, user_id: int) -> AccessProfile:
+        user = self.db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return AccessProfile(user_id=user_id, exists=False)
+        rank = str(getattr(user, "rank", None) or "STANDARD")
+        rfm_group = self.segments.get_or_load(user_id, lambda: self._load_rfm_group(user_id))
+        return AccessProfile(
+            user_id=user_id,
+            exists=True,
+            rank=rank,
+            rank_level=rank_level(rank),
+            rfm_group=rfm_group,
+            segment_level=SEGMENT_LEVELS.get(rfm_group, 0),
+            highest_unlocked_stage=self.unlocks.get_highest_stage(self.db, user_id),
+            vip_tier=VIP_TIERS.get(rfm_group),
+        )
+
+    def _load_rfm_group(self, user_id: int) -> Optional[str]:
+        user_segment = self.db.query(UserSegment).filter(UserSegment.user_id == user_id).first()
+        if not user_segment:
+            return None
+        # Safely check if rfm_group exists and convert to string
+        try:
+            return str(getattr(user_segment.rfm_group, "value", user_segment.rfm_group))
+        except (AttributeError, TypeError):
+            return None
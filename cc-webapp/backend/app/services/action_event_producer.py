@@ -0,0 +1,465 @@
+"""Batched, spool-backed publishing of user action events to Kafka."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    from confluent_kafka import Producer
+except ImportError:  # In case library is not installed during lightweight tests
+    Producer = None
+
+try:
+    from prometheus_client import Counter, Gauge
+except ImportError:  # Optional dependency
+    Counter = Gauge = None
+
+logger = logging.getLogger(__name__)
+
+TOPIC_USER_ACTIONS = "topic_user_actions"
+
+if Counter is not None:
+    ACTION_EVENTS = Counter("action_events_total", "User action events by outcome", ["outcome"])
+    ACTION_SPOOL_BYTES = Gauge("action_spool_bytes", "Bytes of undelivered action events on disk")
+else:
+    ACTION_EVENTS = ACTION_SPOOL_BYTES = None
+
+Record = Tuple[Optional[str], str]  # (key, JSON value)
+
+
+class DiskSpool:
+    """Append-only write-ahead spool of undelivered records.
+
+    Records are JSON lines in numbered segment files; every ``append`` is
+    flushed and fsynced before returning. The active segment is sealed once
+    it passes ``segment_bytes`` (or on ``seal()``) and only sealed segments
+    are replayed. If the spool grows past ``max_bytes`` the oldest sealed
+    segments are discarded and counted as dropped.
+
+    A directory must have a single writer: segment numbers are tracked per
+    process. Use ``DiskSpool.claim`` to give each worker its own directory.
+    """
+
+    PREFIX = "actions-"
+    SUFFIX = ".jsonl"
+
+    def __init__(self, directory: str, segment_bytes: int = 8 * 1024 * 1024, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._active: Optional[str] = None
+        self._next_seq: Optional[int] = None
+        self._claim = None  # claim()의 잠금 파일 (프로세스 수명 동안 유지)
+
+    @classmethod
+    def claim(cls, base_dir: str, max_slots: int = 64, **options: Any) -> "DiskSpool":
+        """
+        Spool in the first ``worker-N`` slot under ``base_dir`` that no live process holds.
+
+        The slot is held with an exclusive ``flock`` for the life of the
+        process, so workers sharing ``ACTION_SPOOL_DIR`` never append to or
+        replay each other's segments. Locks die with their process: a
+        restarted worker takes a free slot and replays what its predecessor
+        left there. Without ``fcntl`` the slot is named after the pid.
+
+        Raises:
+            RuntimeError: All ``max_slots`` slots are held
+        """
+        os.makedirs(base_dir, exist_ok=True)
+        if fcntl is None:
+            return cls(os.path.join(base_dir, f"pid-{os.getpid()}"), **options)
+        for slot in range(max_slots):
+            handle = open(os.path.join(base_dir, f"worker-{slot}.lock"), "a")
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                continue
+            spool = cls(os.path.join(base_dir, f"worker-{slot}"), **options)
+            spool._claim = handle
+            return spool
+        raise RuntimeError(f"No free action spool slot under {base_dir}")
+
+    def _segments(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(self.PREFIX) and name.endswith(self.SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _new_segment(self) -> str:
+        if self._next_seq is None:
+            existing = self._segments()
+            last = os.path.basename(existing[-1])[len(self.PREFIX):-len(self.SUFFIX)] if existing else "0"
+            self._next_seq = int(last) + 1
+        path = os.path.join(self.directory, f"{self.PREFIX}{self._next_seq:012d}{self.SUFFIX}")
+        self._next_seq += 1
+        return path
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(os.path.getsize(path) for path in self._segments())
+
+    def __bool__(self) -> bool:
+        return bool(self._segments())
+
+    def append(self, records: List[Record]) -> int:
+        """
+        Durably append records.
+
+        Returns:
+            int: Records discarded from old segments to respect ``max_bytes``
+        """
+        if not records:
+            return 0
+        data = "".join(json.dumps({"k": key, "v": value}) + "\n" for key, value in records).encode("utf-8")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if self._active is None:
+                self._active = self._new_segment()
+            with open(self._active, "ab") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            if os.path.getsize(self._active) >= self.segment_bytes:
+                self._active = None
+            return self._enforce_limit()
+
+    def _enforce_limit(self) -> int:
+        dropped = 0
+        segments = self._segments()
+        total = sum(os.path.getsize(path) for path in segments)
+        for path in segments:
+            if total <= self.max_bytes or path == self._active:
+                break
+            total -= os.path.getsize(path)
+            dropped += len(self.read(path))
+            os.remove(path)
+            logger.error("Action spool over %s bytes; discarded %s", self.max_bytes, path)
+        return dropped
+
+    def seal(self) -> None:
+        """Close the active segment so it becomes eligible for replay."""
+        with self._lock:
+            self._active = None
+
+    def sealed_segments(self) -> List[str]:
+        with self._lock:
+            return [path for path in self._segments() if path != self._active]
+
+    @staticmethod
+    def read(path: str) -> List[Record]:
+        records = []
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    # 크래시로 잘린 마지막 줄은 버린다
+                    logger.warning("Skipping corrupt spool line in %s", path)
+                    continue
+                records.append((item["k"], item["v"]))
+        return records
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def producer_config(broker: str) -> Dict[str, Any]:
+    """librdkafka settings tuned for batched, compressed, idempotent delivery."""
+    return {
+        "bootstrap.servers": broker,
+        "linger.ms": int(os.getenv("KAFKA_LINGER_MS", "20")),
+        "batch.num.messages": int(os.getenv("KAFKA_BATCH_NUM_MESSAGES", "10000")),
+        "compression.type": os.getenv("KAFKA_COMPRESSION", "lz4"),
+        "queue.buffering.max.messages": int(os.getenv("KAFKA_QUEUE_MAX_MESSAGES", "100000")),
+        "message.timeout.ms": int(os.getenv("KAFKA_MESSAGE_TIMEOUT_MS", "30000")),
+        "enable.idempotence": True,
+        "acks": "all",
+    }
+
+
+class ActionEventProducer:
+    """
+    Publishes action events without blocking the request path.
+
+    ``publish`` appends to a bounded in-memory buffer; a background task
+    drains it every ``linger`` seconds in ``batch_size`` chunks, hands the
+    chunk to the client (which batches and compresses per ``producer_config``)
+    and services delivery callbacks with one ``poll(0)`` per chunk.
+
+    Records go to the :class:`DiskSpool` instead of being dropped when the
+    client queue is full (``BufferError``), a delivery report fails, or the
+    in-memory buffer is full. Spool writes fsync, so on the event loop an
+    overflowing record is only parked and a worker thread spools it.
+
+    After a failure the broker is considered down for ``retry_backoff``
+    seconds: new records are spooled directly, then sealed spool segments
+    are replayed (oldest first, each deleted only once every record in it
+    was delivered) before live traffic resumes.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        topic: str = TOPIC_USER_ACTIONS,
+        spool: Optional[DiskSpool] = None,
+        linger: float = 0.05,
+        batch_size: int = 1000,
+        max_pending: int = 50_000,
+        retry_backoff: float = 5.0,
+        flush_timeout: float = 10.0,
+    ) -> None:
+        self.client = client
+        self.topic = topic
+        self.spool = spool
+        self.linger = linger
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.retry_backoff = retry_backoff
+        self.flush_timeout = flush_timeout
+        self._buffer: Deque[Record] = deque()
+        self._failed: Deque[Record] = deque()
+        self._overflow: Deque[Record] = deque()
+        self._spilling = False
+        self._retry_at = 0.0
+        # 이전 실행에서 남은 스풀이 있으면 시작 후 재생
+        self._spool_pending = bool(spool)
+        self._drain_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            name: 0
+            for name in ("produced", "delivered", "failed", "spooled", "replayed", "dropped", "disabled")
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def _count(self, outcome: str, amount: int = 1) -> None:
+        if amount:
+            self.stats[outcome] += amount
+            if ACTION_EVENTS is not None:
+                ACTION_EVENTS.labels(outcome=outcome).inc(amount)
+
+    def publish(self, payload: Dict[str, Any], key: Optional[str] = None) -> bool:
+        """
+        Queue one event for delivery.
+
+        Args:
+            payload (Dict[str, Any]): JSON-serialisable event
+            key (Optional[str]): Partition key (the user id)
+
+        Returns:
+            bool: False if Kafka is disabled and the event was discarded
+        """
+        if not self.enabled:
+            self._count("disabled")
+            return False
+        record = (key, json.dumps(payload, default=str))
+        if len(self._buffer) < self.max_pending:
+            self._buffer.append(record)
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None:
+            # 스레드풀(동기 엔드포인트)에서는 바로 스풀해도 이벤트 루프를 막지 않는다
+            self._spool([record])
+            return True
+        self._overflow.append(record)
+        if not self._spilling:
+            self._spilling = True
+            loop.run_in_executor(None, self._spill_overflow)
+        return True
+
+    def _spill_overflow(self) -> None:
+        """Spool parked overflow records; runs in a worker thread."""
+        try:
+            while self._overflow:
+                self._spool(self._take_from(self._overflow, len(self._overflow)))
+        finally:
+            self._spilling = False
+
+    # --- background drain --------------------------------------------------
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.linger)
+            if self._buffer or self._failed or self._overflow or (self._spool_pending and time.monotonic() >= self._retry_at):
+                try:
+                    await asyncio.to_thread(self.drain)
+                except Exception as exc:
+                    logger.error("Action event drain failed: %s", exc)
+
+    async def close(self) -> None:
+        """Stop the drain loop, deliver what is buffered and spool the rest."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.enabled:
+            await asyncio.to_thread(self.shutdown)
+
+    def shutdown(self) -> None:
+        self.drain()
+        remaining = self.client.flush(self.flush_timeout)
+        self._spool_failed()
+        if remaining:
+            logger.warning("%s action events still in flight at shutdown", remaining)
+        if self.spool is not None:
+            self.spool.seal()
+
+    def drain(self) -> None:
+        """Move buffered events to the client (or the spool). Runs off the event loop."""
+        with self._drain_lock:
+            self._spool_failed()
+            # 스필 스레드와 경합해 남은 초과분도 여기서 스풀
+            self._spool(self._take_from(self._overflow, len(self._overflow)))
+            if time.monotonic() < self._retry_at:
+                self._spool(self._take(len(self._buffer)))
+                return
+            if self._spool_pending and not self._replay():
+                self._spool(self._take(len(self._buffer)))
+                return
+            while self._buffer:
+                batch = self._take(self.batch_size)
+                produced = self._produce(batch, self._on_delivery)
+                self._count("produced", produced)
+                if produced < len(batch):
+                    self.client.poll(0)
+                    self._mark_down("local queue full")
+                    self._spool(batch[produced:] + self._take(len(self._buffer)))
+                    break
+                self.client.poll(0)
+            self._spool_failed()
+
+    def _take(self, count: int) -> List[Record]:
+        return self._take_from(self._buffer, count)
+
+    @staticmethod
+    def _take_from(queue: Deque[Record], count: int) -> List[Record]:
+        batch = []
+        while queue and len(batch) < count:
+            batch.append(queue.popleft())
+        return batch
+
+    def _produce(self, batch: List[Record], callback, block: bool = False) -> int:
+        """Hand records to the client; returns how many it accepted.
+
+        With ``block`` a full client queue is flushed once before giving up
+        (replay path only; the live path never waits).
+        """
+        for index, (key, value) in enumerate(batch):
+            for attempt in range(2 if block else 1):
+                try:
+                    self.client.produce(self.topic, key=key, value=value.encode("utf-8"), callback=callback)
+                    break
+                except BufferError:
+                    if attempt or not block:
+                        return index
+                    self.client.flush(self.flush_timeout)
+        return len(batch)
+
+    def _on_delivery(self, err, msg) -> None:
+        if err is None:
+            self._count("delivered")
+            return
+        self._count("failed")
+        key = msg.key().decode("utf-8") if msg.key() is not None else None
+        self._failed.append((key, msg.value().decode("utf-8")))
+        self._mark_down(str(err))
+
+    def _mark_down(self, reason: str) -> None:
+        if time.monotonic() >= self._retry_at:
+            logger.warning("Kafka unavailable (%s); spooling action events for %.0fs", reason, self.retry_backoff)
+        self._retry_at = time.monotonic() + self.retry_backoff
+
+    def _spool_failed(self) -> None:
+        failed = []
+        while self._failed:
+            failed.append(self._failed.popleft())
+        self._spool(failed)
+
+    def _spool(self, records: List[Record]) -> None:
+        if not records:
+            return
+        if self.spool is None:
+            self._count("dropped", len(records))
+            logger.error("Dropped %s action events (no spool configured)", len(records))
+            return
+        self._count("dropped", self.spool.append(records))
+        self._count("spooled", len(records))
+        self._spool_pending = True
+        if ACTION_SPOOL_BYTES is not None:
+            ACTION_SPOOL_BYTES.set(self.spool.size_bytes)
+
+    def _replay(self) -> bool:
+        """Deliver sealed spool segments; True once the spool is empty."""
+        self.spool.seal()
+        for path in self.spool.sealed_segments():
+            records = self.spool.read(path)
+            failures: List[str] = []
+
+            def on_replay(err, msg, failures=failures):
+                if err is None:
+                    self._count("delivered")
+                else:
+                    failures.append(str(err))
+
+            produced = self._produce(records, on_replay, block=True)
+            remaining = self.client.flush(self.flush_timeout)
+            if produced < len(records) or remaining or failures:
+                # 세그먼트는 그대로 두고 다음 재시도에서 다시 재생 (일부 중복 전송 가능)
+                self._mark_down(failures[0] if failures else "replay incomplete")
+                return False
+            self.spool.remove(path)
+            self._count("replayed", len(records))
+            logger.info("Replayed %s spooled action events from %s", len(records), os.path.basename(path))
+        self._spool_pending = False
+        if ACTION_SPOOL_BYTES is not None:
+            ACTION_SPOOL_BYTES.set(self.spool.size_bytes)
+        return True
+
+
+def create_action_producer() -> ActionEventProducer:
+    """Build the producer from ``KAFKA_ENABLED``/``KAFKA_BROKER``/``ACTION_SPOOL_DIR``."""
+    client = None
+    if os.getenv("KAFKA_ENABLED", "0") == "1" and Producer is not None:
+        try:
+            client = Producer(producer_config(os.getenv("KAFKA_BROKER", "localhost:9092")))
+        except Exception as exc:
+            logger.error("Kafka producer init failed: %s", exc)
+    spool_dir = os.getenv("ACTION_SPOOL_DIR", "./action_spool")
+    # 워커마다 자기 슬롯 디렉터리를 쓴다
+    return ActionEventProducer(client=client, spool=DiskSpool.claim(spool_dir) if client is not None else None)
+
+
+# 프로세스 공용 프로듀서
+action_producer = create_action_producer()
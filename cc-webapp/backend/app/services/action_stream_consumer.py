@@ -0,0 +1,329 @@
+"""Streaming consumer that materializes ``topic_user_actions`` into the database."""
+
+import json
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import models
+from app.repositories.activity_repository import ActivityRepository
+from app.services.action_event_producer import TOPIC_USER_ACTIONS
+from app.utils.sql_utils import bulk_insert, bulk_upsert
+
+try:
+    from confluent_kafka import Consumer
+except ImportError:  # In case library is not installed during lightweight tests
+    Consumer = None
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:  # Optional dependency
+    Counter = Histogram = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP_ID = "user_actions_consumer_group"
+PARTITION_EOF = -191  # KafkaError._PARTITION_EOF
+
+if Counter is not None:
+    CONSUMED_ACTIONS = Counter(
+        "action_consumer_messages_total", "Action events read from Kafka by outcome", ["outcome"]
+    )
+    CONSUMER_BATCH_SECONDS = Histogram(
+        "action_consumer_batch_seconds", "Time to apply one consumed batch to the database"
+    )
+else:
+    CONSUMED_ACTIONS = CONSUMER_BATCH_SECONDS = None
+
+Action = Tuple[int, str, datetime, float]  # (user_id, action_type, timestamp, value)
+
+
+class BatchResult(NamedTuple):
+    """Outcome of applying one consumed batch."""
+
+    received: int
+    applied: int
+    duplicates: int
+    invalid: int
+
+
+def parse_action(value: Optional[bytes]) -> Optional[Action]:
+    """Decode an event published by ``routers.actions``; ``None`` if malformed."""
+    try:
+        payload = json.loads(value)
+        return (
+            int(payload["user_id"]),
+            str(payload["action_type"]),
+            datetime.fromisoformat(payload["action_timestamp"]),
+            float(payload.get("value") or 0.0),
+        )
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+def _count(outcome: str, amount: int) -> None:
+    if CONSUMED_ACTIONS is not None and amount:
+        CONSUMED_ACTIONS.labels(outcome).inc(amount)
+
+
+class ActionStreamConsumer:
+    """Consumes action events in batches and applies each batch in one transaction.
+
+    A batch writes its ``user_actions`` rows with one bulk insert, folds the
+    events into the ``user_activity_daily`` RFM buckets and the per-user daily
+    activity streak, and records the highest applied offset per partition in
+    ``stream_offsets`` - all in the same commit. Kafka offsets are committed
+    manually only after that commit succeeds, so a crash in between replays
+    the batch, and the stored offsets let the replay be skipped instead of
+    counted twice.
+
+    ``consumer`` is any ``confluent_kafka.Consumer``-compatible object
+    (``consume``/``commit``/``close``), e.g. ``utils.fake_kafka.FakeConsumer``.
+    """
+
+    def __init__(
+        self,
+        consumer,
+        session_factory: Optional[Callable] = None,
+        group_id: str = DEFAULT_GROUP_ID,
+        topic: str = TOPIC_USER_ACTIONS,
+        batch_size: int = 500,
+        poll_timeout: float = 1.0,
+        activity_repo: Optional[ActivityRepository] = None,
+    ) -> None:
+        if session_factory is None:
+            from app.database import SessionLocal
+
+            session_factory = SessionLocal
+        self.consumer = consumer
+        self.session_factory = session_factory
+        self.group_id = group_id
+        self.topic = topic
+        self.batch_size = batch_size
+        self.poll_timeout = poll_timeout
+        self.activity = activity_repo or ActivityRepository()
+        self.consumer.subscribe([topic])
+
+    def _applied_offsets(self, db, partitions) -> Dict[int, int]:
+        Offset = models.StreamOffset
+        return dict(
+            db.query(Offset.partition, Offset.offset).filter(
+                Offset.consumer_group == self.group_id,
+                Offset.topic == self.topic,
+                Offset.partition.in_(list(partitions)),
+            )
+        )
+
+    def apply(self, messages: List) -> BatchResult:
+        """
+        Write a batch of messages to the database and commit.
+
+        Args:
+            messages (List): Error-free messages from ``consumer.consume``
+
+        Returns:
+            BatchResult: Counts of applied, already-applied and malformed events
+        """
+        if not messages:
+            return BatchResult(0, 0, 0, 0)
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            applied = self._applied_offsets(db, {m.partition() for m in messages})
+            last_offsets: Dict[int, int] = {}
+            actions: List[Action] = []
+            duplicates = invalid = 0
+            for message in messages:
+                partition, offset = message.partition(), message.offset()
+                if offset <= applied.get(partition, -1):
+                    duplicates += 1
+                    continue
+                last_offsets[partition] = max(offset, last_offsets.get(partition, -1))
+                action = parse_action(message.value())
+                if action is None:
+                    # 잘못된 이벤트는 건너뛰되 오프셋은 전진시켜 재처리 루프를 막는다
+                    logger.warning(
+                        "Skipping malformed action event at %s[%s]@%s", message.topic(), partition, offset
+                    )
+                    invalid += 1
+                    continue
+                actions.append(action)
+
+            if last_offsets:
+                bulk_insert(
+                    db,
+                    models.UserAction,
+                    [
+                        {"user_id": user_id, "action_type": action_type, "timestamp": at, "value": value}
+                        for user_id, action_type, at, value in actions
+                    ],
+                    ["user_id", "action_type", "timestamp", "value"],
+                )
+                self.activity.record_many(db, [(user_id, value, at) for user_id, _, at, value in actions])
+                active_days = defaultdict(set)
+                for user_id, _, at, _ in actions:
+                    active_days[user_id].add(at.date())
+                self.activity.advance_streaks(db, active_days)
+                now = datetime.utcnow()
+                bulk_upsert(
+                    db,
+                    models.StreamOffset,
+                    [
+                        {
+                            "consumer_group": self.group_id,
+                            "topic": self.topic,
+                            "partition": partition,
+                            "offset": offset,
+                            "updated_at": now,
+                        }
+                        for partition, offset in last_offsets.items()
+                    ],
+                    ["consumer_group", "topic", "partition"],
+                    ["offset", "updated_at"],
+                )
+                db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            logger.error("Failed to apply %s action events: %s", len(messages), exc)
+            raise
+        finally:
+            db.close()
+
+        _count("applied", len(actions))
+        _count("duplicate", duplicates)
+        _count("invalid", invalid)
+        if CONSUMER_BATCH_SECONDS is not None:
+            CONSUMER_BATCH_SECONDS.observe(time.perf_counter() - started)
+        return BatchResult(len(messages), len(actions), duplicates, invalid)
+
+    def poll_batch(self) -> Optional[BatchResult]:
+        """Consume up to ``batch_size`` messages, apply them, then commit offsets.
+
+        Returns ``None`` when nothing was available within ``poll_timeout``.
+        """
+        messages = self.consumer.consume(num_messages=self.batch_size, timeout=self.poll_timeout)
+        if not messages:
+            return None
+        valid = []
+        for message in messages:
+            error = message.error()
+            if error is None:
+                valid.append(message)
+            elif error.code() != PARTITION_EOF:
+                logger.error("Kafka consumer error: %s", error)
+        result = self.apply(valid)
+        # DB 커밋이 끝난 뒤에만 Kafka 오프셋을 커밋한다
+        self.consumer.commit(asynchronous=False)
+        return result
+
+    def run(self, stop_event=None, max_idle_polls: Optional[int] = None) -> int:
+        """
+        Process batches until ``stop_event`` is set.
+
+        Args:
+            stop_event: ``threading.Event``/``multiprocessing.Event`` to stop on
+            max_idle_polls (Optional[int]): Also stop after this many empty polls in a row
+
+        Returns:
+            int: Number of events applied
+        """
+        total = idle = 0
+        while stop_event is None or not stop_event.is_set():
+            result = self.poll_batch()
+            if result is None:
+                idle += 1
+                if max_idle_polls is not None and idle >= max_idle_polls:
+                    break
+                continue
+            idle = 0
+            total += result.applied
+        return total
+
+    def close(self) -> None:
+        self.consumer.close()
+
+
+def create_kafka_consumer(broker: str, group_id: str = DEFAULT_GROUP_ID):
+    """Build a ``confluent_kafka.Consumer`` with manual offset commits."""
+    if Consumer is None:
+        raise RuntimeError("confluent_kafka is not installed")
+    return Consumer(
+        {
+            "bootstrap.servers": broker,
+            "group.id": group_id,
+            "auto.offset.reset": "earliest",
+            "enable.auto.commit": False,
+            "enable.partition.eof": False,
+        }
+    )
+
+
+def _worker_main(consumer_factory: Callable, member: int, members: int, options: dict, stop_event) -> None:
+    consumer = ActionStreamConsumer(consumer_factory(member, members), **options)
+    try:
+        consumer.run(stop_event)
+    finally:
+        consumer.close()
+
+
+def run_workers(
+    workers: int,
+    consumer_factory: Callable,
+    stop_event=None,
+    restart_delay: float = 1.0,
+    **options,
+) -> None:
+    """
+    Run ``workers`` consumer processes in one group, one partition share each.
+
+    ``consumer_factory(member, members)`` is called inside each child to build
+    its consumer; with Kafka the group coordinator spreads the topic's
+    partitions over the members. A worker that dies (e.g. on a database
+    error) is restarted after ``restart_delay`` and resumes from the last
+    committed offset.
+
+    Args:
+        workers (int): Number of processes; more than the partition count leaves some idle
+        consumer_factory (Callable): Picklable ``(member, members) -> consumer``
+        stop_event: ``multiprocessing.Event`` that shuts all workers down
+        **options: Passed to :class:`ActionStreamConsumer`
+    """
+    stop_event = stop_event or multiprocessing.Event()
+    processes: Dict[int, multiprocessing.Process] = {}
+
+    def spawn(member: int) -> None:
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(consumer_factory, member, workers, options, stop_event),
+            name=f"action-consumer-{member}",
+            daemon=True,
+        )
+        process.start()
+        processes[member] = process
+
+    for member in range(workers):
+        spawn(member)
+    try:
+        while not stop_event.is_set():
+            for member, process in list(processes.items()):
+                if not process.is_alive() and not stop_event.is_set():
+                    logger.warning(
+                        "Action consumer worker %s exited with %s; restarting", member, process.exitcode
+                    )
+                    time.sleep(restart_delay)
+                    spawn(member)
+            stop_event.wait(1.0)
+    finally:
+        stop_event.set()
+        for process in processes.values():
+            process.join(timeout=10)
+
+
+def kafka_consumer_factory(broker: str, group_id: str, member: int, members: int):
+    """``consumer_factory`` for :func:`run_workers`; bind ``broker``/``group_id`` with ``functools.partial``."""
+    return create_kafka_consumer(broker, group_id)
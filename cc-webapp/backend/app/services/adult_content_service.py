@@ -11,6 +11,7 @@ from app.schemas import (
     AdultContentDetail, AdultContentGalleryItem, ContentPreviewResponse,
     ContentUnlockResponse, AccessUpgradeRequest, AccessUpgradeResponse
 )
+from app.services.game_config import GameConfigRegistry, get_game_config
 from app.services.token_service import TokenService
 
 logger = logging.getLogger(__name__)
@@ -88,19 +89,41 @@ USER_SEGMENT_ACCESS_ORDER = [
 
 
 class AdultContentService:
-    """Service for managing adult content access and unlocking."""
-    
+    """Service for managing adult content access and unlocking.
+
+    Token prices are defaults here and come from the game config
+    (``CONFIG_KEY``) at construction.
+    """
+
+    CONFIG_KEY = "content"
+    # 단계 값(ContentStageEnum.value) → 해제 토큰 비용
+    STAGE_TOKEN_COST = {stage.value: details["token_cost"] for stage, details in STAGE_DETAILS.items()}
+    ACCESS_UPGRADE_COST = 100
+
     def __init__(
         self,
         db: Session,
         token_service: TokenService,
         age_verification_service=None,
-        reward_service=None
+        reward_service=None,
+        profiles=None,
+        config: Optional[GameConfigRegistry] = None,
     ):
         self.db = db
         self.token_service = token_service
         self.age_verification_service = age_verification_service
         self.reward_service = reward_service
+        if profiles is None:
+            # access_profile이 이 모듈의 STAGE_DETAILS를 참조하므로 지연 import
+            from app.services.access_profile import AccessProfileLoader
+
+            profiles = AccessProfileLoader(db)
+        self.profiles = profiles
+        self.rules = (config or get_game_config()).current.rules_for(type(self))
+
+    def check_content_access(self, user_id: int, content: AdultContent) -> bool:
+        """콘텐츠의 요구 랭크 + 세그먼트 레벨 충족 여부 (요청당 한 번 만든 접근 프로필 기준)"""
+        return self.profiles.get(user_id).can_access_content(content)
     
     def get_content_access_level(self, user_id: int, content_id: int) -> ContentStageEnum:
         """Get content access level for user."""
@@ -169,20 +192,30 @@ class AdultContentService:
         stage_to_unlock: int,
         user: User
     ) -> ContentUnlockResponse:
-        """Unlock specific content stage for a user."""
+        """Unlock specific content stage for a user.
+
+        Raises:
+            ValueError: Content not found, rank or segment level too low,
+                or insufficient tokens
+        """
         try:            # Check if user has enough tokens
             user_id = getattr(user, 'id', 1)  # Default to 1 for now
+            content = self.db.query(AdultContent).filter(AdultContent.id == content_id).first()
+            if content is None:
+                raise ValueError(f"Content {content_id} not found")
+            if not self.check_content_access(user_id, content):
+                raise ValueError("Rank or segment level too low for this content")
             user_tokens = self.token_service.get_token_balance(user_id)
             
             # Get stage details
             stage_enum = list(ContentStageEnum)[min(stage_to_unlock, len(ContentStageEnum) - 1)]
-            stage_details = STAGE_DETAILS.get(stage_enum, STAGE_DETAILS[ContentStageEnum.BASIC])
-            required_tokens = stage_details["token_cost"]
+            costs = self.rules.STAGE_TOKEN_COST
+            required_tokens = costs.get(stage_enum.value, costs[ContentStageEnum.BASIC.value])
             
             if user_tokens < required_tokens:
                 raise ValueError(f"Insufficient tokens. Required: {required_tokens}, Available: {user_tokens}")
               # Deduct tokens
-            result = self.token_service.deduct_tokens(user_id, required_tokens)
+            result = self.token_service.deduct_tokens(user_id, required_tokens, reason="CONTENT_UNLOCK")
             if result is None:
                 raise ValueError("Failed to deduct tokens")
             
@@ -218,7 +251,7 @@ class AdultContentService:
     ) -> AccessUpgradeResponse:
         """Temporarily upgrade user's access level."""
         try:            # Check token cost for upgrade
-            upgrade_cost = 100  # Default upgrade cost
+            upgrade_cost = self.rules.ACCESS_UPGRADE_COST
             user_id = getattr(user, 'id', 1)  # Default to 1 for now
             user_tokens = self.token_service.get_token_balance(user_id)
             
@@ -226,7 +259,7 @@ class AdultContentService:
                 raise ValueError(f"Insufficient tokens for upgrade. Required: {upgrade_cost}, Available: {user_tokens}")
             
             # Deduct tokens
-            result = self.token_service.deduct_tokens(user_id, upgrade_cost)
+            result = self.token_service.deduct_tokens(user_id, upgrade_cost, reason="ACCESS_UPGRADE")
             if result is None:
                 raise ValueError("Failed to deduct tokens")
             
@@ -241,9 +241,11 @@ class CJAIService:
                 logger.warning(f"No WebSocket manager available for user {user_id}")
                 return False
                 
-            # For now, broadcast to all connections since we don't have user-specific connections
-            await self.websocket_manager.broadcast(f"[User {user_id}] {message}")
-            logger.info(f"Sent WebSocket message for user {user_id}")
+            delivered = await self.websocket_manager.send_to_user(user_id, message)
+            if not delivered:
+                logger.info(f"No open WebSocket connection for user {user_id}")
+                return False
+            logger.info(f"Queued WebSocket message for user {user_id} on {delivered} connection(s)")
             return True
         except Exception as exc:
             logger.error(f"Failed to send WebSocket message for user {user_id}: {exc}")
@@ -0,0 +1,111 @@
+"""Application-scoped service container.
+
+Stateless services are built once per process, in the FastAPI lifespan,
+instead of once per request. Only database sessions stay request-scoped:
+they are passed to service methods, or bound to the thin per-request
+wrappers that ``rfm_service(db)`` and friends return over the shared
+repository.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy.orm import Session
+
+from ..database import USE_ASYNC_DB
+from ..repositories.game_repository import AsyncGameRepository, GameRepository
+from .game_config import GameConfig, GameConfigRegistry, get_game_config
+from .game_service import AsyncGameService, GameService
+from .ltv_service import LTVService
+from .personalization_service import PersonalizationService
+from .recommendation_service import RecommendationService
+from .rfm_service import RFMService
+from .rfm_threshold_service import RFMThresholdService
+
+
+class ServiceContainer:
+    """Process-wide service singletons.
+
+    Game services read their rules from the game config when they are
+    constructed. The container therefore rebuilds ``game_service`` when a
+    new config version is published. A request that already holds the old
+    service finishes on the old version.
+    """
+
+    def __init__(
+        self,
+        config: Optional[GameConfigRegistry] = None,
+        use_async: Optional[bool] = None,
+        game_repository: Optional[GameRepository] = None,
+        async_game_repository: Optional[AsyncGameRepository] = None,
+    ) -> None:
+        """
+        Args:
+            config (Optional[GameConfigRegistry]): Game config, defaults to the process registry
+            use_async (Optional[bool]): Serve ``AsyncGameService``; defaults to ``DB_ASYNC``
+            game_repository (Optional[GameRepository]): Shared sync repository
+            async_game_repository (Optional[AsyncGameRepository]): Shared async repository
+        """
+        self.config = config or get_game_config()
+        self.use_async = USE_ASYNC_DB if use_async is None else use_async
+        self.game_repository = game_repository or GameRepository()
+        self.async_game_repository = async_game_repository
+        if self.use_async and self.async_game_repository is None:
+            self.async_game_repository = AsyncGameRepository()
+        self.rfm_thresholds = RFMThresholdService()
+        self.recommendation_service = RecommendationService()
+        self._game_service: Optional[Tuple[GameConfig, GameService]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def game_service(self) -> GameService:
+        """``GameService`` (or ``AsyncGameService``) for the current game config version."""
+        current = self.config.current
+        cached = self._game_service
+        if cached is None or cached[0] is not current:
+            with self._lock:
+                cached = self._game_service
+                if cached is None or cached[0] is not current:
+                    if self.use_async:
+                        service = AsyncGameService(self.async_game_repository, config=self.config)
+                    else:
+                        service = GameService(self.game_repository, config=self.config)
+                    cached = self._game_service = (current, service)
+        return cached[1]
+
+    def rfm_service(self, db: Session) -> RFMService:
+        """``RFMService`` bound to the request's session over the shared repository."""
+        return RFMService(db, self.game_repository, self.rfm_thresholds)
+
+    def ltv_service(self, db: Session) -> LTVService:
+        """``LTVService`` bound to the request's session over the shared repository."""
+        return LTVService(db, self.game_repository)
+
+    def personalization_service(self, db: Session) -> PersonalizationService:
+        """``PersonalizationService`` bound to the request's session over the shared repository."""
+        return PersonalizationService(db, self.game_repository)
+
+
+_default_container: Optional[ServiceContainer] = None
+_default_lock = threading.Lock()
+
+
+def get_service_container() -> ServiceContainer:
+    """Return the process-wide container, built on first use."""
+    global _default_container
+    if _default_container is None:
+        with _default_lock:
+            if _default_container is None:
+                _default_container = ServiceContainer()
+    return _default_container
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """FastAPI dependency: the container wired in the app lifespan.
+
+    Falls back to the process-wide container when the lifespan has not run
+    (e.g. a ``TestClient`` used without a ``with`` block).
+    """
+    services = getattr(request.app.state, "services", None)
+    return services if services is not None else get_service_container()
@@ -1,13 +1,19 @@
+from collections import Counter, deque
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import random
-import os
-import json
 import logging
 
-from .token_service import TokenService
-from ..repositories.game_repository import GameRepository
+from .token_service import AsyncTokenService, TokenService
+from .settlement_service import AsyncSettlementService, GameOutcome, Settlement, SettlementService
+from ..repositories.game_repository import AsyncGameRepository, GameRepository
+from ..repositories.reward_inventory import RewardInventory, get_reward_inventory
+from ..utils.alias_sampler import RarityTable, compile_rarity_table
+from .game_config import GameConfigRegistry, get_game_config
+from ..utils.game_rng import RngProvider, get_rng_provider
 
 
 @dataclass
@@ -17,109 +23,318 @@ class GachaPullResult:
     balance: int
 
 
+@dataclass
+class GachaDraw:
+    """뽑기 결과와 그 이후의 천장 카운트/히스토리."""
+
+    results: List[str]
+    count: int
+    history: List[str]
+
+
 class GachaService:
     """가챠 뽑기 로직을 담당하는 서비스.
 
-    확률 테이블과 보상 풀은 환경 변수에서 로드되며, 런타임에 갱신할 수 있습니다.
+    확률 테이블 등 규칙은 게임 설정(``CONFIG_KEY``)에서 읽으며, 아래 상수는
+    기본값입니다. 한정 보상 재고는 모든 인스턴스가 공유하는 ``RewardInventory``에
+    있습니다.
     """
 
+    CONFIG_KEY = "gacha"
+
     DEFAULT_RARITY_TABLE: list[tuple[str, float]] = [
         ("Legendary", 0.005),
         ("Epic", 0.045),
         ("Rare", 0.25),
         ("Common", 0.70),
     ]
+    RARITY_TABLE: tuple[tuple[str, float], ...] = tuple(DEFAULT_RARITY_TABLE)
+    SINGLE_PULL_COST = 50
+    TEN_PULL_COST = 450
+    PITY_THRESHOLD = 90  # 이 횟수째 뽑기부터 Epic 이상 보장
+    PITY_RARITIES = frozenset({"Epic", "Legendary"})
+    PITY_RARITY = "Epic"
+    HISTORY_SIZE = 10
+    HISTORY_PENALTY = 0.5  # 최근 히스토리에 있는 등급의 확률 배수
+    FALLBACK_RARITY = "Common"
 
-    def __init__(self, repository: GameRepository | None = None, token_service: TokenService | None = None, db: Optional[Session] = None) -> None:
+    def __init__(
+        self,
+        repository: GameRepository | None = None,
+        token_service: TokenService | None = None,
+        db: Optional[Session] = None,
+        settlement: SettlementService | None = None,
+        inventory: RewardInventory | None = None,
+        config: GameConfigRegistry | None = None,
+        rng: RngProvider | None = None,
+    ) -> None:
         self.repo = repository or GameRepository()
         self.token_service = token_service or TokenService(db or None, self.repo)
+        self.settlement = settlement or SettlementService(self.repo, self.token_service)
         self.logger = logging.getLogger(__name__)
-        self.rarity_table = self._load_rarity_table()
-        self.reward_pool = self._load_reward_pool()
-
-    def _load_rarity_table(self) -> List[Tuple[str, float]]:
-        """환경 변수에서 확률 테이블을 로드"""
-        table_json = os.getenv("GACHA_RARITY_TABLE")
-        if table_json:
-            try:
-                data = json.loads(table_json)
-                return [(str(name), float(prob)) for name, prob in data]
-            except Exception as e:  # noqa: BLE001
-                self.logger.error("Invalid GACHA_RARITY_TABLE: %s", e)
-        return self.DEFAULT_RARITY_TABLE.copy()
-
-    def _load_reward_pool(self) -> Dict[str, int]:
-        """환경 변수에서 보상 풀 정보를 로드"""
-        pool_json = os.getenv("GACHA_REWARD_POOL")
-        if pool_json:
-            try:
-                data = json.loads(pool_json)
-                return {str(k): int(v) for k, v in data.items()}
-            except Exception as e:  # noqa: BLE001
-                self.logger.error("Invalid GACHA_REWARD_POOL: %s", e)
-        # 기본 풀은 무한으로 간주
-        return {}
+        self.inventory = inventory if inventory is not None else get_reward_inventory()
+        self.config = config or get_game_config()
+        snapshot = self.config.current
+        self.rules = snapshot.rules_for(type(self))
+        self.config_version = snapshot.version
+        self.rng = rng or get_rng_provider()
+        self._sampler: Optional[Tuple[type, RarityTable]] = None
+
+    @property
+    def rarity_table(self) -> List[Tuple[str, float]]:
+        """현재 설정 버전의 확률 테이블"""
+        return list(self.rules.RARITY_TABLE)
+
+    @property
+    def reward_pool(self) -> Dict[str, int]:
+        """남은 보상 재고 (비어 있으면 무제한)"""
+        return self.inventory.stock()
+
+    @reward_pool.setter
+    def reward_pool(self, pool: Dict[str, int]) -> None:
+        self.inventory.set_stock(pool)
+
+    @property
+    def sampler(self) -> RarityTable:
+        """현재 ``rarity_table``을 컴파일한 알리아스 테이블 (설정별로 한 번만 생성)"""
+        rules = self.rules
+        if self._sampler is None or self._sampler[0] is not rules:
+            # 설정 값은 불변 튜플이므로 compile_rarity_table 캐시를 그대로 쓴다
+            compiled = compile_rarity_table(rules.RARITY_TABLE, rules.HISTORY_PENALTY, rules.FALLBACK_RARITY)
+            self._sampler = (rules, compiled)
+        return self._sampler[1]
 
     def get_config(self) -> dict:
         """현재 설정 정보를 반환"""
         return {"rarity_table": self.rarity_table, "reward_pool": self.reward_pool}
 
     def update_config(self, *, rarity_table: List[Tuple[str, float]] | None = None, reward_pool: Dict[str, int] | None = None) -> None:
-        """확률 테이블 및 보상 풀을 업데이트"""
+        """확률 테이블 및 보상 풀을 업데이트 (확률 테이블은 새 설정 버전으로 게시)
+
+        Raises:
+            ValueError: 확률 테이블이 유효하지 않을 때
+        """
         if rarity_table is not None:
-            self.rarity_table = rarity_table
+            snapshot = self.config.update({self.CONFIG_KEY: {"RARITY_TABLE": rarity_table}}, source="gacha.update_config")
+            self.rules = snapshot.rules_for(type(self))
+            self.config_version = snapshot.version
         if reward_pool is not None:
             self.reward_pool = reward_pool
 
     def pull(self, user_id: int, count: int, db: Session) -> GachaPullResult:
-        """가챠 뽑기를 수행."""
+        """가챠 뽑기를 수행.
+
+        비용 차감, 천장/히스토리 갱신, 액션 기록은 하나의 트랜잭션으로 정산된다.
+        """
+        pulls, cost = self._price(user_id, count)
+        settled = self.settlement.settle(
+            db, user_id, "GACHA_PULL", cost, lambda: self._resolve(user_id, pulls, db)
+        )
+        if settled is None:
+            raise ValueError("토큰이 부족합니다.")
+        return self._result(user_id, cost, settled)
+
+    def _price(self, user_id: int, count: int) -> Tuple[int, int]:
+        """뽑기 횟수(1 또는 10)와 비용을 결정."""
         pulls = 10 if count >= 10 else 1
-        cost = 450 if pulls == 10 else 50
+        cost = self.rules.TEN_PULL_COST if pulls == 10 else self.rules.SINGLE_PULL_COST
         self.logger.info("Deducting %s tokens from user %s", cost, user_id)
-        
-        deducted_tokens = self.token_service.deduct_tokens(user_id, cost)
-        if deducted_tokens is None:
-            raise ValueError("토큰이 부족합니다.")
+        return pulls, cost
 
-        results: List[str] = []
-        current_count = self.repo.get_gacha_count(user_id)
-        history = self.repo.get_gacha_history(user_id)
+    def _result(self, user_id: int, cost: int, settled: Settlement) -> GachaPullResult:
+        results = settled.outcome.detail
+        self.logger.debug(
+            "User %s gacha results %s, balance %s", user_id, results, settled.balance
+        )
+        return GachaPullResult(results, -cost, settled.balance)
+
+    def _resolve(self, user_id: int, pulls: int, db: Optional[Session] = None) -> GameOutcome:
+        """천장과 최근 히스토리를 반영해 뽑기 결과를 결정."""
+        count, history = self.repo.get_gacha_count(user_id), self.repo.get_gacha_history(user_id)
+        stream = self.rng.stream(self.CONFIG_KEY, user_id)
+        draw = self.draw(pulls, count, history, db, stream.random)
+        audit = stream.record(
+            config_version=self.config_version, pulls=pulls, count=count, history=history, results=draw.results
+        )
+        # 천장/히스토리는 정산이 커밋된 뒤에 저장된다
+        return GameOutcome(detail=draw.results, gacha_count=draw.count, gacha_history=draw.history, audit=audit)
+
+    def draw(
+        self,
+        pulls: int,
+        count: int = 0,
+        history: Optional[List[str]] = None,
+        db: Optional[Session] = None,
+        rand: Optional[Callable[[], float]] = None,
+    ) -> GachaDraw:
+        """
+        Resolve ``pulls`` pulls against the shared reward inventory.
 
-        rarity_table = self.rarity_table
+        The pulls are drawn as if stock were unlimited and everything drawn
+        is reserved in one batch. Only if some rarity runs short are the
+        same random numbers replayed with the granted units as budget, so
+        the results are exactly those of taking stock pull by pull; unused
+        units are released again.
+
+        Args:
+            pulls (int): Number of pulls
+            count (int): Pity counter before the first pull
+            history (Optional[List[str]]): Recent results, newest first
+            db (Optional[Session]): Transaction the reservation joins
+            rand (Optional[Callable[[], float]]): Uniform [0, 1) source, one
+                value per pull; defaults to ``random.random``
+
+        Returns:
+            GachaDraw: Results plus the pity counter and history after the last pull
+        """
+        rand = rand or random.random
+        if not self.inventory.limited():
+            return self.pull_many(pulls, count, history, rand)
+        return self._draw_limited(pulls, count, history, db, rand)
+
+    def _draw_limited(
+        self,
+        pulls: int,
+        count: int,
+        history: Optional[List[str]],
+        db: Optional[Session],
+        rand: Callable[[], float],
+    ) -> GachaDraw:
+        """``draw`` against a limited inventory: reserve, and replay on shortage."""
+        uniforms = [rand() for _ in range(pulls)]
+        draw = self.pull_many(pulls, count, history, iter(uniforms).__next__)
+        wanted = Counter(draw.results)
+        granted = self.inventory.reserve(wanted, db)
+        if all(granted.get(rarity, 0) == units for rarity, units in wanted.items()):
+            return draw
+
+        budget = dict(granted)
+        sold_out = {rarity for rarity, units in wanted.items() if granted.get(rarity, 0) < units}
+
+        def claim(rarity: str) -> bool:
+            if budget.get(rarity, 0) > 0:
+                budget[rarity] -= 1
+                return True
+            # 대체 결과로 히스토리가 바뀌어 처음보다 더 뽑힌 등급은 재고를 더 예약
+            if rarity not in sold_out and self.inventory.reserve({rarity: 1}, db).get(rarity):
+                return True
+            sold_out.add(rarity)
+            return False
+
+        draw = self.pull_many(pulls, count, history, iter(uniforms).__next__, claim)
+        self.inventory.release(budget, db)
+        return draw
+
+    def pull_many(
+        self,
+        pulls: int,
+        count: int = 0,
+        history: Optional[List[str]] = None,
+        rand: Optional[Callable[[], float]] = None,
+        claim: Optional[Callable[[str], bool]] = None,
+    ) -> GachaDraw:
+        """
+        Resolve ``pulls`` pulls from a pity counter and recent history.
+
+        Touches no repository or database, so it serves 10-pulls and bulk
+        simulations alike. Each pull is one O(1) draw from the alias table
+        for the current history state.
+
+        Args:
+            pulls (int): Number of pulls
+            count (int): Pity counter before the first pull
+            history (Optional[List[str]]): Recent results, newest first
+            rand (Optional[Callable[[], float]]): Uniform [0, 1) source, defaults to ``random.random``
+            claim (Optional[Callable[[str], bool]]): Takes one unit of a
+                rarity's stock; a rarity it refuses becomes ``FALLBACK_RARITY``.
+                None means unlimited stock.
+
+        Returns:
+            GachaDraw: Results plus the pity counter and history after the last pull
+        """
+        sampler = self.sampler
+        tables, variant, bits = sampler.tables, sampler.variant, sampler.bits
+        rand = rand or random.random
+        rules = self.rules
+        recent = deque((history or [])[: rules.HISTORY_SIZE], maxlen=rules.HISTORY_SIZE)
+        # 히스토리 안의 등급별 개수로 mask를 갱신해 매번 히스토리를 훑지 않는다
+        seen: Dict[str, int] = {}
+        for name in recent:
+            seen[name] = seen.get(name, 0) + 1
+        mask = sampler.mask(seen)
+        results: List[str] = []
 
         for _ in range(pulls):
-            current_count += 1
-            pity = current_count >= 90
-            rnd = random.random()
-            cumulative = 0.0
-            rarity = "Common"
-            for name, prob in rarity_table:
-                adj_prob = prob
-                if history and name in history:
-                    adj_prob *= 0.5
-                cumulative += adj_prob
-                if rnd <= cumulative:
-                    rarity = name
-                    break
-            if pity and rarity not in {"Epic", "Legendary"}:
-                rarity = "Epic"
-                current_count = 0
-            if self.reward_pool:
-                available = self.reward_pool.get(rarity, 0)
-                if available <= 0:
-                    rarity = "Common"
-                else:
-                    self.reward_pool[rarity] = available - 1
+            count += 1
+            # AliasTable.draw를 인라인: 10연차/대량 시뮬레이션의 핫 루프
+            table = tables[mask] or variant(mask)
+            x = rand() * len(table.prob)
+            column = int(x)
+            rarity = table.outcomes[column] if x - column < table.prob[column] else table.alias_outcomes[column]
+            if count >= rules.PITY_THRESHOLD and rarity not in rules.PITY_RARITIES:
+                rarity = rules.PITY_RARITY
+                count = 0
+            if claim is not None and not claim(rarity):
+                rarity = rules.FALLBACK_RARITY
             results.append(rarity)
-            history.insert(0, rarity)
-            history = history[:10]
 
-        self.repo.set_gacha_count(user_id, current_count)
-        self.repo.set_gacha_history(user_id, history)
+            if len(recent) == rules.HISTORY_SIZE:
+                evicted = recent.pop()
+                seen[evicted] -= 1
+                if not seen[evicted]:
+                    mask &= ~bits.get(evicted, 0)
+            recent.appendleft(rarity)
+            seen[rarity] = seen.get(rarity, 0) + 1
+            mask |= bits.get(rarity, 0)
 
-        balance = self.token_service.get_token_balance(user_id)
-        self.repo.record_action(db, user_id, "GACHA_PULL", -cost)
-        self.logger.debug(
-            "User %s gacha results %s, balance %s", user_id, results, balance
+        return GachaDraw(results, count, list(recent))
+
+
+class AsyncGachaService(GachaService):
+    """``GachaService`` on an ``AsyncSession``; database round trips are awaited."""
+
+    def __init__(
+        self,
+        repository: AsyncGameRepository | None = None,
+        token_service: AsyncTokenService | None = None,
+        settlement: AsyncSettlementService | None = None,
+        inventory: RewardInventory | None = None,
+        config: GameConfigRegistry | None = None,
+        rng: RngProvider | None = None,
+    ) -> None:
+        repository = repository or AsyncGameRepository()
+        token_service = token_service or AsyncTokenService(None, repository)
+        super().__init__(
+            repository,
+            token_service,
+            settlement=settlement or AsyncSettlementService(repository, token_service),
+            inventory=inventory,
+            config=config,
+            rng=rng,
+        )
+
+    async def pull(self, user_id: int, count: int, db: AsyncSession) -> GachaPullResult:
+        """가챠 뽑기를 수행 (비동기 세션)."""
+        pulls, cost = self._price(user_id, count)
+        settled = await self.settlement.settle(
+            db, user_id, "GACHA_PULL", cost, lambda: self._resolve_async(user_id, pulls, db)
+        )
+        if settled is None:
+            raise ValueError("토큰이 부족합니다.")
+        return self._result(user_id, cost, settled)
+
+    async def _resolve_async(self, user_id: int, pulls: int, db: AsyncSession) -> GameOutcome:
+        # 가챠 상태(GameStateBackend)와 재고 설정 조회는 동기 I/O일 수 있으므로 스레드풀에서 실행
+        limited = await run_in_threadpool(self.inventory.limited)
+        if not limited:
+            return await run_in_threadpool(self._resolve, user_id, pulls)
+        count, history = await run_in_threadpool(
+            lambda: (self.repo.get_gacha_count(user_id), self.repo.get_gacha_history(user_id))
+        )
+        stream = self.rng.stream(self.CONFIG_KEY, user_id)
+        # 재고 예약만 같은 트랜잭션 안에서 run_sync로 실행 (세션 연결은 비동기 드라이버)
+        draw = await db.run_sync(lambda session: self._draw_limited(pulls, count, history, session, stream.random))
+        audit = stream.record(
+            config_version=self.config_version, pulls=pulls, count=count, history=history, results=draw.results
         )
-        return GachaPullResult(results, -cost, balance)
+        return GameOutcome(detail=draw.results, gacha_count=draw.count, gacha_history=draw.history, audit=audit)
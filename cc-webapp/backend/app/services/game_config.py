@@ -0,0 +1,422 @@
+"""Versioned, hot-swappable game rule configuration.
+
+Each configurable service class declares a ``CONFIG_KEY`` and keeps its
+defaults as upper-case class constants (``SlotService.JACKPOT_PROB``, ...).
+A ``GameConfig`` snapshot holds validated overrides of those constants per
+key, and ``rules_for(SlotService)`` returns a subclass with the overrides
+applied (``tuned``), which services read instead of ``self``. The
+simulator takes the same rule classes, so it can replay any published
+version.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..repositories.game_config_store import SQLGameConfigStore
+
+logger = logging.getLogger(__name__)
+
+# 기존 환경 변수 → (설정 키, 상수 이름)
+LEGACY_ENV = {
+    "GACHA_RARITY_TABLE": ("gacha", "RARITY_TABLE"),
+    "SEGMENT_PROB_ADJUST_JSON": ("segments", "SEGMENT_PROB_ADJUST"),
+    "HOUSE_EDGE_JSON": ("segments", "HOUSE_EDGE"),
+}
+
+# 이 접미사로 끝나는 상수는 확률이므로 [0, 1] 범위여야 한다
+PROBABILITY_SUFFIXES = ("_PROB", "HOUSE_EDGE", "RARITY_TABLE")
+NON_NEGATIVE_SUFFIXES = ("_BET", "_COST", "_PAYOUT", "MULTIPLIER", "MULTIPLIERS", "_THRESHOLD", "_SIZE")
+
+
+class ConfigVersionConflict(ValueError):
+    """Raised when an update was based on a version that is no longer current."""
+
+
+def tuned(rules: type, **overrides: Any) -> type:
+    """
+    Return a subclass of a service class with some rule constants replaced.
+
+    Example: ``tuned(SlotService, JACKPOT_PROB=0.02)``.
+
+    Raises:
+        ValueError: If an override does not name an existing constant
+    """
+    unknown = [name for name in overrides if not hasattr(rules, name)]
+    if unknown:
+        raise ValueError(f"Unknown {rules.__name__} rule(s): {', '.join(unknown)}")
+    return type(rules.__name__, (rules,), overrides)
+
+
+def rule_classes() -> Dict[str, type]:
+    """Configurable service classes by ``CONFIG_KEY``."""
+    # 서비스 모듈이 이 모듈을 import하므로 지연 import
+    from .adult_content_service import AdultContentService
+    from .gacha_service import GachaService
+    from .roulette_service import RouletteService
+    from .rps_service import RPSService
+    from .slot_service import SlotService
+    from .user_segment_service import UserSegmentService
+
+    classes = (SlotService, RouletteService, GachaService, RPSService, UserSegmentService, AdultContentService)
+    return {cls.CONFIG_KEY: cls for cls in classes}
+
+
+def _coerce(default: Any, value: Any, name: str) -> Any:
+    """Convert ``value`` to the shape of ``default``; collections become immutable."""
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} must be a boolean")
+        return value
+    if isinstance(default, int) and not isinstance(default, bool):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+            raise ValueError(f"{name} must be an integer")
+        return int(value)
+    if isinstance(default, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"{name} must be a finite number")
+        return float(value)
+    if isinstance(default, str):
+        return str(value)
+    if isinstance(default, Mapping):
+        if not isinstance(value, Mapping):
+            raise ValueError(f"{name} must be an object")
+        sample = next(iter(default.values()), 0.0)
+        return MappingProxyType({str(k): _coerce(sample, v, f"{name}.{k}") for k, v in value.items()})
+    if isinstance(default, (frozenset, set)):
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            raise ValueError(f"{name} must be a list")
+        sample = next(iter(default), 0)
+        return frozenset(_coerce(sample, v, name) for v in value)
+    if isinstance(default, (list, tuple)):
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{name} must be a list")
+        if default and len({type(item) for item in default}) > 1:
+            # ("Legendary", 0.005) 같은 고정 길이 레코드는 위치별로 변환
+            if len(value) != len(default):
+                raise ValueError(f"{name} must have {len(default)} items")
+            return tuple(_coerce(d, v, f"{name}[{i}]") for i, (d, v) in enumerate(zip(default, value)))
+        sample = default[0] if default else 0.0
+        return tuple(_coerce(sample, v, f"{name}[{i}]") for i, v in enumerate(value))
+    raise ValueError(f"{name} is not configurable")
+
+
+def _numbers(value: Any):
+    if isinstance(value, Mapping):
+        for item in value.values():
+            yield from _numbers(item)
+    elif isinstance(value, (tuple, frozenset)):
+        for item in value:
+            yield from _numbers(item)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield value
+
+
+def _check_range(name: str, value: Any) -> None:
+    if name.endswith(PROBABILITY_SUFFIXES):
+        if any(not 0.0 <= number <= 1.0 for number in _numbers(value)):
+            raise ValueError(f"{name} values must be probabilities in [0, 1]")
+    elif name.endswith(NON_NEGATIVE_SUFFIXES):
+        if any(number < 0 for number in _numbers(value)):
+            raise ValueError(f"{name} values must not be negative")
+    if name == "RARITY_TABLE":
+        if not value or sum(prob for _, prob in value) > 1.0 + 1e-9:
+            raise ValueError("RARITY_TABLE must be non-empty and sum to at most 1")
+
+
+def validate_rules(rules: Mapping[str, Mapping[str, Any]]) -> Dict[str, Mapping[str, Any]]:
+    """
+    Check and normalise rule overrides.
+
+    Args:
+        rules (Mapping[str, Mapping[str, Any]]): ``{config key: {CONSTANT: value}}``
+
+    Returns:
+        Dict[str, Mapping[str, Any]]: Immutable overrides, coerced to the defaults' types
+
+    Raises:
+        ValueError: Unknown key or constant, wrong type or out-of-range value
+    """
+    classes = rule_classes()
+    validated: Dict[str, Mapping[str, Any]] = {}
+    for key, overrides in rules.items():
+        cls = classes.get(key)
+        if cls is None:
+            raise ValueError(f"Unknown game config key: {key}")
+        if not isinstance(overrides, Mapping):
+            raise ValueError(f"{key} must be an object")
+        values = {}
+        for name, value in overrides.items():
+            if name == "CONFIG_KEY" or not name.isupper() or not hasattr(cls, name):
+                raise ValueError(f"Unknown {key} rule: {name}")
+            values[name] = _coerce(getattr(cls, name), value, f"{key}.{name}")
+            _check_range(name, values[name])
+        if values:
+            validated[key] = MappingProxyType(values)
+    return validated
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, frozenset):
+        return sorted(value)
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """One immutable, validated version of the game rules."""
+
+    version: int
+    rules: Mapping[str, Mapping[str, Any]]
+    source: str
+    created_at: datetime
+    # 서비스 클래스별 규칙 클래스 (스냅샷이 불변이므로 만들어 두고 재사용)
+    _classes: Dict[type, type] = field(default_factory=dict, repr=False, compare=False)
+
+    def rules_for(self, cls: type) -> type:
+        """``cls`` with this version's overrides for ``cls.CONFIG_KEY`` applied."""
+        rules = self._classes.get(cls)
+        if rules is None:
+            overrides = self.rules.get(cls.CONFIG_KEY)
+            rules = self._classes[cls] = tuned(cls, **overrides) if overrides else cls
+        return rules
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "created_at": self.created_at.isoformat(),
+            "rules": _plain(self.rules),
+        }
+
+
+def env_rules() -> Dict[str, Dict[str, Any]]:
+    """Overrides from the legacy environment variables; invalid values are logged and skipped."""
+    rules: Dict[str, Dict[str, Any]] = {}
+    for env, (key, name) in LEGACY_ENV.items():
+        value = os.getenv(env)
+        if not value:
+            continue
+        try:
+            candidate = {key: {name: json.loads(value)}}
+            validate_rules(candidate)
+        except ValueError as e:  # JSONDecodeError 포함
+            logger.error("Invalid %s: %s", env, e)
+            continue
+        rules.setdefault(key, {})[name] = candidate[key][name]
+    return rules
+
+
+class GameConfigRegistry:
+    """Holds the current ``GameConfig``; readers never take a lock.
+
+    ``current`` is a plain attribute read. Publishing validates a complete
+    new snapshot first and then swaps the reference under a writer lock, so
+    a reader sees either the old or the new version, never a mix. Services
+    read it once at construction (once per request).
+
+    Sources, lowest first: service class defaults, the legacy environment
+    variables, the JSON file at ``path`` (re-read by ``reload`` when its
+    modification time changes) and admin updates.
+
+    Without a ``store`` every version lives in this process only. With one
+    (``GAME_CONFIG_BACKEND=sql``) each publish is appended to the shared
+    store first and its version number comes from there, so all workers
+    agree on what version N means; ``reload`` (the poll job) adopts versions
+    other workers published, and a restarted worker starts from the latest
+    stored version instead of re-publishing the file.
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        path: Optional[str] = None,
+        source: str = "defaults",
+        store: Optional["SQLGameConfigStore"] = None,
+    ) -> None:
+        self.path = path
+        self.store = store
+        self._base = validate_rules(rules or {})
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self.current = GameConfig(1, MappingProxyType(dict(self._base)), source, datetime.utcnow())
+
+    @classmethod
+    def from_env(cls) -> "GameConfigRegistry":
+        """Registry over the legacy environment variables, ``GAME_CONFIG_FILE`` and ``GAME_CONFIG_BACKEND``."""
+        store = None
+        if os.getenv("GAME_CONFIG_BACKEND", "memory").lower() == "sql":
+            from ..repositories.game_config_store import SQLGameConfigStore
+
+            store = SQLGameConfigStore()
+        registry = cls(env_rules(), os.getenv("GAME_CONFIG_FILE") or None, "env", store)
+        try:
+            registry.reload()
+        except ValueError as exc:
+            logger.error("Ignoring invalid game config from %s: %s", registry.path or "store", exc)
+        except Exception:
+            logger.exception("Game config store unavailable; starting from local config")
+        return registry
+
+    def _adopt(self, row: Any) -> Optional[GameConfig]:
+        # 호출자가 _lock을 잡고 있어야 한다
+        if row is None or row.version <= self.current.version:
+            return None
+        self.current = GameConfig(
+            row.version, MappingProxyType(validate_rules(row.rules)), row.source, row.created_at or datetime.utcnow()
+        )
+        logger.info("Adopted game config version %s from %s", row.version, row.source)
+        return self.current
+
+    def sync(self) -> Optional[GameConfig]:
+        """
+        Adopt the latest version in the shared store if it is newer than ours.
+
+        Returns:
+            Optional[GameConfig]: The adopted version, or None without a store
+            or when already current
+
+        Raises:
+            ValueError: The stored rules no longer validate
+        """
+        if self.store is None:
+            return None
+        row = self.store.latest()
+        with self._lock:
+            return self._adopt(row)
+
+    def _swap(
+        self,
+        build: Callable[[Mapping[str, Mapping[str, Any]]], Mapping[str, Mapping[str, Any]]],
+        source: str,
+        expected_version: Optional[int],
+    ) -> GameConfig:
+        with self._lock:
+            while True:
+                if self.store is not None:
+                    self._adopt(self.store.latest())
+                if expected_version is not None and expected_version != self.current.version:
+                    raise ConfigVersionConflict(
+                        f"game config is at version {self.current.version}, not {expected_version}"
+                    )
+                rules = build(self.current.rules)
+                version = self.current.version + 1
+                if self.store is not None:
+                    if source == self.current.source and _plain(rules) == _plain(self.current.rules):
+                        # 다른 워커가 같은 파일 변경을 이미 게시함
+                        return self.current
+                    if not self.store.append(version, _plain(rules), source):
+                        continue  # 다른 워커가 먼저 이 버전을 게시 — 최신을 받아 다시 시도
+                self.current = GameConfig(version, MappingProxyType(dict(rules)), source, datetime.utcnow())
+                logger.info("Published game config version %s from %s", version, source)
+                return self.current
+
+    def publish(
+        self,
+        rules: Mapping[str, Mapping[str, Any]],
+        source: str = "admin",
+        expected_version: Optional[int] = None,
+    ) -> GameConfig:
+        """
+        Replace every override above the environment defaults with ``rules``.
+
+        Args:
+            rules (Mapping[str, Mapping[str, Any]]): ``{config key: {CONSTANT: value}}``
+            source (str): Recorded on the new version
+            expected_version (Optional[int]): Reject the change unless this is
+                still the current version (compare-and-swap)
+
+        Returns:
+            GameConfig: The new current version
+
+        Raises:
+            ValueError: Invalid rules
+            ConfigVersionConflict: ``expected_version`` is stale
+        """
+        validated = validate_rules(rules)
+        merged = {key: MappingProxyType({**self._base.get(key, {}), **validated.get(key, {})})
+                  for key in {*self._base, *validated}}
+        return self._swap(lambda current: merged, source, expected_version)
+
+    def update(
+        self,
+        rules: Mapping[str, Mapping[str, Any]],
+        source: str = "admin",
+        expected_version: Optional[int] = None,
+    ) -> GameConfig:
+        """Like ``publish`` but keeps current overrides not named in ``rules``."""
+        validated = validate_rules(rules)
+
+        def merge(current: Mapping[str, Mapping[str, Any]]) -> Dict[str, Mapping[str, Any]]:
+            return {key: MappingProxyType({**current.get(key, {}), **validated.get(key, {})})
+                    for key in {*current, *validated}}
+
+        return self._swap(merge, source, expected_version)
+
+    def reload(self, force: bool = False) -> Optional[GameConfig]:
+        """
+        Publish the rules in ``path`` if the file changed since the last load,
+        otherwise adopt any newer version from the shared store.
+
+        Returns:
+            Optional[GameConfig]: The new version, or None if nothing changed
+
+        Raises:
+            ValueError: The file is not a valid rules document (the current
+                version stays in place)
+        """
+        if not self.path:
+            return self.sync()
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError as exc:
+            logger.warning("Game config file %s unavailable: %s", self.path, exc)
+            return self.sync()
+        if not force and mtime == self._mtime:
+            return self.sync()
+        if not force and self._mtime is None and self.store is not None:
+            adopted = self.sync()
+            if self.current.version > 1:
+                # 저장소에 이미 버전이 있으면 관리자 변경을 덮어쓰지 않도록 파일은 다음 변경부터 반영
+                self._mtime = mtime
+                return adopted
+        # 잘못된 파일도 한 번만 보고하도록 먼저 기록
+        self._mtime = mtime
+        with open(self.path, encoding="utf-8") as handle:
+            try:
+                rules = json.load(handle)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"invalid JSON: {exc}") from exc
+        if not isinstance(rules, Mapping):
+            raise ValueError("game config file must contain a JSON object")
+        return self.publish(rules, source=f"file:{self.path}")
+
+
+_default_registry: Optional[GameConfigRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_game_config() -> GameConfigRegistry:
+    """Return the process-wide registry, built from the environment on first use."""
+    global _default_registry
+    if _default_registry is None:
+        with _default_lock:
+            if _default_registry is None:
+                _default_registry = GameConfigRegistry.from_env()
+    return _default_registry
+
+
+def reload_game_config() -> Optional[GameConfig]:
+    """Re-read ``GAME_CONFIG_FILE`` and the shared store if the default registry exists."""
+    return _default_registry.reload() if _default_registry is not None else None
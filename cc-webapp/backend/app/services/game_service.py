@@ -1,13 +1,18 @@
 from typing import Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..repositories.game_repository import GameRepository
+from ..repositories.game_repository import AsyncGameRepository, GameRepository
 from .. import models
-from .slot_service import SlotService, SlotSpinResult
-from .roulette_service import RouletteService, RouletteSpinResult
-from .gacha_service import GachaService, GachaPullResult
-from .rps_service import RPSService, RPSResult
+from .slot_service import AsyncSlotService, SlotService, SlotSpinResult
+from .roulette_service import AsyncRouletteService, RouletteService, RouletteSpinResult
+from .gacha_service import AsyncGachaService, GachaService, GachaPullResult
+from .rps_service import AsyncRPSService, RPSService, RPSResult
+from .game_config import GameConfigRegistry
+from ..utils.game_rng import RngProvider
+from .settlement_service import AsyncSettlementService, SettlementService
+from .token_service import AsyncTokenService, TokenService
 
 
 class GameService:
@@ -16,17 +21,30 @@ class GameService:
     위임 패턴을 통해 구체적인 게임 로직은 각 특화된 서비스 클래스에 위임합니다.
     """
 
-    def __init__(self, repository: "GameRepository | None" = None):
+    def __init__(
+        self,
+        repository: "GameRepository | None" = None,
+        config: "GameConfigRegistry | None" = None,
+        rng: "RngProvider | None" = None,
+    ):
         """게임 서비스 초기화.
 
+        DB 세션은 호출마다 받으므로 요청 간에 공유해도 된다.
+        네 게임이 토큰/정산 서비스 하나를 함께 쓴다.
+
         Args:
             repository: 게임 레포지토리. 없으면 새로 생성됨
+            config: 게임 설정 레지스트리. 없으면 프로세스 기본값
+            rng: 판별 난수 스트림 제공자. 없으면 프로세스 기본값
         """
         self.repo = repository or GameRepository()
-        self.slot_service = SlotService(self.repo)
-        self.roulette_service = RouletteService(self.repo)
-        self.gacha_service = GachaService(self.repo)
-        self.rps_service = RPSService(self.repo)
+        tokens = TokenService(None, self.repo)
+        settlement = SettlementService(self.repo, tokens)
+        shared = dict(token_service=tokens, settlement=settlement, config=config, rng=rng)
+        self.slot_service = SlotService(self.repo, **shared)
+        self.roulette_service = RouletteService(self.repo, **shared)
+        self.gacha_service = GachaService(self.repo, **shared)
+        self.rps_service = RPSService(self.repo, **shared)
 
     def slot_spin(self, user_id: int, db: Session) -> SlotSpinResult:
         """슬롯 게임 스핀을 실행.
@@ -88,3 +106,44 @@ class GameService:
         """
         return self.rps_service.play(user_id, choice, bet_amount, db)
 
+
+class AsyncGameService(GameService):
+    """``GameService`` on an ``AsyncSession`` (``DB_ASYNC=1``).
+
+    Same interface as ``GameService`` but every game method is a coroutine, so
+    DB round trips no longer block the event loop.
+    """
+
+    def __init__(
+        self,
+        repository: "AsyncGameRepository | None" = None,
+        config: "GameConfigRegistry | None" = None,
+        rng: "RngProvider | None" = None,
+    ):
+        self.repo = repository or AsyncGameRepository()
+        tokens = AsyncTokenService(None, self.repo)
+        settlement = AsyncSettlementService(self.repo, tokens)
+        shared = dict(token_service=tokens, settlement=settlement, config=config, rng=rng)
+        self.slot_service = AsyncSlotService(self.repo, **shared)
+        self.roulette_service = AsyncRouletteService(self.repo, **shared)
+        self.gacha_service = AsyncGachaService(self.repo, **shared)
+        self.rps_service = AsyncRPSService(self.repo, **shared)
+
+    async def slot_spin(self, user_id: int, db: AsyncSession) -> SlotSpinResult:
+        return await self.slot_service.spin(user_id, db)
+
+    async def roulette_spin(
+        self,
+        user_id: int,
+        bet: int,
+        bet_type: str,
+        value: Optional[str],
+        db: AsyncSession,
+    ) -> RouletteSpinResult:
+        return await self.roulette_service.spin(user_id, bet, bet_type, value, db)
+
+    async def gacha_pull(self, user_id: int, count: int, db: AsyncSession) -> GachaPullResult:
+        return await self.gacha_service.pull(user_id, count, db)
+
+    async def rps_play(self, user_id: int, choice: str, bet_amount: int, db: AsyncSession) -> RPSResult:
+        return await self.rps_service.play(user_id, choice, bet_amount, db)
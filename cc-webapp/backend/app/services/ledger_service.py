@@ -0,0 +1,217 @@
+"""Append-only token ledger with periodic balance snapshots."""
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, exists, func, insert, literal, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LedgerEntry:
+    """A single balance change to append to the ledger."""
+
+    user_id: int
+    amount: int
+    balance_after: int
+    reason: str
+    action_id: Optional[int] = None
+
+
+class LedgerService:
+    """Writes and reads the token ledger.
+
+    Balances are reconstructed from the user's latest snapshot plus the ledger
+    entries appended after it, so reads stay proportional to recent activity.
+    Users without a snapshot fall back to the opening balance implied by their
+    first entry.
+    """
+
+    SNAPSHOT_INTERVAL = 100
+
+    def append(self, db: Session, entries: Iterable[LedgerEntry]) -> None:
+        """
+        Bulk insert ledger entries inside the caller's transaction.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            entries (Iterable[LedgerEntry]): Balance changes to record
+        """
+        now = datetime.utcnow()
+        rows = [{**asdict(entry), "created_at": now} for entry in entries]
+        if rows:
+            db.execute(insert(models.TokenLedgerEntry), rows)
+
+    def get_history(
+        self, db: Session, user_id: int, limit: int = 10, before_id: Optional[int] = None
+    ) -> List[models.TokenLedgerEntry]:
+        """
+        Return the user's most recent ledger entries, newest first.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            user_id (int): User's unique identifier
+            limit (int): Maximum number of entries to return
+            before_id (Optional[int]): Only return entries older than this id
+                (keyset pagination cursor)
+
+        Returns:
+            List[TokenLedgerEntry]: Ledger entries
+        """
+        query = db.query(models.TokenLedgerEntry).filter(models.TokenLedgerEntry.user_id == user_id)
+        if before_id is not None:
+            query = query.filter(models.TokenLedgerEntry.id < before_id)
+        return query.order_by(models.TokenLedgerEntry.id.desc()).limit(limit).all()
+
+    def get_balance(self, db: Session, user_id: int) -> Optional[int]:
+        """
+        Reconstruct a user's balance from the ledger.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            user_id (int): User's unique identifier
+
+        Returns:
+            Optional[int]: Reconstructed balance or None if the user has no ledger history
+        """
+        Entry = models.TokenLedgerEntry
+        snapshot = (
+            db.query(models.TokenBalanceSnapshot)
+            .filter(models.TokenBalanceSnapshot.user_id == user_id)
+            .order_by(models.TokenBalanceSnapshot.last_entry_id.desc())
+            .first()
+        )
+        if snapshot is not None:
+            base, base_id = snapshot.balance, snapshot.last_entry_id
+        else:
+            first = db.query(Entry).filter(Entry.user_id == user_id).order_by(Entry.id.asc()).first()
+            if first is None:
+                return None
+            base, base_id = first.balance_after - first.amount, first.id - 1
+
+        delta = (
+            db.query(func.coalesce(func.sum(Entry.amount), 0))
+            .filter(Entry.user_id == user_id, Entry.id > base_id)
+            .scalar()
+        )
+        return base + int(delta)
+
+    def take_snapshots(self, db: Session, min_entries: Optional[int] = None) -> int:
+        """
+        Checkpoint every user with at least ``min_entries`` entries since their last snapshot.
+
+        Runs as a single ``INSERT ... SELECT`` and never touches ``users``.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            min_entries (Optional[int]): Threshold, defaults to SNAPSHOT_INTERVAL
+
+        Returns:
+            int: Number of snapshots written
+        """
+        Entry, Snapshot = models.TokenLedgerEntry, models.TokenBalanceSnapshot
+        threshold = min_entries or self.SNAPSHOT_INTERVAL
+
+        latest = (
+            select(Snapshot.user_id, func.max(Snapshot.last_entry_id).label("last_entry_id"))
+            .group_by(Snapshot.user_id)
+            .subquery("latest")
+        )
+        pending = (
+            select(Entry.user_id, func.max(Entry.id).label("max_id"))
+            .outerjoin(latest, latest.c.user_id == Entry.user_id)
+            .where(Entry.id > func.coalesce(latest.c.last_entry_id, 0))
+            .group_by(Entry.user_id)
+            .having(func.count(Entry.id) >= threshold)
+            .subquery("pending")
+        )
+        source = select(
+            pending.c.user_id, pending.c.max_id, Entry.balance_after, literal(datetime.utcnow())
+        ).join(Entry, Entry.id == pending.c.max_id)
+        stmt = insert(Snapshot).from_select(
+            ["user_id", "last_entry_id", "balance", "created_at"], source
+        )
+        try:
+            written = db.execute(stmt).rowcount
+            db.commit()
+        except SQLAlchemyError as exc:
+            logger.error("Failed to take token balance snapshots: %s", exc)
+            db.rollback()
+            raise
+        logger.info("Wrote %s token balance snapshots", written)
+        return written
+
+    def reconcile(self, db: Session, user_ids: Optional[Sequence[int]] = None) -> List[dict]:
+        """
+        Compare ledger-reconstructed balances with ``users.cyber_token_balance``.
+
+        Plain reads only, so it can run against a replica or alongside live
+        traffic without locking ``users``.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            user_ids (Optional[Sequence[int]]): Restrict the check to these users
+
+        Returns:
+            List[dict]: One ``{"user_id", "ledger_balance", "account_balance"}``
+            row per mismatching user
+        """
+        Entry, Snapshot, User = models.TokenLedgerEntry, models.TokenBalanceSnapshot, models.User
+
+        latest = (
+            select(Snapshot.user_id, func.max(Snapshot.last_entry_id).label("last_entry_id"))
+            .group_by(Snapshot.user_id)
+            .subquery("latest")
+        )
+        from_snapshot = (
+            select(
+                Snapshot.user_id,
+                func.max(Snapshot.balance).label("base"),
+                Snapshot.last_entry_id.label("base_id"),
+            )
+            .join(
+                latest,
+                and_(
+                    latest.c.user_id == Snapshot.user_id,
+                    latest.c.last_entry_id == Snapshot.last_entry_id,
+                ),
+            )
+            .group_by(Snapshot.user_id, Snapshot.last_entry_id)
+        )
+        first = select(Entry.user_id, func.min(Entry.id).label("first_id")).group_by(Entry.user_id).subquery("first")
+        from_opening = (
+            select(
+                Entry.user_id,
+                (Entry.balance_after - Entry.amount).label("base"),
+                (Entry.id - 1).label("base_id"),
+            )
+            .join(first, first.c.first_id == Entry.id)
+            .where(~exists().where(Snapshot.user_id == Entry.user_id))
+        )
+        base = union_all(from_snapshot, from_opening).subquery("base")
+
+        delta = (
+            select(func.coalesce(func.sum(Entry.amount), 0))
+            .where(Entry.user_id == base.c.user_id, Entry.id > base.c.base_id)
+            .correlate(base)
+            .scalar_subquery()
+        )
+        ledger_balance = (base.c.base + delta).label("ledger_balance")
+        account_balance = func.coalesce(User.cyber_token_balance, 0).label("account_balance")
+        query = (
+            select(base.c.user_id, ledger_balance, account_balance)
+            .join(User, User.id == base.c.user_id)
+            .where(base.c.base + delta != func.coalesce(User.cyber_token_balance, 0))
+            .order_by(base.c.user_id)
+        )
+        if user_ids is not None:
+            query = query.where(base.c.user_id.in_(list(user_ids)))
+
+        return [dict(row._mapping) for row in db.execute(query)]
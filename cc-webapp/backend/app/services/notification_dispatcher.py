@@ -0,0 +1,230 @@
+"""Push delivery of pending notifications over WebSocket."""
+
+import asyncio
+import json
+import logging
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.notification_service import NotificationService
+from app.websockets.chat import WebSocketManager, manager
+
+logger = logging.getLogger(__name__)
+
+
+def notification_payload(notifications: List[models.Notification]) -> str:
+    """Serialize a batch as one WebSocket frame."""
+    return json.dumps(
+        {
+            "type": "notifications",
+            "items": [
+                {
+                    "id": n.id,
+                    "message": n.message,
+                    "created_at": n.created_at.isoformat() if n.created_at else None,
+                    "sent_at": n.sent_at.isoformat() if n.sent_at else None,
+                }
+                for n in notifications
+            ],
+        }
+    )
+
+
+class NotificationDispatcher:
+    """
+    Claims pending notifications in batches and pushes them to users' sockets.
+
+    Only users with a socket on this worker are claimed for, so workers never
+    compete for the same user; claims themselves use ``SKIP LOCKED`` so a
+    concurrent long-poll is also safe. ``wake(user_id)`` triggers an immediate
+    dispatch for that user (and wakes its long-poll waiters); otherwise all
+    local users are swept every ``interval`` seconds, which also picks up
+    notifications created on other workers.
+
+    Delivery is at-least-once up to the socket write: notifications whose
+    frame could not be queued, or was queued but dropped before being written
+    (slow-consumer eviction, disconnect, failed send), are released back to
+    pending for the long-poll or the next connection. A frame written to the
+    socket counts as delivered, and frames routed to another worker over the
+    relay are at-most-once.
+    """
+
+    def __init__(
+        self,
+        manager: WebSocketManager,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: int = NotificationService.DEFAULT_BATCH_SIZE,
+        interval: float = 5.0,
+    ):
+        """
+        Args:
+            manager (WebSocketManager): Connection registry used for pushes
+            session_factory (Optional[Callable[[], Session]]): Session factory, defaults to SessionLocal
+            batch_size (int): Rows claimed per query
+            interval (float): Seconds between sweeps over all connected users
+        """
+        self.manager = manager
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self._woken: Set[int] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._waiters: Dict[int, Set[asyncio.Event]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._releases: Set[asyncio.Task] = set()
+        self.stats = {"pushed": 0, "batches": 0, "released": 0}
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from app.database import SessionLocal
+
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.gather(*self._releases, return_exceptions=True)
+
+    def wake(self, user_id: int) -> None:
+        """Request immediate delivery for ``user_id``. Safe to call from worker threads."""
+        self.wake_many((user_id,))
+
+    def wake_many(self, user_ids: Iterable[int]) -> None:
+        """Like ``wake`` for many users; only users with a local socket or waiter are kept."""
+        interested = set(self.manager.local_users()).union(self._waiters)
+        user_ids = [user_id for user_id in user_ids if user_id in interested]
+        if not user_ids:
+            return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake(user_ids)
+        else:
+            # 동기 엔드포인트(스레드풀)에서 호출된 경우
+            loop.call_soon_threadsafe(self._wake, user_ids)
+
+    def _wake(self, user_ids: List[int]) -> None:
+        self._woken.update(user_ids)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        for user_id in user_ids:
+            for waiter in self._waiters.get(user_id, ()):
+                waiter.set()
+
+    async def wait_for(self, user_id: int, timeout: float) -> bool:
+        """Wait until ``wake(user_id)`` or ``timeout``; used by the long-poll endpoint."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        waiter = asyncio.Event()
+        waiters = self._waiters.setdefault(user_id, set())
+        waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters.discard(waiter)
+            if not waiters:
+                self._waiters.pop(user_id, None)
+
+    async def dispatch(self, user_ids: List[int]) -> int:
+        """
+        Claim and push pending notifications for connected users.
+
+        Args:
+            user_ids (List[int]): Candidate users; those without a local socket are skipped
+
+        Returns:
+            int: Number of notifications pushed
+        """
+        local = set(self.manager.local_users())
+        user_ids = [user_id for user_id in user_ids if user_id in local]
+        pushed = 0
+        while user_ids:
+            claimed = await asyncio.to_thread(self._claim, user_ids)
+            if not claimed:
+                break
+            by_user: Dict[int, List[models.Notification]] = {}
+            for notification in claimed:
+                by_user.setdefault(notification.user_id, []).append(notification)
+            failed: List[int] = []
+            for user_id, batch in by_user.items():
+                dropped = partial(self._release_later, [n.id for n in batch])
+                if await self.manager.send_to_user(user_id, notification_payload(batch), on_dropped=dropped):
+                    pushed += len(batch)
+                else:
+                    failed.extend(n.id for n in batch)
+            self.stats["batches"] += 1
+            if failed:
+                # 전송 직전에 끊긴 사용자: 다시 대기 상태로 돌려 롱폴/재접속 때 전달
+                self.stats["released"] += await asyncio.to_thread(self._release, failed)
+                local = set(self.manager.local_users())
+                user_ids = [u for u in user_ids if u in local]
+            if len(claimed) < self.batch_size:
+                break
+        self.stats["pushed"] += pushed
+        return pushed
+
+    def _claim(self, user_ids: List[int]) -> List[models.Notification]:
+        db = self._session()
+        try:
+            return NotificationService(db).claim_pending(user_ids, limit=self.batch_size)
+        finally:
+            db.close()
+
+    def _release(self, notification_ids: List[int]) -> int:
+        db = self._session()
+        try:
+            return NotificationService(db).release(notification_ids)
+        finally:
+            db.close()
+
+    def _release_later(self, notification_ids: List[int]) -> None:
+        # 큐에 넣은 프레임이 전송 전에 버려짐 (이벤트 루프에서 호출)
+        task = asyncio.ensure_future(self._release_dropped(notification_ids))
+        self._releases.add(task)
+        task.add_done_callback(self._releases.discard)
+
+    async def _release_dropped(self, notification_ids: List[int]) -> None:
+        try:
+            self.stats["released"] += await asyncio.to_thread(self._release, notification_ids)
+        except Exception as exc:
+            logger.error("Failed to release dropped notifications %s: %s", notification_ids, exc)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+                user_ids, self._woken = list(self._woken), set()
+            except asyncio.TimeoutError:
+                user_ids = self.manager.local_users()
+            self._wakeup.clear()
+            if not user_ids:
+                continue
+            try:
+                await self.dispatch(user_ids)
+            except Exception as exc:
+                logger.error("Notification dispatch failed: %s", exc)
+
+
+# 프로세스 공용 디스패처
+notification_dispatcher = NotificationDispatcher(manager)
@@ -1,20 +1,32 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Sequence
 
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app import models
+from app.utils.sql_utils import bulk_insert
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.notification_dispatcher import NotificationDispatcher
 
 
 class NotificationService:
-    def __init__(self, db: Session):
+    DEFAULT_BATCH_SIZE = 100
+    INSERT_CHUNK_SIZE = 5_000
+
+    def __init__(self, db: Session, dispatcher: Optional["NotificationDispatcher"] = None):
         self.db = db
+        self.dispatcher = dispatcher
 
     def get_oldest_pending_notification(self, user_id: int) -> Optional[models.Notification]:
         """
         Retrieves the oldest pending notification for a user, marks it as sent,
         and returns it.
+
+        Single-item polling path kept for old clients; new clients receive
+        notifications over WebSocket or ``claim_pending`` batches.
         """
         try:
             notification = (
@@ -43,6 +55,98 @@ class NotificationService:
             # Consider specific exception handling for different error types if necessary.
             raise e # Re-raise the exception after rollback
 
+    def claim_pending(
+        self, user_ids: Sequence[int], limit: int = DEFAULT_BATCH_SIZE
+    ) -> List[models.Notification]:
+        """
+        Atomically claim the oldest pending notifications of the given users.
+
+        Claimed rows are marked ``is_sent`` in a single UPDATE. On PostgreSQL
+        the candidate rows are locked with ``FOR UPDATE SKIP LOCKED`` so
+        concurrent claimers (workers, long-polls) never hand out the same row.
+
+        Args:
+            user_ids (Sequence[int]): Users whose notifications to claim
+            limit (int): Maximum rows claimed in this call
+
+        Returns:
+            List[Notification]: Claimed rows (detached), oldest first
+        """
+        if not user_ids:
+            return []
+        Notification = models.Notification
+        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+        candidates = (
+            select(Notification.id)
+            .where(Notification.user_id.in_(list(user_ids)), Notification.is_sent == False)
+            .order_by(Notification.created_at.asc(), Notification.id.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        try:
+            if self.db.get_bind().dialect.update_returning:
+                claimed = list(
+                    self.db.scalars(
+                        update(Notification)
+                        .where(Notification.id.in_(candidates), Notification.is_sent == False)
+                        .values(is_sent=True, sent_at=now)
+                        .returning(Notification)
+                        .execution_options(synchronize_session=False)
+                    )
+                )
+            else:
+                # RETURNING 미지원 DB(MySQL 등): 잠근 후보 id를 먼저 읽고 갱신
+                ids = list(self.db.scalars(candidates))
+                if not ids:
+                    return []
+                self.db.execute(
+                    update(Notification)
+                    .where(Notification.id.in_(ids), Notification.is_sent == False)
+                    .values(is_sent=True, sent_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                claimed = list(
+                    self.db.scalars(
+                        select(Notification)
+                        .where(Notification.id.in_(ids))
+                        .execution_options(populate_existing=True)
+                    )
+                )
+            # 커밋 시 만료되어 행마다 재조회되지 않도록 세션에서 분리
+            for notification in claimed:
+                self.db.expunge(notification)
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+        claimed.sort(key=lambda n: (n.created_at, n.id))
+        return claimed
+
+    def release(self, notification_ids: Sequence[int]) -> int:
+        """
+        Return claimed notifications to the pending state (e.g. push failed).
+
+        Args:
+            notification_ids (Sequence[int]): Notifications to release
+
+        Returns:
+            int: Number of rows released
+        """
+        if not notification_ids:
+            return 0
+        try:
+            released = self.db.execute(
+                update(models.Notification)
+                .where(models.Notification.id.in_(list(notification_ids)))
+                .values(is_sent=False, sent_at=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+        return released
+
     def create_notification(
         self, user_id: int, message: str # Removed notification_type default arg
     ) -> models.Notification:
@@ -60,16 +164,79 @@ class NotificationService:
             self.db.add(db_notification)
             self.db.commit()
             self.db.refresh(db_notification)
-            return db_notification
         except SQLAlchemyError as e:
             # Log the error
             self.db.rollback()
             # Raise a custom service exception or handle as per application policy
             raise # Re-raising for now, or transform into a service-specific exception.
+        if self.dispatcher is not None:
+            # 접속 중이면 즉시 푸시, 롱폴 대기자는 깨움
+            self.dispatcher.wake(user_id)
+        return db_notification
 
-    # Potential future method for batch creation or more complex logic
-    # def create_notifications_batch(self, notifications_data: List[Dict]) -> List[models.Notification]:
-    #     pass
+    def create_notifications_batch(
+        self,
+        user_ids: Sequence[int],
+        message: str,
+        campaign_id: Optional[int] = None,
+        chunk_size: int = INSERT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Create the same notification for many users.
+
+        Rows are bulk-inserted ``chunk_size`` at a time (COPY on PostgreSQL,
+        executemany elsewhere) with one commit per chunk. Duplicate user ids
+        are ignored, and with ``campaign_id`` users that already received the
+        campaign are skipped, so reruns only fill in missing users.
+
+        Args:
+            user_ids (Sequence[int]): Recipients
+            message (str): Notification text
+            campaign_id (Optional[int]): Campaign the notifications belong to
+            chunk_size (int): Rows per insert/commit
+
+        Returns:
+            int: Number of notifications created
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        now = datetime.utcnow().replace(tzinfo=timezone.utc)
+        created = 0
+        for start in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[start : start + chunk_size]
+            try:
+                if campaign_id is not None:
+                    already = set(
+                        self.db.scalars(
+                            select(models.Notification.user_id).where(
+                                models.Notification.campaign_id == campaign_id,
+                                models.Notification.user_id.in_(chunk),
+                            )
+                        )
+                    )
+                    chunk = [user_id for user_id in chunk if user_id not in already]
+                bulk_insert(
+                    self.db,
+                    models.Notification,
+                    [
+                        {
+                            "user_id": user_id,
+                            "message": message,
+                            "is_sent": False,
+                            "created_at": now,
+                            "campaign_id": campaign_id,
+                        }
+                        for user_id in chunk
+                    ],
+                    ["user_id", "message", "is_sent", "created_at", "campaign_id"],
+                )
+                self.db.commit()
+            except SQLAlchemyError:
+                self.db.rollback()
+                raise
+            created += len(chunk)
+            if self.dispatcher is not None and chunk:
+                self.dispatcher.wake_many(chunk)
+        return created
 
     # Potential future method for marking as read (distinct from sent, if UI supports it)
     # def mark_notification_as_read(self, notification_id: int, user_id: int) -> Optional[models.Notification]:
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError # Import SQLAlchemyError
 
 from app import models
+from app.repositories.unlock_repository import UnlockRepository, parse_unlock_stage
 
 
 class RewardService:
@@ -32,6 +33,9 @@ class RewardService:
         )
         try:
             self.db.add(db_user_reward)
+            stage = parse_unlock_stage(reward_value)
+            if stage is not None:
+                UnlockRepository().record_unlock(self.db, user_id, stage, awarded_at)
             self.db.commit()
             self.db.refresh(db_user_reward)
             return db_user_reward
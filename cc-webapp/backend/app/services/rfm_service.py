@@ -2,11 +2,14 @@
 
 import json
 import logging
-from typing import Dict, List, Union, NamedTuple
+from datetime import datetime
+from typing import Dict, List, Optional, Union, NamedTuple
 
 from sqlalchemy.orm import Session
 
+from app.repositories.activity_repository import RFM_WINDOW_DAYS
 from app.repositories.game_repository import GameRepository
+from app.services.rfm_threshold_service import RFMThresholdService
 
 logger = logging.getLogger(__name__)
 
@@ -34,38 +37,45 @@ __all__ = ["RFMService", "RFMScore"]
 class RFMService:
     """Service for calculating and managing RFM (Recency, Frequency, Monetary) metrics."""
 
-    def __init__(self, db: Session, repository: GameRepository):
+    def __init__(
+        self,
+        db: Session,
+        repository: GameRepository,
+        threshold_service: Optional[RFMThresholdService] = None,
+    ):
         """
         Initialize RFM service with database session and game repository.
 
         Args:
             db (Session): SQLAlchemy database session
             repository (GameRepository): Game data repository
+            threshold_service (Optional[RFMThresholdService]): Publishes
+                sketch-based RFM thresholds
         """
         self.db = db
         self.repository = repository
+        self.threshold_service = threshold_service or RFMThresholdService()
 
     def compute_dynamic_thresholds(self) -> Dict[str, float]:
         """
         Compute dynamic thresholds based on distribution.
 
+        Streams per-user RFM values through quantile sketches and publishes
+        them as a new threshold version (see ``RFMThresholdService``). Returns
+        the thresholds now in effect, which stay at the static defaults until
+        enough users have been sampled.
+
         Returns:
             Dict[str, float]: Dynamic RFM thresholds
         """
         try:
-            # Placeholder implementation for dynamic thresholds
-            thresholds = {
-                "recency_high": 30.0,
-                "recency_medium": 60.0,
-                "frequency_high": 10.0,
-                "frequency_medium": 5.0,
-                "monetary_high": 500.0,
-                "monetary_medium": 250.0
+            self.threshold_service.refresh(self.db)
+            _, thresholds = self.threshold_service.get_current(self.db)
+            return {
+                f"{metric}_{'medium' if level == 'mid' else level}": float(thresholds[metric][level])
+                for metric in ("recency", "frequency", "monetary")
+                for level in ("high", "mid")
             }
-
-            # Store thresholds in game repository
-            self.repository.set_gacha_history(0, [json.dumps(thresholds)])
-            return thresholds
         except Exception as exc:
             logger.error(f"Failed to compute dynamic RFM thresholds: {exc}")
             return {}
@@ -96,18 +106,21 @@ class RFMService:
             RFMScore: Calculated RFM metrics
         """
         try:
-            # Retrieve user's game history and actions
-            gacha_history = self.repository.get_gacha_history(user_id)
-            user_segment = self.repository.get_user_segment(self.db, user_id)
-
-            # Calculate recency (days since last activity)
-            recency = 45  # Placeholder, should be calculated from actual user activity
+            # 기록 시점에 갱신되는 일별 활동 집계에서 조회
+            summary = self.repository.get_activity_summary(self.db, user_id)
+
+            # Calculate recency (days since last activity, window + 1 if inactive)
+            recency = (
+                (datetime.utcnow() - summary.last_action_at).days
+                if summary.last_action_at
+                else RFM_WINDOW_DAYS + 1
+            )
 
             # Calculate frequency (number of interactions)
-            frequency = len(gacha_history) if gacha_history else 0
+            frequency = summary.frequency
 
             # Calculate monetary value (total value generated)
-            monetary = sum(float(json.loads(h).get('value', 0)) for h in gacha_history) if gacha_history else 0.0
+            monetary = summary.monetary
 
             # Compute RFM score (simplified calculation)
             rfm_score = (recency * 0.3) + (frequency * 0.3) + (monetary * 0.4)
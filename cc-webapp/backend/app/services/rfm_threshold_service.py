@@ -0,0 +1,176 @@
+"""Distribution-aware RFM thresholds from mergeable quantile sketches."""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..repositories.activity_repository import window_start
+from ..utils.quantile_sketch import KLLSketch
+from ..utils.segment_utils import load_rfm_thresholds
+
+logger = logging.getLogger(__name__)
+
+Thresholds = Dict[str, Dict[str, float]]
+
+
+@dataclass
+class RFMSketches:
+    """Per-user recency (days), frequency and monetary distributions."""
+
+    recency: KLLSketch = field(default_factory=KLLSketch)
+    frequency: KLLSketch = field(default_factory=KLLSketch)
+    monetary: KLLSketch = field(default_factory=KLLSketch)
+
+    @property
+    def sample_size(self) -> int:
+        return self.frequency.n
+
+    def merge(self, other: "RFMSketches") -> "RFMSketches":
+        self.recency.merge(other.recency)
+        self.frequency.merge(other.frequency)
+        self.monetary.merge(other.monetary)
+        return self
+
+    def to_dict(self) -> Dict:
+        return {
+            "recency": self.recency.to_dict(),
+            "frequency": self.frequency.to_dict(),
+            "monetary": self.monetary.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RFMSketches":
+        return cls(*(KLLSketch.from_dict(data[name]) for name in ("recency", "frequency", "monetary")))
+
+
+class RFMThresholdService:
+    """Builds, merges and publishes versioned RFM thresholds.
+
+    Sketches are built in one streaming pass over the per-user rollups in
+    ``user_activity_daily`` (keyset pages of ``CHUNK_SIZE`` users) and can be
+    split across workers with ``shard``/``shards`` and merged afterwards, so no
+    full sort over the population is ever needed. Higher-is-better metrics use
+    the ``HIGH_QUANTILE``/``MID_QUANTILE`` percentiles as the score 5/3 cut-offs;
+    recency (lower is better) uses the mirrored percentiles.
+    """
+
+    HIGH_QUANTILE = 0.8
+    MID_QUANTILE = 0.5
+    MIN_SAMPLE_SIZE = 100
+    CHUNK_SIZE = 10_000
+
+    def build_sketches(
+        self, db: Session, shard: int = 0, shards: int = 1, now: Optional[datetime] = None
+    ) -> RFMSketches:
+        """
+        Stream this shard's users through fresh sketches.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            shard (int): Shard handled by this worker (``user_id % shards``)
+            shards (int): Total number of shards
+            now (Optional[datetime]): Reference time for recency
+
+        Returns:
+            RFMSketches: Sketches for the shard
+        """
+        now = now or datetime.utcnow()
+        Daily = models.UserActivityDaily
+        sketches = RFMSketches()
+        filters = [Daily.day >= window_start(now)]
+        if shards > 1:
+            filters.append(Daily.user_id % shards == shard)
+
+        last_user_id = None
+        while True:
+            page = filters if last_user_id is None else filters + [Daily.user_id > last_user_id]
+            rows = db.execute(
+                select(
+                    Daily.user_id,
+                    func.max(Daily.last_action_at),
+                    func.sum(Daily.action_count),
+                    func.coalesce(func.sum(Daily.monetary), 0),
+                )
+                .where(*page)
+                .group_by(Daily.user_id)
+                .order_by(Daily.user_id)
+                .limit(self.CHUNK_SIZE)
+            ).all()
+            if not rows:
+                return sketches
+            for user_id, last_action_at, frequency, monetary in rows:
+                sketches.recency.update((now - last_action_at).days)
+                sketches.frequency.update(int(frequency))
+                sketches.monetary.update(float(monetary))
+            last_user_id = rows[-1][0]
+
+    def derive_thresholds(self, sketches: RFMSketches) -> Thresholds:
+        """Turn sketches into ``get_rfm_score`` threshold dicts."""
+        high, mid = self.HIGH_QUANTILE, self.MID_QUANTILE
+        return {
+            "recency": {
+                "high": int(sketches.recency.quantile(1 - high)),
+                "mid": int(sketches.recency.quantile(1 - mid)),
+            },
+            "frequency": {"high": sketches.frequency.quantile(high), "mid": sketches.frequency.quantile(mid)},
+            "monetary": {"high": sketches.monetary.quantile(high), "mid": sketches.monetary.quantile(mid)},
+        }
+
+    def publish(self, db: Session, *shard_sketches: RFMSketches) -> Optional[models.RFMThresholdVersion]:
+        """
+        Merge shard sketches and store them as the next threshold version.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            shard_sketches (RFMSketches): Sketches from one or more shards
+
+        Returns:
+            Optional[RFMThresholdVersion]: New version, or None if the merged
+            sample is smaller than ``MIN_SAMPLE_SIZE``
+        """
+        merged = RFMSketches()
+        for sketches in shard_sketches:
+            merged.merge(sketches)
+        if merged.sample_size < self.MIN_SAMPLE_SIZE:
+            logger.info("Skipping RFM threshold publish: only %s users sampled", merged.sample_size)
+            return None
+
+        try:
+            current = db.query(func.max(models.RFMThresholdVersion.version)).scalar() or 0
+            row = models.RFMThresholdVersion(
+                version=current + 1,
+                thresholds=self.derive_thresholds(merged),
+                sketches=merged.to_dict(),
+                sample_size=merged.sample_size,
+            )
+            db.add(row)
+            db.commit()
+        except SQLAlchemyError as exc:
+            # 동시 발행 시 version 유니크 제약 위반 가능
+            logger.error("Failed to publish RFM thresholds: %s", exc)
+            db.rollback()
+            raise
+        logger.info("Published RFM thresholds v%s from %s users", row.version, row.sample_size)
+        return row
+
+    def refresh(self, db: Session) -> Optional[models.RFMThresholdVersion]:
+        """Build sketches over all users and publish them."""
+        return self.publish(db, self.build_sketches(db))
+
+    def get_current(self, db: Session) -> Tuple[Optional[int], Thresholds]:
+        """Return ``(version, thresholds)``; version is None for the static defaults."""
+        return load_rfm_thresholds(db)
+
+    def get_sketches(self, db: Session, version: Optional[int] = None) -> Optional[RFMSketches]:
+        """Load the sketches stored with ``version`` (latest by default) for merging."""
+        query = db.query(models.RFMThresholdVersion)
+        if version is not None:
+            query = query.filter(models.RFMThresholdVersion.version == version)
+        row = query.order_by(models.RFMThresholdVersion.version.desc()).first()
+        return RFMSketches.from_dict(row.sketches) if row else None
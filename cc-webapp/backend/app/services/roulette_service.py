@@ -2,12 +2,16 @@
 
 from dataclasses import dataclass
 from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-import random
 import logging
 
-from .token_service import TokenService
-from ..repositories.game_repository import GameRepository
+from .token_service import AsyncTokenService, TokenService
+from .settlement_service import AsyncSettlementService, GameOutcome, Settlement, SettlementService
+from ..repositories.game_repository import AsyncGameRepository, GameRepository
+from .game_config import GameConfigRegistry, get_game_config
+from ..utils.game_rng import RngProvider, get_rng_provider
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +28,40 @@ class RouletteSpinResult:
 
 
 class RouletteService:
-    """룰렛 게임 로직을 담당하는 서비스."""
-
-    def __init__(self, repository: GameRepository | None = None, token_service: TokenService | None = None, db: Optional[Session] = None) -> None:
+    """룰렛 게임 로직을 담당하는 서비스.
+
+    아래 상수는 기본값이며, 실제 값은 게임 설정(``CONFIG_KEY``)에서
+    생성 시 한 번 읽은 ``self.rules``를 따른다.
+    """
+
+    CONFIG_KEY = "roulette"
+    MIN_BET = 1
+    MAX_BET = 50
+    HOUSE_EDGE = {"Whale": 0.05, "Medium": 0.10, "Low": 0.15}
+    DEFAULT_HOUSE_EDGE = 0.10
+    NUMBER_MULTIPLIER = 35
+    ZERO_MULTIPLIER = 50  # 0번 적중 잭팟
+    EVEN_MONEY_MULTIPLIER = 2
+    # 실제 룰렛에서의 색상 매핑
+    RED_NUMBERS = frozenset({1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36})
+    BLACK_NUMBERS = frozenset({2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35})
+
+    def __init__(
+        self,
+        repository: GameRepository | None = None,
+        token_service: TokenService | None = None,
+        db: Optional[Session] = None,
+        settlement: SettlementService | None = None,
+        config: GameConfigRegistry | None = None,
+        rng: RngProvider | None = None,
+    ) -> None:
         self.repo = repository or GameRepository()
         self.token_service = token_service or TokenService(db, self.repo)
+        self.settlement = settlement or SettlementService(self.repo, self.token_service)
+        snapshot = (config or get_game_config()).current
+        self.rules = snapshot.rules_for(type(self))
+        self.config_version = snapshot.version
+        self.rng = rng or get_rng_provider()
 
     def spin(
         self,
@@ -38,12 +71,10 @@ class RouletteService:
         value: Optional[str],
         db: Session,
     ) -> RouletteSpinResult:
-        """룰렛 스핀을 실행하고 결과를 반환."""
-        # DB 세션을 TokenService에 설정
-        if not self.token_service.db:
-            self.token_service.db = db
         """룰렛 스핀을 실행하고 결과를 반환한다.
 
+        베팅 차감, 보상 지급, 스트릭 갱신, 액션 기록은 하나의 트랜잭션으로 정산된다.
+
         Parameters
         ----------
         user_id: int
@@ -68,19 +99,56 @@ class RouletteService:
             토큰이 부족한 경우
         """
 
-        bet = max(1, min(bet, 50))
+        bet = max(self.rules.MIN_BET, min(bet, self.rules.MAX_BET))
         logger.info("룰렛 스핀 시작 user=%s bet=%s type=%s value=%s", user_id, bet, bet_type, value)
 
-        deducted_tokens = self.token_service.deduct_tokens(user_id, bet)
-        if deducted_tokens is None:
+        settled = self.settlement.settle(
+            db,
+            user_id,
+            "ROULETTE_SPIN",
+            bet,
+            lambda: self._resolve(user_id, bet, bet_type, value, db),
+        )
+        if settled is None:
             logger.warning("토큰 차감 실패: 토큰 부족")
             raise ValueError("토큰이 부족합니다.")
+        return self._result(user_id, bet, settled)
 
-        segment = self.repo.get_user_segment(db, user_id)
-        edge_map = {"Whale": 0.05, "Medium": 0.10, "Low": 0.15}
-        house_edge = edge_map.get(segment, 0.10)
+    def _result(self, user_id: int, bet: int, settled: Settlement) -> RouletteSpinResult:
+        number, result, animation = settled.outcome.detail
+        logger.info(
+            "스핀 결과 user=%s number=%s result=%s payout=%s streak=%s",
+            user_id, number, result, settled.payout, settled.streak,
+        )
+
+        return RouletteSpinResult(number, result, settled.payout - bet, settled.balance, animation)
 
-        number = random.randint(0, 36)
+    def _resolve(
+        self,
+        user_id: int,
+        bet: int,
+        bet_type: str,
+        value: Optional[str],
+        db: Session,
+    ) -> GameOutcome:
+        """당첨 번호를 뽑고 배당과 스트릭을 계산."""
+        return self._outcome(user_id, bet, bet_type, value, self.repo.get_user_segment(db, user_id))
+
+    def _outcome(
+        self,
+        user_id: int,
+        bet: int,
+        bet_type: str,
+        value: Optional[str],
+        segment: str,
+        stream=None,
+    ) -> GameOutcome:
+        """``stream``: 이 판의 난수 스트림 (재현 시 감사 로그로 복원한 스트림)"""
+        rules = self.rules
+        house_edge = rules.HOUSE_EDGE.get(segment, rules.DEFAULT_HOUSE_EDGE)
+
+        stream = stream or self.rng.stream(self.CONFIG_KEY, user_id)
+        number = stream.randint(0, 36)
         payout = 0
         result = "lose"
         animation = "lose"
@@ -90,37 +158,70 @@ class RouletteService:
 
         if bet_type == "number" and value is not None:
             if number == int(value):
-                payout = int(bet * 35 * (1 - house_edge))
+                payout = int(bet * rules.NUMBER_MULTIPLIER * (1 - house_edge))
                 if number == 0:
                     # 0번 적중은 잭팟으로 처리
-                    payout = int(bet * 50 * (1 - house_edge))
+                    payout = int(bet * rules.ZERO_MULTIPLIER * (1 - house_edge))
                     animation = "jackpot"
         elif bet_type == "color" and value in {"red", "black"}:
-            # 실제 룰렛에서의 색상 매핑
-            red_numbers = {1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36}
-            black_numbers = {2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35}
-            
-            color_map = {"red": red_numbers, "black": black_numbers}
+            color_map = {"red": rules.RED_NUMBERS, "black": rules.BLACK_NUMBERS}
             if number != 0 and number in color_map[value]:
-                payout = int(bet * 2 * (1 - house_edge))
+                payout = int(bet * rules.EVEN_MONEY_MULTIPLIER * (1 - house_edge))
         elif bet_type == "odd_even" and value in {"odd", "even"}:
             if number != 0 and (number % 2 == 0) == (value == "even"):
-                payout = int(bet * 2 * (1 - house_edge))
+                payout = int(bet * rules.EVEN_MONEY_MULTIPLIER * (1 - house_edge))
 
         if payout:
             result = "win" if animation != "jackpot" else "jackpot"
             animation = animation if animation != "lose" else "win"
-            self.token_service.add_tokens(user_id, payout)
             streak = 0
         else:
             streak += 1
 
-        balance = self.token_service.get_token_balance(user_id)
-        self.repo.set_streak(user_id, streak)
-        self.repo.record_action(db, user_id, "ROULETTE_SPIN", -bet)
-
-        logger.info(
-            "스핀 결과 user=%s number=%s result=%s payout=%s streak=%s", user_id, number, result, payout, streak
+        audit = stream.record(
+            config_version=self.config_version, segment=segment, bet=bet, bet_type=bet_type, value=value,
+            number=number, payout=payout,
         )
+        return GameOutcome(payout=payout, streak=streak, detail=(number, result, animation), audit=audit)
+
 
-        return RouletteSpinResult(number, result, payout - bet, balance, animation)
+class AsyncRouletteService(RouletteService):
+    """``RouletteService`` on an ``AsyncSession``; database round trips are awaited."""
+
+    def __init__(
+        self,
+        repository: AsyncGameRepository | None = None,
+        token_service: AsyncTokenService | None = None,
+        settlement: AsyncSettlementService | None = None,
+        config: GameConfigRegistry | None = None,
+        rng: RngProvider | None = None,
+    ) -> None:
+        self.repo = repository or AsyncGameRepository()
+        self.token_service = token_service or AsyncTokenService(None, self.repo)
+        self.settlement = settlement or AsyncSettlementService(self.repo, self.token_service)
+        snapshot = (config or get_game_config()).current
+        self.rules = snapshot.rules_for(type(self))
+        self.config_version = snapshot.version
+        self.rng = rng or get_rng_provider()
+
+    async def spin(
+        self,
+        user_id: int,
+        bet: int,
+        bet_type: str,
+        value: Optional[str],
+        db: AsyncSession,
+    ) -> RouletteSpinResult:
+        """룰렛 스핀을 실행하고 결과를 반환 (비동기 세션)."""
+        bet = max(self.rules.MIN_BET, min(bet, self.rules.MAX_BET))
+
+        async def resolve() -> GameOutcome:
+            segment = await self.repo.get_user_segment(db, user_id)
+            # 스트릭은 동기 GameStateBackend(SQL일 수 있음)에서 읽으므로 이벤트 루프 밖에서 실행
+            return await run_in_threadpool(self._outcome, user_id, bet, bet_type, value, segment)
+
+        settled = await self.settlement.settle(db, user_id, "ROULETTE_SPIN", bet, resolve)
+        if settled is None:
+            logger.warning("토큰 차감 실패: 토큰 부족")
+            raise ValueError("토큰이 부족합니다.")
+        return self._result(user_id, bet, settled)
@@ -2,12 +2,15 @@
 
 from dataclasses import dataclass
 from typing import Optional
-import random
 import logging
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .token_service import TokenService
-from ..repositories.game_repository import GameRepository
+from .token_service import AsyncTokenService, TokenService
+from .settlement_service import AsyncSettlementService, GameOutcome, Settlement, SettlementService
+from ..repositories.game_repository import AsyncGameRepository, GameRepository
+from .game_config import GameConfigRegistry, get_game_config
+from ..utils.game_rng import RngProvider, get_rng_provider
 
 logger = logging.getLogger(__name__)
 
@@ -23,46 +26,91 @@ class RPSResult:
 
 
 class RPSService:
-    """RPS (Rock-Paper-Scissors) 게임 로직을 담당하는 서비스."""
-    
+    """RPS (Rock-Paper-Scissors) 게임 로직을 담당하는 서비스.
+
+    아래 상수는 기본값이며, 실제 값은 게임 설정(``CONFIG_KEY``)에서
+    생성 시 한 번 읽은 ``self.rules``를 따른다.
+    """
+
+    CONFIG_KEY = "rps"
     VALID_CHOICES = ["rock", "paper", "scissors"]
     WINNING_COMBINATIONS = {
         "rock": "scissors",
         "paper": "rock", 
         "scissors": "paper"
     }
+    # 승리 시 세그먼트별 총 보상 배율
+    WIN_MULTIPLIERS = {"Whale": 3.0, "Low": 1.5}
+    DEFAULT_WIN_MULTIPLIER = 2.0
 
-    def __init__(self, repository: Optional[GameRepository] = None, token_service: Optional[TokenService] = None, db: Optional[Session] = None) -> None:
+    def __init__(
+        self,
+        repository: Optional[GameRepository] = None,
+        token_service: Optional[TokenService] = None,
+        db: Optional[Session] = None,
+        settlement: Optional[SettlementService] = None,
+        config: Optional[GameConfigRegistry] = None,
+        rng: Optional[RngProvider] = None,
+    ) -> None:
         self.repo = repository or GameRepository()
         self.token_service = token_service or TokenService(db or None, self.repo)
+        self.settlement = settlement or SettlementService(self.repo, self.token_service)
+        snapshot = (config or get_game_config()).current
+        self.rules = snapshot.rules_for(type(self))
+        self.config_version = snapshot.version
+        self.rng = rng or get_rng_provider()
 
     def play(self, user_id: int, user_choice: str, bet_amount: int, db: Session) -> RPSResult:
         """RPS 게임을 플레이하고 결과를 반환."""
         logger.info(f"RPS game started: user_id={user_id}, choice={user_choice}, bet_amount={bet_amount}")
-        
-        # 입력 검증
-        if user_choice not in self.VALID_CHOICES:
+        self._validate(user_id, user_choice, bet_amount)
+
+        # 토큰 차감, 결과 결정, 보상 지급, 게임 기록을 한 번에 정산
+        settled = self.settlement.settle(
+            db,
+            user_id,
+            "RPS_PLAY",
+            bet_amount,
+            lambda: self._resolve(user_id, user_choice, bet_amount, db),
+        )
+        if settled is None:
+            logger.error(f"Insufficient tokens for user {user_id}")
+            raise ValueError("Insufficient tokens")
+        return self._result(user_id, user_choice, bet_amount, settled)
+
+    def _validate(self, user_id: int, user_choice: str, bet_amount: int) -> None:
+        if user_choice not in self.rules.VALID_CHOICES:
             logger.warning(f"Invalid choice from user {user_id}: {user_choice}")
             raise ValueError("Invalid choice. Please select rock, paper, or scissors.")
-        
+
         if bet_amount <= 0:
             logger.warning(f"Invalid bet amount from user {user_id}: {bet_amount}")
             raise ValueError("Bet amount must be greater than 0.")
 
-        # 토큰 차감
-        deducted_tokens = self.token_service.deduct_tokens(user_id, bet_amount)
-        if deducted_tokens is None:
-            logger.error(f"Insufficient tokens for user {user_id}")
-            raise ValueError("Insufficient tokens")
+    def _result(self, user_id: int, user_choice: str, bet_amount: int, settled: Settlement) -> RPSResult:
+        computer_choice, result = settled.outcome.detail
+        tokens_change = settled.payout - bet_amount
+        balance = settled.balance
+
+        logger.info(f"RPS game completed: user_id={user_id}, result={result}, tokens_change={tokens_change}, balance={balance}")
+        
+        return RPSResult(user_choice, computer_choice, result, tokens_change, balance)
+
+    def _resolve(self, user_id: int, user_choice: str, bet_amount: int, db: Session) -> GameOutcome:
+        """컴퓨터 선택과 승패, 세그먼트별 보상을 결정."""
+        return self._outcome(user_id, user_choice, bet_amount, self.repo.get_user_segment(db, user_id))
 
+    def _outcome(self, user_id: int, user_choice: str, bet_amount: int, segment: str, stream=None) -> GameOutcome:
+        """``stream``: 이 판의 난수 스트림 (재현 시 감사 로그로 복원한 스트림)"""
         # 컴퓨터 선택 (랜덤)
-        computer_choice = random.choice(self.VALID_CHOICES)
+        stream = stream or self.rng.stream(self.CONFIG_KEY, user_id)
+        computer_choice = stream.choice(self.rules.VALID_CHOICES)
         logger.debug(f"Computer choice: {computer_choice}")
         
         # 게임 결과 결정
         if user_choice == computer_choice:
             result = "draw"
-        elif self.WINNING_COMBINATIONS[user_choice] == computer_choice:
+        elif self.rules.WINNING_COMBINATIONS[user_choice] == computer_choice:
             result = "win"
         else:
             result = "lose"
@@ -70,41 +118,58 @@ class RPSService:
         logger.info(f"Game result: user={user_choice}, computer={computer_choice}, result={result}")
             
         # 사용자 세그먼트에 따른 보상 조정
-        segment = self.repo.get_user_segment(db, user_id)
         logger.debug(f"User {user_id} segment: {segment}")
         
-        # 토큰 변화량 계산
-        tokens_change = 0
+        # 지급액 계산
+        payout = 0
         if result == "win":
-            base_reward = bet_amount * 2  # 기본 2배 보상
-            multiplier = 2.0  # 기본 배율
-            
-            if segment == "Whale":
-                multiplier = 3.0  # 고래 사용자 3배 총 보상
-            elif segment == "Low":
-                multiplier = 1.5  # 저소비 사용자 1.5배 총 보상
-            
-            reward = int(bet_amount * multiplier)
-            self.token_service.add_tokens(user_id, reward)
-            tokens_change = reward - bet_amount  # 실제 순수익
-            logger.info(f"User {user_id} won: reward={reward}, net_change={tokens_change}")
+            multiplier = self.rules.WIN_MULTIPLIERS.get(segment, self.rules.DEFAULT_WIN_MULTIPLIER)
+            payout = int(bet_amount * multiplier)
+            logger.info(f"User {user_id} won: reward={payout}, net_change={payout - bet_amount}")
         elif result == "draw":
             # 무승부 시 베팅 금액 환불
-            self.token_service.add_tokens(user_id, bet_amount)
-            tokens_change = 0
+            payout = bet_amount
             logger.info(f"User {user_id} draw: bet refunded")
         else:  # lose
             # 패배 시 베팅 금액만 잃음
-            tokens_change = -bet_amount
             logger.info(f"User {user_id} lost: lost={bet_amount}")
 
-        # 현재 잔액 조회
-        balance = self.token_service.get_token_balance(user_id)
-        
-        # 게임 기록
-        self.repo.record_action(db, user_id, "RPS_PLAY", -bet_amount)
-        logger.debug(f"Game action recorded for user {user_id}")
-        
-        logger.info(f"RPS game completed: user_id={user_id}, result={result}, tokens_change={tokens_change}, balance={balance}")
-        
-        return RPSResult(user_choice, computer_choice, result, tokens_change, balance)
+        audit = stream.record(
+            config_version=self.config_version, segment=segment, bet=bet_amount, choice=user_choice,
+            computer_choice=computer_choice, result=result, payout=payout,
+        )
+        return GameOutcome(payout=payout, detail=(computer_choice, result), audit=audit)
+
+
+class AsyncRPSService(RPSService):
+    """``RPSService`` on an ``AsyncSession``; database round trips are awaited."""
+
+    def __init__(
+        self,
+        repository: Optional[AsyncGameRepository] = None,
+        token_service: Optional[AsyncTokenService] = None,
+        settlement: Optional[AsyncSettlementService] = None,
+        config: Optional[GameConfigRegistry] = None,
+        rng: Optional[RngProvider] = None,
+    ) -> None:
+        self.repo = repository or AsyncGameRepository()
+        self.token_service = token_service or AsyncTokenService(None, self.repo)
+        self.settlement = settlement or AsyncSettlementService(self.repo, self.token_service)
+        snapshot = (config or get_game_config()).current
+        self.rules = snapshot.rules_for(type(self))
+        self.config_version = snapshot.version
+        self.rng = rng or get_rng_provider()
+
+    async def play(self, user_id: int, user_choice: str, bet_amount: int, db: AsyncSession) -> RPSResult:
+        """RPS 게임을 플레이하고 결과를 반환 (비동기 세션)."""
+        self._validate(user_id, user_choice, bet_amount)
+
+        async def resolve() -> GameOutcome:
+            segment = await self.repo.get_user_segment(db, user_id)
+            return self._outcome(user_id, user_choice, bet_amount, segment)
+
+        settled = await self.settlement.settle(db, user_id, "RPS_PLAY", bet_amount, resolve)
+        if settled is None:
+            logger.error(f"Insufficient tokens for user {user_id}")
+            raise ValueError("Insufficient tokens")
+        return self._result(user_id, user_choice, bet_amount, settled)
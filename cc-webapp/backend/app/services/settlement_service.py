@@ -0,0 +1,201 @@
+"""Single-transaction settlement of game outcomes."""
+
+import inspect
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .token_service import AsyncTokenService, TokenService
+from .ledger_service import LedgerEntry, LedgerService
+from ..repositories.game_repository import AsyncGameRepository, GameRepository
+from ..utils.game_rng import write_audit
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GameOutcome:
+    """Resolved game outcome to be applied by the settlement service."""
+
+    payout: int = 0
+    streak: Optional[int] = None
+    detail: Any = None
+    # 가챠 천장 카운터와 최근 히스토리 (None이면 변경 없음)
+    gacha_count: Optional[int] = None
+    gacha_history: Optional[List[str]] = None
+    # RNG 감사 기록: 롤백된 라운드가 남지 않도록 커밋 후에 기록
+    audit: Optional[Dict[str, Any]] = field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class Settlement:
+    """Result of a committed settlement."""
+
+    balance: int
+    payout: int
+    streak: Optional[int]
+    outcome: GameOutcome
+    action: models.UserAction
+
+
+class SettlementService:
+    """Applies bet debit, payout credit, streak, action log and ledger in one commit.
+
+    The bet is debited first with a conditional ``UPDATE ... RETURNING`` so the
+    outcome is only resolved once the user is known to be able to pay for it.
+    Everything after that runs in the same transaction and is committed once;
+    the bet and payout ledger entries are written in a single bulk insert.
+    Per-user game state (streak, gacha pity and history) lives outside the
+    database transaction, so it and the outcome's RNG audit record are
+    applied only after the commit succeeds; a rolled-back round changes
+    neither.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[GameRepository] = None,
+        token_service: Optional[TokenService] = None,
+        ledger: Optional[LedgerService] = None,
+    ) -> None:
+        self.repo = repository or GameRepository()
+        self.token_service = token_service or TokenService(None, self.repo)
+        self.ledger = ledger or LedgerService()
+
+    def settle(
+        self,
+        db: Session,
+        user_id: int,
+        action_type: str,
+        bet: int,
+        resolve: Callable[[], GameOutcome],
+    ) -> Optional[Settlement]:
+        """
+        Debit the bet, resolve the game and persist the result atomically.
+
+        Args:
+            db (Session): SQLAlchemy database session
+            user_id (int): User's unique identifier
+            action_type (str): ``UserAction.action_type`` to record
+            bet (int): Number of tokens staked
+            resolve (Callable[[], GameOutcome]): Resolves the game outcome;
+                called only after the bet has been debited
+
+        Returns:
+            Optional[Settlement]: Settlement result or None if insufficient tokens
+        """
+        # 서비스가 요청 간 공유되므로 세션은 호출마다 넘긴다
+        try:
+            balance = self.token_service.debit(user_id, bet, db=db)
+            if balance is None:
+                db.rollback()
+                logger.warning("Insufficient tokens for user %s: bet %s", user_id, bet)
+                return None
+
+            entries = [LedgerEntry(user_id, -bet, balance, f"{action_type}_BET")]
+
+            outcome = resolve()
+            if outcome.payout:
+                balance = self.token_service.credit(user_id, outcome.payout, db=db)
+                entries.append(LedgerEntry(user_id, outcome.payout, balance, f"{action_type}_PAYOUT"))
+            action = self.repo.record_action(db, user_id, action_type, -bet, commit=False)
+            # write-behind 모드에서는 행이 커밋 후에 쓰이므로 원장 항목은 action_id 없이 남는다
+            for entry in entries:
+                entry.action_id = action.id
+            self.ledger.append(db, entries)
+            db.commit()
+        except SQLAlchemyError as exc:
+            logger.error("Settlement failed for user %s (%s): %s", user_id, action_type, exc)
+            db.rollback()
+            raise
+        except Exception:
+            # 결과 계산 중 오류가 나면 차감된 베팅도 함께 되돌린다
+            db.rollback()
+            raise
+
+        self._apply_state(user_id, outcome)
+        write_audit(outcome.audit)
+        return Settlement(balance, outcome.payout, outcome.streak, outcome, action)
+
+    def _apply_state(self, user_id: int, outcome: GameOutcome) -> None:
+        """Store the round's streak and gacha state in the game state backend."""
+        if outcome.streak is not None:
+            self.repo.set_streak(user_id, outcome.streak)
+        if outcome.gacha_count is not None:
+            self.repo.set_gacha_count(user_id, outcome.gacha_count)
+        if outcome.gacha_history is not None:
+            self.repo.set_gacha_history(user_id, outcome.gacha_history)
+
+
+class AsyncSettlementService(SettlementService):
+    """``SettlementService`` for an ``AsyncSession``; same single-commit semantics."""
+
+    def __init__(
+        self,
+        repository: Optional[AsyncGameRepository] = None,
+        token_service: Optional[AsyncTokenService] = None,
+        ledger: Optional[LedgerService] = None,
+    ) -> None:
+        self.repo = repository or AsyncGameRepository()
+        self.token_service = token_service or AsyncTokenService(None, self.repo)
+        self.ledger = ledger or LedgerService()
+
+    async def settle(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        action_type: str,
+        bet: int,
+        resolve: Callable[[], Union[GameOutcome, Awaitable[GameOutcome]]],
+    ) -> Optional[Settlement]:
+        """
+        Debit the bet, resolve the game and persist the result atomically.
+
+        Args:
+            db (AsyncSession): Async database session
+            user_id (int): User's unique identifier
+            action_type (str): ``UserAction.action_type`` to record
+            bet (int): Number of tokens staked
+            resolve: Resolves the game outcome (may be a coroutine function);
+                called only after the bet has been debited
+
+        Returns:
+            Optional[Settlement]: Settlement result or None if insufficient tokens
+        """
+        try:
+            balance = await self.token_service.debit(user_id, bet, db=db)
+            if balance is None:
+                await db.rollback()
+                logger.warning("Insufficient tokens for user %s: bet %s", user_id, bet)
+                return None
+
+            entries = [LedgerEntry(user_id, -bet, balance, f"{action_type}_BET")]
+
+            outcome = resolve()
+            if inspect.isawaitable(outcome):
+                outcome = await outcome
+            if outcome.payout:
+                balance = await self.token_service.credit(user_id, outcome.payout, db=db)
+                entries.append(LedgerEntry(user_id, outcome.payout, balance, f"{action_type}_PAYOUT"))
+            action = await self.repo.record_action(db, user_id, action_type, -bet, commit=False)
+            for entry in entries:
+                entry.action_id = action.id
+            await db.run_sync(self.ledger.append, entries)
+            await db.commit()
+        except SQLAlchemyError as exc:
+            logger.error("Settlement failed for user %s (%s): %s", user_id, action_type, exc)
+            await db.rollback()
+            raise
+        except Exception:
+            await db.rollback()
+            raise
+
+        # GameStateBackend는 동기 API (SQL 백엔드는 쓰기 중 flush 가능)
+        await run_in_threadpool(self._apply_state, user_id, outcome)
+        write_audit(outcome.audit)
+        return Settlement(balance, outcome.payout, outcome.streak, outcome, action)
@@ -1,10 +1,14 @@
 from dataclasses import dataclass
 from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-import random
 
-from .token_service import TokenService
-from ..repositories.game_repository import GameRepository
+from .token_service import AsyncTokenService, TokenService
+from .settlement_service import AsyncSettlementService, GameOutcome, Settlement, SettlementService
+from ..repositories.game_repository import AsyncGameRepository, GameRepository
+from .game_config import GameConfigRegistry, get_game_config
+from ..utils.game_rng import RngProvider, get_rng_provider
 
 
 @dataclass
@@ -17,61 +21,128 @@ class SlotSpinResult:
 
 
 class SlotService:
-    """슬롯 머신 로직을 담당하는 서비스 계층."""
+    """슬롯 머신 로직을 담당하는 서비스 계층.
 
-    def __init__(self, repository: GameRepository | None = None, token_service: TokenService | None = None, db: Optional[Session] = None) -> None:
+    아래 상수는 기본값이며, 실제 값은 게임 설정(``CONFIG_KEY``)에서
+    생성 시 한 번 읽은 ``self.rules``를 따른다.
+    """
+
+    CONFIG_KEY = "slot"
+    BET = 2
+    BASE_WIN_PROB = 0.10
+    STREAK_WIN_BONUS = 0.01  # 연패 1회당 승률 보정
+    MAX_STREAK_BONUS = 0.05
+    SEGMENT_WIN_ADJUST = {"Whale": 0.02, "Low": -0.02}
+    JACKPOT_PROB = 0.01
+    FORCE_WIN_STREAK = 7
+    WIN_PAYOUT = 10
+    JACKPOT_PAYOUT = 100
+
+    def __init__(
+        self,
+        repository: GameRepository | None = None,
+        token_service: TokenService | None = None,
+        db: Optional[Session] = None,
+        settlement: SettlementService | None = None,
+        config: GameConfigRegistry | None = None,
+        rng: RngProvider | None = None,
+    ) -> None:
         self.repo = repository or GameRepository()
         self.token_service = token_service or TokenService(db, self.repo)
+        self.settlement = settlement or SettlementService(self.repo, self.token_service)
+        snapshot = (config or get_game_config()).current
+        self.rules = snapshot.rules_for(type(self))
+        self.config_version = snapshot.version
+        self.rng = rng or get_rng_provider()
 
     def spin(self, user_id: int, db: Session) -> SlotSpinResult:
-        """슬롯 스핀을 실행하고 결과를 반환."""
-        # DB 세션을 TokenService에 설정
-        if not self.token_service.db:
-            self.token_service.db = db
-            
-        # 토큰 차감. 부족하면 ValueError 발생
-        deducted_tokens = self.token_service.deduct_tokens(user_id, 2)
-        if deducted_tokens is None:
+        """슬롯 스핀을 실행하고 결과를 반환.
+
+        베팅 차감, 보상 지급, 스트릭 갱신, 액션 기록은 하나의 트랜잭션으로 정산된다.
+        """
+        settled = self.settlement.settle(
+            db, user_id, "SLOT_SPIN", self.rules.BET, lambda: self._resolve(user_id, db)
+        )
+        if settled is None:
             raise ValueError("토큰이 부족합니다.")
+        return self._result(settled)
 
-        segment = self.repo.get_user_segment(db, user_id)
-        streak = self.repo.get_streak(user_id)
+    def _result(self, settled: Settlement) -> SlotSpinResult:
+        result, animation = settled.outcome.detail
+        return SlotSpinResult(result, settled.payout - self.rules.BET, settled.balance, settled.streak, animation)
+
+    def _resolve(self, user_id: int, db: Session) -> GameOutcome:
+        """세그먼트와 스트릭을 반영해 스핀 결과를 결정."""
+        return self._outcome(user_id, self.repo.get_user_segment(db, user_id))
+
+    def _outcome(self, user_id: int, segment: str, stream=None) -> GameOutcome:
+        """``stream``: 이 판의 난수 스트림 (재현 시 감사 로그로 복원한 스트림)"""
+        rules = self.rules
+        stream = stream or self.rng.stream(self.CONFIG_KEY, user_id)
+        streak = start_streak = self.repo.get_streak(user_id)
 
         # 기본 승리 확률과 잭팟 확률 설정
-        win_prob = 0.10 + min(streak * 0.01, 0.05)
-        if segment == "Whale":
-            win_prob += 0.02
-        elif segment == "Low":
-            win_prob -= 0.02
-        jackpot_prob = 0.01
-
-        spin = random.random()
+        win_prob = rules.BASE_WIN_PROB + min(streak * rules.STREAK_WIN_BONUS, rules.MAX_STREAK_BONUS)
+        win_prob += rules.SEGMENT_WIN_ADJUST.get(segment, 0.0)
+        jackpot_prob = rules.JACKPOT_PROB
+
+        spin = stream.random()
         result = "lose"
         reward = 0
         animation = "lose"
-        if streak >= 7:
+        if streak >= rules.FORCE_WIN_STREAK:
             # 연패 보상으로 강제 승리
             result = "win"
-            reward = 10
+            reward = rules.WIN_PAYOUT
             animation = "force_win"
             streak = 0
         elif spin < jackpot_prob:
             result = "jackpot"
-            reward = 100
+            reward = rules.JACKPOT_PAYOUT
             animation = "jackpot"
             streak = 0
         elif spin < jackpot_prob + win_prob:
             result = "win"
-            reward = 10
+            reward = rules.WIN_PAYOUT
             animation = "win"
             streak = 0
         else:
             streak += 1
 
-        if reward:
-            self.token_service.add_tokens(user_id, reward)
+        audit = stream.record(
+            config_version=self.config_version, segment=segment, streak=start_streak, result=result, payout=reward
+        )
+        return GameOutcome(payout=reward, streak=streak, detail=(result, animation), audit=audit)
 
-        self.repo.set_streak(user_id, streak)
-        balance = self.token_service.get_token_balance(user_id)
-        self.repo.record_action(db, user_id, "SLOT_SPIN", -2)
-        return SlotSpinResult(result, reward - 2, balance, streak, animation)
+
+class AsyncSlotService(SlotService):
+    """``SlotService`` on an ``AsyncSession``; database round trips are awaited."""
+
+    def __init__(
+        self,
+        repository: AsyncGameRepository | None = None,
+        token_service: AsyncTokenService | None = None,
+        settlement: AsyncSettlementService | None = None,
+        config: GameConfigRegistry | None = None,
+        rng: RngProvider | None = None,
+    ) -> None:
+        self.repo = repository or AsyncGameRepository()
+        self.token_service = token_service or AsyncTokenService(None, self.repo)
+        self.settlement = settlement or AsyncSettlementService(self.repo, self.token_service)
+        snapshot = (config or get_game_config()).current
+        self.rules = snapshot.rules_for(type(self))
+        self.config_version = snapshot.version
+        self.rng = rng or get_rng_provider()
+
+    async def spin(self, user_id: int, db: AsyncSession) -> SlotSpinResult:
+        """슬롯 스핀을 실행하고 결과를 반환 (비동기 세션)."""
+
+        async def resolve() -> GameOutcome:
+            segment = await self.repo.get_user_segment(db, user_id)
+            # 스트릭은 동기 GameStateBackend(SQL일 수 있음)에서 읽으므로 이벤트 루프 밖에서 실행
+            return await run_in_threadpool(self._outcome, user_id, segment)
+
+        settled = await self.settlement.settle(db, user_id, "SLOT_SPIN", self.rules.BET, resolve)
+        if settled is None:
+            raise ValueError("토큰이 부족합니다.")
+        return self._result(settled)
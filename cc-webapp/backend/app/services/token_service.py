@@ -3,11 +3,14 @@
 import logging
 from typing import Optional
 
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.repositories.game_repository import GameRepository
+from app.repositories.game_repository import AsyncGameRepository, GameRepository
 from app.models import User
+from app.services.ledger_service import LedgerEntry, LedgerService
 
 logger = logging.getLogger(__name__)
 
@@ -15,24 +18,35 @@ logger = logging.getLogger(__name__)
 class TokenService:
     """Service for managing user cyber tokens with real DB persistence."""
 
-    def __init__(self, db: Optional[Session] = None, repository: Optional[GameRepository] = None):
+    def __init__(
+        self,
+        db: Optional[Session] = None,
+        repository: Optional[GameRepository] = None,
+        ledger: Optional[LedgerService] = None,
+    ):
         """
         Initialize token service with database session and game repository.
 
         Args:
             db (Optional[Session]): SQLAlchemy database session
             repository (Optional[GameRepository]): Game data repository
+            ledger (Optional[LedgerService]): Token ledger writer
         """
         self.db = db
         self.repository = repository or GameRepository()
+        self.ledger = ledger or LedgerService()
 
-    def add_tokens(self, user_id: int, amount: int) -> int:
+    def add_tokens(self, user_id: int, amount: int, reason: str = "CREDIT") -> int:
         """
         Add tokens to a user's balance in the database.
 
+        Uses a single atomic ``UPDATE`` so concurrent credits are never lost.
+        The change is appended to the token ledger in the same transaction.
+
         Args:
             user_id (int): User's unique identifier
             amount (int): Number of tokens to add
+            reason (str): Ledger reason code
 
         Returns:
             int: Updated token balance
@@ -42,17 +56,14 @@ class TokenService:
             return 0
             
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
+            new_balance = self.credit(user_id, amount)
+            if new_balance is None:
+                self.db.rollback()
                 logger.error(f"User {user_id} not found")
                 return 0
-                
-            current_balance = getattr(user, 'cyber_token_balance', 0) or 0
-            new_balance = current_balance + amount
-            setattr(user, 'cyber_token_balance', new_balance)
+
+            self.ledger.append(self.db, [LedgerEntry(user_id, amount, new_balance, reason)])
             self.db.commit()
-            self.db.refresh(user)
-            
             logger.info(f"Added {amount} tokens to user {user_id}, new balance: {new_balance}")
             return new_balance
             
@@ -61,13 +72,19 @@ class TokenService:
             self.db.rollback()
             return self.get_token_balance(user_id)
 
-    def deduct_tokens(self, user_id: int, amount: int) -> Optional[int]:
+    def deduct_tokens(self, user_id: int, amount: int, reason: str = "DEBIT") -> Optional[int]:
         """
         Deduct tokens from a user's balance in the database.
 
+        The balance check and the deduction are a single conditional
+        ``UPDATE``, so two concurrent deductions cannot both spend the same
+        tokens. The change is appended to the token ledger in the same
+        transaction.
+
         Args:
             user_id (int): User's unique identifier
             amount (int): Number of tokens to deduct
+            reason (str): Ledger reason code
 
         Returns:
             Optional[int]: Updated token balance or None if insufficient tokens
@@ -77,21 +94,14 @@ class TokenService:
             return None
             
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
-                logger.error(f"User {user_id} not found")
-                return None
-                
-            current_balance = getattr(user, 'cyber_token_balance', 0) or 0
-            if current_balance < amount:
-                logger.warning(f"Insufficient tokens for user {user_id}: {current_balance} < {amount}")
+            new_balance = self.debit(user_id, amount)
+            if new_balance is None:
+                self.db.rollback()
+                logger.warning(f"Insufficient tokens or unknown user {user_id}: requested {amount}")
                 return None
 
-            new_balance = current_balance - amount
-            setattr(user, 'cyber_token_balance', new_balance)
+            self.ledger.append(self.db, [LedgerEntry(user_id, -amount, new_balance, reason)])
             self.db.commit()
-            self.db.refresh(user)
-            
             logger.info(f"Deducted {amount} tokens from user {user_id}, new balance: {new_balance}")
             return new_balance
             
@@ -100,6 +110,64 @@ class TokenService:
             self.db.rollback()
             return None
 
+    def debit(self, user_id: int, amount: int, db: Optional[Session] = None) -> Optional[int]:
+        """
+        Atomically deduct tokens inside the caller's transaction.
+
+        Issues a single conditional ``UPDATE`` so concurrent debits can never
+        drive the balance below zero. Does not commit.
+
+        Args:
+            user_id (int): User's unique identifier
+            amount (int): Number of tokens to deduct
+            db (Optional[Session]): Caller's session, defaults to ``self.db``
+
+        Returns:
+            Optional[int]: Updated token balance or None if insufficient tokens
+        """
+        return self._update_balance(
+            db or self.db,
+            user_id,
+            User.cyber_token_balance - amount,
+            User.cyber_token_balance >= amount,
+        )
+
+    def credit(self, user_id: int, amount: int, db: Optional[Session] = None) -> Optional[int]:
+        """
+        Atomically add tokens inside the caller's transaction.
+
+        Does not commit; the caller owns the transaction boundary.
+
+        Args:
+            user_id (int): User's unique identifier
+            amount (int): Number of tokens to add
+            db (Optional[Session]): Caller's session, defaults to ``self.db``
+
+        Returns:
+            Optional[int]: Updated token balance or None if the user does not exist
+        """
+        return self._update_balance(db or self.db, user_id, func.coalesce(User.cyber_token_balance, 0) + amount)
+
+    @staticmethod
+    def _update_balance(db: Session, user_id: int, value, *conditions) -> Optional[int]:
+        """Apply a conditional balance update and return the new balance.
+
+        Uses ``UPDATE ... RETURNING`` where the dialect supports it (PostgreSQL,
+        SQLite >= 3.35). Otherwise the new balance is re-read in the same
+        transaction, which still holds the row's write lock.
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user_id, *conditions)
+            .values(cyber_token_balance=value)
+        )
+        if db.get_bind().dialect.update_returning:
+            return db.execute(stmt.returning(User.cyber_token_balance)).scalar_one_or_none()
+
+        if db.execute(stmt).rowcount != 1:
+            return None
+        return db.query(User.cyber_token_balance).filter(User.id == user_id).scalar()
+
     def get_token_balance(self, user_id: int) -> int:
         """
         Retrieve a user's token balance from the database.
@@ -142,23 +210,39 @@ class TokenService:
         current_balance = self.get_token_balance(user_id)
         return current_balance >= amount
 
-    def get_transaction_history(self, user_id: int, limit: int = 10) -> list:
+    def get_transaction_history(self, user_id: int, limit: int = 10, before_id: Optional[int] = None) -> list:
         """
-        Get token transaction history for a user.
-        
-        Note: This is a placeholder implementation. 
-        In a real system, you would have a separate transaction log table.
+        Get token transaction history for a user from the token ledger.
 
         Args:
             user_id (int): User's unique identifier
             limit (int): Maximum number of transactions to return
+            before_id (Optional[int]): Return entries older than this ledger id
 
         Returns:
-            list: List of transaction records
+            list: List of transaction records, newest first
         """
-        # Placeholder implementation
-        logger.info(f"Transaction history requested for user {user_id} (limit: {limit})")
-        return []
+        if not self.db:
+            logger.error("Database session not available")
+            return []
+
+        try:
+            entries = self.ledger.get_history(self.db, user_id, limit, before_id)
+        except SQLAlchemyError as exc:
+            logger.error(f"Failed to get transaction history for user {user_id}: {exc}")
+            return []
+
+        return [
+            {
+                "id": entry.id,
+                "amount": entry.amount,
+                "balance_after": entry.balance_after,
+                "reason": entry.reason,
+                "action_id": entry.action_id,
+                "created_at": entry.created_at,
+            }
+            for entry in entries
+        ]
 
     def reset_tokens(self, user_id: int, new_balance: int = 0) -> int:
         """
@@ -176,19 +260,128 @@ class TokenService:
             return 0
             
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
+            previous = (
+                self.db.query(User.cyber_token_balance)
+                .filter(User.id == user_id)
+                .with_for_update()
+                .scalar()
+            )
+            balance = self._update_balance(self.db, user_id, new_balance)
+            if balance is None:
+                self.db.rollback()
                 logger.error(f"User {user_id} not found")
                 return 0
-                
-            setattr(user, 'cyber_token_balance', new_balance)
+
+            self.ledger.append(self.db, [LedgerEntry(user_id, balance - (previous or 0), balance, "RESET")])
             self.db.commit()
-            self.db.refresh(user)
-            
             logger.info(f"Reset tokens for user {user_id} to {new_balance}")
-            return new_balance
+            return balance
             
         except Exception as exc:
             logger.error(f"Failed to reset tokens for user {user_id}: {exc}")
             self.db.rollback()
             return self.get_token_balance(user_id)
+
+
+class AsyncTokenService:
+    """``TokenService`` for an ``AsyncSession`` (game and token hot paths).
+
+    Same atomic ``UPDATE`` statements and ledger semantics as the sync
+    service; each database round trip is awaited instead of blocking the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        db: Optional[AsyncSession] = None,
+        repository: Optional[AsyncGameRepository] = None,
+        ledger: Optional[LedgerService] = None,
+    ):
+        self.db = db
+        self.repository = repository or AsyncGameRepository()
+        self.ledger = ledger or LedgerService()
+
+    async def add_tokens(self, user_id: int, amount: int, reason: str = "CREDIT") -> int:
+        """Add tokens and append a ledger entry in one commit; see ``TokenService.add_tokens``."""
+        if not self.db:
+            logger.error("Database session not available")
+            return 0
+
+        try:
+            new_balance = await self.credit(user_id, amount)
+            if new_balance is None:
+                await self.db.rollback()
+                logger.error(f"User {user_id} not found")
+                return 0
+
+            await self.db.run_sync(self.ledger.append, [LedgerEntry(user_id, amount, new_balance, reason)])
+            await self.db.commit()
+            return new_balance
+
+        except Exception as exc:
+            logger.error(f"Failed to add tokens for user {user_id}: {exc}")
+            await self.db.rollback()
+            return await self.get_token_balance(user_id)
+
+    async def deduct_tokens(self, user_id: int, amount: int, reason: str = "DEBIT") -> Optional[int]:
+        """Deduct tokens and append a ledger entry in one commit; see ``TokenService.deduct_tokens``."""
+        if not self.db:
+            logger.error("Database session not available")
+            return None
+
+        try:
+            new_balance = await self.debit(user_id, amount)
+            if new_balance is None:
+                await self.db.rollback()
+                logger.warning(f"Insufficient tokens or unknown user {user_id}: requested {amount}")
+                return None
+
+            await self.db.run_sync(self.ledger.append, [LedgerEntry(user_id, -amount, new_balance, reason)])
+            await self.db.commit()
+            return new_balance
+
+        except Exception as exc:
+            logger.error(f"Failed to deduct tokens for user {user_id}: {exc}")
+            await self.db.rollback()
+            return None
+
+    async def debit(self, user_id: int, amount: int, db: Optional[AsyncSession] = None) -> Optional[int]:
+        """Atomically deduct tokens inside the caller's transaction. Does not commit."""
+        return await self._update_balance(
+            db or self.db,
+            user_id,
+            User.cyber_token_balance - amount,
+            User.cyber_token_balance >= amount,
+        )
+
+    async def credit(self, user_id: int, amount: int, db: Optional[AsyncSession] = None) -> Optional[int]:
+        """Atomically add tokens inside the caller's transaction. Does not commit."""
+        return await self._update_balance(db or self.db, user_id, func.coalesce(User.cyber_token_balance, 0) + amount)
+
+    @staticmethod
+    async def _update_balance(db: AsyncSession, user_id: int, value, *conditions) -> Optional[int]:
+        stmt = (
+            update(User)
+            .where(User.id == user_id, *conditions)
+            .values(cyber_token_balance=value)
+        )
+        if db.get_bind().dialect.update_returning:
+            result = await db.execute(stmt.returning(User.cyber_token_balance))
+            return result.scalar_one_or_none()
+
+        if (await db.execute(stmt)).rowcount != 1:
+            return None
+        return await db.scalar(select(User.cyber_token_balance).where(User.id == user_id))
+
+    async def get_token_balance(self, user_id: int) -> int:
+        """Retrieve a user's token balance from the database."""
+        if not self.db:
+            logger.error("Database session not available")
+            return 0
+
+        try:
+            balance = await self.db.scalar(select(User.cyber_token_balance).where(User.id == user_id))
+        except Exception as exc:
+            logger.error(f"Failed to get token balance for user {user_id}: {exc}")
+            return 0
+        return balance or 0
@@ -1,15 +1,19 @@
-import json
 import logging
-import os
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
 from app import models
+from app.repositories.segment_cache import SegmentCache, segment_cache
+from app.services.game_config import GameConfigRegistry, get_game_config
 
 logger = logging.getLogger(__name__)
 
 class UserSegmentService:
     """Service for retrieving user segment and adjusting game probabilities."""
 
+    CONFIG_KEY = "segments"
+
     DEFAULT_SEGMENT_PROB_ADJUST = {
         "Whale": 0.02,
         "Low": -0.02,
@@ -22,38 +26,34 @@ class UserSegmentService:
         "Low": 0.15,
     }
 
-    def __init__(self, db: Session) -> None:
-        """서비스 초기화. 환경 변수에서 설정을 로드한다."""
-        self.db = db
-        self.SEGMENT_PROB_ADJUST = self._load_json_env(
-            "SEGMENT_PROB_ADJUST_JSON", self.DEFAULT_SEGMENT_PROB_ADJUST
-        )
-        self.HOUSE_EDGE = self._load_json_env(
-            "HOUSE_EDGE_JSON", self.DEFAULT_HOUSE_EDGE
-        )
+    SEGMENT_PROB_ADJUST = DEFAULT_SEGMENT_PROB_ADJUST
+    HOUSE_EDGE = DEFAULT_HOUSE_EDGE
 
-    def _load_json_env(self, name: str, default: dict) -> dict:
-        """환경 변수에서 JSON 구성을 읽어 들인다."""
-        value = os.getenv(name)
-        if not value:
-            return default
-        try:
-            data = json.loads(value)
-            if isinstance(data, dict):
-                return {k: float(v) for k, v in data.items()}
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.warning("%s 파싱 실패: %s", name, e)
-        return default
+    def __init__(
+        self,
+        db: Session,
+        segments: Optional[SegmentCache] = None,
+        config: Optional[GameConfigRegistry] = None,
+    ) -> None:
+        """서비스 초기화. 게임 설정의 현재 버전에서 조정값을 읽는다."""
+        self.db = db
+        self.segments = segments if segments is not None else segment_cache
+        rules = (config or get_game_config()).current.rules_for(type(self))
+        self.SEGMENT_PROB_ADJUST = rules.SEGMENT_PROB_ADJUST
+        self.HOUSE_EDGE = rules.HOUSE_EDGE
 
     def get_segment_label(self, user_id: int) -> str:
+        return self.segments.get_or_load(user_id, lambda: self._load_segment(user_id)) or "Low"
+
+    def _load_segment(self, user_id: int) -> Optional[str]:
         seg = (
             self.db.query(models.UserSegment)
             .filter(models.UserSegment.user_id == user_id)
             .first()
         )
         if not seg or not seg.rfm_group:
-            return "Low"
-        return seg.rfm_group
+            return None
+        return str(seg.rfm_group)
 
     def adjust_probability(self, base_prob: float, segment_label: str) -> float:
         adj = self.SEGMENT_PROB_ADJUST.get(segment_label, 0.0)
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app import models
+from app.repositories.segment_cache import segment_cache
 
 class UserService:
     """Utility service for common user lookups."""
@@ -35,5 +36,6 @@ class UserService:
         )
         self.db.add(segment)
         self.db.commit()
+        segment_cache.invalidate([user_id])
         self.db.refresh(segment)
         return segment
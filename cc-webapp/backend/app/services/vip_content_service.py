@@ -6,57 +6,41 @@ from sqlalchemy.orm import Session
 from app.models import User, UserSegment, AdultContent, VIPAccessLog
 from app.schemas import VIPInfoResponse, VIPExclusiveContentItem, AdultContentGalleryItem
 from app.services.adult_content_service import AdultContentService, ContentStageEnum, STAGE_DETAILS
+from app.services.access_profile import VIP_TIERS, AccessProfile, AccessProfileLoader
 from app.auth.simple_auth import SimpleAuth
+from app.repositories.segment_cache import SegmentCache
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-# Define VIP Tiers (could be more dynamic, e.g., from DB config)
-VIP_TIERS: Dict[str, Dict[str, Any]] = {
-    "Whale": {"tier_name": "Ultimate VIP", "discount_percentage": 0.15, "min_segment_order": STAGE_DETAILS[ContentStageEnum.VIP]["index"]},
-    # Add other VIP tiers if they are distinct from RFM groups
-    # min_segment_order indicates the access level this VIP tier inherently grants
-}
 
 class VIPContentService:
-    def __init__(self, db: Session, adult_content_service: AdultContentService):
+    def __init__(
+        self,
+        db: Session,
+        adult_content_service: AdultContentService,
+        segments: Optional[SegmentCache] = None,
+        profiles: Optional[AccessProfileLoader] = None,
+    ):
         self.db = db
         self.adult_content_service = adult_content_service
+        self.profiles = profiles if profiles is not None else AccessProfileLoader(db, segments)
+
+    def _get_profile(self, user_id: int) -> AccessProfile:
+        """요청 단위로 한 번만 조회되는 접근 프로필"""
+        return self.profiles.get(user_id)
 
     def _get_user_vip_details(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get VIP details for a user based on their segment."""
-        user_segment = self.db.query(UserSegment).filter(UserSegment.user_id == user_id).first()
-        if not user_segment:
-            return None
-            
-        # Safely check if rfm_group exists and convert to string
-        try:
-            rfm_group = str(getattr(user_segment.rfm_group, 'value', user_segment.rfm_group))
-        except (AttributeError, TypeError):
-            return None
-            
-        if rfm_group in VIP_TIERS:
-            return VIP_TIERS.get(rfm_group)
-        return None
+        return self._get_profile(user_id).vip_tier
 
     def _check_user_rank_access(self, user_id: int, required_rank: str) -> bool:
         """사용자의 랭크 기반 접근 권한 확인"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return False
-        return SimpleAuth.check_rank_access(str(user.rank), required_rank)
+        return self._get_profile(user_id).has_rank(required_rank)
 
     def _get_user_segment_level(self, user_id: int) -> int:
         """사용자의 RFM 세그먼트 레벨 반환"""
-        user_segment = self.db.query(UserSegment).filter(UserSegment.user_id == user_id).first()
-        if not user_segment:
-            return 1  # 기본값: Low
-        
-        segment_levels = {
-            "Low": 1,
-            "Medium": 2,
-            "Whale": 3
-        }
-        return segment_levels.get(str(user_segment.rfm_group), 1)
+        # 세그먼트가 없거나 알 수 없으면 Low(1) 취급
+        return max(self._get_profile(user_id).segment_level, 1)
 
     def get_vip_info(self, user_id: int) -> Optional[VIPInfoResponse]:
         """Provides information about the user's VIP status and benefits."""
@@ -140,12 +124,10 @@ class VIPContentService:
 
     def check_combined_vip_access(self, user_id: int, required_rank: str, required_segment_level: int) -> bool:
         """VIP 콘텐츠에 대한 이중 접근 제어 (랭크 + 세그먼트)"""
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+        profile = self._get_profile(user_id)
+        if not profile.exists:
             return False
-        
-        user_segment_level = self._get_user_segment_level(user_id)
         return SimpleAuth.check_combined_access(
-            str(user.rank), user_segment_level,
+            profile.rank, self._get_user_segment_level(user_id),
             required_rank, required_segment_level
         )
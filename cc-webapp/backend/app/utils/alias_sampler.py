@@ -0,0 +1,145 @@
+"""Vose alias tables for O(1) weighted draws, and compiled gacha rarity tables."""
+
+import random
+from functools import lru_cache
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AliasTable(Generic[T]):
+    """Weighted sampler over fixed outcomes using Vose's alias method.
+
+    Building is ``O(n)``; each draw takes one uniform number and costs
+    ``O(1)`` regardless of the number of outcomes. The integer part of
+    ``u * n`` picks a column and the fractional part decides between the
+    column's own outcome and its alias.
+    """
+
+    def __init__(self, outcomes: Sequence[T], weights: Sequence[float]) -> None:
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("outcomes and weights must be non-empty and of equal length")
+        if any(weight < 0 for weight in weights):
+            raise ValueError("weights must be non-negative")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("weights must have a positive sum")
+
+        n = len(outcomes)
+        self.outcomes: List[T] = list(outcomes)
+        self.prob: List[float] = [1.0] * n
+        self.alias: List[int] = list(range(n))
+        scaled = [weight * n / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # 남은 열은 반올림 오차만 있으므로 확률 1로 둔다
+        self.alias_outcomes: List[T] = [self.outcomes[i] for i in self.alias]
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def index(self, u: float) -> int:
+        """Map a uniform draw in [0, 1) to an outcome index."""
+        # u < 1 이면 u * n < n 이므로 열 인덱스 보정이 필요 없다
+        x = u * len(self.prob)
+        column = int(x)
+        return column if x - column < self.prob[column] else self.alias[column]
+
+    def draw(self, rand: Optional[Callable[[], float]] = None) -> T:
+        """Draw one outcome; ``rand`` defaults to ``random.random``."""
+        x = (rand or random.random)() * len(self.prob)
+        column = int(x)
+        return self.outcomes[column] if x - column < self.prob[column] else self.alias_outcomes[column]
+
+    def probabilities(self) -> List[float]:
+        """Per-outcome probabilities implied by the table (for verification)."""
+        n = len(self.prob)
+        result = [p / n for p in self.prob]
+        for column, (p, alias) in enumerate(zip(self.prob, self.alias)):
+            if alias != column:
+                result[alias] += (1.0 - p) / n
+        return result
+
+
+class RarityTable:
+    """A gacha rarity table compiled into one alias table per history state.
+
+    Reproduces the distribution of ``GachaService``'s original linear walk:
+    a rarity seen in the recent history has its probability multiplied by
+    ``history_penalty`` without renormalising, whatever is left of [0, 1)
+    after the walk goes to ``fallback``, and a table summing past 1 is cut
+    off at 1. The history state is a bit mask over the table's rarities, so
+    there are at most ``2 ** len(rarities)`` variants; each is built on first
+    use and cached.
+    """
+
+    def __init__(
+        self,
+        rarity_table: Sequence[Tuple[str, float]],
+        history_penalty: float = 0.5,
+        fallback: str = "Common",
+    ) -> None:
+        self.table: List[Tuple[str, float]] = [(str(name), float(prob)) for name, prob in rarity_table]
+        self.history_penalty = history_penalty
+        self.fallback = fallback
+        self.rarities: List[str] = list(dict.fromkeys(name for name, _ in self.table))
+        self.outcomes: List[str] = self.rarities + ([fallback] if fallback not in self.rarities else [])
+        self.bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(self.rarities)}
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.outcomes)}
+        # 히스토리 mask별 알리아스 테이블 (처음 쓰일 때 생성)
+        self.tables: List[Optional[AliasTable[str]]] = [None] * (1 << len(self.rarities))
+
+    def bit(self, name: str) -> int:
+        """History mask bit of a rarity (0 for names outside the table)."""
+        return self.bits.get(name, 0)
+
+    def mask(self, history: Iterable[str]) -> int:
+        mask = 0
+        for name in history:
+            mask |= self.bits.get(name, 0)
+        return mask
+
+    def distribution(self, mask: int = 0) -> List[float]:
+        """Probability of each outcome after the linear walk for a history mask."""
+        weights = [0.0] * len(self.outcomes)
+        cumulative = 0.0
+        for name, prob in self.table:
+            if mask & self.bits[name]:
+                prob *= self.history_penalty
+            low = min(cumulative, 1.0)
+            cumulative += prob
+            weights[self._index[name]] += max(min(cumulative, 1.0) - low, 0.0)
+        weights[self._index[self.fallback]] += max(1.0 - min(cumulative, 1.0), 0.0)
+        return weights
+
+    def variant(self, mask: int = 0) -> AliasTable[str]:
+        table = self.tables[mask]
+        if table is None:
+            table = self.tables[mask] = AliasTable(self.outcomes, self.distribution(mask))
+        return table
+
+    def variants(self) -> List[AliasTable[str]]:
+        """Every history variant, indexed by mask (builds all of them)."""
+        return [self.variant(mask) for mask in range(1 << len(self.rarities))]
+
+
+@lru_cache(maxsize=32)
+def compile_rarity_table(
+    rarity_table: Tuple[Tuple[str, float], ...],
+    history_penalty: float = 0.5,
+    fallback: str = "Common",
+) -> RarityTable:
+    """
+    Return the compiled ``RarityTable`` for a configuration.
+
+    Compiled tables are shared by every service instance with the same
+    configuration, so a table is built once per configuration version
+    rather than once per request.
+    """
+    return RarityTable(rarity_table, history_penalty, fallback)
@@ -0,0 +1,220 @@
+"""In-memory stand-in for a Kafka cluster with ``confluent_kafka``-style clients.
+
+Used by tests and local runs without a broker. Only the client surface this
+codebase relies on is implemented.
+"""
+
+import threading
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class FakeKafkaError:
+    """Mimics ``confluent_kafka.KafkaError`` (``code()``/``str()``)."""
+
+    _TRANSPORT = -195
+    _MSG_TIMED_OUT = -192
+    _PARTITION_EOF = -191
+
+    def __init__(self, code: int, reason: str = "") -> None:
+        self._code = code
+        self._reason = reason or str(code)
+
+    def code(self) -> int:
+        return self._code
+
+    def __str__(self) -> str:
+        return self._reason
+
+
+class FakeMessage:
+    """Mimics ``confluent_kafka.Message``."""
+
+    def __init__(
+        self,
+        topic: str,
+        partition: int,
+        offset: int,
+        key: Optional[bytes],
+        value: Optional[bytes],
+        error: Optional[FakeKafkaError] = None,
+    ) -> None:
+        self._topic = topic
+        self._partition = partition
+        self._offset = offset
+        self._key = key
+        self._value = value
+        self._error = error
+
+    def topic(self) -> str:
+        return self._topic
+
+    def partition(self) -> int:
+        return self._partition
+
+    def offset(self) -> int:
+        return self._offset
+
+    def key(self) -> Optional[bytes]:
+        return self._key
+
+    def value(self) -> Optional[bytes]:
+        return self._value
+
+    def error(self) -> Optional[FakeKafkaError]:
+        return self._error
+
+
+def _to_bytes(data) -> Optional[bytes]:
+    if data is None or isinstance(data, bytes):
+        return data
+    return str(data).encode("utf-8")
+
+
+class InMemoryKafkaBroker:
+    """Topics of partitioned, append-only logs plus committed group offsets.
+
+    Set ``available = False`` to simulate an outage: producers then get
+    ``_TRANSPORT`` delivery errors.
+    """
+
+    def __init__(self, partitions: int = 4) -> None:
+        self.partitions = partitions
+        self.available = True
+        self._logs: Dict[Tuple[str, int], List[FakeMessage]] = {}
+        self._committed: Dict[Tuple[str, str, int], int] = {}
+        self._lock = threading.RLock()
+
+    def partition_for(self, key: Optional[bytes]) -> int:
+        return zlib.crc32(key or b"") % self.partitions
+
+    def append(self, topic: str, key: Optional[bytes], value: Optional[bytes], partition: Optional[int] = None) -> FakeMessage:
+        with self._lock:
+            partition = self.partition_for(key) if partition is None else partition
+            log = self._logs.setdefault((topic, partition), [])
+            message = FakeMessage(topic, partition, len(log), key, value)
+            log.append(message)
+            return message
+
+    def messages(self, topic: str, partition: Optional[int] = None) -> List[FakeMessage]:
+        with self._lock:
+            if partition is not None:
+                return list(self._logs.get((topic, partition), []))
+            return [m for (t, _), log in sorted(self._logs.items()) if t == topic for m in log]
+
+    def read(self, topic: str, partition: int, offset: int, limit: int) -> List[FakeMessage]:
+        with self._lock:
+            return self._logs.get((topic, partition), [])[offset : offset + limit]
+
+    def end_offset(self, topic: str, partition: int) -> int:
+        with self._lock:
+            return len(self._logs.get((topic, partition), []))
+
+    def commit(self, group: str, topic: str, partition: int, offset: int) -> None:
+        with self._lock:
+            self._committed[(group, topic, partition)] = offset
+
+    def committed(self, group: str, topic: str, partition: int) -> Optional[int]:
+        with self._lock:
+            return self._committed.get((group, topic, partition))
+
+
+class FakeProducer:
+    """``confluent_kafka.Producer`` look-alike writing to an :class:`InMemoryKafkaBroker`.
+
+    ``produce`` only queues locally (raising ``BufferError`` past
+    ``queue_size``); delivery and callbacks happen in ``poll``/``flush``, as
+    with librdkafka.
+    """
+
+    def __init__(self, broker: InMemoryKafkaBroker, queue_size: int = 100_000) -> None:
+        self.broker = broker
+        self.queue_size = queue_size
+        self._queue: List[Tuple[str, Optional[bytes], Optional[bytes], Optional[Callable]]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def produce(self, topic: str, value=None, key=None, callback: Optional[Callable] = None, on_delivery=None, **_) -> None:
+        with self._lock:
+            if len(self._queue) >= self.queue_size:
+                raise BufferError("Local: Queue full")
+            self._queue.append((topic, _to_bytes(key), _to_bytes(value), callback or on_delivery))
+
+    def poll(self, timeout: float = 0) -> int:
+        with self._lock:
+            queued, self._queue = self._queue, []
+        for topic, key, value, callback in queued:
+            if self.broker.available:
+                err, message = None, self.broker.append(topic, key, value)
+            else:
+                err = FakeKafkaError(FakeKafkaError._TRANSPORT, "Local: Broker transport failure")
+                message = FakeMessage(topic, -1, -1, key, value, err)
+            if callback is not None:
+                callback(err, message)
+        return len(queued)
+
+    def flush(self, timeout: float = None) -> int:
+        self.poll(0)
+        return len(self._queue)
+
+
+class FakeConsumer:
+    """``confluent_kafka.Consumer`` look-alike reading from an :class:`InMemoryKafkaBroker`.
+
+    There is no group coordinator: a consumer started as member ``member`` of
+    ``members`` owns the partitions ``p`` with ``p % members == member``, which
+    is what a range/round-robin assignment gives a stable group. Positions
+    start at the group's committed offset (or 0, i.e. ``earliest``) and
+    ``commit()`` stores the current positions.
+    """
+
+    def __init__(self, broker: InMemoryKafkaBroker, config: dict, member: int = 0, members: int = 1) -> None:
+        self.broker = broker
+        self.group_id = config["group.id"]
+        self.member = member
+        self.members = members
+        self._positions: Dict[Tuple[str, int], int] = {}
+        self._closed = False
+
+    def subscribe(self, topics: List[str]) -> None:
+        self.assign(
+            [(topic, p) for topic in topics for p in range(self.broker.partitions) if p % self.members == self.member]
+        )
+
+    def assign(self, partitions: List[Tuple[str, int]]) -> None:
+        self._positions = {}
+        for topic, partition in partitions:
+            committed = self.broker.committed(self.group_id, topic, partition)
+            self._positions[(topic, partition)] = committed or 0
+
+    def assignment(self) -> List[Tuple[str, int]]:
+        return sorted(self._positions)
+
+    def consume(self, num_messages: int = 1, timeout: float = -1) -> List[FakeMessage]:
+        if self._closed:
+            raise RuntimeError("Consumer closed")
+        batch: List[FakeMessage] = []
+        for (topic, partition), position in sorted(self._positions.items()):
+            if len(batch) >= num_messages:
+                break
+            messages = self.broker.read(topic, partition, position, num_messages - len(batch))
+            if messages:
+                self._positions[(topic, partition)] = position + len(messages)
+                batch.extend(messages)
+        return batch
+
+    def poll(self, timeout: float = -1) -> Optional[FakeMessage]:
+        messages = self.consume(1, timeout)
+        return messages[0] if messages else None
+
+    def commit(self, message: Optional[FakeMessage] = None, offsets=None, asynchronous: bool = True) -> None:
+        if message is not None:
+            self.broker.commit(self.group_id, message.topic(), message.partition(), message.offset() + 1)
+            return
+        for (topic, partition), position in self._positions.items():
+            self.broker.commit(self.group_id, topic, partition, position)
+
+    def close(self) -> None:
+        self._closed = True
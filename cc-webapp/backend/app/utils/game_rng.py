@@ -0,0 +1,233 @@
+"""Seedable, replayable random number streams for game outcomes.
+
+Game services draw each round's randomness from a per-round stream
+obtained from an ``RngProvider`` instead of the process-wide ``random``
+state:
+
+- ``KeyedRngProvider`` (``GAME_RNG_SEED`` set) is counter based. Block
+  ``i`` of a stream is ``BLAKE2b(key=server seed, game:user:nonce:i)``, so a
+  round is fully determined by ``(seed, game, user_id, nonce)``. Every
+  committed round is written to the ``app.utils.game_rng.audit`` logger with
+  its nonce and inputs (``write_audit``, called by the settlement service) and
+  can be replayed from that line (``scripts/replay_game_round.py``).
+  Streams share no state, so there is no lock between threads or processes.
+- ``SystemRngProvider`` (no seed) keeps the previous behaviour and draws
+  from ``random``; rounds are not replayable.
+
+``simulation_generator`` gives the vectorized simulator independent NumPy
+Philox streams per chunk of users, so chunks can run in separate processes
+and still reproduce a single-process run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import secrets
+import struct
+import threading
+from typing import Any, Mapping, Optional, Sequence, TypeVar
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = logging.getLogger(__name__)
+audit_logger = logging.getLogger(f"{__name__}.audit")
+
+T = TypeVar("T")
+
+_WORDS = struct.Struct("<8Q")  # BLAKE2b 64바이트 다이제스트 → 64비트 정수 8개
+_TWO_64 = 1 << 64
+
+
+class SystemRngStream:
+    """Draws from the process-wide ``random`` module (looked up per call)."""
+
+    nonce = None
+    draws = 0
+
+    def random(self) -> float:
+        return random.random()
+
+    def randint(self, a: int, b: int) -> int:
+        return random.randint(a, b)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        return random.choice(seq)
+
+    def record(self, **fields: Any) -> None:
+        """Not replayable, so there is no audit record."""
+        return None
+
+
+class KeyedRngStream:
+    """Counter-based stream for one game round.
+
+    Args:
+        key (bytes): Derived server key (see ``KeyedRngProvider``)
+        seed_id (str): Public identifier of the server seed
+        game (str): Game key, e.g. ``"slot"``
+        user_id (int): Player
+        nonce (int): Round nonce; distinct nonces give independent streams
+    """
+
+    __slots__ = ("_key", "_prefix", "_words", "_block", "seed_id", "game", "user_id", "nonce", "draws")
+
+    def __init__(self, key: bytes, seed_id: str, game: str, user_id: int, nonce: int) -> None:
+        self._key = key
+        self._prefix = f"{game}:{user_id}:{nonce}:".encode()
+        self._words: tuple = ()
+        self._block = 0
+        self.seed_id = seed_id
+        self.game = game
+        self.user_id = user_id
+        self.nonce = nonce
+        self.draws = 0
+
+    def _next(self) -> int:
+        """Next uniform 64-bit integer."""
+        index = self.draws % 8
+        if index == 0:
+            digest = hashlib.blake2b(self._prefix + str(self._block).encode(), key=self._key).digest()
+            self._words = _WORDS.unpack(digest)
+            self._block += 1
+        self.draws += 1
+        return self._words[index]
+
+    def random(self) -> float:
+        """Uniform float in [0, 1) with 53 random bits."""
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def randint(self, a: int, b: int) -> int:
+        """Uniform integer in [a, b], without modulo bias."""
+        span = b - a + 1
+        if span <= 0:
+            raise ValueError(f"empty range for randint({a}, {b})")
+        limit = _TWO_64 - _TWO_64 % span
+        while True:
+            word = self._next()
+            if word < limit:
+                return a + word % span
+
+    def choice(self, seq: Sequence[T]) -> T:
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randint(0, len(seq) - 1)]
+
+    def record(self, **fields: Any) -> dict:
+        """Audit record: stream identity, draws used and the round's inputs/outcome."""
+        return {
+            "game": self.game,
+            "user_id": self.user_id,
+            "seed_id": self.seed_id,
+            "nonce": self.nonce,
+            "draws": self.draws,
+            **fields,
+        }
+
+
+
+def write_audit(record: Optional[Mapping[str, Any]]) -> None:
+    """Write one round's audit record as a JSON line; None (unseeded stream) is skipped."""
+    if record is not None:
+        audit_logger.info(json.dumps(record, separators=(",", ":"), default=list))
+
+
+class RngProvider:
+    """Hands out one random stream per game round."""
+
+    seed_id: Optional[str] = None
+
+    def stream(self, game: str, user_id: int, nonce: Optional[int] = None):
+        raise NotImplementedError
+
+
+class SystemRngProvider(RngProvider):
+    """Legacy provider: every round draws from the shared ``random`` state."""
+
+    _stream = SystemRngStream()
+
+    def stream(self, game: str, user_id: int, nonce: Optional[int] = None) -> SystemRngStream:
+        return self._stream
+
+
+class KeyedRngProvider(RngProvider):
+    """Counter-based streams keyed by a server seed.
+
+    Args:
+        seed (bytes): Server seed; keep it secret and stable to allow replays.
+            ``seed_id`` (a hash of it) is what gets logged.
+    """
+
+    def __init__(self, seed: bytes) -> None:
+        if not seed:
+            raise ValueError("RNG seed must not be empty")
+        self._key = hashlib.blake2b(seed, digest_size=32, person=b"cc-game-rng").digest()
+        self.seed_id = hashlib.blake2b(self._key, digest_size=8, person=b"cc-rng-seed-id").hexdigest()
+
+    def stream(self, game: str, user_id: int, nonce: Optional[int] = None) -> KeyedRngStream:
+        """
+        Stream for one round; a fresh random 63-bit nonce unless one is given.
+
+        Args:
+            game (str): Game key
+            user_id (int): Player
+            nonce (Optional[int]): Nonce to reproduce a specific stream
+        """
+        if nonce is None:
+            nonce = secrets.randbits(63)
+        return KeyedRngStream(self._key, self.seed_id, game, user_id, nonce)
+
+    def replay(self, record: Mapping[str, Any]) -> KeyedRngStream:
+        """
+        Rebuild the stream of an audit record.
+
+        Raises:
+            ValueError: The record was produced with a different server seed
+        """
+        if record.get("seed_id") != self.seed_id:
+            raise ValueError(f"record was drawn with seed {record.get('seed_id')}, not {self.seed_id}")
+        return self.stream(record["game"], int(record["user_id"]), int(record["nonce"]))
+
+
+def parse_seed(value: str) -> bytes:
+    """``GAME_RNG_SEED`` value as bytes: hex if it parses as hex, else UTF-8."""
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        return value.encode()
+
+
+_default_provider: Optional[RngProvider] = None
+_default_lock = threading.Lock()
+
+
+def get_rng_provider() -> RngProvider:
+    """Return the process-wide provider (keyed if ``GAME_RNG_SEED`` is set)."""
+    global _default_provider
+    if _default_provider is None:
+        with _default_lock:
+            if _default_provider is None:
+                seed = os.getenv("GAME_RNG_SEED")
+                if seed:
+                    _default_provider = KeyedRngProvider(parse_seed(seed))
+                    logger.info("Game RNG: keyed streams, seed id %s", _default_provider.seed_id)
+                else:
+                    _default_provider = SystemRngProvider()
+                    logger.info("Game RNG: GAME_RNG_SEED not set, outcomes are not replayable")
+    return _default_provider
+
+
+def simulation_generator(seed: int, index: int) -> "np.random.Generator":
+    """
+    Independent NumPy Philox generator for chunk ``index`` of a simulation.
+
+    Equivalent to ``SeedSequence(seed).spawn(...)[index]``, but any process
+    can build chunk ``index`` without building the ones before it.
+    """
+    if np is None:
+        raise RuntimeError("numpy is required for simulation streams")
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed, spawn_key=(index,))))
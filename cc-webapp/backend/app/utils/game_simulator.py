@@ -0,0 +1,640 @@
+"""Vectorized Monte Carlo simulator for the game economy.
+
+Replays the payout rules of ``SlotService``, ``RouletteService``,
+``GachaService`` and ``RPSService`` over arrays of synthetic users, one round
+at a time, so changes to win probabilities, house edges or the rarity table
+can be evaluated before they ship. Rule constants are read from the service
+classes (or a ``tuned`` subclass); nothing touches the database.
+
+Each game gets its own per-user state (slot/roulette streak, gacha pity
+counter and history). In production slot and roulette share one streak key,
+so a user mixing both games is not modelled.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from ..services.gacha_service import GachaService
+from ..services.game_config import tuned  # noqa: F401  (재노출: 기존 import 경로 유지)
+from ..services.roulette_service import RouletteService
+from ..services.rps_service import RPSService
+from ..services.slot_service import SlotService
+from .alias_sampler import compile_rarity_table
+from .game_rng import simulation_generator
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS: Tuple[str, ...] = ("Low", "Medium", "Whale")
+# 세그먼트가 없는 사용자는 서비스에서 "Low"로 취급되므로 Low 비중이 가장 크다
+DEFAULT_SEGMENT_MIX: Dict[str, float] = {"Low": 0.70, "Medium": 0.25, "Whale": 0.05}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for the game simulator")
+
+
+def _by_segment(mapping: Mapping[str, float], default: float) -> "np.ndarray":
+    return np.array([mapping.get(name, default) for name in SEGMENTS], dtype=np.float64)
+
+
+# --- 규칙 커널: 서비스의 난수 한 번을 배열로 받아 결과를 계산 ---
+
+def slot_round(rules: type, streak: "np.ndarray", segment: "np.ndarray", spin: "np.ndarray"):
+    """
+    Resolve one ``SlotService`` spin per user.
+
+    Args:
+        rules (type): ``SlotService`` or a tuned subclass
+        streak (np.ndarray): Losing streak before the spin
+        segment (np.ndarray): Segment codes (indexes into ``SEGMENTS``)
+        spin (np.ndarray): Uniform [0, 1) draws, the service's ``random.random()``
+
+    Returns:
+        Tuple: (payout, streak after the spin, jackpot mask, forced-win mask)
+    """
+    win_prob = rules.BASE_WIN_PROB + np.minimum(streak * rules.STREAK_WIN_BONUS, rules.MAX_STREAK_BONUS)
+    win_prob = win_prob + _by_segment(rules.SEGMENT_WIN_ADJUST, 0.0)[segment]
+    forced = streak >= rules.FORCE_WIN_STREAK
+    jackpot = ~forced & (spin < rules.JACKPOT_PROB)
+    win = forced | (~jackpot & (spin < rules.JACKPOT_PROB + win_prob))
+    payout = np.where(jackpot, rules.JACKPOT_PAYOUT, np.where(win, rules.WIN_PAYOUT, 0))
+    return payout, np.where(jackpot | win, 0, streak + 1), jackpot, forced
+
+
+def roulette_round(
+    rules: type,
+    bet: int,
+    bet_type: str,
+    value: Optional[str],
+    segment: "np.ndarray",
+    number: "np.ndarray",
+):
+    """
+    Resolve one ``RouletteService`` spin per user for a fixed bet.
+
+    Args:
+        rules (type): ``RouletteService`` or a tuned subclass
+        bet (int): Bet already clamped to ``MIN_BET``..``MAX_BET``
+        bet_type (str): 'number', 'color' or 'odd_even'
+        value (Optional[str]): Bet value as sent to the API
+        segment (np.ndarray): Segment codes
+        number (np.ndarray): Winning numbers in 0..36, the service's ``random.randint(0, 36)``
+
+    Returns:
+        Tuple: (payout, jackpot mask)
+    """
+    keep = 1 - _by_segment(rules.HOUSE_EDGE, rules.DEFAULT_HOUSE_EDGE)[segment]
+    jackpot = np.zeros(number.shape, dtype=bool)
+    if bet_type == "number" and value is not None:
+        hit = number == int(value)
+        jackpot = hit & (number == 0)
+        multiplier = rules.ZERO_MULTIPLIER if int(value) == 0 else rules.NUMBER_MULTIPLIER
+    elif bet_type == "color" and value in {"red", "black"}:
+        numbers = rules.RED_NUMBERS if value == "red" else rules.BLACK_NUMBERS
+        hit = (number != 0) & np.isin(number, sorted(numbers))
+        multiplier = rules.EVEN_MONEY_MULTIPLIER
+    elif bet_type == "odd_even" and value in {"odd", "even"}:
+        hit = (number != 0) & ((number % 2 == 0) == (value == "even"))
+        multiplier = rules.EVEN_MONEY_MULTIPLIER
+    else:
+        return np.zeros(number.shape, dtype=np.int64), jackpot
+    return np.where(hit, (bet * multiplier * keep).astype(np.int64), 0), jackpot
+
+
+def gacha_pull(
+    rules: type,
+    prob: "np.ndarray",
+    alias: "np.ndarray",
+    pity_rarity: int,
+    guaranteed: "np.ndarray",
+    count: "np.ndarray",
+    variant: "np.ndarray",
+    rnd: "np.ndarray",
+):
+    """
+    Resolve one ``GachaService`` pull per user, before reward-pool limits.
+
+    Uses the same alias tables as ``GachaService.pull_many`` (stacked by
+    history mask, see ``RarityTable.variants``), so a draw maps to the same
+    rarity. Rarities are indexes into the model's name list, which starts
+    with the compiled table's outcomes.
+
+    Args:
+        rules (type): ``GachaService`` or a tuned subclass
+        prob (np.ndarray): (variants, columns) alias table thresholds
+        alias (np.ndarray): (variants, columns) alias outcomes
+        pity_rarity (int): Index of ``PITY_RARITY``
+        guaranteed (np.ndarray): Per-name mask of ``PITY_RARITIES``
+        count (np.ndarray): Pity counter before the pull
+        variant (np.ndarray): History mask of each user
+        rnd (np.ndarray): Uniform [0, 1) draws, the service's ``random.random()``
+
+    Returns:
+        Tuple: (rarity, pity counter after the pull, pity-triggered mask)
+    """
+    count = count + 1
+    x = rnd * prob.shape[1]
+    column = np.minimum(x.astype(np.int64), prob.shape[1] - 1)
+    rarity = np.where(x - column < prob[variant, column], column, alias[variant, column])
+    pity = (count >= rules.PITY_THRESHOLD) & ~guaranteed[rarity]
+    return np.where(pity, pity_rarity, rarity), np.where(pity, 0, count), pity
+
+
+def rps_round(rules: type, bet: int, choice: str, segment: "np.ndarray", computer: "np.ndarray"):
+    """
+    Resolve one ``RPSService`` game per user for a fixed choice and bet.
+
+    Args:
+        rules (type): ``RPSService`` or a tuned subclass
+        bet (int): Bet amount
+        choice (str): The user's choice
+        segment (np.ndarray): Segment codes
+        computer (np.ndarray): Indexes into ``VALID_CHOICES``, the service's ``random.choice``
+
+    Returns:
+        Tuple: (payout, win mask, draw mask)
+    """
+    draw = computer == rules.VALID_CHOICES.index(choice)
+    win = computer == rules.VALID_CHOICES.index(rules.WINNING_COMBINATIONS[choice])
+    multiplier = _by_segment(rules.WIN_MULTIPLIERS, rules.DEFAULT_WIN_MULTIPLIER)[segment]
+    payout = np.where(win, (bet * multiplier).astype(np.int64), np.where(draw, bet, 0))
+    return payout, win, draw
+
+
+# --- 게임 모델: 사용자별 상태를 들고 한 라운드씩 진행 ---
+
+def _advance_streak(state: Dict[str, Any], streak: "np.ndarray", active: "np.ndarray") -> None:
+    state["streak"] = np.where(active, streak, state["streak"])
+    np.maximum(state["max_streak"], state["streak"], out=state["max_streak"])
+
+
+class GameModel:
+    """
+    One game's rules applied to a chunk of users.
+
+    ``play`` resolves one round for every user, updates per-user state only
+    where ``active`` (the user could pay ``cost``) and returns the payout
+    with per-user event counts. ``state["streak"]`` is the game's losing
+    streak: the service streak for slot and roulette, non-paying games for
+    RPS and pulls since the last ``PITY_RARITIES`` item for gacha.
+    """
+
+    game = ""
+    cost = 0
+    events: Tuple[str, ...] = ()
+
+    def init_state(self, n: int) -> Dict[str, Any]:
+        return {"streak": np.zeros(n, dtype=np.int64), "max_streak": np.zeros(n, dtype=np.int64)}
+
+    def play(self, rng, state: Dict[str, Any], segment, active):
+        raise NotImplementedError
+
+
+class SlotModel(GameModel):
+    game = "slot"
+    events = ("win", "jackpot", "force_win")
+
+    def __init__(self, rules: type = SlotService) -> None:
+        self.rules = rules
+        self.cost = rules.BET
+
+    def play(self, rng, state, segment, active):
+        payout, streak, jackpot, forced = slot_round(self.rules, state["streak"], segment, rng.random(len(segment)))
+        _advance_streak(state, streak, active)
+        return payout, {"win": payout > 0, "jackpot": jackpot, "force_win": forced}
+
+
+class RouletteModel(GameModel):
+    game = "roulette"
+    events = ("win", "jackpot")
+
+    def __init__(
+        self,
+        rules: type = RouletteService,
+        bet: int = 10,
+        bet_type: str = "color",
+        value: Optional[str] = "red",
+    ) -> None:
+        self.rules = rules
+        self.cost = max(rules.MIN_BET, min(bet, rules.MAX_BET))
+        self.bet_type = bet_type
+        self.value = value
+
+    def play(self, rng, state, segment, active):
+        number = rng.integers(0, 37, size=len(segment))
+        payout, jackpot = roulette_round(self.rules, self.cost, self.bet_type, self.value, segment, number)
+        _advance_streak(state, np.where(payout != 0, 0, state["streak"] + 1), active)
+        return payout, {"win": payout > 0, "jackpot": jackpot}
+
+
+class RPSModel(GameModel):
+    game = "rps"
+    events = ("win", "draw")
+
+    def __init__(self, rules: type = RPSService, bet: int = 10, choice: str = "rock") -> None:
+        if choice not in rules.VALID_CHOICES:
+            raise ValueError("Invalid choice. Please select rock, paper, or scissors.")
+        if bet <= 0:
+            raise ValueError("Bet amount must be greater than 0.")
+        self.rules = rules
+        self.cost = bet
+        self.choice = choice
+
+    def play(self, rng, state, segment, active):
+        computer = rng.integers(0, len(self.rules.VALID_CHOICES), size=len(segment))
+        payout, win, draw = rps_round(self.rules, self.cost, self.choice, segment, computer)
+        _advance_streak(state, np.where(payout != 0, 0, state["streak"] + 1), active)
+        return payout, {"win": win, "draw": draw}
+
+
+class GachaModel(GameModel):
+    """
+    ``GachaService.pull`` with per-user pity counter and recent history.
+
+    A finite ``reward_pool`` is shared by all simulated users like the
+    service's process-wide pool; within a pull, stock goes to users in index
+    order (chunks are played one after another).
+    """
+
+    game = "gacha"
+
+    def __init__(
+        self,
+        rules: type = GachaService,
+        count: int = 1,
+        rarity_table: Optional[Sequence[Tuple[str, float]]] = None,
+        reward_pool: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        self.rules = rules
+        self.pulls = 10 if count >= 10 else 1
+        self.cost = rules.TEN_PULL_COST if self.pulls == 10 else rules.SINGLE_PULL_COST
+        table = rarity_table if rarity_table is not None else rules.RARITY_TABLE
+        self.table = compile_rarity_table(
+            tuple((str(name), float(prob)) for name, prob in table), rules.HISTORY_PENALTY, rules.FALLBACK_RARITY
+        )
+        variants = self.table.variants()
+        self.prob = np.array([variant.prob for variant in variants], dtype=np.float64)
+        self.alias = np.array([variant.alias for variant in variants], dtype=np.int64)
+        self.names: List[str] = list(self.table.outcomes)
+        for name in (rules.FALLBACK_RARITY, rules.PITY_RARITY, *sorted(rules.PITY_RARITIES)):
+            if name not in self.names:
+                self.names.append(name)
+        self.fallback = self.names.index(rules.FALLBACK_RARITY)
+        self.pity_rarity = self.names.index(rules.PITY_RARITY)
+        self.guaranteed = np.isin(self.names, sorted(rules.PITY_RARITIES))
+        self.reward_pool = {str(name): int(stock) for name, stock in (reward_pool or {}).items()}
+        self.events = tuple(self.names) + ("pity",)
+
+    def init_state(self, n):
+        state = super().init_state(n)
+        state["count"] = np.zeros(n, dtype=np.int64)
+        # 최근 히스토리 대신 등급별 마지막 등장 순번을 유지:
+        # 최근 HISTORY_SIZE회 안에 나왔으면 히스토리에 있는 것과 같다
+        state["pulls"] = np.zeros(n, dtype=np.int64)
+        state["last_seen"] = np.full((len(self.names), n), -self.rules.HISTORY_SIZE - 1, dtype=np.int64)
+        return state
+
+    def _apply_pool(self, rarity, active):
+        # 재고가 없는 등급은 FALLBACK_RARITY로 대체 (대체된 아이템은 재고를 쓰지 않음)
+        drawn = rarity.copy()
+        for index, name in enumerate(self.names):
+            winners = np.flatnonzero(active & (drawn == index))
+            available = self.reward_pool.get(name, 0)
+            denied = winners[max(available, 0):]
+            if available > 0:
+                self.reward_pool[name] = available - (len(winners) - len(denied))
+            rarity[denied] = self.fallback
+        return rarity
+
+    def play(self, rng, state, segment, active):
+        n = len(segment)
+        drawn = np.zeros((len(self.names), n), dtype=np.int64)
+        pity_count = np.zeros(n, dtype=np.int64)
+        for _ in range(self.pulls):
+            window = state["pulls"] - self.rules.HISTORY_SIZE
+            variant = np.zeros(n, dtype=np.int64)
+            for index in range(len(self.table.rarities)):
+                variant |= (state["last_seen"][index] >= window).astype(np.int64) << index
+            rarity, count, pity = gacha_pull(
+                self.rules,
+                self.prob,
+                self.alias,
+                self.pity_rarity,
+                self.guaranteed,
+                state["count"],
+                variant,
+                rng.random(n),
+            )
+            if self.reward_pool:
+                rarity = self._apply_pool(rarity, active)
+            state["count"] = np.where(active, count, state["count"])
+            for index in range(len(self.names)):
+                hit = active & (rarity == index)
+                np.copyto(state["last_seen"][index], state["pulls"], where=hit)
+                drawn[index] += hit
+            state["pulls"] += active
+            _advance_streak(state, np.where(self.guaranteed[rarity], 0, state["streak"] + 1), active)
+            pity_count += active & pity
+        events = dict(zip(self.names, drawn))
+        events["pity"] = pity_count
+        # 가챠는 아이템만 지급하고 토큰 지급은 없다
+        return np.zeros(n, dtype=np.int64), events
+
+
+# --- 결과 집계 ---
+
+@dataclass
+class SegmentStats:
+    """Totals for one segment (or all segments) of a simulation run."""
+
+    segment: str
+    users: int = 0
+    plays: int = 0
+    wagered: int = 0
+    paid: int = 0
+    net_sum_squares: float = 0.0
+    session_net_sum_squares: float = 0.0
+    broke: int = 0
+    streak_histogram: List[int] = field(default_factory=list)
+    events: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rtp(self) -> float:
+        """Return to player: tokens paid out per token wagered."""
+        return self.paid / self.wagered if self.wagered else 0.0
+
+    @property
+    def net_variance(self) -> float:
+        """Variance of the player's net result (payout - cost) per play."""
+        if not self.plays:
+            return 0.0
+        mean = (self.paid - self.wagered) / self.plays
+        return self.net_sum_squares / self.plays - mean * mean
+
+    @property
+    def session_net_std(self) -> float:
+        """Standard deviation of a user's net result over the whole run."""
+        if not self.users:
+            return 0.0
+        mean = (self.paid - self.wagered) / self.users
+        return max(self.session_net_sum_squares / self.users - mean * mean, 0.0) ** 0.5
+
+    @property
+    def sink_rate(self) -> float:
+        """Tokens removed from circulation per play."""
+        return self.wagered / self.plays if self.plays else 0.0
+
+    @property
+    def source_rate(self) -> float:
+        """Tokens put into circulation per play."""
+        return self.paid / self.plays if self.plays else 0.0
+
+    def streak_percentile(self, q: float) -> int:
+        """Per-user longest losing streak at quantile ``q`` (0..1)."""
+        target = q * self.users
+        seen = 0
+        for streak, users in enumerate(self.streak_histogram):
+            seen += users
+            if users and seen >= target:
+                return streak
+        return 0
+
+    def merge(self, other: "SegmentStats") -> None:
+        self.users += other.users
+        self.plays += other.plays
+        self.wagered += other.wagered
+        self.paid += other.paid
+        self.net_sum_squares += other.net_sum_squares
+        self.session_net_sum_squares += other.session_net_sum_squares
+        self.broke += other.broke
+        size = max(len(self.streak_histogram), len(other.streak_histogram))
+        self.streak_histogram = [
+            (self.streak_histogram[i] if i < len(self.streak_histogram) else 0)
+            + (other.streak_histogram[i] if i < len(other.streak_histogram) else 0)
+            for i in range(size)
+        ]
+        for name, value in other.events.items():
+            self.events[name] = self.events.get(name, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "segment": self.segment,
+            "users": self.users,
+            "plays": self.plays,
+            "wagered": self.wagered,
+            "paid": self.paid,
+            "rtp": self.rtp,
+            "net_variance": self.net_variance,
+            "session_net_std": self.session_net_std,
+            "sink_rate": self.sink_rate,
+            "source_rate": self.source_rate,
+            "broke": self.broke,
+            "streak": {
+                "p50": self.streak_percentile(0.5),
+                "p90": self.streak_percentile(0.9),
+                "p99": self.streak_percentile(0.99),
+                "max": len(self.streak_histogram) - 1 if self.streak_histogram else 0,
+                "histogram": self.streak_histogram,
+            },
+            "events": self.events,
+        }
+
+
+@dataclass
+class SimulationReport:
+    game: str
+    users: int
+    rounds: int
+    seed: Optional[int]
+    segments: Dict[str, SegmentStats]
+    elapsed: float = 0.0
+
+    @property
+    def overall(self) -> SegmentStats:
+        total = SegmentStats("All")
+        for stats in self.segments.values():
+            total.merge(stats)
+        return total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "game": self.game,
+            "users": self.users,
+            "rounds": self.rounds,
+            "seed": self.seed,
+            "elapsed": self.elapsed,
+            "segments": {name: stats.to_dict() for name, stats in self.segments.items()},
+            "overall": self.overall.to_dict(),
+        }
+
+
+def _segment_weights(segment_mix: Optional[Mapping[str, float]]) -> "np.ndarray":
+    mix = dict(segment_mix or DEFAULT_SEGMENT_MIX)
+    unknown = set(mix) - set(SEGMENTS)
+    if unknown:
+        raise ValueError(f"Unknown segment(s): {', '.join(sorted(unknown))}")
+    weights = np.array([float(mix.get(name, 0.0)) for name in SEGMENTS])
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("Segment mix must have non-negative weights with a positive sum")
+    return weights / weights.sum()
+
+
+def _chunk_stats(model: GameModel, segment, plays, wagered, paid, sum_squares, state, wallet) -> List[SegmentStats]:
+    def by_segment(values) -> "np.ndarray":
+        return np.bincount(segment, weights=values, minlength=len(SEGMENTS))
+
+    users = np.bincount(segment, minlength=len(SEGMENTS))
+    session_net = (paid - wagered).astype(np.float64)
+    sums = {
+        "plays": by_segment(plays),
+        "wagered": by_segment(wagered),
+        "paid": by_segment(paid),
+        "net_sum_squares": by_segment(sum_squares),
+        "session_net_sum_squares": by_segment(session_net * session_net),
+        "broke": by_segment(wallet < model.cost) if wallet is not None else np.zeros(len(SEGMENTS)),
+    }
+    chunk = []
+    for code, name in enumerate(SEGMENTS):
+        mine = segment == code
+        chunk.append(SegmentStats(
+            segment=name,
+            users=int(users[code]),
+            plays=int(sums["plays"][code]),
+            wagered=int(sums["wagered"][code]),
+            paid=int(sums["paid"][code]),
+            net_sum_squares=float(sums["net_sum_squares"][code]),
+            session_net_sum_squares=float(sums["session_net_sum_squares"][code]),
+            broke=int(sums["broke"][code]),
+            streak_histogram=np.bincount(state["max_streak"][mine]).tolist(),
+        ))
+    return chunk
+
+
+def simulate(
+    model: GameModel,
+    users: int = 1_000_000,
+    rounds: int = 100,
+    segment_mix: Optional[Mapping[str, float]] = None,
+    seed: Optional[int] = None,
+    balance: Optional[int] = None,
+    chunk_size: int = 500_000,
+    shard: int = 0,
+    shards: int = 1,
+) -> SimulationReport:
+    """
+    Play ``rounds`` rounds of ``model`` for ``users`` synthetic users.
+
+    Users are assigned segments by ``segment_mix`` and processed in chunks of
+    ``chunk_size`` to bound memory; each round is a handful of array
+    operations over the whole chunk.
+
+    Every chunk draws from its own Philox stream derived from ``seed`` and
+    the chunk index, so the chunks can be split over ``shards`` processes
+    and the shard reports combined with ``merge_reports`` give the same
+    result as one run. A finite gacha ``reward_pool`` is per process and is
+    therefore not shared between shards.
+
+    Args:
+        model (GameModel): Game and bet to simulate
+        users (int): Number of synthetic users
+        rounds (int): Plays attempted per user
+        segment_mix (Optional[Mapping[str, float]]): Segment weights, defaults to ``DEFAULT_SEGMENT_MIX``
+        seed (Optional[int]): RNG seed for reproducible runs; a fresh one is
+            drawn (and reported) when None
+        balance (Optional[int]): Starting tokens per user; plays the user cannot
+            pay for are skipped like an insufficient-balance settlement.
+            None means unlimited.
+        chunk_size (int): Users simulated at once
+        shard (int): Index of the chunks this call simulates (``chunk % shards == shard``)
+        shards (int): Number of shards the run is split into
+
+    Returns:
+        SimulationReport: Per-segment totals of the simulated users
+    """
+    _require_numpy()
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard must be in [0, {shards}), got {shard}")
+    weights = _segment_weights(segment_mix)
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+    started = time.perf_counter()
+    segments = {name: SegmentStats(name, events={event: 0 for event in model.events}) for name in SEGMENTS}
+    simulated = 0
+
+    for index, start in enumerate(range(0, users, chunk_size)):
+        if index % shards != shard:
+            continue
+        n = min(chunk_size, users - start)
+        simulated += n
+        rng = simulation_generator(seed, index)
+        segment = rng.choice(len(SEGMENTS), size=n, p=weights)
+        state = model.init_state(n)
+        wallet = np.full(n, balance, dtype=np.int64) if balance is not None else None
+        plays = np.zeros(n, dtype=np.int64)
+        paid = np.zeros(n, dtype=np.int64)
+        sum_squares = np.zeros(n, dtype=np.float64)
+        events = {event: np.zeros(n, dtype=np.int64) for event in model.events}
+        active = np.ones(n, dtype=bool)
+
+        for _ in range(rounds):
+            if wallet is not None:
+                active = wallet >= model.cost
+            payout, round_events = model.play(rng, state, segment, active)
+            payout = np.where(active, payout, 0)
+            net = np.where(active, payout - model.cost, 0)
+            plays += active
+            paid += payout
+            sum_squares += net.astype(np.float64) ** 2
+            if wallet is not None:
+                wallet += net
+            for event, values in round_events.items():
+                events[event] += values * active
+
+        wagered = plays * model.cost
+        for stats in _chunk_stats(model, segment, plays, wagered, paid, sum_squares, state, wallet):
+            stats.events = {
+                event: int(values[segment == SEGMENTS.index(stats.segment)].sum())
+                for event, values in events.items()
+            }
+            segments[stats.segment].merge(stats)
+
+    report = SimulationReport(model.game, simulated, rounds, seed, segments, time.perf_counter() - started)
+    logger.info("Simulated %s: %s users x %s rounds in %.1fs", model.game, simulated, rounds, report.elapsed)
+    return report
+
+
+def merge_reports(reports: Sequence[SimulationReport]) -> SimulationReport:
+    """
+    Combine the shard reports of one run (same game, rounds and seed).
+
+    ``elapsed`` is the slowest shard, i.e. the wall time of a parallel run.
+
+    Raises:
+        ValueError: No reports, or reports from different runs
+    """
+    if not reports:
+        raise ValueError("No reports to merge")
+    first = reports[0]
+    if any((r.game, r.rounds, r.seed) != (first.game, first.rounds, first.seed) for r in reports):
+        raise ValueError("Reports come from different simulation runs")
+    segments = {name: SegmentStats(name, events={event: 0 for event in stats.events})
+                for name, stats in first.segments.items()}
+    for report in reports:
+        for name, stats in report.segments.items():
+            segments[name].merge(stats)
+    return SimulationReport(
+        first.game,
+        sum(r.users for r in reports),
+        first.rounds,
+        first.seed,
+        segments,
+        max(r.elapsed for r in reports),
+    )
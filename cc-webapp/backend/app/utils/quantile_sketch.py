@@ -0,0 +1,96 @@
+"""Mergeable streaming quantile sketch (KLL)."""
+
+import math
+import random
+from typing import Dict, Iterable, List, Optional
+
+
+class KLLSketch:
+    """KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Keeps ``O(k)`` items regardless of stream length; rank error is roughly
+    ``1.65 / k`` (about 1% at the default ``k=200``). Level ``h`` holds items of
+    weight ``2**h``. Sketches built on different shards can be merged and the
+    result has the same error guarantee as one built over the union.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        self.k = k
+        self.n = 0
+        self.compactors: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+        self._max_size = self._capacity(0)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * (2.0 / 3.0) ** depth)) + 1
+
+    def _grow(self) -> None:
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _size(self) -> int:
+        return sum(len(c) for c in self.compactors)
+
+    def _compress(self) -> None:
+        for level in range(len(self.compactors)):
+            if len(self.compactors[level]) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+                items = sorted(self.compactors[level])
+                # 홀수 개면 하나는 현재 레벨에 남겨 가중치 합을 보존
+                self.compactors[level] = [items.pop()] if len(items) % 2 else []
+                self.compactors[level + 1].extend(items[self._rng.randint(0, 1)::2])
+                if self._size() < self._max_size:
+                    break
+
+    def update(self, value: float) -> None:
+        """Add one value to the sketch."""
+        self.compactors[0].append(value)
+        self.n += 1
+        if self._size() >= self._max_size:
+            self._compress()
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold ``other`` into this sketch in place and return ``self``."""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        while self._size() >= self._max_size:
+            self._compress()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return an approximate ``q``-quantile (0..1), or None if empty."""
+        weighted = sorted(
+            (item, 1 << level) for level, items in enumerate(self.compactors) for item in items
+        )
+        if not weighted:
+            return None
+        target = q * sum(weight for _, weight in weighted)
+        cumulative = 0
+        for item, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return item
+        return weighted[-1][0]
+
+    def to_dict(self) -> Dict:
+        return {"k": self.k, "n": self.n, "compactors": [list(c) for c in self.compactors]}
+
+    @classmethod
+    def from_dict(cls, data: Dict, seed: Optional[int] = None) -> "KLLSketch":
+        sketch = cls(k=data["k"], seed=seed)
+        sketch.n = data["n"]
+        sketch.compactors = [list(c) for c in data["compactors"]] or [[]]
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch.compactors)))
+        return sketch
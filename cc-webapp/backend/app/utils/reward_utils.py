@@ -1,12 +1,13 @@
 # cc-webapp/backend/app/utils/reward_utils.py
 import random
 from sqlalchemy.orm import Session
-from sqlalchemy import desc # For ordering
 from datetime import datetime
 import logging
 
 # Assuming models are available via 'from .. import models'
 from .. import models
+from ..repositories.unlock_repository import UnlockRepository
+from .alias_sampler import AliasTable
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +21,7 @@ def _check_eligibility_for_next_unlock_stage(user_id: int, db: Session) -> int |
     Returns the next stage number if eligible and content exists, otherwise None.
     This function DOES NOT perform the unlock or check segment requirements.
     """
-    latest_unlock_reward = db.query(models.UserReward).filter(
-        models.UserReward.user_id == user_id,
-        models.UserReward.reward_type == "CONTENT_UNLOCK"
-    ).order_by(desc(models.UserReward.awarded_at)).first() # Assuming awarded_at defines sequence.
-                                                          # Could also order by CAST(reward_value AS INTEGER) DESC.
-
-    last_stage_unlocked = 0
-    if latest_unlock_reward and latest_unlock_reward.reward_value:
-        try:
-            last_stage_unlocked = int(latest_unlock_reward.reward_value)
-        except ValueError:
-            logger.error(f"_check_eligibility_for_next_unlock_stage: User {user_id}, invalid reward_value '{latest_unlock_reward.reward_value}' for CONTENT_UNLOCK.")
-            last_stage_unlocked = 0 # Or handle as error
+    last_stage_unlocked = UnlockRepository().get_highest_stage(db, user_id)
 
     next_stage = last_stage_unlocked + 1
     if next_stage > MAX_UNLOCK_STAGE:
@@ -105,6 +94,9 @@ GACHA_ITEMS_POOL = [
     {"item_type": "COIN", "details": {"min_amount": 1, "max_amount": 5}, "weight": 50},
 ] # Total weight = 1000
 
+# 풀은 고정이므로 알리아스 테이블을 한 번만 만들어 두고 O(1)로 뽑는다
+GACHA_ITEM_SAMPLER = AliasTable(GACHA_ITEMS_POOL, [item["weight"] for item in GACHA_ITEMS_POOL])
+
 def spin_gacha(user_id: int, db: Session) -> dict:
     """
     Simulates a gacha spin and returns the item won.
@@ -112,8 +104,7 @@ def spin_gacha(user_id: int, db: Session) -> dict:
     1. Deducting gacha cost (if any).
     2. Recording the gacha result as a UserReward.
     3. If CONTENT_UNLOCK is the result, the frontend should then be prompted to call /api/unlock.    """
-    choices, weights = zip(*[(item, item["weight"]) for item in GACHA_ITEMS_POOL])
-    chosen_item_template = random.choices(choices, weights=weights, k=1)[0]
+    chosen_item_template = GACHA_ITEM_SAMPLER.draw()
 
     item_type = chosen_item_template["item_type"]
     details = chosen_item_template["details"]
@@ -136,18 +127,7 @@ def spin_gacha(user_id: int, db: Session) -> dict:
         stage_to_potentially_unlock = details["stage"]
 
         # Check if user has already unlocked this stage or beyond to avoid duplicate "wins" of same stage unlock
-        latest_unlock_reward = db.query(models.UserReward).filter(
-            models.UserReward.user_id == user_id,
-            models.UserReward.reward_type == "CONTENT_UNLOCK"
-        ).order_by(desc(models.UserReward.awarded_at)).first() # Or by int value of stage
-
-        last_stage_unlocked = 0
-        if latest_unlock_reward and hasattr(latest_unlock_reward, 'reward_value') and latest_unlock_reward.reward_value:
-            try:
-                last_stage_unlocked = int(latest_unlock_reward.reward_value)
-            except ValueError: # Should not happen if reward_value for CONTENT_UNLOCK is always int string
-                logger.error(f"spin_gacha: User {user_id}, invalid reward_value '{latest_unlock_reward.reward_value}' for CONTENT_UNLOCK.")
-                last_stage_unlocked = 0
+        last_stage_unlocked = UnlockRepository().get_highest_stage(db, user_id)
 
         if stage_to_potentially_unlock <= last_stage_unlocked:
             # User already unlocked this or a higher stage, give fallback COIN reward
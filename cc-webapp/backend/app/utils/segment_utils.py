@@ -1,38 +1,25 @@
 # cc-webapp/backend/app/utils/segment_utils.py
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, distinct, func, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from datetime import datetime, timedelta
-# Assuming models are defined in ..models
-# from ..models import UserAction, UserSegment # Placeholder
-# from ..database import SessionLocal # Placeholder for getting a DB session
-
-# Placeholder models for development if actual models are not yet available
-# Define these here or assume they are imported
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, DateTime, Float #, ForeignKey
-# from sqlalchemy.orm import relationship
-
-Base = declarative_base()
-
-class UserAction(Base): # Placeholder
-    __tablename__ = "user_actions" # Match your actual table name
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, index=True) # Should ideally be ForeignKey("users.id")
-    action_type = Column(String)
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    # Add a 'value' field if needed for Monetary calculation
-    value = Column(Float, default=0.0)
-
-
-class UserSegment(Base): # Placeholder
-    __tablename__ = "user_segments" # Match your actual table name
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, unique=True, index=True) # Should ideally be ForeignKey("users.id")
-    rfm_group = Column(String, index=True, nullable=True) # Nullable if user has no actions yet
-    risk_profile = Column(String, index=True, nullable=True) # From previous/other logic
-    last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    # Add other fields as per your schema (e.g., streak_count, etc.)
 
+from ..models import RFMThresholdVersion, UserActivityDaily, UserSegment
+from ..repositories.activity_repository import ActivityRepository, window_start
+from ..repositories.segment_cache import segment_cache
+from .sql_utils import bulk_upsert
+
+try:
+    from prometheus_client import Gauge
+except ImportError:  # Optional dependency
+    Gauge = None
+
+logger = logging.getLogger(__name__)
 
 # Define RFM thresholds (these should come from 02_data_personalization_en.md)
 # Using placeholder values/logic here as direct doc parsing isn't feasible for the agent.
@@ -48,7 +35,44 @@ FREQUENCY_THRESHOLDS = {'high': 10, 'mid': 3}
 # Example: Score 5 if monetary >= 100 units, Score 3 if >= 20, else Score 1
 MONETARY_THRESHOLDS = {'high': 100, 'mid': 20}
 
-def get_rfm_score(value, thresholds, higher_is_better=True):
+# Used until a sketch-based version is published (see services/rfm_threshold_service.py)
+DEFAULT_RFM_THRESHOLDS = {
+    'recency': RECENCY_THRESHOLDS,
+    'frequency': FREQUENCY_THRESHOLDS,
+    'monetary': MONETARY_THRESHOLDS,
+}
+
+# Users scored and upserted per transaction
+RFM_CHUNK_SIZE = 10_000
+
+if Gauge is not None:
+    RFM_USERS_TOTAL = Gauge("rfm_job_users_total", "Users with actions in the current RFM window")
+    RFM_USERS_PROCESSED = Gauge("rfm_job_users_processed", "Users scored so far by the current RFM run")
+    RFM_LAST_DURATION = Gauge("rfm_job_last_duration_seconds", "Duration of the last completed RFM run")
+else:
+    RFM_USERS_TOTAL = RFM_USERS_PROCESSED = RFM_LAST_DURATION = None
+
+
+@dataclass
+class RFMJobStats:
+    """Progress of an RFM segmentation run."""
+
+    total: int = 0
+    processed: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+    thresholds_version: Optional[int] = None
+
+    @property
+    def rate(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+def get_rfm_score(value, thresholds, higher_is_better=True, table=None):
+    if isinstance(thresholds, str):
+        # 지표 이름이면 게시된 임계값(table, 기본값은 정적 임계값)에서 조회
+        higher_is_better = thresholds != 'recency'
+        thresholds = (table or DEFAULT_RFM_THRESHOLDS)[thresholds]
     if higher_is_better:
         if value >= thresholds['high']: return 5
         if value >= thresholds['mid']: return 3
@@ -58,116 +82,146 @@ def get_rfm_score(value, thresholds, higher_is_better=True):
         if value <= thresholds['mid']: return 3 # e.g. days <= 30 is a 3
         return 1
 
-def compute_rfm_and_update_segments(db: Session):
-    print(f"[{datetime.utcnow()}] Starting RFM computation and segment update...")
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
 
-    # Query for Recency, Frequency, Monetary based on actions in the last 30 days
-    rfm_data = db.query(
-        UserAction.user_id,
-        func.max(UserAction.timestamp).label("last_action_date"),
-        func.count(UserAction.id).label("frequency"),
-        func.sum(UserAction.value).label("monetary_value")
-    ).filter(UserAction.timestamp >= thirty_days_ago).group_by(UserAction.user_id).all()
-
-    if not rfm_data:
+def load_rfm_thresholds(db: Session) -> Tuple[Optional[int], Dict[str, Dict[str, float]]]:
+    """Return ``(version, thresholds)`` of the latest published RFM thresholds.
+
+    Falls back to ``(None, DEFAULT_RFM_THRESHOLDS)`` when nothing has been
+    published yet. Each entry is in the format ``get_rfm_score`` expects.
+    """
+    latest = db.query(RFMThresholdVersion).order_by(RFMThresholdVersion.version.desc()).first()
+    if latest is None:
+        return None, DEFAULT_RFM_THRESHOLDS
+    return latest.version, latest.thresholds
+
+
+def _score_case(expr, thresholds):
+    """SQL equivalent of ``get_rfm_score(value, thresholds)`` for higher-is-better metrics."""
+    return case((expr >= thresholds['high'], 5), (expr >= thresholds['mid'], 3), else_=1)
+
+
+def _recency_case(last_action, now: datetime, thresholds):
+    # (now - last).days <= N  <=>  last > now - (N + 1) days
+    return case(
+        (last_action > now - timedelta(days=int(thresholds['high']) + 1), 5),
+        (last_action > now - timedelta(days=int(thresholds['mid']) + 1), 3),
+        else_=1,
+    )
+
+
+def _scored_chunk(now: datetime, since: date, after_user_id: Optional[int], limit: int, thresholds):
+    """Score the next ``limit`` users (by id) from their daily activity buckets."""
+    filters = [UserActivityDaily.day >= since]
+    if after_user_id is not None:
+        filters.append(UserActivityDaily.user_id > after_user_id)
+    scores = (
+        select(
+            UserActivityDaily.user_id.label("user_id"),
+            _recency_case(func.max(UserActivityDaily.last_action_at), now, thresholds['recency']).label("r"),
+            _score_case(func.sum(UserActivityDaily.action_count), thresholds['frequency']).label("f"),
+            _score_case(
+                func.coalesce(func.sum(UserActivityDaily.monetary), 0), thresholds['monetary']
+            ).label("m"),
+        )
+        .where(*filters)
+        .group_by(UserActivityDaily.user_id)
+        .order_by(UserActivityDaily.user_id)
+        .limit(limit)
+        .subquery("scores")
+    )
+    # Whale: 모든 점수가 상위, Medium: 최근성과 빈도가 중간 이상
+    rfm_group = case(
+        (and_(scores.c.r >= 4, scores.c.f >= 4, scores.c.m >= 4), "Whale"),
+        (and_(scores.c.r >= 3, scores.c.f >= 3), "Medium"),
+        else_="Low",
+    )
+    return select(scores.c.user_id, scores.c.r, scores.c.f, scores.c.m, rfm_group.label("rfm_group")).order_by(
+        scores.c.user_id
+    )
+
+
+def compute_rfm_and_update_segments(db: Session, chunk_size: int = RFM_CHUNK_SIZE) -> RFMJobStats:
+    """Recompute RFM groups for every user active in the last 30 days.
+
+    Reads the ``user_activity_daily`` buckets maintained on write rather than
+    ``user_actions``, so it is cheap enough to run every few minutes. The
+    window is day-granular: it starts at midnight 30 days ago.
+
+    Scores are computed in SQL for ``chunk_size`` users at a time (keyset
+    pagination on ``user_id``) and each chunk is bulk upserted into
+    ``user_segments`` and committed, so memory stays flat and progress is
+    durable. New segments get ``risk_profile='Unknown'``; existing risk
+    profiles are left untouched. Buckets past retention are pruned at the end.
+    Scores use the latest published sketch-based thresholds, if any. Each
+    committed chunk's users are invalidated in the segment cache.
+    """
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    since = window_start(now)
+    stats = RFMJobStats()
+    stats.thresholds_version, thresholds = load_rfm_thresholds(db)
+    print(f"[{now}] Starting RFM computation and segment update...")
+
+    stats.total = db.execute(
+        select(func.count(distinct(UserActivityDaily.user_id))).where(UserActivityDaily.day >= since)
+    ).scalar_one()
+    if RFM_USERS_TOTAL is not None:
+        RFM_USERS_TOTAL.set(stats.total)
+        RFM_USERS_PROCESSED.set(0)
+    if not stats.total:
         print(f"[{datetime.utcnow()}] No user actions in the last 30 days to process for RFM.")
-        return
-
-    updated_count = 0
-    created_count = 0
-
-    for row in rfm_data:
-        user_id, last_action_date, frequency, monetary_value = row
-        monetary_value = monetary_value or 0.0 # Ensure monetary_value is not None
-
-        recency_days = (datetime.utcnow() - last_action_date).days if last_action_date else 999 # Handle potential None
-
-        r_score = get_rfm_score(recency_days, RECENCY_THRESHOLDS, higher_is_better=False)
-        f_score = get_rfm_score(frequency, FREQUENCY_THRESHOLDS)
-        m_score = get_rfm_score(monetary_value, MONETARY_THRESHOLDS)
-
-        # Simplified RFM group assignment based on typical segmentation.
-        # This should be replaced/refined by rules from 02_data_personalization_en.md.
-        # Current logic:
-        # Whale: All scores are high (>=4 based on example thresholds, let's use score 5 for very top)
-        # Medium: Average or mixed scores
-        # Low: All scores are low
-
-        # Using a common approach for RFM naming:
-        # Whale: R=5, F=5, M=5 (Best Customers)
-        # Champions: R=5, F=4-5, M=4-5
-        # Loyal Customers: F=4-5 (regardless of R, M for simplicity here, or R=3-5, M=3-5)
-        # Potential Loyalists: R=3-5, F=1-3, M=1-3 (Recent, but not frequent)
-        # Big Spenders: M=4-5 (regardless of R, F for simplicity here)
-        # At Risk: R=1-2, F=1-2 (Low Recency, Low Frequency)
-        # Hibernating: R=1-2, F=1-2 (similar to At Risk)
-        # Lost: R=1, F=1 (Lowest scores)
-
-        # Simplified to Whale, Medium, Low as per example in prompt for now
-        if r_score >= 4 and f_score >= 4 and m_score >= 4 : # Example: Top tier scores
-            rfm_group = "Whale"
-        elif r_score >= 3 and f_score >= 3 : # Example: Mid tier (good recency and frequency)
-            rfm_group = "Medium"
-        else:
-            rfm_group = "Low"
-
-        # Alternative simplified logic from prompt:
-        # if r_score >= 4 and f_score >= 4 and m_score >= 4: rfm_group = "Whale"
-        # elif (r_score + f_score + m_score) / 3 >= 2.5: rfm_group = "Medium" # Avg score >= 2.5
-        # else: rfm_group = "Low"
-
-
-        # Update or Create UserSegment
-        user_segment = db.query(UserSegment).filter(UserSegment.user_id == user_id).first()
-        current_time = datetime.utcnow()
-        if user_segment:
-            user_segment.rfm_group = rfm_group
-            user_segment.name = rfm_group
-            user_segment.recency_score = r_score
-            user_segment.frequency_score = f_score
-            user_segment.monetary_score = m_score
-            user_segment.last_updated = current_time
-            updated_count += 1
-        else:
-            user_segment = UserSegment(
-                user_id=user_id,
-                rfm_group=rfm_group,
-                name=rfm_group,
-                recency_score=r_score,
-                frequency_score=f_score,
-                monetary_score=m_score,
-                # risk_profile will be set by another process or if logic is added here
-                last_updated=current_time,
-            )
-            db.add(user_segment)
-            created_count += 1
-
-        # print(f"User {user_id}: R={recency_days}d (Score {r_score}), F={frequency} (Score {f_score}), M={monetary_value} (Score {m_score}) -> RFM Group: {rfm_group}")
+        ActivityRepository().prune(db, now)
+        return stats
 
+    last_user_id = None
     try:
-        db.commit()
-        print(f"[{datetime.utcnow()}] User segments updated: {updated_count} updated, {created_count} created.")
-    except Exception as e:
+        while True:
+            rows = db.execute(_scored_chunk(now, since, last_user_id, chunk_size, thresholds)).all()
+            if not rows:
+                break
+            bulk_upsert(
+                db,
+                UserSegment,
+                [
+                    {
+                        "user_id": row.user_id,
+                        "rfm_group": row.rfm_group,
+                        "name": row.rfm_group,
+                        "risk_profile": "Unknown",
+                        "recency_score": row.r,
+                        "frequency_score": row.f,
+                        "monetary_score": row.m,
+                        "last_updated": now,
+                    }
+                    for row in rows
+                ],
+                ["user_id"],
+                ["rfm_group", "name", "recency_score", "frequency_score", "monetary_score", "last_updated"],
+            )
+            db.commit()
+            segment_cache.invalidate(row.user_id for row in rows)
+
+            last_user_id = rows[-1].user_id
+            stats.processed += len(rows)
+            stats.chunks += 1
+            stats.elapsed = time.perf_counter() - started
+            if RFM_USERS_PROCESSED is not None:
+                RFM_USERS_PROCESSED.set(stats.processed)
+            logger.info(
+                "RFM progress: %s/%s users (%.1f%%), %.0f users/s",
+                stats.processed, stats.total, 100.0 * stats.processed / stats.total, stats.rate,
+            )
+    except SQLAlchemyError as e:
         db.rollback()
-        print(f"[{datetime.utcnow()}] Error updating user segments: {e}")
-
-# Example usage (for testing, not part of the final scheduler call directly)
-# if __name__ == "__main__":
-#     # This requires database.py to be setup and accessible
-#     # from ..database import SessionLocal, engine
-#     # from ..models import Base as ActualBase # Import Base from actual models.py
-#     # ActualBase.metadata.create_all(bind=engine) # Create tables if not exist (for testing)
-#
-#     # db = SessionLocal()
-#     # try:
-#     #     # Add some dummy UserAction data for testing
-#     #     # Example:
-#     #     # db.add(UserAction(user_id=1, action_type="login", value=0, timestamp=datetime.utcnow() - timedelta(days=np.random.randint(1,60))))
-#     #     # for i in range(50): # Add 50 random actions for user 1
-#     #     #    db.add(UserAction(user_id=1, action_type="event", value=np.random.uniform(5,20), timestamp=datetime.utcnow() - timedelta(days=np.random.randint(1,60))))
-#     #     # db.commit()
-#     #     compute_rfm_and_update_segments(db)
-#     # finally:
-#     #     db.close()
-#     pass
+        print(f"[{datetime.utcnow()}] Error updating user segments after {stats.processed} users: {e}")
+        raise
+
+    ActivityRepository().prune(db, now)
+    stats.elapsed = time.perf_counter() - started
+    if RFM_LAST_DURATION is not None:
+        RFM_LAST_DURATION.set(stats.elapsed)
+    print(
+        f"[{datetime.utcnow()}] User segments updated: {stats.processed} users in {stats.chunks} chunks "
+        f"({stats.elapsed:.1f}s, {stats.rate:.0f} users/s)."
+    )
+    return stats
@@ -0,0 +1,116 @@
+"""Dialect-aware bulk SQL helpers."""
+
+import csv
+import io
+from typing import Iterable, List, Sequence
+
+from sqlalchemy import bindparam, case, select, tuple_, update
+from sqlalchemy.orm import Session
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: List[dict],
+    index_elements: Sequence[str],
+    columns: Iterable[str],
+    increment: Iterable[str] = (),
+    greatest: Iterable[str] = (),
+) -> None:
+    """Insert ``rows`` or update ``columns`` where ``index_elements`` already exist.
+
+    Columns listed in ``increment`` are added to the stored value instead of
+    overwriting it, which makes the upsert usable for counters. Columns in
+    ``greatest`` keep the larger of the stored and new value (high-water marks).
+
+    Uses a single ``INSERT ... ON CONFLICT DO UPDATE`` (PostgreSQL, SQLite) or
+    ``ON DUPLICATE KEY UPDATE`` (MySQL) executemany. Other dialects fall back to
+    one keyed ``UPDATE`` executemany plus one ``INSERT`` for the missing rows.
+    Does not commit.
+    """
+    if not rows:
+        return
+    columns, increment, greatest = list(columns), list(increment), list(greatest)
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(model)
+        set_ = {column: stmt.excluded[column] for column in columns}
+        set_.update({column: table.c[column] + stmt.excluded[column] for column in increment})
+        set_.update({column: _greater(table.c[column], stmt.excluded[column]) for column in greatest})
+        stmt = stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+        db.execute(stmt, rows)
+        return
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(model)
+        set_ = {column: stmt.inserted[column] for column in columns}
+        set_.update({column: table.c[column] + stmt.inserted[column] for column in increment})
+        set_.update({column: _greater(table.c[column], stmt.inserted[column]) for column in greatest})
+        stmt = stmt.on_duplicate_key_update(set_)
+        db.execute(stmt, rows)
+        return
+
+    keys = [table.c[name] for name in index_elements]
+    wanted = {tuple(row[name] for name in index_elements) for row in rows}
+    existing = {
+        tuple(found)
+        for found in db.execute(select(*keys).where(tuple_(*keys).in_(list(wanted))))
+    }
+    updates = [
+        {
+            **{f"_key_{name}": row[name] for name in index_elements},
+            **{c: row[c] for c in columns + increment + greatest},
+        }
+        for row in rows
+        if tuple(row[name] for name in index_elements) in existing
+    ]
+    inserts = [row for row in rows if tuple(row[name] for name in index_elements) not in existing]
+    if updates:
+        values = {c: bindparam(c) for c in columns}
+        values.update({c: table.c[c] + bindparam(c) for c in increment})
+        values.update({c: _greater(table.c[c], bindparam(c)) for c in greatest})
+        stmt = update(table).values(values)
+        for name, key in zip(index_elements, keys):
+            stmt = stmt.where(key == bindparam(f"_key_{name}"))
+        db.connection().execute(stmt, updates)
+    if inserts:
+        db.execute(table.insert(), inserts)
+
+
+def _greater(stored, new):
+    # GREATEST()는 SQLite에 없으므로 CASE로 표현
+    return case((new > stored, new), else_=stored)
+
+
+def bulk_insert(db: Session, model, rows: List[dict], columns: Sequence[str]) -> None:
+    """Insert ``rows`` (dicts keyed by ``columns``) in one round trip.
+
+    On PostgreSQL with psycopg2 the rows are streamed with ``COPY ... FROM
+    STDIN``; other backends get a single executemany ``INSERT``. Does not
+    commit.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(["" if row.get(c) is None else row[c] for c in columns])
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+        return
+    db.execute(table.insert(), [{c: row.get(c) for c in columns} for row in rows])
@@ -0,0 +1,377 @@
+"""Pub/sub transports used to fan WebSocket messages out across workers.
+
+Two interchangeable buses implement :class:`PubSubBus`:
+
+* :class:`InMemoryBus` - clients of one process-local broker. Used by tests
+  and single-process deployments that still want the cluster code path.
+* :class:`RespBus` - speaks the Redis wire protocol (RESP ``PUBLISH`` /
+  ``SUBSCRIBE``) over TCP or a unix socket, so it works against a real Redis
+  server or the bundled :class:`LocalPubSubServer` stand-in without needing
+  the ``redis`` package.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, bytes], Awaitable[None]]
+
+
+class PubSubBus:
+    """Channel based publish/subscribe transport (fire-and-forget delivery)."""
+
+    async def publish(self, channel: str, payload: bytes) -> None:
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryBroker:
+    """Process-local broker shared by :class:`InMemoryBus` clients."""
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Set["InMemoryBus"]] = {}
+
+    def publish(self, channel: str, payload: bytes) -> int:
+        receivers = list(self._subscribers.get(channel, ()))
+        for bus in receivers:
+            bus._inbox.put_nowait((channel, payload))
+        return len(receivers)
+
+    def subscribe(self, channel: str, bus: "InMemoryBus") -> None:
+        self._subscribers.setdefault(channel, set()).add(bus)
+
+    def unsubscribe_all(self, bus: "InMemoryBus") -> None:
+        for channel in list(self._subscribers):
+            self._subscribers[channel].discard(bus)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+
+_default_broker = InMemoryBroker()
+
+
+class InMemoryBus(PubSubBus):
+    """One client of an :class:`InMemoryBroker`.
+
+    Messages are handed to subscribers through an inbox drained by a single
+    dispatcher task, so handlers run in publish order and never re-enter the
+    publisher, like with a networked broker.
+    """
+
+    def __init__(self, broker: Optional[InMemoryBroker] = None) -> None:
+        self.broker = broker or _default_broker
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def publish(self, channel: str, payload: bytes) -> None:
+        self.broker.publish(channel, payload)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+        self.broker.subscribe(channel, self)
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while True:
+            channel, payload = await self._inbox.get()
+            for handler in self._handlers.get(channel, ()):
+                try:
+                    await handler(channel, payload)
+                except Exception as exc:
+                    logger.error("Pub/sub handler failed on %s: %s", channel, exc)
+
+    async def close(self) -> None:
+        self.broker.unsubscribe_all(self)
+        self._handlers.clear()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+
+
+# --- RESP (Redis serialization protocol) ---------------------------------------
+
+
+class RespError(Exception):
+    """Error reply (``-ERR ...``) from a RESP server."""
+
+
+def encode_command(*parts) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    out = [b"*%d\r\n" % len(parts)]
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        elif isinstance(part, int):
+            part = str(part).encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(part), part))
+    return b"".join(out)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """Read one RESP value. Bulk strings are returned as ``bytes``."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("RESP connection closed")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        raise RespError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RespError(f"Unexpected RESP type: {line!r}")
+
+
+def _parse_url(url: str) -> Tuple[Optional[str], Optional[int], Optional[str], Optional[str]]:
+    """Split ``redis://[:password@]host[:port]`` or ``unix:///path`` into parts."""
+    parsed = urlparse(url)
+    password = unquote(parsed.password) if parsed.password else None
+    if parsed.scheme == "unix":
+        return None, None, parsed.path, password
+    if parsed.scheme not in ("redis", "tcp"):
+        raise ValueError(f"Unsupported pub/sub URL: {url}")
+    return parsed.hostname or "localhost", parsed.port or 6379, None, password
+
+
+class RespBus(PubSubBus):
+    """Pub/sub over the Redis protocol.
+
+    Uses one connection for ``PUBLISH`` (serialised by a lock) and a second,
+    dedicated subscriber connection whose reader task dispatches pushed
+    messages. The subscriber reconnects with backoff and re-subscribes; a
+    failed publish reconnects once and then raises, leaving retries to the
+    caller's delivery mode.
+    """
+
+    RECONNECT_DELAYS = (0.1, 0.5, 1.0, 2.0, 5.0)
+
+    def __init__(self, url: str, connect_timeout: float = 5.0) -> None:
+        self.url = url
+        self.host, self.port, self.path, self.password = _parse_url(url)
+        self.connect_timeout = connect_timeout
+        self._handlers: Dict[str, List[MessageHandler]] = {}
+        self._pub: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._sub_writer: Optional[asyncio.StreamWriter] = None
+        self._sub_reader: Optional[asyncio.StreamReader] = None
+        self._sub_task: Optional[asyncio.Task] = None
+        self._pub_lock = asyncio.Lock()
+        self._closed = False
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.path:
+            connecting = asyncio.open_unix_connection(self.path)
+        else:
+            connecting = asyncio.open_connection(self.host, self.port)
+        reader, writer = await asyncio.wait_for(connecting, self.connect_timeout)
+        if self.password:
+            writer.write(encode_command("AUTH", self.password))
+            await writer.drain()
+            await read_reply(reader)
+        return reader, writer
+
+    async def publish(self, channel: str, payload: bytes) -> None:
+        async with self._pub_lock:
+            for attempt in range(2):
+                try:
+                    if self._pub is None:
+                        self._pub = await self._open()
+                    reader, writer = self._pub
+                    writer.write(encode_command("PUBLISH", channel, payload))
+                    await writer.drain()
+                    await read_reply(reader)
+                    return
+                except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    self._drop_publisher()
+                    if attempt:
+                        raise
+
+    def _drop_publisher(self) -> None:
+        if self._pub is not None:
+            self._pub[1].close()
+            self._pub = None
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        first = channel not in self._handlers
+        self._handlers.setdefault(channel, []).append(handler)
+        if self._sub_writer is None:
+            self._sub_reader, self._sub_writer = await self._open()
+            self._sub_task = asyncio.create_task(self._listen())
+        if first:
+            self._sub_writer.write(encode_command("SUBSCRIBE", channel))
+            await self._sub_writer.drain()
+
+    async def _listen(self) -> None:
+        failures = 0
+        while not self._closed:
+            try:
+                reply = await read_reply(self._sub_reader)
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                if self._closed:
+                    return
+                delay = self.RECONNECT_DELAYS[min(failures, len(self.RECONNECT_DELAYS) - 1)]
+                failures += 1
+                logger.warning("Pub/sub subscriber lost (%s); reconnecting in %.1fs", exc, delay)
+                await asyncio.sleep(delay)
+                await self._resubscribe()
+                continue
+            if isinstance(reply, list) and reply and reply[0] == b"message":
+                channel = reply[1].decode()
+                for handler in self._handlers.get(channel, ()):
+                    try:
+                        await handler(channel, reply[2])
+                    except Exception as exc:
+                        logger.error("Pub/sub handler failed on %s: %s", channel, exc)
+
+    async def _resubscribe(self) -> None:
+        if self._sub_writer is not None:
+            self._sub_writer.close()
+        try:
+            self._sub_reader, self._sub_writer = await self._open()
+            if self._handlers:
+                self._sub_writer.write(encode_command("SUBSCRIBE", *self._handlers))
+                await self._sub_writer.drain()
+        except (ConnectionError, OSError, asyncio.TimeoutError) as exc:
+            logger.warning("Pub/sub reconnect failed: %s", exc)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._sub_task is not None:
+            self._sub_task.cancel()
+            await asyncio.gather(self._sub_task, return_exceptions=True)
+        if self._sub_writer is not None:
+            self._sub_writer.close()
+        self._drop_publisher()
+
+
+def _subscription_reply(kind: str, channel: str, count: int) -> bytes:
+    """``[kind, channel, count]`` confirmation pushed for (UN)SUBSCRIBE."""
+    # encode_command의 "*2\r\n" 헤더를 3요소 배열 헤더로 교체
+    return b"*3\r\n" + encode_command(kind, channel)[4:] + b":%d\r\n" % count
+
+
+class LocalPubSubServer:
+    """Minimal RESP pub/sub server (``PUBLISH``/``SUBSCRIBE``/``PING``).
+
+    A drop-in stand-in for Redis when only WebSocket fan-out is needed, e.g.
+    several uvicorn workers on one host talking over a unix socket.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> None:
+        self.host = host
+        self.port = port
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._channels: Dict[str, Set[asyncio.StreamWriter]] = {}
+
+    @property
+    def url(self) -> str:
+        if self.path:
+            return f"unix://{self.path}"
+        return f"redis://{self.host}:{self.port}"
+
+    async def start(self) -> "LocalPubSubServer":
+        if self.path:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writers in self._channels.values():
+            for writer in writers:
+                writer.close()
+        self._channels.clear()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        subscribed: Set[str] = set()
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    writer.write(b"-ERR Protocol error\r\n")
+                    continue
+                name = command[0].decode().upper()
+                args = command[1:]
+                if name == "PUBLISH" and len(args) == 2:
+                    receivers = list(self._channels.get(args[0].decode(), ()))
+                    push = encode_command("message", args[0], args[1])
+                    for receiver in receivers:
+                        receiver.write(push)
+                    writer.write(b":%d\r\n" % len(receivers))
+                elif name == "SUBSCRIBE":
+                    for channel in (arg.decode() for arg in args):
+                        self._channels.setdefault(channel, set()).add(writer)
+                        subscribed.add(channel)
+                        writer.write(_subscription_reply("subscribe", channel, len(subscribed)))
+                elif name == "UNSUBSCRIBE":
+                    for channel in [arg.decode() for arg in args] or list(subscribed):
+                        self._channels.get(channel, set()).discard(writer)
+                        subscribed.discard(channel)
+                        writer.write(_subscription_reply("unsubscribe", channel, len(subscribed)))
+                elif name == "PING":
+                    writer.write(b"+PONG\r\n")
+                elif name == "AUTH":
+                    writer.write(b"+OK\r\n")
+                elif name == "QUIT":
+                    writer.write(b"+OK\r\n")
+                    await writer.drain()
+                    return
+                else:
+                    writer.write(b"-ERR unknown command '%s'\r\n" % name.encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, RespError):
+            pass
+        finally:
+            for channel in subscribed:
+                self._channels.get(channel, set()).discard(writer)
+            writer.close()
+
+
+def create_bus(url: Optional[str]) -> Optional[PubSubBus]:
+    """
+    Build a bus from a URL.
+
+    Args:
+        url (Optional[str]): ``memory://``, ``redis://[:password@]host[:port]``
+            or ``unix:///path/to/socket``; empty disables cross-worker fan-out
+
+    Returns:
+        Optional[PubSubBus]: Configured bus, or None
+    """
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return InMemoryBus()
+    return RespBus(url)
@@ -1,34 +1,161 @@
 """WebSocket connection and message management."""
 
+import asyncio
 import logging
-from typing import List
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
 
 from fastapi import WebSocket
 
+from .relay import ClusterRelay, create_relay_from_env
+
+try:
+    from prometheus_client import Counter, Gauge
+except ImportError:  # Optional dependency
+    Counter = Gauge = None
+
 logger = logging.getLogger(__name__)
 
+if Gauge is not None:
+    WS_CONNECTIONS = Gauge("ws_connections", "Open WebSocket connections")
+    WS_QUEUE_DEPTH = Gauge("ws_send_queue_depth", "Messages waiting in WebSocket send queues")
+    WS_SENT = Counter("ws_messages_sent_total", "Messages written to WebSocket connections")
+    WS_EVICTIONS = Counter(
+        "ws_slow_consumer_evictions_total", "Connections closed for not keeping up", ["reason"]
+    )
+else:
+    WS_CONNECTIONS = WS_QUEUE_DEPTH = WS_SENT = WS_EVICTIONS = None
+
+# 1013 Try Again Later: 느린 소비자 연결 종료 코드
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Delivery:
+    """One message queued on several connections; ``on_dropped`` runs once if none of them sent it."""
+
+    def __init__(self, on_dropped: Callable[[], None]) -> None:
+        self.on_dropped = on_dropped
+        self.queued = 0
+        self.sent = False
+
+    def settle(self, sent: bool) -> None:
+        self.sent = self.sent or sent
+        self.queued -= 1
+        if self.queued == 0 and not self.sent:
+            try:
+                self.on_dropped()
+            except Exception:  # noqa: BLE001 - 콜백 오류가 작성자 태스크를 멈추지 않도록
+                logger.exception("WebSocket drop callback failed")
+
+
+@dataclass(eq=False)
+class _Connection:
+    """A registered socket with its own bounded send queue and writer task."""
+
+    websocket: WebSocket
+    user_id: Optional[int]
+    queue: asyncio.Queue
+    writer: Optional[asyncio.Task] = field(default=None, repr=False)
+
 
 class WebSocketManager:
     """
     Manages WebSocket connections and message broadcasting.
-    
-    Handles multiple WebSocket connections, allowing connection,
-    disconnection, and message broadcasting.
+
+    Every connection gets a bounded send queue drained by its own writer task,
+    so ``broadcast`` and ``send_to_user`` only enqueue and never wait on a
+    client. A connection whose queue is full, or whose send does not finish
+    within ``send_timeout`` seconds, is evicted as a slow consumer. Connections
+    are indexed by ``user_id`` (a user may have several sockets open).
+    ``send_to_user`` can take an ``on_dropped`` callback that runs if the
+    message was queued but no connection wrote it (eviction, disconnect or a
+    failed send).
+
+    With a :class:`ClusterRelay` attached, messages for users connected to other
+    workers are routed over the relay's pub/sub bus and ``is_connected`` sees
+    the whole cluster.
     """
 
-    def __init__(self):
-        """Initialize an empty list of active WebSocket connections."""
-        self.active_connections: List[WebSocket] = []
+    def __init__(
+        self, queue_size: int = 256, send_timeout: float = 5.0, relay: Optional[ClusterRelay] = None
+    ):
+        """
+        Initialize an empty connection registry.
+
+        Args:
+            queue_size (int): Per-connection send queue bound
+            send_timeout (float): Seconds a single send may take before eviction
+            relay (Optional[ClusterRelay]): Cross-worker relay, None for single-worker mode
+        """
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.relay = relay
+        if relay is not None:
+            relay.bind(self)
+        self._connections: Dict[WebSocket, _Connection] = {}
+        self._by_user: Dict[int, Set[_Connection]] = {}
+        self.stats = {"sent": 0, "evicted": 0, "dropped": 0}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        """Currently registered WebSocket connections."""
+        return list(self._connections)
+
+    def __contains__(self, websocket: WebSocket) -> bool:
+        return websocket in self._connections
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    def is_connected(self, user_id: int) -> bool:
+        """Whether the user has a socket on this worker or, with a relay, any worker."""
+        if self._by_user.get(user_id):
+            return True
+        return self.relay is not None and self.relay.is_present(user_id)
+
+    def local_users(self) -> List[int]:
+        return list(self._by_user)
+
+    def user_connections(self, user_id: int) -> List[WebSocket]:
+        return [conn.websocket for conn in self._by_user.get(user_id, ())]
+
+    def metrics(self) -> Dict[str, int]:
+        """Snapshot of registry size, queued messages and delivery counters."""
+        metrics = {
+            "connections": len(self._connections),
+            "users": len(self._by_user),
+            "queued": sum(conn.queue.qsize() for conn in self._connections.values()),
+            **self.stats,
+        }
+        if self.relay is not None:
+            metrics.update({f"relay_{key}": value for key, value in self.relay.metrics().items()})
+        return metrics
 
-    async def connect(self, websocket: WebSocket):
+    async def start(self) -> None:
+        """Start cross-worker fan-out (no-op without a relay)."""
+        if self.relay is not None:
+            await self.relay.start()
+
+    async def connect(self, websocket: WebSocket, user_id: Optional[int] = None):
         """
-        Add a new WebSocket connection to active connections.
+        Accept a WebSocket connection and start its writer task.
 
         Args:
             websocket (WebSocket): WebSocket connection to add
+            user_id (Optional[int]): Owner of the connection, used for routing
         """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        conn = _Connection(websocket, user_id, asyncio.Queue(maxsize=self.queue_size))
+        self._connections[websocket] = conn
+        if user_id is not None:
+            user_conns = self._by_user.setdefault(user_id, set())
+            user_conns.add(conn)
+            if len(user_conns) == 1 and self.relay is not None:
+                self.relay.presence_changed(user_id, True)
+        conn.writer = asyncio.create_task(self._writer(conn))
+        if WS_CONNECTIONS is not None:
+            WS_CONNECTIONS.inc()
 
     def disconnect(self, websocket: WebSocket):
         """
@@ -37,24 +164,138 @@ class WebSocketManager:
         Args:
             websocket (WebSocket): WebSocket connection to remove
         """
-        try:
-            self.active_connections.remove(websocket)
-        except ValueError:
+        conn = self._connections.pop(websocket, None)
+        if conn is None:
             logger.warning("Attempted to remove non-existent WebSocket connection")
+            return
+        if conn.user_id is not None:
+            user_conns = self._by_user.get(conn.user_id)
+            if user_conns is not None:
+                user_conns.discard(conn)
+                if not user_conns:
+                    del self._by_user[conn.user_id]
+                    if self.relay is not None:
+                        self.relay.presence_changed(conn.user_id, False)
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+        if WS_CONNECTIONS is not None:
+            WS_CONNECTIONS.dec()
+        if WS_QUEUE_DEPTH is not None:
+            WS_QUEUE_DEPTH.dec(conn.queue.qsize())
+        # 보내지 못한 채 버려지는 메시지를 보낸 쪽에 알린다
+        while not conn.queue.empty():
+            _, delivery = conn.queue.get_nowait()
+            if delivery is not None:
+                delivery.settle(False)
+
+    def _evict(self, conn: _Connection, reason: str) -> None:
+        """Drop a slow or broken consumer and close its socket in the background."""
+        if conn.websocket not in self._connections:
+            return
+        logger.warning("Evicting WebSocket for user %s: %s", conn.user_id, reason)
+        self.stats["evicted"] += 1
+        self.stats["dropped"] += conn.queue.qsize()
+        if WS_EVICTIONS is not None:
+            WS_EVICTIONS.labels(reason=reason).inc()
+        self.disconnect(conn.websocket)
+        asyncio.ensure_future(self._close(conn.websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:  # noqa: BLE001 - socket may already be gone
+            pass
+
+    def _enqueue(self, conn: _Connection, message: str, delivery: Optional[_Delivery] = None) -> bool:
+        try:
+            conn.queue.put_nowait((message, delivery))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            self._evict(conn, "queue_full")
+            return False
+        if delivery is not None:
+            delivery.queued += 1
+        if WS_QUEUE_DEPTH is not None:
+            WS_QUEUE_DEPTH.inc()
+        return True
 
-    async def broadcast(self, message: str):
+    async def _writer(self, conn: _Connection) -> None:
+        """Drain one connection's queue; a failed or slow send evicts it."""
+        while True:
+            message, delivery = await conn.queue.get()
+            if WS_QUEUE_DEPTH is not None:
+                WS_QUEUE_DEPTH.dec()
+            try:
+                await asyncio.wait_for(conn.websocket.send_text(message), self.send_timeout)
+            except asyncio.TimeoutError:
+                if delivery is not None:
+                    delivery.settle(False)
+                self._evict(conn, "send_timeout")
+                return
+            except asyncio.CancelledError:
+                if delivery is not None:
+                    delivery.settle(False)
+                raise
+            except Exception as exc:
+                logger.error(f"Error sending WebSocket message: {exc}")
+                if delivery is not None:
+                    delivery.settle(False)
+                self._evict(conn, "send_error")
+                return
+            if delivery is not None:
+                delivery.settle(True)
+            self.stats["sent"] += 1
+            if WS_SENT is not None:
+                WS_SENT.inc()
+
+    def _broadcast_local(self, message: str) -> int:
+        # 큐 적재 중 퇴출로 딕셔너리가 바뀌므로 스냅샷을 순회
+        return sum(self._enqueue(conn, message) for conn in list(self._connections.values()))
+
+    def _deliver_local(self, user_id: int, message: str, delivery: Optional[_Delivery] = None) -> int:
+        return sum(self._enqueue(conn, message, delivery) for conn in list(self._by_user.get(user_id, ())))
+
+    async def broadcast(self, message: str) -> int:
         """
-        Send a message to all active WebSocket connections.
+        Queue a message for all active WebSocket connections.
 
         Args:
             message (str): Message to broadcast
+
+        Returns:
+            int: Number of local connections the message was queued for
         """
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as exc:
-                logger.error(f"Error broadcasting message: {exc}")
-                self.disconnect(connection)
+        if self.relay is not None:
+            self.relay.broadcast(message)
+        return self._broadcast_local(message)
+
+    async def send_to_user(
+        self, user_id: int, message: str, on_dropped: Optional[Callable[[], None]] = None
+    ) -> int:
+        """
+        Queue a message for every connection of one user.
+
+        Args:
+            user_id (int): Target user
+            message (str): Message to send
+            on_dropped (Optional[Callable[[], None]]): Called once, later, if the
+                message was queued locally but no connection wrote it. Not
+                called when this returns 0, nor for copies routed to other
+                workers over the relay
+
+        Returns:
+            int: Local connections the message was queued for plus remote
+            workers it was routed to
+        """
+        delivery = _Delivery(on_dropped) if on_dropped is not None else None
+        delivered = self._deliver_local(user_id, message, delivery)
+        if self.relay is not None:
+            routed = self.relay.send(user_id, message)
+            if routed and delivery is not None:
+                delivery.sent = True
+            delivered += routed
+        return delivered
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """
@@ -64,8 +305,28 @@ class WebSocketManager:
             message (str): Message to send
             websocket (WebSocket): Target WebSocket connection
         """
+        conn = self._connections.get(websocket)
+        if conn is not None:
+            self._enqueue(conn, message)
+            return
+        # 등록되지 않은 소켓은 직접 전송
         try:
             await websocket.send_text(message)
         except Exception as exc:
             logger.error(f"Error sending personal message: {exc}")
-            self.disconnect(websocket)
+
+    async def close(self) -> None:
+        """Stop all writer tasks and close every connection (used on shutdown)."""
+        conns = list(self._connections.values())
+        for conn in conns:
+            self.disconnect(conn.websocket)
+        if self.relay is not None:
+            await self.relay.close()
+        await asyncio.gather(
+            *(conn.writer for conn in conns if conn.writer is not None), return_exceptions=True
+        )
+        await asyncio.gather(*(conn.websocket.close() for conn in conns), return_exceptions=True)
+
+
+# 프로세스 공용 매니저 (채팅/알림 푸시). WS_BUS_URL 설정 시 워커 간 팬아웃
+manager = WebSocketManager(relay=create_relay_from_env())
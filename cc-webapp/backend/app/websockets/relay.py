@@ -0,0 +1,325 @@
+"""Cross-worker routing of WebSocket messages over a :class:`PubSubBus`."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from .bus import PubSubBus, create_bus
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .chat import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+AT_MOST_ONCE = "at_most_once"
+AT_LEAST_ONCE = "at_least_once"
+DELIVERY_MODES = (AT_MOST_ONCE, AT_LEAST_ONCE)
+
+CHANNEL_PREFIX = "ws"
+BROADCAST_CHANNEL = f"{CHANNEL_PREFIX}:broadcast"
+CONTROL_CHANNEL = f"{CHANNEL_PREFIX}:control"
+
+
+def worker_channel(worker_id: str) -> str:
+    return f"{CHANNEL_PREFIX}:worker:{worker_id}"
+
+
+class ClusterRelay:
+    """Lets any worker deliver to users connected to any other worker.
+
+    Each worker announces which users it holds sockets for on a control
+    channel, so every worker keeps a presence map ``user_id -> workers``.
+    ``send`` routes a message only to the workers holding that user, over
+    their private channel; ``broadcast`` uses a shared channel. Outgoing events
+    are coalesced for ``batch_interval`` seconds and published as one bus
+    message per channel (at most ``batch_size`` events each).
+
+    Delivery modes:
+
+    * ``at_most_once`` - publish and forget.
+    * ``at_least_once`` - the receiving worker acks once the message is queued
+      on the user's sockets; unacked messages are re-published every
+      ``ack_timeout`` seconds up to ``max_retries`` times. Receivers drop
+      duplicates by message id, so users see each message once in practice.
+      Broadcasts are always at-most-once.
+
+    Workers send a heartbeat every ``heartbeat_interval`` seconds; presence of
+    a worker that stays silent for three intervals is discarded.
+    """
+
+    def __init__(
+        self,
+        bus: PubSubBus,
+        delivery: str = AT_MOST_ONCE,
+        worker_id: Optional[str] = None,
+        batch_size: int = 200,
+        batch_interval: float = 0.005,
+        ack_timeout: float = 1.0,
+        max_retries: int = 3,
+        heartbeat_interval: float = 5.0,
+        dedup_size: int = 10_000,
+    ) -> None:
+        if delivery not in DELIVERY_MODES:
+            raise ValueError(f"Unknown delivery mode: {delivery}")
+        self.bus = bus
+        self.delivery = delivery
+        self.worker_id = worker_id or uuid.uuid4().hex[:12]
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+        self.heartbeat_interval = heartbeat_interval
+        self.dedup_size = dedup_size
+
+        self.manager: Optional["WebSocketManager"] = None
+        self._presence: Dict[int, Set[str]] = {}
+        self._worker_users: Dict[str, Set[int]] = {}
+        self._last_seen: Dict[str, float] = {}
+        # (message id, worker) -> (event, attempts, deadline)
+        self._pending: Dict[Tuple[str, str], Tuple[dict, int, float]] = {}
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._outbox: List[Tuple[str, dict]] = []
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+        self.stats = {"published": 0, "received": 0, "retried": 0, "acked": 0, "dropped": 0}
+
+    @property
+    def channel(self) -> str:
+        return worker_channel(self.worker_id)
+
+    def bind(self, manager: "WebSocketManager") -> None:
+        self.manager = manager
+
+    # --- lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Subscribe to the bus, start background tasks and announce this worker."""
+        if self._running:
+            return
+        for channel in (BROADCAST_CHANNEL, CONTROL_CHANNEL, self.channel):
+            await self.bus.subscribe(channel, self._on_message)
+        self._running = True
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._maintenance_loop()),
+        ]
+        self._enqueue(CONTROL_CHANNEL, {"type": "hello"})
+        self._enqueue(CONTROL_CHANNEL, {"type": "snapshot", "users": self._local_users()})
+
+    async def close(self) -> None:
+        """Announce departure, flush pending output and close the bus."""
+        if not self._running:
+            return
+        self._enqueue(CONTROL_CHANNEL, {"type": "leave"})
+        await self._flush()
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.bus.close()
+
+    # --- outbound ----------------------------------------------------------
+
+    def is_present(self, user_id: int) -> bool:
+        """Whether another worker holds a socket for ``user_id``."""
+        return bool(self._presence.get(user_id))
+
+    def remote_workers(self, user_id: int) -> Set[str]:
+        return set(self._presence.get(user_id, ()))
+
+    def send(self, user_id: int, message: str) -> int:
+        """
+        Route a message to the other workers holding ``user_id``.
+
+        Args:
+            user_id (int): Target user
+            message (str): Message text
+
+        Returns:
+            int: Number of remote workers the message was routed to
+        """
+        workers = self._presence.get(user_id)
+        if not self._running or not workers:
+            return 0
+        event = {"type": "deliver", "id": uuid.uuid4().hex, "user_id": user_id, "message": message}
+        if self.delivery == AT_LEAST_ONCE:
+            event["ack"] = True
+        deadline = time.monotonic() + self.ack_timeout
+        for worker in workers:
+            self._enqueue(worker_channel(worker), event)
+            if self.delivery == AT_LEAST_ONCE:
+                self._pending[(event["id"], worker)] = (event, 0, deadline)
+        return len(workers)
+
+    def broadcast(self, message: str) -> None:
+        if self._running:
+            self._enqueue(BROADCAST_CHANNEL, {"type": "broadcast", "message": message})
+
+    def presence_changed(self, user_id: int, online: bool) -> None:
+        """Called by the manager when a user's first socket opens or last closes."""
+        if self._running:
+            self._enqueue(CONTROL_CHANNEL, {"type": "presence", "user_id": user_id, "online": online})
+
+    def _enqueue(self, channel: str, event: dict) -> None:
+        self._outbox.append((channel, event))
+        self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # 짧게 모아서 채널별 한 번에 발행
+            if self.batch_interval:
+                await asyncio.sleep(self.batch_interval)
+            await self._flush()
+
+    async def _flush(self) -> None:
+        self._wakeup.clear()
+        outbox, self._outbox = self._outbox, []
+        batches: Dict[str, List[dict]] = {}
+        for channel, event in outbox:
+            batches.setdefault(channel, []).append(event)
+        for channel, events in batches.items():
+            for start in range(0, len(events), self.batch_size):
+                chunk = events[start : start + self.batch_size]
+                payload = json.dumps({"origin": self.worker_id, "events": chunk}).encode()
+                try:
+                    await self.bus.publish(channel, payload)
+                    self.stats["published"] += len(chunk)
+                except Exception as exc:
+                    # at-least-once 메시지는 재시도 루프가 다시 발행
+                    logger.warning("Pub/sub publish to %s failed: %s", channel, exc)
+
+    async def _maintenance_loop(self) -> None:
+        next_heartbeat = 0.0
+        interval = min(self.ack_timeout, self.heartbeat_interval) / 2
+        while True:
+            now = time.monotonic()
+            if now >= next_heartbeat:
+                self._enqueue(CONTROL_CHANNEL, {"type": "heartbeat"})
+                next_heartbeat = now + self.heartbeat_interval
+                self._expire_workers(now)
+            self._retry_pending(now)
+            await asyncio.sleep(interval)
+
+    def _retry_pending(self, now: float) -> None:
+        for key, (event, attempts, deadline) in list(self._pending.items()):
+            if deadline > now:
+                continue
+            message_id, worker = key
+            if attempts >= self.max_retries or worker not in self._last_seen:
+                del self._pending[key]
+                self.stats["dropped"] += 1
+                logger.warning("Dropping message %s for user %s after %s retries", message_id, event["user_id"], attempts)
+                continue
+            self._pending[key] = (event, attempts + 1, now + self.ack_timeout)
+            self.stats["retried"] += 1
+            self._enqueue(worker_channel(worker), event)
+
+    def _expire_workers(self, now: float) -> None:
+        cutoff = now - 3 * self.heartbeat_interval
+        for worker, seen in list(self._last_seen.items()):
+            if seen < cutoff:
+                logger.warning("Worker %s stopped sending heartbeats; dropping its presence", worker)
+                self._forget_worker(worker)
+
+    # --- inbound -----------------------------------------------------------
+
+    async def _on_message(self, channel: str, payload: bytes) -> None:
+        envelope = json.loads(payload)
+        origin = envelope["origin"]
+        if origin == self.worker_id:
+            return
+        if origin not in self._last_seen:
+            # 처음 보거나 만료시킨 워커: 접속자 스냅샷을 요청 (snapshot은 멱등)
+            self._enqueue(worker_channel(origin), {"type": "hello"})
+        self._last_seen[origin] = time.monotonic()
+        for event in envelope["events"]:
+            self.stats["received"] += 1
+            self._handle(origin, event)
+
+    def _handle(self, origin: str, event: dict) -> None:
+        kind = event["type"]
+        if kind == "deliver":
+            self._handle_deliver(origin, event)
+        elif kind == "ack":
+            if self._pending.pop((event["id"], origin), None) is not None:
+                self.stats["acked"] += 1
+            if not event.get("delivered"):
+                self._set_presence(origin, event["user_id"], False)
+        elif kind == "broadcast":
+            if self.manager is not None:
+                self.manager._broadcast_local(event["message"])
+        elif kind == "presence":
+            self._set_presence(origin, event["user_id"], event["online"])
+        elif kind == "snapshot":
+            self._forget_worker(origin, keep_alive=True)
+            for user_id in event["users"]:
+                self._set_presence(origin, user_id, True)
+        elif kind == "hello":
+            self._enqueue(worker_channel(origin), {"type": "snapshot", "users": self._local_users()})
+        elif kind == "leave":
+            self._forget_worker(origin)
+
+    def _handle_deliver(self, origin: str, event: dict) -> None:
+        message_id = event["id"]
+        if message_id in self._seen:
+            delivered = 1  # 재전송된 중복: 이미 전달했으므로 ack만 다시 보냄
+        else:
+            self._seen[message_id] = None
+            if len(self._seen) > self.dedup_size:
+                self._seen.popitem(last=False)
+            delivered = self.manager._deliver_local(event["user_id"], event["message"]) if self.manager else 0
+        if event.get("ack"):
+            self._enqueue(
+                worker_channel(origin),
+                {"type": "ack", "id": message_id, "user_id": event["user_id"], "delivered": delivered},
+            )
+
+    def _set_presence(self, worker: str, user_id: int, online: bool) -> None:
+        if online:
+            self._presence.setdefault(user_id, set()).add(worker)
+            self._worker_users.setdefault(worker, set()).add(user_id)
+            return
+        workers = self._presence.get(user_id)
+        if workers is not None:
+            workers.discard(worker)
+            if not workers:
+                del self._presence[user_id]
+        self._worker_users.get(worker, set()).discard(user_id)
+
+    def _forget_worker(self, worker: str, keep_alive: bool = False) -> None:
+        for user_id in self._worker_users.pop(worker, set()):
+            self._set_presence(worker, user_id, False)
+        if not keep_alive:
+            self._last_seen.pop(worker, None)
+
+    def _local_users(self) -> List[int]:
+        return self.manager.local_users() if self.manager is not None else []
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._last_seen),
+            "remote_users": len(self._presence),
+            "pending_acks": len(self._pending),
+            **self.stats,
+        }
+
+
+def create_relay_from_env() -> Optional[ClusterRelay]:
+    """
+    Build a relay from ``WS_BUS_URL`` / ``WS_DELIVERY_MODE``.
+
+    ``WS_BUS_URL`` accepts ``memory://``, ``redis://[:password@]host[:port]``
+    or ``unix:///path``. Unset means single-worker mode (no relay).
+    """
+    bus = create_bus(os.getenv("WS_BUS_URL"))
+    if bus is None:
+        return None
+    return ClusterRelay(bus, delivery=os.getenv("WS_DELIVERY_MODE", AT_MOST_ONCE))
@@ -60,3 +60,13 @@ def clear_prometheus_registry():
                     pass
     except Exception:
         pass
+
+
+@pytest.fixture(autouse=True)
+def clear_segment_cache():
+    """Forget cached user segments between tests (ids are reused across test databases)."""
+    from app.repositories.segment_cache import segment_cache
+
+    segment_cache.invalidate()
+    yield
+    segment_cache.invalidate()
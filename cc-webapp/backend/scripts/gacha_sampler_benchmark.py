@@ -0,0 +1,165 @@
+"""Benchmark and distribution check for the alias-method gacha samplers.
+
+1. For every history state of the rarity table, compares the distribution
+   implied by the compiled alias table with the exact distribution of the
+   previous linear walk (cumulative sum, history halving, fallback).
+2. Runs ``--pulls`` pulls through the previous implementation and through
+   ``GachaService.pull_many`` (pity and history included), then reports
+   throughput and a two-sample chi-square test on the rarity counts.
+3. Does the same for ``spin_gacha``'s item pool (``random.choices`` against
+   ``GACHA_ITEM_SAMPLER``).
+
+Usage:
+    python scripts/gacha_sampler_benchmark.py --pulls 1000000
+    GACHA_RARITY_TABLE='[["SSR", 0.01], ["SR", 0.1], ["R", 0.89]]' python scripts/gacha_sampler_benchmark.py
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.gacha_service import GachaService  # noqa: E402
+from app.utils.reward_utils import GACHA_ITEM_SAMPLER, GACHA_ITEMS_POOL  # noqa: E402
+
+# 표준정규 99.9% 분위수 (카이제곱 분위수의 Wilson-Hilferty 근사에 사용)
+Z_999 = 3.09
+
+
+def legacy_pull_many(
+    service: GachaService, pulls: int, count: int, history: List[str]
+) -> Tuple[List[str], int, List[str]]:
+    """The pull loop ``GachaService`` used before alias tables."""
+    results: List[str] = []
+    for _ in range(pulls):
+        count += 1
+        pity = count >= service.PITY_THRESHOLD
+        rnd = random.random()
+        cumulative = 0.0
+        rarity = service.FALLBACK_RARITY
+        for name, prob in service.rarity_table:
+            adj_prob = prob
+            if history and name in history:
+                adj_prob *= service.HISTORY_PENALTY
+            cumulative += adj_prob
+            if rnd <= cumulative:
+                rarity = name
+                break
+        if pity and rarity not in service.PITY_RARITIES:
+            rarity = service.PITY_RARITY
+            count = 0
+        results.append(rarity)
+        history.insert(0, rarity)
+        history = history[:service.HISTORY_SIZE]
+    return results, count, history
+
+
+def chi_square(a: Dict, b: Dict) -> Tuple[float, int]:
+    """Two-sample chi-square statistic and degrees of freedom."""
+    total_a, total_b = sum(a.values()), sum(b.values())
+    ka, kb = (total_b / total_a) ** 0.5, (total_a / total_b) ** 0.5
+    statistic, cells = 0.0, 0
+    for key in set(a) | set(b):
+        x, y = a.get(key, 0), b.get(key, 0)
+        if x + y:
+            cells += 1
+            statistic += (ka * x - kb * y) ** 2 / (x + y)
+    return statistic, max(cells - 1, 1)
+
+
+def verdict(statistic: float, dof: int) -> str:
+    limit = dof * (1 - 2 / (9 * dof) + Z_999 * (2 / (9 * dof)) ** 0.5) ** 3
+    return f"chi2={statistic:.2f} dof={dof} ({'same' if statistic < limit else 'DIFFERENT'} at 99.9%, limit {limit:.2f})"
+
+
+def run_gacha(service: GachaService, pulls: int, batch: int, use_alias: bool) -> Tuple[Dict[str, int], float]:
+    counts: Dict[str, int] = {}
+    count, history = 0, []
+    started = time.perf_counter()
+    for _ in range(pulls // batch):
+        if use_alias:
+            draw = service.pull_many(batch, count, history)
+            results, count, history = draw.results, draw.count, draw.history
+        else:
+            results, count, history = legacy_pull_many(service, batch, count, history)
+        for rarity in results:
+            counts[rarity] = counts.get(rarity, 0) + 1
+    return counts, time.perf_counter() - started
+
+
+def run_items(draws: int, use_alias: bool) -> Tuple[Dict[int, int], float]:
+    counts: Dict[int, int] = {}
+    index = {id(item): i for i, item in enumerate(GACHA_ITEMS_POOL)}
+    started = time.perf_counter()
+    for _ in range(draws):
+        if use_alias:
+            item = GACHA_ITEM_SAMPLER.draw()
+        else:
+            choices, weights = zip(*[(item, item["weight"]) for item in GACHA_ITEMS_POOL])
+            item = random.choices(choices, weights=weights, k=1)[0]
+        counts[index[id(item)]] = counts.get(index[id(item)], 0) + 1
+    return counts, time.perf_counter() - started
+
+
+def print_exact(service: GachaService) -> float:
+    compiled = service.sampler
+    worst = 0.0
+    for mask, variant in enumerate(compiled.variants()):
+        expected = compiled.distribution(mask)
+        error = max(abs(a - b) for a, b in zip(variant.probabilities(), expected))
+        worst = max(worst, error)
+        history = ",".join(name for name in compiled.rarities if mask & compiled.bit(name)) or "-"
+        shown = " ".join(f"{name}={p:.6f}" for name, p in zip(compiled.outcomes, expected))
+        print(f"  history {history:<28} {shown}  max err {error:.1e}")
+    return worst
+
+
+def print_counts(label: str, counts: Dict, total: int, elapsed: float, names: Sequence) -> None:
+    shown = " ".join(f"{name}={counts.get(key, 0) / total:.5f}" for key, name in names)
+    print(f"  {label:<8} {total / elapsed:>12,.0f} draws/s  {shown}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pulls", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10, help="pulls per request (1 or 10)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    service = GachaService()
+
+    print("alias tables vs. linear walk (exact):")
+    worst = print_exact(service)
+
+    print(f"\ngacha pulls ({args.pulls:,} in batches of {args.batch}):")
+    random.seed(args.seed)
+    legacy, legacy_elapsed = run_gacha(service, args.pulls, args.batch, use_alias=False)
+    alias, alias_elapsed = run_gacha(service, args.pulls, args.batch, use_alias=True)
+    names = [(name, name) for name in service.sampler.outcomes + [service.PITY_RARITY] if name in legacy or name in alias]
+    names = list(dict.fromkeys(names))
+    print_counts("linear", legacy, sum(legacy.values()), legacy_elapsed, names)
+    print_counts("alias", alias, sum(alias.values()), alias_elapsed, names)
+    gacha_check = chi_square(legacy, alias)
+    print(f"  speedup x{legacy_elapsed / alias_elapsed:.2f}, {verdict(*gacha_check)}")
+
+    print(f"\nspin_gacha item pool ({args.pulls:,} draws):")
+    choices, choices_elapsed = run_items(args.pulls, use_alias=False)
+    items, items_elapsed = run_items(args.pulls, use_alias=True)
+    names = [(i, f"#{i}") for i in range(len(GACHA_ITEMS_POOL))]
+    print_counts("choices", choices, args.pulls, choices_elapsed, names)
+    print_counts("alias", items, args.pulls, items_elapsed, names)
+    items_check = chi_square(choices, items)
+    print(f"  speedup x{choices_elapsed / items_elapsed:.2f}, {verdict(*items_check)}")
+
+    same = worst < 1e-12 and "DIFFERENT" not in verdict(*gacha_check) + verdict(*items_check)
+    print(f"\ndistribution unchanged: {'yes' if same else 'NO'}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,56 +1,56 @@
+"""Materialize ``topic_user_actions`` into the database.
+
+Usage:
+    python scripts/kafka_consumer.py [--workers 4] [--batch-size 500]
+
+Each worker is a separate process in the same consumer group, so partitions
+are processed in parallel. Offsets are committed only after a batch is
+written to the database.
+"""
+
+import argparse
+import functools
+import logging
 import os
-import json
-from confluent_kafka import Consumer, KafkaException, KafkaError
-
-KAFKA_BROKER = os.getenv("KAFKA_BROKER", "localhost:9092")
-TOPIC_USER_ACTIONS = "topic_user_actions"
-GROUP_ID = "user_actions_consumer_group" # Example group ID
-
-conf = {
-    'bootstrap.servers': KAFKA_BROKER,
-    'group.id': GROUP_ID,
-    'auto.offset.reset': 'earliest' # Start reading at the earliest message if no offset is stored
-}
-
-consumer = Consumer(conf)
-
-try:
-    consumer.subscribe([TOPIC_USER_ACTIONS])
-    print(f"Subscribed to topic: {TOPIC_USER_ACTIONS} with group ID: {GROUP_ID}")
-    print(f"Broker: {KAFKA_BROKER}")
-    print("Waiting for messages... (Ctrl+C to exit)")
-
-    while True:
-        msg = consumer.poll(timeout=1.0) # Poll for messages with a 1-second timeout
-
-        if msg is None:
-            continue
-        if msg.error():
-            if msg.error().code() == KafkaError._PARTITION_EOF:
-                # End of partition event
-                print(f'{msg.topic()} [{msg.partition()}] reached end at offset {msg.offset()}')
-            elif msg.error():
-                print(f"Kafka error: {msg.error()}") # More direct error printing
-                # raise KafkaException(msg.error()) # Raising might stop the consumer prematurely for some errors
-            else:
-                print(f"Unknown Kafka error: {msg.error()}")
-        else:
-            # Message is normal
-            try:
-                payload = json.loads(msg.value().decode('utf-8'))
-                print(f"Received message from {msg.topic()} [{msg.partition()}] at offset {msg.offset()}:")
-                print(json.dumps(payload, indent=2))
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON: {msg.value().decode('utf-8')}")
-            except Exception as e:
-                print(f"An error occurred while processing message: {e}")
-except KeyboardInterrupt:
-    print("Aborted by user")
-except KafkaException as ke:
-    print(f"A KafkaException occurred: {ke}")
-except Exception as e:
-    print(f"An unexpected error occurred: {e}")
-finally:
-    # Close down consumer to commit final offsets.
-    consumer.close()
-    print("Consumer closed.")
+import signal
+import sys
+import multiprocessing
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.action_event_producer import TOPIC_USER_ACTIONS  # noqa: E402
+from app.services.action_stream_consumer import (  # noqa: E402
+    DEFAULT_GROUP_ID,
+    kafka_consumer_factory,
+    run_workers,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--broker", default=os.getenv("KAFKA_BROKER", "localhost:9092"))
+    parser.add_argument("--group", default=os.getenv("ACTION_CONSUMER_GROUP", DEFAULT_GROUP_ID))
+    parser.add_argument("--topic", default=TOPIC_USER_ACTIONS)
+    parser.add_argument("--workers", type=int, default=1, help="consumer processes (<= partition count)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--poll-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    stop_event = multiprocessing.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop_event.set())
+
+    run_workers(
+        args.workers,
+        functools.partial(kafka_consumer_factory, args.broker, args.group),
+        stop_event=stop_event,
+        group_id=args.group,
+        topic=args.topic,
+        batch_size=args.batch_size,
+        poll_timeout=args.poll_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
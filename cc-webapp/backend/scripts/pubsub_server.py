@@ -0,0 +1,49 @@
+"""Run the local RESP pub/sub stand-in used for cross-worker WebSocket fan-out.
+
+Lets several uvicorn workers share WebSocket delivery without a Redis server.
+
+Usage:
+    python scripts/pubsub_server.py --path /tmp/cc-ws.sock
+    WS_BUS_URL=unix:///tmp/cc-ws.sock uvicorn app.main:app --workers 4
+
+    python scripts/pubsub_server.py --host 127.0.0.1 --port 6390
+    WS_BUS_URL=redis://127.0.0.1:6390 uvicorn app.main:app --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.websockets.bus import LocalPubSubServer  # noqa: E402
+
+logger = logging.getLogger("pubsub_server")
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = await LocalPubSubServer(host=args.host, port=args.port, path=args.path).start()
+    logger.info("Pub/sub stand-in listening on %s", server.url)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    parser.add_argument("--path", help="Listen on a unix socket instead of TCP")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
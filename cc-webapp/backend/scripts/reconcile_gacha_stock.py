@@ -0,0 +1,45 @@
+"""Reconciliation report for the gacha reward stock.
+
+Prints allocated, remaining and granted units per rarity and flags rarities
+whose shards do not add up (``allocated != remaining + granted``) or that
+were oversold. Exits with status 1 if any rarity is flagged.
+
+Usage:
+    GACHA_INVENTORY_BACKEND=sql python scripts/reconcile_gacha_stock.py
+    GACHA_INVENTORY_BACKEND=sql python scripts/reconcile_gacha_stock.py --json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.repositories.reward_inventory import get_reward_inventory  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    report = get_reward_inventory().reconcile()
+    flagged = [row for row in report if row["drift"] or row["oversold"]]
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'rarity':<16}{'allocated':>10}{'remaining':>10}{'granted':>10}{'shards':>8}{'drift':>8}  status")
+        for row in report:
+            status = "OVERSOLD" if row["oversold"] else "DRIFT" if row["drift"] else "ok"
+            print(f"{row['rarity']:<16}{row['allocated']:>10}{row['remaining']:>10}{row['granted']:>10}"
+                  f"{row['shards']:>8}{row['drift']:>8}  {status}")
+        if not report:
+            print("no limited stock configured")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Replay game rounds from the RNG audit log.
+
+With ``GAME_RNG_SEED`` set, every committed slot, roulette, RPS and gacha
+round is written to the ``app.utils.game_rng.audit`` logger as one JSON line
+with its stream nonce, inputs and outcome. This script rebuilds each round's stream
+from the same seed and re-runs the service's outcome logic on an in-memory
+repository holding the logged pre-round state (streak, pity counter,
+history). It prints one line per round and exits non-zero if any outcome
+differs. Rules come from the current game config; a warning is printed
+when the round was played on another config version.
+
+Log lines may carry a formatter prefix; everything before the first ``{``
+is ignored.
+
+Usage:
+    GAME_RNG_SEED=<seed> python scripts/replay_game_round.py audit.log
+    python scripts/replay_game_round.py --seed <seed> - < audit.log
+    python scripts/replay_game_round.py audit.log --nonce 1234567890
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, Iterator, Mapping
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.repositories.game_repository import GameRepository  # noqa: E402
+from app.repositories.game_state import InMemoryGameStateBackend  # noqa: E402
+from app.services.gacha_service import GachaService  # noqa: E402
+from app.services.game_config import get_game_config  # noqa: E402
+from app.services.roulette_service import RouletteService  # noqa: E402
+from app.services.rps_service import RPSService  # noqa: E402
+from app.services.slot_service import SlotService  # noqa: E402
+from app.utils.game_rng import KeyedRngProvider, parse_seed  # noqa: E402
+
+
+def read_records(lines) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        start = line.find("{")
+        if start < 0:
+            continue
+        try:
+            record = json.loads(line[start:])
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and "nonce" in record:
+            yield record
+
+
+def replay(provider: KeyedRngProvider, record: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Re-run one audited round.
+
+    Returns:
+        Dict[str, Any]: The outcome fields of ``record`` as recomputed
+    """
+    stream = provider.replay(record)
+    repo = GameRepository(state=InMemoryGameStateBackend())
+    user_id = int(record["user_id"])
+    game = record["game"]
+
+    if game == SlotService.CONFIG_KEY:
+        repo.set_streak(user_id, int(record["streak"]))
+        outcome = SlotService(repo, rng=provider)._outcome(user_id, record["segment"], stream)
+        return {"result": outcome.detail[0], "payout": outcome.payout}
+    if game == RouletteService.CONFIG_KEY:
+        outcome = RouletteService(repo, rng=provider)._outcome(
+            user_id, record["bet"], record["bet_type"], record["value"], record["segment"], stream
+        )
+        return {"number": outcome.detail[0], "payout": outcome.payout}
+    if game == RPSService.CONFIG_KEY:
+        outcome = RPSService(repo, rng=provider)._outcome(
+            user_id, record["choice"], record["bet"], record["segment"], stream
+        )
+        computer_choice, result = outcome.detail
+        return {"computer_choice": computer_choice, "result": result, "payout": outcome.payout}
+    if game == GachaService.CONFIG_KEY:
+        # 재고 소진으로 대체된 뽑기는 로그에 기록된 결과 그대로 재현
+        recorded = iter(record["results"])
+        draw = GachaService(repo, rng=provider).pull_many(
+            int(record["pulls"]),
+            int(record["count"]),
+            list(record["history"]),
+            stream.random,
+            lambda rarity: next(recorded, None) == rarity,
+        )
+        return {"results": draw.results}
+    raise ValueError(f"Unknown game {game!r}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="audit log file, or - for stdin")
+    parser.add_argument("--seed", default=os.getenv("GAME_RNG_SEED"), help="server seed (default: GAME_RNG_SEED)")
+    parser.add_argument("--nonce", type=int, action="append", default=[], help="only replay these rounds")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if not args.seed:
+        parser.error("--seed or GAME_RNG_SEED is required")
+
+    provider = KeyedRngProvider(parse_seed(args.seed))
+    version = get_game_config().current.version
+    source = sys.stdin if args.log == "-" else open(args.log, encoding="utf-8")
+    replayed = mismatched = 0
+    with source:
+        for record in read_records(source):
+            if args.nonce and record["nonce"] not in args.nonce:
+                continue
+            replayed += 1
+            label = f"{record['game']} user={record['user_id']} nonce={record['nonce']}"
+            if record.get("config_version") != version:
+                print(f"warning: {label} was played on config v{record.get('config_version')}, replaying on v{version}")
+            try:
+                actual = replay(provider, record)
+            except (KeyError, ValueError) as exc:
+                mismatched += 1
+                print(f"ERROR    {label}: {exc}")
+                continue
+            expected = {name: record.get(name) for name in actual}
+            if json.loads(json.dumps(actual)) == expected:
+                print(f"OK       {label}: {actual}")
+            else:
+                mismatched += 1
+                print(f"MISMATCH {label}: logged {expected}, replayed {actual}")
+
+    print(f"{replayed} round(s) replayed, {mismatched} mismatch(es)")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
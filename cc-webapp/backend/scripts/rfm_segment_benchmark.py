@@ -0,0 +1,96 @@
+"""Benchmark for the nightly RFM segmentation job.
+
+Seeds ``--users`` users with the daily activity buckets of about
+``--actions-per-user`` recent actions each and times ``compute_rfm_and_update_segments`` twice: once against an empty
+``user_segments`` table (all inserts) and once more (all updates).
+
+Usage:
+    python scripts/rfm_segment_benchmark.py --users 1000000
+    DATABASE_URL=postgresql://... python scripts/rfm_segment_benchmark.py --users 1000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models import Base, User, UserActivityDaily, UserSegment  # noqa: E402
+from app.utils.segment_utils import compute_rfm_and_update_segments  # noqa: E402
+
+SEED_BATCH = 50_000
+
+
+def seed(SessionLocal, users: int, actions_per_user: int) -> None:
+    """Seed users and the daily activity buckets their actions would produce."""
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    with SessionLocal() as db:
+        for start in range(1, users + 1, SEED_BATCH):
+            ids = range(start, min(start + SEED_BATCH, users + 1))
+            db.execute(
+                insert(User),
+                [{"id": uid, "nickname": f"rfm_bench_{uid}", "invite_code": "BENCH1"} for uid in ids],
+            )
+            buckets = {}
+            for uid in ids:
+                for _ in range(rng.randint(1, 2 * actions_per_user - 1)):
+                    at = now - timedelta(days=rng.randint(0, 29), seconds=rng.randint(0, 86399))
+                    bucket = buckets.setdefault(
+                        (uid, at.date()),
+                        {"user_id": uid, "day": at.date(), "action_count": 0, "monetary": 0.0, "last_action_at": at},
+                    )
+                    bucket["action_count"] += 1
+                    bucket["monetary"] += rng.choice((0.0, 2.0, 10.0, 50.0))
+                    bucket["last_action_at"] = max(bucket["last_action_at"], at)
+            db.execute(insert(UserActivityDaily), list(buckets.values()))
+            db.commit()
+
+
+def run(database_url: str, users: int, actions_per_user: int, chunk_size: int) -> None:
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    Base.metadata.drop_all(bind=engine, tables=[UserSegment.__table__, UserActivityDaily.__table__])
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    started = time.perf_counter()
+    seed(SessionLocal, users, actions_per_user)
+    print(f"database:     {engine.url.render_as_string(hide_password=True)}")
+    print(f"seeded:       {users} users in {time.perf_counter() - started:.1f}s")
+
+    for label in ("insert run", "update run"):
+        with SessionLocal() as db:
+            stats = compute_rfm_and_update_segments(db, chunk_size=chunk_size)
+        print(f"{label + ':':<14}{stats.processed} users, {stats.chunks} chunks, "
+              f"{stats.elapsed:.1f}s ({stats.rate:.0f} users/s)")
+    engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--actions-per-user", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    database_url = args.database_url
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'rfm_bench.db')}"
+
+    run(database_url, args.users, args.actions_per_user, args.chunk_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
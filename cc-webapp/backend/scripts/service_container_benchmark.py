@@ -0,0 +1,106 @@
+"""Per-request allocation benchmark: service graphs built per request vs. the container.
+
+For each router dependency, resolves the services a request needs
+``--requests`` times, once the old way (build the graph in the request)
+and once through ``ServiceContainer``, and reports time, Python objects
+and bytes allocated per request. Results are kept alive while measuring,
+as they would be for in-flight requests. No database is touched; a
+placeholder stands in for the request session.
+
+Usage:
+    python scripts/service_container_benchmark.py
+    python scripts/service_container_benchmark.py --requests 20000
+"""
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.repositories.game_repository import GameRepository  # noqa: E402
+from app.services.container import ServiceContainer  # noqa: E402
+from app.services.game_service import GameService  # noqa: E402
+from app.services.ltv_service import LTVService  # noqa: E402
+from app.services.personalization_service import PersonalizationService  # noqa: E402
+from app.services.recommendation_service import RecommendationService  # noqa: E402
+from app.services.rfm_service import RFMService  # noqa: E402
+
+DB = object()  # 요청 세션 자리 표시자 (생성자는 저장만 한다)
+
+
+def per_request_cases() -> List[Tuple[str, Callable[[], object]]]:
+    """What the routers did before the container."""
+
+    def personalization():
+        repo = GameRepository()
+        return RFMService(DB, repo), LTVService(DB, repo), PersonalizationService(DB, repo)
+
+    return [
+        ("games", GameService),
+        ("personalization", personalization),
+        ("recommend", RecommendationService),
+    ]
+
+
+def container_cases(container: ServiceContainer) -> List[Tuple[str, Callable[[], object]]]:
+    def personalization():
+        return container.rfm_service(DB), container.ltv_service(DB), container.personalization_service(DB)
+
+    return [
+        ("games", lambda: container.game_service),
+        ("personalization", personalization),
+        ("recommend", lambda: container.recommendation_service),
+    ]
+
+
+def measure(resolve: Callable[[], object], requests: int) -> Tuple[float, float, float]:
+    """Seconds, objects and bytes per request."""
+    resolve()  # 지연 import/캐시 준비
+    gc.collect()
+    gc.disable()
+    try:
+        kept = []
+        objects = len(gc.get_objects())
+        tracemalloc.start()
+        for _ in range(requests):
+            kept.append(resolve())
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        objects = len(gc.get_objects()) - objects
+        del kept
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            resolve()
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.enable()
+    return elapsed / requests, objects / requests, allocated / requests
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    container = ServiceContainer(use_async=False)
+
+    print(f"{'dependency':<18}{'mode':<12}{'us/request':>12}{'objects':>10}{'bytes':>10}")
+    for (name, build), (_, shared) in zip(per_request_cases(), container_cases(container)):
+        before = measure(build, args.requests)
+        after = measure(shared, args.requests)
+        for mode, (seconds, objects, allocated) in (("per-request", before), ("container", after)):
+            print(f"{name:<18}{mode:<12}{seconds * 1e6:>12.2f}{objects:>10.1f}{allocated:>10.0f}")
+        print(f"{'':<18}{'saved':<12}{(before[0] - after[0]) * 1e6:>12.2f}"
+              f"{before[1] - after[1]:>10.1f}{before[2] - after[2]:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Monte Carlo simulation of one game's token economy per user segment.
+
+Plays ``--rounds`` rounds for ``--users`` synthetic users with the payout
+rules of the game services and prints RTP, variance, losing-streak
+percentiles and token sink/source rates per segment. No database is used.
+Rules start from the current game config (``GAME_CONFIG_FILE`` and the
+legacy environment variables) and can be overridden with ``--set NAME=VALUE``
+(JSON values).
+
+``--workers N`` splits the users' chunks over N processes. Each chunk has its
+own Philox stream derived from ``--seed``, so the result does not depend on
+the number of workers (a seed is picked and printed when none is given).
+
+Usage:
+    python scripts/simulate_economy.py slot --users 1000000 --rounds 100
+    python scripts/simulate_economy.py slot --set JACKPOT_PROB=0.005 --set 'SEGMENT_WIN_ADJUST={"Whale": 0.0}'
+    python scripts/simulate_economy.py roulette --bet 10 --bet-type number --value 0
+    python scripts/simulate_economy.py gacha --count 10 --rarity-table '[["Legendary", 0.01], ["Common", 0.99]]'
+    python scripts/simulate_economy.py rps --balance 200 --json
+    python scripts/simulate_economy.py slot --users 10000000 --chunk-size 250000 --workers 8 --seed 42
+"""
+
+import argparse
+import json
+import logging
+import os
+import secrets
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.gacha_service import GachaService  # noqa: E402
+from app.services.game_config import get_game_config  # noqa: E402
+from app.services.roulette_service import RouletteService  # noqa: E402
+from app.services.rps_service import RPSService  # noqa: E402
+from app.services.slot_service import SlotService  # noqa: E402
+from app.utils.game_simulator import (  # noqa: E402
+    DEFAULT_SEGMENT_MIX,
+    GachaModel,
+    RouletteModel,
+    RPSModel,
+    SlotModel,
+    merge_reports,
+    simulate,
+    tuned,
+)
+
+RULES = {"slot": SlotService, "roulette": RouletteService, "gacha": GachaService, "rps": RPSService}
+
+
+def parse_overrides(items):
+    overrides = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        try:
+            overrides[name] = json.loads(value)
+        except json.JSONDecodeError:
+            overrides[name] = value
+    return overrides
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def build_model(args):
+    rules = tuned(get_game_config().current.rules_for(RULES[args.game]), **parse_overrides(args.set))
+    if args.game == "slot":
+        return SlotModel(rules)
+    if args.game == "roulette":
+        return RouletteModel(rules, args.bet, args.bet_type, args.value)
+    if args.game == "rps":
+        return RPSModel(rules, args.bet, args.choice)
+    # 서비스와 같은 환경 변수 형식으로 확률 테이블/보상 풀을 받는다
+    table = json.loads(args.rarity_table) if args.rarity_table else None
+    pool = json.loads(args.reward_pool) if args.reward_pool else None
+    return GachaModel(rules, args.count, [(name, prob) for name, prob in table] if table else None, pool)
+
+
+def run_shard(args, seed, shard):
+    """Simulate one shard; runs in a worker process, which rebuilds the model."""
+    return simulate(
+        build_model(args),
+        users=args.users,
+        rounds=args.rounds,
+        segment_mix=args.segment_mix,
+        seed=seed,
+        balance=args.balance,
+        chunk_size=args.chunk_size,
+        shard=shard,
+        shards=args.workers,
+    )
+
+
+def print_report(report):
+    print(f"game:         {report.game}")
+    print(f"seed:         {report.seed}")
+    print(f"simulated:    {report.users} users x {report.rounds} rounds in {report.elapsed:.1f}s")
+    print(f"{'segment':<8}{'users':>10}{'plays':>12}{'RTP':>8}{'var':>10}{'sink/play':>11}"
+          f"{'src/play':>10}{'streak p50/p90/p99/max':>24}{'broke':>8}")
+    for stats in [*report.segments.values(), report.overall]:
+        streak = "/".join(
+            str(value) for value in (
+                stats.streak_percentile(0.5),
+                stats.streak_percentile(0.9),
+                stats.streak_percentile(0.99),
+                max(len(stats.streak_histogram) - 1, 0),
+            )
+        )
+        print(f"{stats.segment:<8}{stats.users:>10}{stats.plays:>12}{stats.rtp:>8.4f}{stats.net_variance:>10.2f}"
+              f"{stats.sink_rate:>11.2f}{stats.source_rate:>10.2f}{streak:>24}{stats.broke:>8}")
+    plays = report.overall.plays or 1
+    print("events/play:  " + ", ".join(f"{name}={count / plays:.4f}" for name, count in report.overall.events.items()))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("game", choices=sorted(RULES))
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--balance", type=int, default=None, help="starting tokens per user (default: unlimited)")
+    parser.add_argument("--segment-mix", type=parse_mix, default=DEFAULT_SEGMENT_MIX,
+                        help="e.g. Low=0.7,Medium=0.25,Whale=0.05")
+    parser.add_argument("--chunk-size", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, default=1, help="processes to split the chunks over")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a service rule constant")
+    parser.add_argument("--bet", type=int, default=10)
+    parser.add_argument("--bet-type", default="color", choices=("number", "color", "odd_even"))
+    parser.add_argument("--value", default="red")
+    parser.add_argument("--choice", default="rock", choices=RPSService.VALID_CHOICES)
+    parser.add_argument("--count", type=int, default=1, help="gacha pulls per play (1 or 10)")
+    parser.add_argument("--rarity-table", default=os.getenv("GACHA_RARITY_TABLE"))
+    parser.add_argument("--reward-pool", default=os.getenv("GACHA_REWARD_POOL"))
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.game == "gacha" and args.reward_pool:
+        parser.error("--reward-pool is shared by all users and cannot be split over --workers")
+
+    if args.workers == 1:
+        report = run_shard(args, args.seed, 0)
+    else:
+        # 모든 워커가 같은 시드를 써야 하므로 부모에서 정한다
+        seed = args.seed if args.seed is not None else secrets.randbits(63)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(run_shard, args, seed, shard) for shard in range(args.workers)]
+            report = merge_reports([future.result() for future in futures])
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
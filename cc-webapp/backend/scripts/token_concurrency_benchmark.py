@@ -0,0 +1,109 @@
+"""Concurrency stress benchmark for TokenService deductions.
+
+Fires many parallel ``deduct_tokens`` calls against a shared set of users and
+checks that balances are conserved: every token that left a balance is
+accounted for by a successful deduction and no balance goes negative.
+
+Usage:
+    python scripts/token_concurrency_benchmark.py --users 50 --deductions 5000 --workers 32
+    DATABASE_URL=postgresql://... python scripts/token_concurrency_benchmark.py
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models import Base, User  # noqa: E402
+from app.services.token_service import TokenService  # noqa: E402
+
+
+def run(database_url: str, users: int, deductions: int, workers: int, initial_balance: int, max_amount: int) -> bool:
+    connect_args = {"check_same_thread": False, "timeout": 60} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args, pool_size=workers, max_overflow=0)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    base_id = 900_000
+    user_ids = list(range(base_id, base_id + users))
+    with SessionLocal() as db:
+        db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.add_all(
+            User(id=uid, nickname=f"bench_{uid}", invite_code="BENCH1", cyber_token_balance=initial_balance)
+            for uid in user_ids
+        )
+        db.commit()
+
+    rng = random.Random(42)
+    jobs = [(rng.choice(user_ids), rng.randint(1, max_amount)) for _ in range(deductions)]
+
+    def deduct(job):
+        user_id, amount = job
+        with SessionLocal() as db:
+            return user_id, amount, TokenService(db).deduct_tokens(user_id, amount)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(deduct, jobs))
+    elapsed = time.perf_counter() - started
+
+    spent = defaultdict(int)
+    succeeded = 0
+    for user_id, amount, balance in outcomes:
+        if balance is not None:
+            spent[user_id] += amount
+            succeeded += 1
+
+    with SessionLocal() as db:
+        final = dict(db.query(User.id, User.cyber_token_balance).filter(User.id.in_(user_ids)).all())
+        db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.commit()
+    engine.dispose()
+
+    violations = [
+        uid for uid in user_ids
+        if final[uid] < 0 or final[uid] != initial_balance - spent[uid]
+    ]
+
+    print(f"database:     {engine.url.render_as_string(hide_password=True)}")
+    print(f"deductions:   {deductions} ({succeeded} succeeded, {deductions - succeeded} rejected)")
+    print(f"workers:      {workers}")
+    print(f"elapsed:      {elapsed:.2f}s ({deductions / elapsed:.0f} ops/s)")
+    print(f"conserved:    {'yes' if not violations else 'NO'}")
+    for uid in violations[:10]:
+        print(f"  user {uid}: final={final[uid]} expected={initial_balance - spent[uid]}")
+    return not violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--deductions", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--initial-balance", type=int, default=1000)
+    parser.add_argument("--max-amount", type=int, default=10)
+    args = parser.parse_args()
+    # 거절된 차감마다 남는 경고 로그는 벤치마크 출력에서 제외
+    logging.basicConfig(level=logging.ERROR)
+
+    database_url = args.database_url
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'token_bench.db')}"
+
+    ok = run(database_url, args.users, args.deductions, args.workers, args.initial_balance, args.max_amount)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
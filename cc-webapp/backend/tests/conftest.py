@@ -59,6 +59,36 @@ def client():
     except ImportError as e:
         pytest.skip(f"TestClient or app not available: {e}")
 
+@pytest.fixture()
+def engine():
+    """Fresh in-memory SQLite database with every table created (one connection, shared by threads)."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    from app.models import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+@pytest.fixture()
+def session_factory(engine):
+    """Session factory bound to ``engine``; modules override it to add their seed rows."""
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture()
+def db_session(session_factory):
+    """One session on the in-memory database; modules override it to add their seed rows."""
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
 @pytest.fixture
 def mock_database():
     """Mock database session"""
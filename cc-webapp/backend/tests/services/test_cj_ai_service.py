@@ -71,7 +71,7 @@ async def test_send_websocket_message(ai_service):
     result = await ai_service.send_websocket_message(user_id, message)
 
     assert result is True
-    ai_service.websocket_manager.broadcast.assert_called_once()
+    ai_service.websocket_manager.send_to_user.assert_awaited_once_with(user_id, message)
 
 @pytest.mark.asyncio
 async def test_send_websocket_message_no_manager(ai_service):
@@ -0,0 +1,114 @@
+"""Tests for the precomputed access profile used by content gating."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import get_db
+from app.models import AdultContent, User, UserReward, UserSegment, UserUnlockState
+from app.routers import unlock
+from app.services.access_profile import AccessProfileLoader
+from app.services.adult_content_service import AdultContentService
+from app.services.vip_content_service import VIPContentService
+
+
+@pytest.fixture()
+def session_factory(session_factory, engine):
+    db = session_factory()
+    db.add_all([
+        User(id=1, nickname="profile_vip", invite_code="PRO001", rank="VIP"),
+        User(id=2, nickname="profile_std", invite_code="PRO002"),
+        UserSegment(user_id=1, rfm_group="Whale", risk_profile="Low"),
+        UserSegment(user_id=2, rfm_group="Medium", risk_profile="Low"),
+        UserReward(user_id=1, reward_type="CONTENT_UNLOCK", reward_value="1",
+                   awarded_at=datetime.utcnow() - timedelta(days=1)),
+        UserReward(user_id=1, reward_type="CONTENT_UNLOCK", reward_value="2", awarded_at=datetime.utcnow()),
+        UserUnlockState(user_id=1, highest_stage=2),
+    ])
+    db.add_all(
+        AdultContent(stage=stage, name=f"Stage {stage}", required_rank="STANDARD", required_segment_level=stage)
+        for stage in (1, 2, 3)
+    )
+    db.commit()
+    db.close()
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    session_factory.statements = statements
+    return session_factory
+
+
+def test_profile_is_built_once_per_request(session_factory):
+    db = session_factory()
+    service = VIPContentService(db, MagicMock(spec=AdultContentService))
+    session_factory.statements.clear()
+
+    assert service.get_vip_info(1).vip_tier == "Ultimate VIP"
+    assert service.apply_vip_discount(1, 1000) == 850
+    assert service.check_combined_vip_access(1, "VIP", 3)
+    assert service.get_vip_exclusive_content(1) == []
+
+    assert len(session_factory.statements) == 3  # user, segment, unlock state
+    profile = service.profiles.get(1)
+    assert (profile.rank_level, profile.segment_level, profile.highest_unlocked_stage) == (3, 3, 2)
+
+
+def test_gating_checks_evaluate_against_profile(session_factory):
+    profiles = AccessProfileLoader(session_factory())
+    standard, missing = profiles.get(2), profiles.get(99)
+    content = AdultContent(stage=3, name="VIP only", required_rank="VIP", required_segment_level=2)
+
+    assert not standard.has_rank("VIP") and standard.check_access("STANDARD", 2)
+    assert not standard.can_access_content(content)
+    assert profiles.get(1).can_access_content(content)
+    assert not missing.exists and not missing.check_access("STANDARD", 0)
+    assert standard.vip_tier is None and standard.next_stage == 1
+
+
+def test_unlock_endpoint_uses_and_refreshes_profile(session_factory):
+    app = FastAPI()
+    app.include_router(unlock.router, prefix="/api")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    response = client.get("/api/unlock", params={"user_id": 1})
+    assert response.status_code == 200 and response.json()["stage"] == 3
+    assert client.get("/api/unlock", params={"user_id": 1}).status_code == 400
+    assert client.get("/api/unlock", params={"user_id": 2}).status_code == 200
+    assert client.get("/api/unlock", params={"user_id": 2}).status_code == 200
+    assert client.get("/api/unlock", params={"user_id": 2}).status_code == 403
+    assert client.get("/api/unlock", params={"user_id": 99}).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_unlock_content_stage_checks_profile(session_factory):
+    db = session_factory()
+    tokens = MagicMock()
+    tokens.get_token_balance.return_value = 1000
+    service = AdultContentService(db, tokens)
+    standard = db.get(User, 2)  # Medium 세그먼트 (레벨 2)
+
+    with pytest.raises(ValueError, match="segment level too low"):
+        await service.unlock_content_stage(3, 1, standard)
+    with pytest.raises(ValueError, match="not found"):
+        await service.unlock_content_stage(99, 1, standard)
+    tokens.deduct_tokens.assert_not_called()
+
+    response = await service.unlock_content_stage(2, 1, standard)
+    assert response.success and response.tokens_spent == 10
+    tokens.deduct_tokens.assert_called_once_with(2, 10, reason="CONTENT_UNLOCK")
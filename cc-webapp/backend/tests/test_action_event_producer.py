@@ -0,0 +1,178 @@
+"""Tests for the batched action event producer and its disk spool."""
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from app.services import action_event_producer
+from app.services.action_event_producer import TOPIC_USER_ACTIONS, ActionEventProducer, DiskSpool
+from app.utils.fake_kafka import FakeProducer, InMemoryKafkaBroker
+
+
+def delivered_ids(broker):
+    return sorted(json.loads(m.value())["n"] for m in broker.messages(TOPIC_USER_ACTIONS))
+
+
+def make_producer(broker, tmp_path, **options):
+    options.setdefault("retry_backoff", 0)
+    return ActionEventProducer(
+        client=FakeProducer(broker, queue_size=options.pop("queue_size", 100_000)),
+        spool=DiskSpool(str(tmp_path / "spool")),
+        **options,
+    )
+
+
+def test_drain_delivers_batches_keyed_by_user(tmp_path):
+    broker = InMemoryKafkaBroker()
+    producer = make_producer(broker, tmp_path, batch_size=7)
+    for n in range(20):
+        producer.publish({"n": n}, key=str(n % 3))
+
+    producer.drain()
+
+    assert delivered_ids(broker) == list(range(20))
+    assert producer.stats["delivered"] == 20
+    user_one = {m.partition() for m in broker.messages(TOPIC_USER_ACTIONS) if m.key() == b"1"}
+    assert len(user_one) == 1
+    assert not producer.spool
+
+
+def test_outage_spools_then_replays_in_order(tmp_path):
+    broker = InMemoryKafkaBroker(partitions=1)
+    producer = make_producer(broker, tmp_path)
+    broker.available = False
+    for n in range(5):
+        producer.publish({"n": n}, key="1")
+    producer.drain()
+
+    assert producer.stats["spooled"] == 5
+    assert broker.messages(TOPIC_USER_ACTIONS) == []
+    assert producer.spool
+
+    broker.available = True
+    for n in range(5, 8):
+        producer.publish({"n": n}, key="1")
+    producer.drain()
+
+    # 스풀된 이벤트가 먼저 재생된 뒤 실시간 이벤트가 전송된다
+    assert [json.loads(m.value())["n"] for m in broker.messages(TOPIC_USER_ACTIONS)] == list(range(8))
+    assert producer.stats["replayed"] == 5
+    assert not producer.spool
+
+
+def test_full_client_queue_spools_overflow(tmp_path):
+    broker = InMemoryKafkaBroker()
+    producer = make_producer(broker, tmp_path, queue_size=3, batch_size=10)
+    for n in range(10):
+        producer.publish({"n": n})
+
+    producer.drain()
+
+    assert producer.stats["produced"] == 3
+    assert producer.stats["spooled"] == 7
+    producer.drain()
+    assert delivered_ids(broker) == list(range(10))
+
+
+def test_backoff_spools_without_touching_client(tmp_path):
+    broker = InMemoryKafkaBroker()
+    producer = make_producer(broker, tmp_path, retry_backoff=60)
+    broker.available = False
+    producer.publish({"n": 0})
+    producer.drain()
+    broker.available = True
+
+    producer.publish({"n": 1})
+    producer.drain()
+
+    assert broker.messages(TOPIC_USER_ACTIONS) == []
+    assert producer.stats["spooled"] == 2
+
+
+def test_spool_left_by_previous_process_is_replayed(tmp_path):
+    spool = DiskSpool(str(tmp_path / "spool"))
+    spool.append([("1", json.dumps({"n": 0})), ("2", json.dumps({"n": 1}))])
+    broker = InMemoryKafkaBroker()
+
+    producer = make_producer(broker, tmp_path)
+    producer.drain()
+
+    assert delivered_ids(broker) == [0, 1]
+
+
+def test_disabled_producer_discards():
+    producer = ActionEventProducer(client=None)
+
+    assert producer.publish({"n": 1}) is False
+    assert producer.stats["disabled"] == 1
+
+
+def test_spool_limits_size_and_skips_torn_lines(tmp_path):
+    spool = DiskSpool(str(tmp_path), segment_bytes=50, max_bytes=120)
+    dropped = sum(spool.append([(None, json.dumps({"n": n}))]) for n in range(10))
+
+    assert dropped > 0
+    assert spool.size_bytes <= 120 + 50
+    last = spool._segments()[-1]
+    with open(last, "a", encoding="utf-8") as handle:
+        handle.write('{"k": null, "v": "{\\"n\\": 9')
+    assert all(value for _, value in DiskSpool.read(last))
+    assert os.path.basename(last).startswith(DiskSpool.PREFIX)
+
+
+@pytest.mark.asyncio
+async def test_background_loop_and_close_flush(tmp_path):
+    broker = InMemoryKafkaBroker()
+    producer = make_producer(broker, tmp_path, linger=0.01)
+    await producer.start()
+    for n in range(50):
+        producer.publish({"n": n})
+
+    await asyncio.sleep(0.05)
+    producer.publish({"n": 50})
+    await producer.close()
+
+    assert delivered_ids(broker) == list(range(51))
+
+
+@pytest.mark.skipif(action_event_producer.fcntl is None, reason="needs fcntl")
+def test_each_process_claims_its_own_spool_slot(tmp_path):
+    first = DiskSpool.claim(str(tmp_path))
+    second = DiskSpool.claim(str(tmp_path))
+    assert first.directory != second.directory
+
+    first.append([("1", json.dumps({"n": 0}))])
+    first._claim.close()  # 프로세스 종료로 잠금 해제
+
+    restarted = DiskSpool.claim(str(tmp_path))
+    assert restarted.directory == first.directory
+    assert [DiskSpool.read(path) for path in restarted.sealed_segments()] == [[("1", '{"n": 0}')]]
+
+
+@pytest.mark.asyncio
+async def test_buffer_overflow_is_spooled_off_the_event_loop(tmp_path):
+    broker = InMemoryKafkaBroker()
+    producer = make_producer(broker, tmp_path, max_pending=1)
+    spooling_threads = []
+    append = producer.spool.append
+
+    def record_thread(records):
+        spooling_threads.append(threading.get_ident())
+        return append(records)
+
+    producer.spool.append = record_thread
+    for n in range(3):
+        producer.publish({"n": n})
+
+    for _ in range(100):
+        if producer.stats["spooled"] == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert producer.stats["spooled"] == 2
+    assert threading.get_ident() not in spooling_threads
+    producer.drain()
+    assert delivered_ids(broker) == [0, 1, 2]
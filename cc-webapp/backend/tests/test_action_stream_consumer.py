@@ -0,0 +1,125 @@
+"""Tests for the streaming consumer that materializes user action events."""
+
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.models import StreamOffset, User, UserAction, UserActivityDaily, UserStreak
+from app.repositories.activity_repository import ActivityRepository
+from app.services.action_event_producer import TOPIC_USER_ACTIONS
+from app.services.action_stream_consumer import ActionStreamConsumer
+from app.utils.fake_kafka import FakeConsumer, InMemoryKafkaBroker
+
+GROUP = "test-group"
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    with session_factory() as session:
+        for user_id in (1, 2, 3):
+            session.add(User(id=user_id, nickname=f"stream_{user_id}", invite_code=f"STR{user_id:03d}"))
+        session.commit()
+    return session_factory
+
+
+def publish(broker, user_id, at, action_type="SLOT_SPIN", value=None):
+    payload = {"user_id": user_id, "action_type": action_type, "action_timestamp": at.isoformat()}
+    if value is not None:
+        payload["value"] = value
+    broker.append(TOPIC_USER_ACTIONS, str(user_id).encode(), json.dumps(payload).encode())
+
+
+def make_consumer(broker, session_factory, member=0, members=1, **options):
+    return ActionStreamConsumer(
+        FakeConsumer(broker, {"group.id": GROUP}, member=member, members=members),
+        session_factory,
+        group_id=GROUP,
+        poll_timeout=0,
+        **options,
+    )
+
+
+def test_batches_materialize_actions_and_aggregates(session_factory):
+    broker = InMemoryKafkaBroker()
+    for hour in range(5):
+        publish(broker, 1, datetime(2024, 5, 1, hour), value=2.5)
+    publish(broker, 2, datetime(2024, 5, 1, 9), action_type="PURCHASE", value=10)
+    broker.append(TOPIC_USER_ACTIONS, b"3", b"not json")
+
+    consumer = make_consumer(broker, session_factory, batch_size=4)
+    assert consumer.run(max_idle_polls=1) == 6
+
+    db = session_factory()
+    assert db.query(UserAction).count() == 6
+    bucket = db.query(UserActivityDaily).filter_by(user_id=1).one()
+    assert (bucket.action_count, bucket.monetary, bucket.last_action_at) == (5, 12.5, datetime(2024, 5, 1, 4))
+    assert db.query(UserStreak).filter_by(user_id=2).one().activity_streak == 1
+    for partition in range(broker.partitions):
+        assert broker.committed(GROUP, TOPIC_USER_ACTIONS, partition) in (
+            None,
+            broker.end_offset(TOPIC_USER_ACTIONS, partition),
+        )
+
+
+def test_streak_extends_on_consecutive_days_and_resets_after_gap(session_factory):
+    db = session_factory()
+    repo = ActivityRepository()
+
+    repo.advance_streaks(db, {1: [date(2024, 5, 1), date(2024, 5, 2)]})
+    repo.advance_streaks(db, {1: [date(2024, 5, 3), date(2024, 5, 1)]})
+    assert db.get(UserStreak, 1).activity_streak == 3
+
+    streaks = repo.advance_streaks(db, {1: [date(2024, 5, 2)], 2: [date(2024, 5, 2)]})
+    assert streaks == {1: 3, 2: 1}
+    assert repo.advance_streaks(db, {1: [date(2024, 5, 6)]}) == {1: 1}
+
+
+def test_redelivered_batch_is_not_applied_twice(session_factory):
+    broker = InMemoryKafkaBroker(partitions=1)
+    for hour in range(3):
+        publish(broker, 1, datetime(2024, 5, 1, hour))
+    first = make_consumer(broker, session_factory)
+    first.apply(first.consumer.consume(10))  # crash before the Kafka commit
+
+    replay = make_consumer(broker, session_factory)
+    result = replay.poll_batch()
+
+    assert (result.applied, result.duplicates) == (0, 3)
+    db = session_factory()
+    assert db.query(UserAction).count() == 3
+    assert db.query(UserActivityDaily).one().action_count == 3
+    assert db.query(StreamOffset).one().offset == 2
+    assert broker.committed(GROUP, TOPIC_USER_ACTIONS, 0) == 3
+
+
+def test_failed_write_leaves_offsets_uncommitted(session_factory, monkeypatch):
+    broker = InMemoryKafkaBroker(partitions=1)
+    publish(broker, 1, datetime(2024, 5, 1))
+    consumer = make_consumer(broker, session_factory)
+
+    def fail(*args, **kwargs):
+        raise OperationalError("INSERT", {}, Exception("disk full"))
+
+    monkeypatch.setattr("app.services.action_stream_consumer.bulk_insert", fail)
+    with pytest.raises(OperationalError):
+        consumer.poll_batch()
+
+    assert broker.committed(GROUP, TOPIC_USER_ACTIONS, 0) is None
+    monkeypatch.undo()
+    assert make_consumer(broker, session_factory).poll_batch().applied == 1
+
+
+def test_group_members_split_partitions(session_factory):
+    broker = InMemoryKafkaBroker(partitions=4)
+    for n in range(40):
+        publish(broker, 1 + n % 3, datetime(2024, 5, 1, n % 24))
+
+    members = [make_consumer(broker, session_factory, member=m, members=2) for m in range(2)]
+    owned = [set(m.consumer.assignment()) for m in members]
+    applied = sum(m.run(max_idle_polls=1) for m in members)
+
+    assert not owned[0] & owned[1]
+    assert applied == 40
+    assert session_factory().query(UserAction).count() == 40
@@ -0,0 +1,150 @@
+"""Tests for write-behind batching of user action rows."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.models import User, UserAction, UserActivityDaily
+from app.repositories import action_writer as action_writer_module
+from app.repositories.action_writer import ActionWriter
+from app.repositories.game_repository import GameRepository
+from app.repositories.game_state import InMemoryGameStateBackend
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    with session_factory() as session:
+        session.add_all([User(id=i, nickname=f"writer_{i}", invite_code=f"WRT00{i}") for i in (1, 2)])
+        session.commit()
+    return session_factory
+
+
+def action_count(factory):
+    db = factory()
+    try:
+        return db.query(UserAction).count()
+    finally:
+        db.close()
+
+
+@pytest.mark.asyncio
+async def test_record_action_is_batched_and_flushed_on_close(session_factory):
+    writer = ActionWriter(session_factory, interval=60, batch_size=100)
+    repo = GameRepository(state=InMemoryGameStateBackend(), writer=writer)
+    await writer.start()
+    db = session_factory()
+
+    for n in range(5):
+        action = repo.record_action(db, 1 + n % 2, "SLOT_SPIN", -2)
+    assert action.id is None
+    assert action_count(session_factory) == 0
+
+    await writer.close()
+
+    assert action_count(session_factory) == 5
+    buckets = {b.user_id: b.action_count for b in db.query(UserActivityDaily)}
+    assert buckets == {1: 3, 2: 2}
+    assert writer.stats["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_before_interval(session_factory):
+    writer = ActionWriter(session_factory, interval=60, batch_size=3)
+    await writer.start()
+    for _ in range(3):
+        assert writer.submit(1, "SLOT_SPIN", -2.0, datetime.utcnow())
+
+    for _ in range(50):
+        if action_count(session_factory) == 3:
+            break
+        await asyncio.sleep(0.01)
+
+    assert action_count(session_factory) == 3
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_falls_back_to_synchronous_write(session_factory):
+    writer = ActionWriter(session_factory, interval=60, batch_size=100, max_pending=2)
+    repo = GameRepository(state=InMemoryGameStateBackend(), writer=writer)
+    await writer.start()
+    db = session_factory()
+
+    actions = [repo.record_action(db, 1, "SLOT_SPIN", -2) for _ in range(3)]
+
+    assert [a.id is not None for a in actions] == [False, False, True]
+    assert writer.stats["rejected"] == 1
+    await writer.close()
+    assert action_count(session_factory) == 3
+
+
+def test_stopped_writer_rejects_without_counting(session_factory):
+    writer = ActionWriter(session_factory)
+
+    assert writer.submit(1, "SLOT_SPIN", -2.0, datetime.utcnow()) is False
+    assert writer.stats["rejected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_requeued(session_factory, monkeypatch):
+    writer = ActionWriter(session_factory, interval=60)
+    await writer.start()
+    writer.submit(1, "SLOT_SPIN", -2.0, datetime.utcnow())
+    writer.submit(2, "SLOT_SPIN", -2.0, datetime.utcnow())
+
+    def fail(*args, **kwargs):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr("app.repositories.action_writer.bulk_insert", fail)
+    assert writer.flush() == 0
+    assert writer.pending == 2
+
+    monkeypatch.undo()
+    await writer.close()
+    assert action_count(session_factory) == 2
+
+
+@pytest.mark.asyncio
+async def test_transactional_rows_are_queued_only_after_commit(session_factory):
+    writer = ActionWriter(session_factory, interval=60)
+    repo = GameRepository(state=InMemoryGameStateBackend(), writer=writer)
+    await writer.start()
+    db = session_factory()
+
+    repo.record_action(db, 1, "SLOT_SPIN", -2, commit=False)
+    assert writer.pending == 0
+    db.rollback()  # 정산이 롤백되면 행도 버린다
+    db.commit()
+    assert writer.pending == 0
+
+    repo.record_action(db, 2, "SLOT_SPIN", -2, commit=False)
+    db.commit()
+    assert writer.pending == 1
+
+    await writer.close()
+    assert [a.user_id for a in db.query(UserAction)] == [2]
+    assert {b.user_id for b in db.query(UserActivityDaily)} == {2}
+
+
+@pytest.mark.asyncio
+async def test_bad_rows_are_dead_lettered_without_blocking_the_batch(session_factory, monkeypatch):
+    writer = ActionWriter(session_factory, interval=60)
+    await writer.start()
+    for user_id in (1, 2, 999, 1, 2):
+        writer.submit(user_id, "SLOT_SPIN", -2.0, datetime.utcnow())
+
+    real_insert = action_writer_module.bulk_insert
+
+    def reject_unknown_user(db, model, rows, columns):
+        if any(row["user_id"] == 999 for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+        return real_insert(db, model, rows, columns)
+
+    monkeypatch.setattr(action_writer_module, "bulk_insert", reject_unknown_user)
+    assert writer.flush() == 4
+    assert writer.pending == 0
+    assert writer.stats["dead_lettered"] == 1
+    assert action_count(session_factory) == 4
+    await writer.close()
@@ -0,0 +1,78 @@
+"""Tests for the rolling per-user activity aggregates."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import User, UserAction, UserActivityDaily
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.game_repository import GameRepository
+from app.services.rfm_service import RFMService
+
+
+@pytest.fixture()
+def db_session(db_session):
+    db_session.add_all([
+        User(id=1, nickname="activity_a", invite_code="ACT001"),
+        User(id=2, nickname="activity_b", invite_code="ACT002"),
+    ])
+    db_session.commit()
+    return db_session
+
+
+def test_record_action_bumps_daily_bucket(db_session):
+    repo = GameRepository()
+    repo.record_action(db_session, 1, "SLOT_SPIN", -2)
+    repo.record_action(db_session, 1, "GACHA_PULL", -50)
+    repo.record_action(db_session, 2, "SLOT_SPIN", -2)
+
+    buckets = {b.user_id: b for b in db_session.query(UserActivityDaily).all()}
+    assert (buckets[1].action_count, buckets[1].monetary) == (2, 52.0)  # 베팅 금액의 크기
+    assert buckets[1].last_action_at == max(
+        a.timestamp for a in db_session.query(UserAction).filter_by(user_id=1)
+    )
+    assert buckets[2].action_count == 1
+
+
+def test_uncommitted_action_rolls_back_with_bucket(db_session):
+    GameRepository().record_action(db_session, 1, "SLOT_SPIN", -2, commit=False)
+    db_session.rollback()
+
+    assert db_session.query(UserActivityDaily).count() == 0
+
+
+def test_late_batch_does_not_move_last_action_back(db_session):
+    activity = ActivityRepository()
+    now = datetime.utcnow().replace(hour=12)
+    activity.record(db_session, 1, 5.0, now)
+    activity.record(db_session, 1, 5.0, now - timedelta(hours=1))
+    db_session.commit()
+
+    bucket = db_session.query(UserActivityDaily).one()
+    assert (bucket.action_count, bucket.last_action_at) == (2, now)
+
+
+def test_summary_only_covers_window(db_session):
+    activity = ActivityRepository()
+    now = datetime.utcnow()
+    activity.record(db_session, 1, 10.0, now - timedelta(days=40))
+    activity.record(db_session, 1, 5.0, now - timedelta(days=3))
+    activity.record(db_session, 1, 5.0, now - timedelta(days=1))
+    db_session.commit()
+
+    summary = activity.get_summary(db_session, 1, now=now)
+
+    assert (summary.frequency, summary.monetary) == (2, 10.0)
+    assert summary.last_action_at == now - timedelta(days=1)
+    assert activity.get_summary(db_session, 2, now=now) == (None, 0, 0.0)
+
+
+def test_rfm_service_reads_aggregates(db_session):
+    activity = ActivityRepository()
+    activity.record(db_session, 1, 100.0, datetime.utcnow() - timedelta(days=2, hours=1))
+    activity.record(db_session, 1, 50.0, datetime.utcnow() - timedelta(days=2))
+    db_session.commit()
+
+    rfm = RFMService(db_session, GameRepository()).calculate_rfm(1)
+
+    assert (rfm.recency, rfm.frequency, rfm.monetary) == (2, 2, 150.0)
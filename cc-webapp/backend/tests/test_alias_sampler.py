@@ -0,0 +1,78 @@
+"""Tests for the alias-method samplers used by the gacha."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.repositories.game_repository import GameRepository
+from app.repositories.reward_inventory import InMemoryRewardInventory
+from app.services.gacha_service import GachaService
+from app.services.game_config import GameConfigRegistry
+from app.services.token_service import TokenService
+from app.utils.alias_sampler import AliasTable, RarityTable
+
+
+def legacy_walk(rarity_table, history, rnd, fallback="Common"):
+    """The linear walk ``GachaService`` used before alias tables."""
+    cumulative = 0.0
+    for name, prob in rarity_table:
+        cumulative += prob * 0.5 if history and name in history else prob
+        if rnd <= cumulative:
+            return name
+    return fallback
+
+
+def grid_frequencies(draw, outcomes, points=20_000):
+    counts = dict.fromkeys(outcomes, 0)
+    for i in range(points):
+        counts[draw((i + 0.5) / points)] += 1
+    return {name: count / points for name, count in counts.items()}
+
+
+def test_alias_table_reproduces_weights():
+    table = AliasTable(["a", "b", "c", "d", "e"], [5, 0, 1, 3.5, 0.5])
+
+    expected = [0.5, 0.0, 0.1, 0.35, 0.05]
+    assert table.probabilities() == pytest.approx(expected, abs=1e-12)
+    frequencies = grid_frequencies(lambda u: table.outcomes[table.index(u)], table.outcomes)
+    assert list(frequencies.values()) == pytest.approx(expected, abs=5e-4)
+    assert table.draw(lambda: 0.999999999) in {"a", "c", "d", "e"}
+    with pytest.raises(ValueError):
+        AliasTable(["a"], [0])
+
+
+@pytest.mark.parametrize("rarity_table", [
+    GachaService.DEFAULT_RARITY_TABLE,
+    [("Legendary", 0.01), ("Super", 0.09), ("Normal", 0.9)],  # 폴백이 테이블에 없음
+    [("SSR", 0.3), ("SR", 0.5), ("R", 0.6)],  # 합이 1을 넘으면 잘린다
+])
+def test_rarity_variants_match_linear_walk(rarity_table):
+    compiled = RarityTable(rarity_table)
+
+    for mask, variant in enumerate(compiled.variants()):
+        history = [name for name in compiled.rarities if mask & compiled.bit(name)]
+        assert variant.probabilities() == pytest.approx(compiled.distribution(mask), abs=1e-12)
+        legacy = grid_frequencies(lambda u: legacy_walk(rarity_table, history, u), compiled.outcomes)
+        assert list(legacy.values()) == pytest.approx(compiled.distribution(mask), abs=5e-4)
+
+
+def test_pull_many_tracks_pity_history_and_pool():
+    service = GachaService(
+        repository=MagicMock(spec=GameRepository),
+        token_service=MagicMock(spec=TokenService),
+        inventory=InMemoryRewardInventory(),
+        config=GameConfigRegistry(),
+    )
+    assert service.sampler is GachaService(repository=MagicMock(spec=GameRepository)).sampler
+
+    history = ["Epic"] + ["Common"] * 11
+    draw = service.pull_many(2, count=88, history=history, rand=lambda: 0.99)
+    assert draw.results == ["Common", "Epic"] and draw.count == 0
+    assert draw.history == ["Epic", "Common"] + history[:8]
+
+    service.update_config(reward_pool={"Common": 1})
+    assert service.draw(3, rand=lambda: 0.99).results == ["Common"] * 3
+    assert service.reward_pool == {"Common": 0}
+
+    service.update_config(rarity_table=[("SSR", 1.0)])
+    assert service.draw(1).results == ["Common"]  # SSR 재고 없음
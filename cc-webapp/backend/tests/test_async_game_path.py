@@ -0,0 +1,182 @@
+"""Tests for the AsyncSession game and token path."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.auth.simple_auth import require_user
+from app.database import to_async_url
+from app.models import Base, TokenLedgerEntry, User, UserAction, UserActivityDaily, UserSegment
+from app.repositories.game_repository import AsyncGameRepository
+from app.repositories.game_state import InMemoryGameStateBackend
+from app.repositories.reward_inventory import InMemoryRewardInventory
+from app.services.gacha_service import AsyncGachaService
+from app.routers import games
+from app.services.game_service import AsyncGameService
+from app.services.token_service import AsyncTokenService
+
+
+@pytest_asyncio.fixture()
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with factory() as db:
+        db.add_all([
+            User(id=1, nickname="async_a", invite_code="ASY001", cyber_token_balance=1000),
+            User(id=2, nickname="async_b", invite_code="ASY002", cyber_token_balance=10),
+            UserSegment(user_id=1, rfm_group="Whale", risk_profile="Low"),
+        ])
+        await db.commit()
+    try:
+        yield factory
+    finally:
+        await engine.dispose()
+
+
+def make_service():
+    return AsyncGameService(AsyncGameRepository(state=InMemoryGameStateBackend(), writer=None))
+
+
+def test_to_async_url_swaps_driver():
+    assert to_async_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+    assert to_async_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    with pytest.raises(ValueError):
+        to_async_url("oracle://u:p@db/app")
+
+
+@pytest.mark.asyncio
+async def test_async_token_service_debits_atomically(session_factory):
+    async with session_factory() as db:
+        tokens = AsyncTokenService(db, AsyncGameRepository(state=InMemoryGameStateBackend()))
+
+        assert await tokens.deduct_tokens(2, 8) == 2
+        assert await tokens.deduct_tokens(2, 5) is None
+        assert await tokens.add_tokens(2, 3) == 5
+        assert await tokens.get_token_balance(2) == 5
+        reasons = (await db.scalars(select(TokenLedgerEntry.reason).order_by(TokenLedgerEntry.id))).all()
+        assert reasons == ["DEBIT", "CREDIT"]
+
+
+@pytest.mark.asyncio
+async def test_async_slot_spin_settles_in_one_transaction(session_factory):
+    service = make_service()
+    async with session_factory() as db:
+        result = await service.slot_spin(1, db)
+
+        assert result.balance == 1000 + result.tokens_change
+        action = (await db.scalars(select(UserAction))).one()
+        assert (action.user_id, action.action_type, action.value) == (1, "SLOT_SPIN", -2)
+        ledger = (await db.scalars(select(TokenLedgerEntry))).all()
+        assert {entry.action_id for entry in ledger} == {action.id}
+        assert await db.scalar(select(UserActivityDaily.action_count)) == 1
+
+
+class ThreadRecordingState(InMemoryGameStateBackend):
+    """Records which threads touched the (sync) game state backend."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get_streak(self, user_id):
+        self.threads.add(threading.get_ident())
+        return super().get_streak(user_id)
+
+    def set_streak(self, user_id, value):
+        self.threads.add(threading.get_ident())
+        super().set_streak(user_id, value)
+
+    def get_gacha_state(self, user_id):
+        self.threads.add(threading.get_ident())
+        return super().get_gacha_state(user_id)
+
+    def set_gacha_state(self, user_id, count=None, history=None):
+        self.threads.add(threading.get_ident())
+        super().set_gacha_state(user_id, count, history)
+
+
+@pytest.mark.asyncio
+async def test_sync_game_state_stays_off_the_event_loop(session_factory):
+    state = ThreadRecordingState()
+    service = AsyncGameService(AsyncGameRepository(state=state, writer=None))
+    limited = AsyncGachaService(service.repo, inventory=InMemoryRewardInventory({"SSR": 1}))
+    async with session_factory() as db:
+        await service.slot_spin(1, db)
+        await service.roulette_spin(1, 5, "color", "red", db)
+        await service.gacha_pull(1, 1, db)
+        await limited.pull(1, 1, db)
+
+    assert state.threads and threading.get_ident() not in state.threads
+    assert state.get_gacha_state(1)[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_async_commit_leaves_game_state_unchanged(session_factory):
+    state = InMemoryGameStateBackend()
+    state.set_streak(1, 3)
+    state.set_gacha_state(1, 0, ["Common", "Rare"])
+    service = AsyncGameService(AsyncGameRepository(state=state, writer=None))
+    limited = AsyncGachaService(service.repo, inventory=InMemoryRewardInventory({"SSR": 1}))
+    failure = OperationalError("INSERT", {}, Exception("disk I/O error"))
+    async with session_factory() as db:
+        with patch("app.services.ledger_service.LedgerService.append", side_effect=failure):
+            for play in (
+                lambda: service.slot_spin(1, db),
+                lambda: service.gacha_pull(1, 1, db),
+                lambda: limited.pull(1, 1, db),
+            ):
+                with pytest.raises(OperationalError):
+                    await play()
+
+        assert await db.scalar(select(User.cyber_token_balance).where(User.id == 1)) == 1000
+        assert state.get_streak(1) == 3
+        assert state.get_gacha_state(1) == (0, ["Common", "Rare"])
+
+
+@pytest.mark.asyncio
+async def test_async_games_reject_insufficient_tokens(session_factory):
+    service = make_service()
+    async with session_factory() as db:
+        with pytest.raises(ValueError):
+            await service.gacha_pull(2, 1, db)
+        with pytest.raises(ValueError):
+            await service.rps_play(2, "lizard", 5, db)
+
+        assert await db.scalar(select(User.cyber_token_balance).where(User.id == 2)) == 10
+        assert await db.scalar(select(func.count()).select_from(UserAction)) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_game_endpoints(session_factory):
+    app = FastAPI()
+    app.include_router(games.router)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides = {
+        require_user: lambda: 1,
+        games.game_db: override_get_db,
+        games.get_game_service: make_service,
+    }
+    client = TestClient(app)
+
+    assert client.post("/api/games/slot/spin").status_code == 200
+    assert client.post("/api/games/gacha/pull", json={"count": 1}).status_code == 200
+    assert client.post("/api/games/rps/play", json={"choice": "rock", "bet_amount": 5}).status_code == 200
+    roulette = client.post("/api/games/roulette/spin", json={"bet_type": "color", "bet_amount": 5, "value": "red"})
+    assert roulette.status_code == 200
+
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(UserAction)) == 4
@@ -0,0 +1,112 @@
+"""Tests for bulk notification creation and segment campaigns."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth.simple_auth import get_current_user
+from app.database import get_db
+from app.models import Notification, NotificationCampaign, User, UserSegment
+from app.routers import notification as notification_router
+from app.services.campaign_service import CampaignService
+from app.services.notification_service import NotificationService
+
+GROUPS = ["Whale", "Low", "Medium", "Whale", "Low", "Low", "Whale", "Medium", "Low", "Whale"]
+
+
+def add_user(session, user_id, group):
+    session.add(User(id=user_id, nickname=f"camp_{user_id}", invite_code=f"CMP{user_id:03d}"))
+    session.add(UserSegment(user_id=user_id, rfm_group=group, risk_profile="Unknown"))
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    with session_factory() as session:
+        for user_id, group in enumerate(GROUPS, start=1):
+            add_user(session, user_id, group)
+        session.commit()
+    return session_factory
+
+
+def test_batch_creation_deduplicates_users(session_factory):
+    db = session_factory()
+    service = NotificationService(db)
+
+    created = service.create_notifications_batch([1, 2, 2, 3, 1], "hello", chunk_size=2)
+
+    assert created == 3
+    assert sorted(n.user_id for n in db.query(Notification)) == [1, 2, 3]
+    assert all(not n.is_sent and n.campaign_id is None for n in db.query(Notification))
+
+
+def test_campaign_targets_segments_in_chunks(session_factory, monkeypatch):
+    monkeypatch.setattr(CampaignService, "CHUNK_SIZE", 3)
+    db = session_factory()
+
+    result = CampaignService(db).run("whale-promo", "Bonus spins!", ["Whale", "Low"])
+
+    expected = [i for i, g in enumerate(GROUPS, start=1) if g in ("Whale", "Low")]
+    assert (result.targeted, result.created, result.skipped) == (8, 8, 0)
+    assert result.chunks == 3
+    assert sorted(n.user_id for n in db.query(Notification)) == expected
+    campaign = db.query(NotificationCampaign).one()
+    assert (campaign.status, campaign.created_count, campaign.targeted_count) == ("completed", 8, 8)
+
+
+def test_rerun_only_notifies_new_segment_members(session_factory):
+    db = session_factory()
+    service = CampaignService(db)
+    service.run("whale-promo", "Bonus spins!", ["Whale"])
+
+    add_user(db, 11, "Whale")
+    db.commit()
+    result = service.run("whale-promo", "Bonus spins!", ["Whale"])
+
+    assert (result.targeted, result.created, result.skipped) == (5, 1, 4)
+    assert db.query(Notification).filter_by(user_id=11).count() == 1
+    assert db.query(Notification).count() == 5
+    assert db.query(NotificationCampaign).one().created_count == 5
+
+
+def test_campaign_endpoint_reports_throughput(session_factory):
+    app = FastAPI()
+    app.include_router(notification_router.router, prefix="/api")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/notification/campaigns",
+        json={"name": "low-winback", "message": "We miss you", "segments": ["Low"]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 4
+    assert body["per_second"] >= 0
+    pending = client.get("/api/notification/pending/2/batch").json()["notifications"]
+    assert [n["message"] for n in pending] == ["We miss you"]
+
+
+def test_campaign_endpoint_is_admin_only(session_factory):
+    app = FastAPI()
+    app.include_router(notification_router.router, prefix="/api")
+    app.dependency_overrides[get_current_user] = lambda: 2
+    app.dependency_overrides[get_db] = session_factory
+
+    response = TestClient(app).post(
+        "/api/notification/campaigns",
+        json={"name": "spam", "message": "Click here", "segments": ["Whale"]},
+    )
+
+    assert response.status_code == 403
+    db = session_factory()
+    assert db.query(Notification).count() == 0
+    db.close()
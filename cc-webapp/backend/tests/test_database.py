@@ -0,0 +1,87 @@
+"""Tests for engine pooling, connection settings and replica routing."""
+
+import itertools
+
+import pytest
+from sqlalchemy import exc, make_url, text
+
+from app import database
+from app.database import create_db_engine, pool_options
+
+
+def sample(metric, name, engine_name):
+    # conftest empties the default registry, so read the metric objects directly
+    for family in metric.collect():
+        for found in family.samples:
+            if found.name == name and found.labels.get("engine") == engine_name:
+                return found.value
+    return 0
+
+
+def test_pool_options_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "5")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "0")
+
+    options = pool_options(make_url("postgresql://u:p@db/app"))
+
+    assert (options["pool_size"], options["max_overflow"], options["pool_pre_ping"]) == (20, 5, False)
+    assert "pool_size" not in pool_options(make_url("sqlite://"))
+
+
+def test_sqlite_file_uses_wal_and_busy_timeout(tmp_path, monkeypatch):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'wal.db'}", "test_wal")
+    monkeypatch.setenv("DB_SQLITE_WAL", "0")
+    plain = create_db_engine(f"sqlite:///{tmp_path / 'plain.db'}", "test_plain")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        with plain.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    finally:
+        engine.dispose()
+        plain.dispose()
+
+
+def test_exhausted_pool_is_counted(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}", "test_pool")
+    before = sample(database.POOL_TIMEOUTS, "db_pool_checkout_timeouts_total", "test_pool")
+    try:
+        with engine.connect():
+            assert sample(database.POOL_CHECKED_OUT, "db_pool_checked_out", "test_pool") == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        assert sample(database.POOL_TIMEOUTS, "db_pool_checkout_timeouts_total", "test_pool") == before + 1
+        assert sample(database.POOL_WAIT_SECONDS, "db_pool_checkout_wait_seconds_count", "test_pool") >= 2
+        assert sample(database.POOL_CHECKED_OUT, "db_pool_checked_out", "test_pool") == 0
+    finally:
+        engine.dispose()
+
+
+def test_read_sessions_rotate_over_replicas(tmp_path, monkeypatch):
+    replicas = [create_db_engine(f"sqlite:///{tmp_path / f'replica{i}.db'}", f"test_replica{i}") for i in range(2)]
+    monkeypatch.setattr(database, "_replica_cycle", itertools.cycle(replicas))
+
+    binds = []
+    for _ in range(3):
+        db = database.ReadSessionLocal()
+        binds.append(db.get_bind())
+        db.close()
+
+    assert binds == [replicas[0], replicas[1], replicas[0]]
+    for replica in replicas:
+        replica.dispose()
+
+
+def test_read_sessions_use_primary_without_replicas(monkeypatch):
+    monkeypatch.setattr(database, "_replica_cycle", None)
+
+    db = database.ReadSessionLocal()
+    try:
+        assert db.get_bind() is database.engine
+    finally:
+        db.close()
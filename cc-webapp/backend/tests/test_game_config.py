@@ -0,0 +1,168 @@
+"""Tests for the versioned game config registry."""
+
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database
+from app.repositories.game_config_store import SQLGameConfigStore
+from app.repositories.game_repository import GameRepository
+from app.repositories.reward_inventory import InMemoryRewardInventory
+from app.routers import game_config as game_config_router
+from app.services.gacha_service import GachaService
+from app.services.game_config import ConfigVersionConflict, GameConfigRegistry
+from app.services.roulette_service import RouletteService
+from app.services.slot_service import SlotService
+from app.services.user_segment_service import UserSegmentService
+
+
+def test_publish_validates_and_versions():
+    registry = GameConfigRegistry({"slot": {"JACKPOT_PROB": 0.02}})
+    first = registry.current
+    assert first.version == 1 and first.rules_for(SlotService).JACKPOT_PROB == 0.02
+
+    for bad in (
+        {"slot": {"JACKPOT_PROB": 1.5}},
+        {"slot": {"NOT_A_RULE": 1}},
+        {"poker": {"BET": 1}},
+        {"gacha": {"RARITY_TABLE": [["SSR", 0.8], ["SR", 0.8]]}},
+        {"roulette": {"HOUSE_EDGE": {"Whale": "high"}}},
+    ):
+        with pytest.raises(ValueError):
+            registry.update(bad)
+    assert registry.current is first
+
+    second = registry.update({"roulette": {"HOUSE_EDGE": {"Whale": 0.01}}}, expected_version=1)
+    assert second.version == 2
+    assert second.rules_for(SlotService).JACKPOT_PROB == 0.02  # update는 기존 재정의 유지
+    assert dict(second.rules_for(RouletteService).HOUSE_EDGE) == {"Whale": 0.01}
+    with pytest.raises(ConfigVersionConflict):
+        registry.update({"slot": {"BET": 3}}, expected_version=1)
+
+    # publish는 환경 기본값 위의 재정의를 모두 교체
+    third = registry.publish({"slot": {"BET": 3}})
+    assert third.rules_for(SlotService).JACKPOT_PROB == 0.02
+    assert third.rules_for(RouletteService) is RouletteService
+    assert third.to_dict()["rules"] == {"slot": {"JACKPOT_PROB": 0.02, "BET": 3}}
+
+    # 이전 버전을 잡고 있던 요청은 그 버전 그대로 끝난다
+    assert first.rules_for(SlotService).BET == SlotService.BET
+    with pytest.raises(TypeError):
+        third.rules["slot"]["BET"] = 4
+
+
+def test_services_read_the_snapshot_at_construction():
+    registry = GameConfigRegistry()
+    repo = MagicMock(spec=GameRepository)
+    service = GachaService(repository=repo, inventory=InMemoryRewardInventory(), config=registry)
+    assert service.rarity_table == GachaService.DEFAULT_RARITY_TABLE
+
+    service.update_config(rarity_table=[("SSR", 1.0)])
+    assert registry.current.version == 2
+    assert service.draw(1).results == ["SSR"]
+    assert GachaService(repository=repo, config=registry).rarity_table == [("SSR", 1.0)]
+
+    registry.update({"segments": {"HOUSE_EDGE": {"Whale": 0.2}}})
+    assert UserSegmentService(db=MagicMock(), config=registry).get_house_edge("Whale") == 0.2
+
+
+def test_env_and_file_sources(tmp_path, monkeypatch):
+    path = tmp_path / "game_config.json"
+    path.write_text(json.dumps({"slot": {"JACKPOT_PROB": 0.03}}))
+    monkeypatch.setenv("GAME_CONFIG_FILE", str(path))
+    monkeypatch.setenv("HOUSE_EDGE_JSON", '{"Whale": 0.2}')
+    monkeypatch.setenv("GACHA_RARITY_TABLE", "not json")
+
+    registry = GameConfigRegistry.from_env()
+    config = registry.current
+    assert config.source == f"file:{path}"
+    assert config.rules_for(SlotService).JACKPOT_PROB == 0.03
+    assert dict(config.rules_for(UserSegmentService).HOUSE_EDGE) == {"Whale": 0.2}
+    assert config.rules_for(GachaService) is GachaService  # 잘못된 환경 변수는 무시
+    assert registry.reload() is None  # 파일이 바뀌지 않음
+
+    path.write_text(json.dumps({"slot": {"JACKPOT_PROB": 0.04}}))
+    os.utime(path, (1, 1))
+    assert registry.reload().rules_for(SlotService).JACKPOT_PROB == 0.04
+
+    path.write_text('{"slot": {"JACKPOT_PROB": 7}}')
+    os.utime(path, (2, 2))
+    with pytest.raises(ValueError):
+        registry.reload()
+    assert registry.current.rules_for(SlotService).JACKPOT_PROB == 0.04
+
+
+@pytest.fixture
+def store(session_factory):
+    return SQLGameConfigStore(session_factory)
+
+
+def test_workers_share_versions_through_the_store(store, tmp_path, monkeypatch):
+    path = tmp_path / "game_config.json"
+    path.write_text(json.dumps({"slot": {"JACKPOT_PROB": 0.03}}))
+    first = GameConfigRegistry(path=str(path), store=store)
+    second = GameConfigRegistry(path=str(path), store=store)
+
+    # 시작 시 파일은 먼저 본 워커가 한 번만 게시하고 다른 워커는 그 버전을 받는다
+    assert first.reload().version == 2
+    assert second.reload().version == 2 and second.current.source == f"file:{path}"
+    assert second.current.rules_for(SlotService).JACKPOT_PROB == 0.03
+
+    # 관리자 변경은 한 워커에만 들어와도 다른 워커의 폴링이 같은 버전으로 반영
+    published = first.update({"slot": {"BET": 3}}, expected_version=2)
+    assert published.version == 3 and store.latest().version == 3
+    assert second.reload().version == 3
+    assert second.current.rules_for(SlotService).BET == 3
+    assert second.reload() is None
+
+    # 오래된 버전을 기준으로 한 변경은 다른 워커에서도 거절되고, 번호는 저장소 기준으로 증가
+    with pytest.raises(ConfigVersionConflict):
+        second.update({"slot": {"BET": 4}}, expected_version=2)
+    assert second.update({"slot": {"BET": 4}}).version == 4
+    assert first.update({"rps": {"DEFAULT_WIN_MULTIPLIER": 1.8}}).version == 5
+    assert first.current.rules_for(SlotService).BET == 4
+
+    # 파일 변경도 한 번만 게시
+    os.utime(path, (1, 1))
+    assert first.reload().version == 6
+    assert second.reload().version == 6 and store.latest().version == 6
+    assert second.current.rules_for(SlotService).BET == SlotService.BET
+
+    # 재시작한 워커는 파일을 다시 게시하지 않고 최신 버전에서 시작
+    second.update({"slot": {"BET": 5}})
+    monkeypatch.setenv("GAME_CONFIG_FILE", str(path))
+    monkeypatch.setattr(database, "SessionLocal", store.session_factory)
+    monkeypatch.setenv("GAME_CONFIG_BACKEND", "sql")
+    restarted = GameConfigRegistry.from_env()
+    assert restarted.current.version == 7
+    assert restarted.current.rules_for(SlotService).BET == 5 and restarted.reload() is None
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+
+    registry = GameConfigRegistry()
+    app.dependency_overrides[game_config_router.get_registry] = lambda: registry
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.pop(game_config_router.get_registry, None)
+
+
+def test_admin_endpoints(client):
+    assert client.get("/api/admin/game-config").json()["version"] == 1
+
+    resp = client.put(
+        "/api/admin/game-config", json={"rules": {"rps": {"DEFAULT_WIN_MULTIPLIER": 1.8}}, "expected_version": 1}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["rules"] == {"rps": {"DEFAULT_WIN_MULTIPLIER": 1.8}}
+
+    stale = client.put("/api/admin/game-config", json={"rules": {}, "expected_version": 1})
+    assert stale.status_code == 409
+    invalid = client.put("/api/admin/game-config", json={"rules": {"rps": {"DEFAULT_WIN_MULTIPLIER": -1}}})
+    assert invalid.status_code == 422
+    assert client.post("/api/admin/game-config/reload").status_code == 404
@@ -62,6 +62,7 @@ def test_record_action_success(db_session):
 
 def test_record_action_failure():
     mock_session = Mock(spec=Session)
+    mock_session.get_bind.return_value.dialect.name = "sqlite"
     mock_session.commit.side_effect = IntegrityError("err", None, None)
     with pytest.raises(IntegrityError):
         repo.record_action(mock_session, 1, "PLAY", 1.0)
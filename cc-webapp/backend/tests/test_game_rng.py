@@ -0,0 +1,130 @@
+"""Tests for seedable, replayable game RNG streams."""
+
+import json
+import logging
+from collections import Counter
+
+import pytest
+
+from app.repositories.game_repository import GameRepository
+from app.repositories.game_state import InMemoryGameStateBackend
+from app.repositories.reward_inventory import InMemoryRewardInventory
+from app.services.gacha_service import GachaService
+from app.services.game_config import GameConfigRegistry
+from app.services.roulette_service import RouletteService
+from app.services.rps_service import RPSService
+from app.services.slot_service import SlotService
+from app.utils import game_rng
+from app.utils.game_rng import KeyedRngProvider, SystemRngProvider, parse_seed
+
+
+def test_keyed_streams_are_deterministic_and_independent():
+    provider = KeyedRngProvider(b"server-seed")
+    first = provider.stream("slot", 1, nonce=7)
+    values = [first.random() for _ in range(20)]
+    again = provider.stream("slot", 1, nonce=7)
+    assert [again.random() for _ in range(20)] == values
+    assert all(0.0 <= value < 1.0 for value in values) and first.draws == 20
+
+    others = [provider.stream("slot", 1, nonce=8), provider.stream("slot", 2, nonce=7),
+              provider.stream("rps", 1, nonce=7), KeyedRngProvider(b"other").stream("slot", 1, nonce=7)]
+    for other in others:
+        assert [other.random() for _ in range(20)] != values
+
+    stream = provider.stream("roulette", 1, nonce=1)
+    rolls = Counter(stream.randint(0, 36) for _ in range(5_000))
+    assert set(rolls) == set(range(37))
+    assert stream.choice(("rock",)) == "rock"
+    with pytest.raises(ValueError):
+        stream.randint(1, 0)
+    assert provider.stream("slot", 1).nonce != provider.stream("slot", 1).nonce
+
+
+def test_seed_parsing_and_default_provider(monkeypatch):
+    assert parse_seed("00ff") == b"\x00\xff" and parse_seed("not hex") == b"not hex"
+    assert KeyedRngProvider(parse_seed("00ff")).seed_id != KeyedRngProvider(b"00ff").seed_id
+    with pytest.raises(ValueError):
+        KeyedRngProvider(b"")
+
+    monkeypatch.setattr(game_rng, "_default_provider", None)
+    monkeypatch.delenv("GAME_RNG_SEED", raising=False)
+    assert isinstance(game_rng.get_rng_provider(), SystemRngProvider)
+    monkeypatch.setattr(game_rng, "_default_provider", None)
+    monkeypatch.setenv("GAME_RNG_SEED", "abc123")
+    provider = game_rng.get_rng_provider()
+    assert provider.seed_id == KeyedRngProvider(bytes.fromhex("abc123")).seed_id
+    assert game_rng.get_rng_provider() is provider
+
+
+def audit_records(caplog):
+    return [json.loads(record.getMessage()) for record in caplog.records if record.name == game_rng.audit_logger.name]
+
+
+def repository():
+    return GameRepository(state=InMemoryGameStateBackend())
+
+
+def test_service_rounds_are_audited_and_replay(caplog):
+    caplog.set_level(logging.INFO, logger=game_rng.audit_logger.name)
+    provider = KeyedRngProvider(b"audit-seed")
+    registry = GameConfigRegistry()
+    services = dict(config=registry, rng=provider)
+    slot = SlotService(repository(), **services)
+    roulette = RouletteService(repository(), **services)
+    rps = RPSService(repository(), **services)
+    gacha = GachaService(repository(), inventory=InMemoryRewardInventory(), **services)
+
+    slot.repo.set_streak(1, 4)
+    outcomes = [
+        slot._outcome(1, "Whale"),
+        roulette._outcome(1, 10, "number", "7", "Low"),
+        rps._outcome(1, "rock", 5, "Medium"),
+        gacha._resolve(1, 10),
+    ]
+    # 기록은 결과에 담겨 정산 커밋 후에만 로그로 남는다
+    assert audit_records(caplog) == []
+    for outcome in outcomes:
+        game_rng.write_audit(outcome.audit)
+    slot_record, roulette_record, rps_record, gacha_record = records = audit_records(caplog)
+    assert [record["game"] for record in records] == ["slot", "roulette", "rps", "gacha"]
+    assert all(r["seed_id"] == provider.seed_id and r["config_version"] == 1 for r in records)
+    assert slot_record["streak"] == 4 and slot_record["payout"] == outcomes[0].payout
+    assert gacha_record["draws"] == 10 and gacha_record["count"] == 0
+    assert gacha_record["results"] == outcomes[3].detail
+
+    # 같은 시드와 감사 기록의 입력만으로 같은 결과가 나온다
+    caplog.clear()
+    slot.repo.set_streak(1, 4)
+    assert slot._outcome(1, "Whale", provider.replay(slot_record)) == outcomes[0]
+    assert roulette._outcome(1, 10, "number", "7", "Low", provider.replay(roulette_record)) == outcomes[1]
+    assert rps._outcome(1, "rock", 5, "Medium", provider.replay(rps_record)) == outcomes[2]
+    replayed = gacha.pull_many(10, gacha_record["count"], gacha_record["history"], provider.replay(gacha_record).random)
+    assert replayed.results == outcomes[3].detail
+    assert audit_records(caplog) == []
+
+    with pytest.raises(ValueError):
+        KeyedRngProvider(b"another-seed").replay(slot_record)
+
+
+def test_simulator_shards_merge_into_the_single_run():
+    pytest.importorskip("numpy")
+    from app.utils.game_simulator import RPSModel, merge_reports, simulate
+
+    kwargs = dict(users=9_000, rounds=15, seed=21, chunk_size=2_000)
+    single = simulate(RPSModel(bet=10), **kwargs)
+    shards = [simulate(RPSModel(bet=10), shard=shard, shards=3, **kwargs) for shard in range(3)]
+    merged = merge_reports(shards)
+
+    assert sum(report.users for report in shards) == merged.users == single.users == 9_000
+    for name, stats in single.segments.items():
+        other = merged.segments[name]
+        assert (other.users, other.plays, other.paid, other.events, other.streak_histogram) == (
+            stats.users, stats.plays, stats.paid, stats.events, stats.streak_histogram
+        )
+        assert other.net_variance == pytest.approx(stats.net_variance)
+
+    assert simulate(RPSModel(), users=10, rounds=1).seed is not None
+    with pytest.raises(ValueError):
+        simulate(RPSModel(), users=10, rounds=1, shard=2, shards=2)
+    with pytest.raises(ValueError):
+        merge_reports([single, simulate(RPSModel(bet=10), **{**kwargs, "seed": 22})])
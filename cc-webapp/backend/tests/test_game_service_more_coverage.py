@@ -55,10 +55,12 @@ class TestGameServiceDelegation(unittest.TestCase):
         self.assertIsInstance(self.service.roulette_service, MagicMock)
         self.assertIsInstance(self.service.gacha_service, MagicMock)
         
-        # 각 서비스가 올바른 저장소로 초기화되었는지 검증
-        self.mock_slot_class.assert_called_once_with(self.mock_repo)
-        self.mock_roulette_class.assert_called_once_with(self.mock_repo)
-        self.mock_gacha_class.assert_called_once_with(self.mock_repo)
+        # 각 서비스가 올바른 저장소와 공유 토큰/정산 서비스로 초기화되었는지 검증
+        shared = self.mock_slot_class.call_args.kwargs
+        self.assertIs(shared["settlement"].token_service, shared["token_service"])
+        self.mock_slot_class.assert_called_once_with(self.mock_repo, **shared)
+        self.mock_roulette_class.assert_called_once_with(self.mock_repo, **shared)
+        self.mock_gacha_class.assert_called_once_with(self.mock_repo, **shared)
 
     def test_default_repository_initialization(self):
         """저장소 기본값 초기화 테스트."""
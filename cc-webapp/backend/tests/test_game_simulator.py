@@ -0,0 +1,139 @@
+"""Tests for the vectorized game economy simulator."""
+
+import random
+from itertools import product
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.repositories.game_repository import GameRepository  # noqa: E402
+from app.repositories.game_state import InMemoryGameStateBackend  # noqa: E402
+from app.repositories.reward_inventory import InMemoryRewardInventory  # noqa: E402
+from app.services.gacha_service import GachaService  # noqa: E402
+from app.services.game_config import GameConfigRegistry  # noqa: E402
+from app.services.roulette_service import RouletteService  # noqa: E402
+from app.services.rps_service import RPSService  # noqa: E402
+from app.services.slot_service import SlotService  # noqa: E402
+from app.utils import game_simulator  # noqa: E402
+from app.utils.game_simulator import (  # noqa: E402
+    SEGMENTS,
+    GachaModel,
+    RPSModel,
+    RouletteModel,
+    SlotModel,
+    roulette_round,
+    rps_round,
+    simulate,
+    slot_round,
+    tuned,
+)
+
+
+class ScriptedRng:
+    """Feeds the same draws to the simulator that the service gets from ``random``."""
+
+    def __init__(self, draws):
+        self.draws = iter(draws)
+
+    def random(self, n):
+        return np.array([next(self.draws) for _ in range(n)])
+
+
+def repository():
+    return GameRepository(state=InMemoryGameStateBackend())
+
+
+def test_slot_kernel_matches_service(monkeypatch):
+    repo = repository()
+    service = SlotService(repository=repo)
+    spins = [0.0, 0.0099, 0.01, 0.079, 0.08, 0.1, 0.119, 0.12, 0.13, 0.16, 0.5, 0.999]
+    for streak, code, spin in product(range(9), range(len(SEGMENTS)), spins):
+        repo.set_streak(1, streak)
+        monkeypatch.setattr(random, "random", lambda: spin)
+        outcome = service._outcome(1, SEGMENTS[code])
+
+        payout, new_streak, _, _ = slot_round(SlotService, np.array([streak]), np.array([code]), np.array([spin]))
+        assert (payout[0], new_streak[0]) == (outcome.payout, outcome.streak), (streak, SEGMENTS[code], spin)
+
+
+def test_roulette_and_rps_kernels_match_services(monkeypatch):
+    roulette = RouletteService(repository=repository())
+    bets = [("number", "0"), ("number", "17"), ("color", "red"), ("color", "black"),
+            ("odd_even", "odd"), ("odd_even", "even"), ("color", "green")]
+    for (bet_type, value), bet, code, number in product(bets, (1, 7, 50), range(len(SEGMENTS)), range(37)):
+        monkeypatch.setattr(random, "randint", lambda a, b: number)
+        outcome = roulette._outcome(1, bet, bet_type, value, SEGMENTS[code])
+
+        payout, _ = roulette_round(RouletteService, bet, bet_type, value, np.array([code]), np.array([number]))
+        assert payout[0] == outcome.payout, (bet_type, value, bet, SEGMENTS[code], number)
+
+    rps = RPSService(repository=repository())
+    for choice, bet, code, computer in product(RPSService.VALID_CHOICES, (1, 3, 10), range(len(SEGMENTS)), range(3)):
+        monkeypatch.setattr(random, "choice", lambda choices: choices[computer])
+        outcome = rps._outcome(1, choice, bet, SEGMENTS[code])
+
+        payout, _, _ = rps_round(RPSService, bet, choice, np.array([code]), np.array([computer]))
+        assert payout[0] == outcome.payout, (choice, bet, SEGMENTS[code], computer)
+
+
+@pytest.mark.parametrize("reward_pool", [{}, {"Legendary": 1, "Epic": 3, "Rare": 40, "Common": 500}])
+def test_gacha_model_replays_service_pulls(monkeypatch, reward_pool):
+    draws = np.random.default_rng(3).random(400).tolist()
+    # 경계값과 천장 구간이 반드시 포함되도록
+    draws[:3] = [0.005, 0.0025, 0.7]
+    service = GachaService(repository=repository(), inventory=InMemoryRewardInventory(), config=GameConfigRegistry())
+    service.update_config(rarity_table=GachaService.DEFAULT_RARITY_TABLE.copy(), reward_pool=dict(reward_pool))
+    feed = iter(draws)
+    monkeypatch.setattr(random, "random", lambda: next(feed))
+    expected = []
+    for _ in range(len(draws) // 10):
+        outcome = service._resolve(1, 10)
+        # 천장/히스토리는 정산 커밋 후에 반영되므로 커밋된 라운드처럼 적용한다
+        service.settlement._apply_state(1, outcome)
+        expected.extend(outcome.detail)
+
+    model = GachaModel(count=1, reward_pool=reward_pool)
+    state = model.init_state(1)
+    rng = ScriptedRng(draws)
+    actual = []
+    for _ in draws:
+        _, events = model.play(rng, state, np.array([0]), np.array([True]))
+        actual.extend(name for name in model.names if events[name][0])
+
+    assert actual == expected
+    assert "Epic" in actual and state["count"][0] == service.repo.get_gacha_count(1)
+    assert model.reward_pool == service.reward_pool
+
+
+def test_simulation_reports_per_segment_economics():
+    report = simulate(RPSModel(bet=10), users=20_000, rounds=30, seed=11)
+    again = simulate(RPSModel(bet=10), users=20_000, rounds=30, seed=11)
+    assert report.to_dict()["segments"] == again.to_dict()["segments"]
+
+    low, whale = report.segments["Low"], report.segments["Whale"]
+    # 무승부 환불 1/3 + 승리 배율 1/3
+    assert low.rtp == pytest.approx((1 + 1.5) / 3, abs=0.01)
+    assert whale.rtp == pytest.approx((1 + 3.0) / 3, abs=0.03)
+    assert low.plays == low.users * 30 and low.sink_rate == 10
+    assert low.net_variance > 0 and low.streak_percentile(0.99) >= low.streak_percentile(0.5)
+    assert report.overall.users == 20_000
+
+    no_payout = SlotModel(tuned(SlotService, WIN_PAYOUT=0, JACKPOT_PAYOUT=0))
+    broke = simulate(no_payout, users=1_000, rounds=20, seed=1, balance=10)
+    assert broke.overall.plays == 1_000 * 5 and broke.overall.broke == 1_000 and broke.overall.rtp == 0
+
+    gacha = simulate(GachaModel(), users=2_000, rounds=120, seed=5, segment_mix={"Medium": 1})
+    medium = gacha.segments["Medium"]
+    assert gacha.segments["Low"].users == 0 and medium.paid == 0
+    assert medium.events["pity"] > 0 and medium.streak_percentile(1.0) < GachaService.PITY_THRESHOLD
+
+
+def test_invalid_configuration_is_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        tuned(SlotService, NOT_A_RULE=1)
+    with pytest.raises(ValueError):
+        simulate(RouletteModel(), users=10, rounds=1, segment_mix={"Dolphin": 1.0})
+    monkeypatch.setattr(game_simulator, "np", None)
+    with pytest.raises(RuntimeError):
+        simulate(RouletteModel(), users=10, rounds=1)
@@ -0,0 +1,139 @@
+"""Tests for the pluggable game state backends."""
+
+import threading
+
+import pytest
+
+from app.models import User, UserGachaState, UserStreak
+from app.repositories.game_repository import GameRepository
+from app.repositories.game_state import InMemoryGameStateBackend, SQLGameStateBackend
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add_all(User(id=i, nickname=f"state_{i}", invite_code="STATE1") for i in range(1, 6))
+        db.commit()
+    return session_factory
+
+
+def _backend(factory, **kwargs):
+    options = {"flush_interval": 3600, "max_dirty": 1000, "ttl": 3600}
+    options.update(kwargs)
+    return SQLGameStateBackend(factory, **options)
+
+
+def test_writes_are_deferred_until_flush(session_factory):
+    backend = _backend(session_factory)
+    repo = GameRepository(backend)
+
+    repo.set_streak(1, 4)
+    repo.set_gacha_count(1, 12)
+    repo.set_gacha_history(1, ["Epic", "Common"])
+
+    with session_factory() as db:
+        assert db.query(UserStreak).count() == 0
+    assert repo.get_streak(1) == 4
+
+    assert backend.flush() == 2
+    with session_factory() as db:
+        assert db.get(UserStreak, 1).loss_streak == 4
+        state = db.get(UserGachaState, 1)
+        assert (state.pull_count, state.history) == (12, ["Epic", "Common"])
+
+
+def test_state_is_shared_between_workers(session_factory):
+    worker_a = GameRepository(_backend(session_factory))
+    worker_b = GameRepository(_backend(session_factory, ttl=0))
+
+    worker_a.set_streak(2, 3)
+    worker_a.state.flush()
+    assert worker_b.get_streak(2) == 3
+
+    worker_a.set_streak(2, 0)
+    worker_a.state.flush()
+    assert worker_b.get_streak(2) == 0
+
+
+def test_flush_upserts_existing_rows(session_factory):
+    backend = _backend(session_factory)
+    backend.set_streak(1, 1)
+    backend.flush()
+    backend.set_streak(1, 2)
+    backend.flush()
+
+    with session_factory() as db:
+        assert [(s.user_id, s.loss_streak) for s in db.query(UserStreak).all()] == [(1, 2)]
+
+
+def test_batch_flush_when_dirty_limit_reached(session_factory):
+    backend = _backend(session_factory, max_dirty=3)
+    for user_id in (1, 2):
+        backend.set_streak(user_id, user_id)
+    assert backend.dirty_count == 2
+
+    backend.set_streak(3, 3)
+
+    assert backend.dirty_count == 0
+    with session_factory() as db:
+        assert db.query(UserStreak).count() == 3
+
+
+def test_lru_is_bounded_and_flushes_dirty_entries_before_eviction(session_factory):
+    backend = _backend(session_factory, max_entries=2)
+    for user_id in (1, 2, 3):
+        backend.set_streak(user_id, 5)
+
+    assert len(backend) == 2
+    with session_factory() as db:
+        assert db.get(UserStreak, 1).loss_streak == 5
+    # Evicted entry is reloaded from the database
+    assert backend.get_streak(1) == 5
+
+
+def test_returned_history_is_a_copy(session_factory):
+    repo = GameRepository(_backend(session_factory))
+    repo.set_gacha_history(1, ["Rare"])
+
+    repo.get_gacha_history(1).append("Legendary")
+
+    assert repo.get_gacha_history(1) == ["Rare"]
+    assert repo.get_gacha_count(1) == 0
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryGameStateBackend(max_entries=2)
+    backend.set_streak(1, 1)
+    backend.set_streak(2, 2)
+    backend.get_streak(1)
+    backend.set_streak(3, 3)
+
+    assert len(backend) == 2
+    assert backend.get_streak(1) == 1
+    assert backend.get_streak(2) == 0
+
+
+def test_database_round_trips_do_not_hold_the_cache_lock(session_factory):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_factory():
+        entered.set()
+        assert release.wait(5)
+        return session_factory()
+
+    backend = _backend(slow_factory)
+    backend._store(("streak", 2), 7)  # 캐시에 있는 다른 사용자
+    loader = threading.Thread(target=backend.get_streak, args=(1,))
+    loader.start()
+    assert entered.wait(5)
+
+    # 사용자 1의 DB 조회가 끝나지 않아도 다른 사용자의 읽기/쓰기는 막히지 않는다
+    seen = []
+    other = threading.Thread(target=lambda: (backend.set_streak(3, 1), seen.append(backend.get_streak(2))))
+    other.start()
+    other.join(1)
+    assert seen == [7]
+
+    release.set()
+    loader.join(5)
+    assert backend.get_streak(1) == 0 and backend.dirty_count == 2
@@ -0,0 +1,104 @@
+"""Tests for the append-only token ledger."""
+
+import pytest
+
+from app.models import TokenBalanceSnapshot, TokenLedgerEntry, User
+from app.repositories.game_repository import GameRepository
+from app.services.ledger_service import LedgerEntry, LedgerService
+from app.services.settlement_service import GameOutcome, SettlementService
+from app.services.token_service import TokenService
+
+
+@pytest.fixture()
+def db_session(db_session):
+    db_session.add_all([
+        User(id=1, nickname="ledger_a", invite_code="LEDG01", cyber_token_balance=200),
+        User(id=2, nickname="ledger_b", invite_code="LEDG02", cyber_token_balance=50),
+    ])
+    db_session.commit()
+    return db_session
+
+
+def test_token_service_writes_ledger_entries(db_session):
+    service = TokenService(db_session)
+
+    service.deduct_tokens(1, 30, reason="CONTENT_UNLOCK")
+    service.add_tokens(1, 5)
+
+    history = service.get_transaction_history(1, limit=10)
+    assert [(h["amount"], h["balance_after"], h["reason"]) for h in history] == [
+        (5, 175, "CREDIT"),
+        (-30, 170, "CONTENT_UNLOCK"),
+    ]
+    assert LedgerService().get_balance(db_session, 1) == 175
+
+
+def test_rejected_deduction_is_not_recorded(db_session):
+    TokenService(db_session).deduct_tokens(2, 500)
+
+    assert db_session.query(TokenLedgerEntry).count() == 0
+
+
+def test_settlement_writes_bet_and_payout_entries(db_session):
+    service = SettlementService(GameRepository(), TokenService(db_session))
+
+    settled = service.settle(db_session, 1, "SLOT_SPIN", 2, lambda: GameOutcome(payout=10, streak=0))
+
+    entries = db_session.query(TokenLedgerEntry).order_by(TokenLedgerEntry.id).all()
+    assert [(e.amount, e.balance_after, e.reason) for e in entries] == [
+        (-2, 198, "SLOT_SPIN_BET"),
+        (10, 208, "SLOT_SPIN_PAYOUT"),
+    ]
+    assert {e.action_id for e in entries} == {settled.action.id}
+
+
+def test_history_keyset_pagination(db_session):
+    service = TokenService(db_session)
+    for _ in range(5):
+        service.add_tokens(1, 1)
+
+    first_page = service.get_transaction_history(1, limit=2)
+    second_page = service.get_transaction_history(1, limit=2, before_id=first_page[-1]["id"])
+
+    assert [h["balance_after"] for h in first_page] == [205, 204]
+    assert [h["balance_after"] for h in second_page] == [203, 202]
+
+
+def test_snapshots_bound_balance_reconstruction(db_session):
+    ledger = LedgerService()
+    service = TokenService(db_session, ledger=ledger)
+    for _ in range(3):
+        service.add_tokens(1, 10)
+
+    assert ledger.take_snapshots(db_session, min_entries=3) == 1
+    assert ledger.take_snapshots(db_session, min_entries=3) == 0
+
+    snapshot = db_session.query(TokenBalanceSnapshot).filter_by(user_id=1).one()
+    assert snapshot.balance == 230
+
+    service.deduct_tokens(1, 15)
+    assert ledger.get_balance(db_session, 1) == 215
+
+
+def test_reconcile_reports_only_mismatches(db_session):
+    ledger = LedgerService()
+    service = TokenService(db_session, ledger=ledger)
+    service.add_tokens(1, 10)
+    service.add_tokens(2, 10)
+    assert ledger.reconcile(db_session) == []
+
+    # Balance changed behind the ledger's back
+    db_session.query(User).filter(User.id == 2).update({"cyber_token_balance": 999})
+    db_session.commit()
+
+    assert ledger.reconcile(db_session) == [
+        {"user_id": 2, "ledger_balance": 60, "account_balance": 999}
+    ]
+
+
+def test_append_skips_empty_batches(db_session):
+    LedgerService().append(db_session, [])
+    LedgerService().append(db_session, [LedgerEntry(1, 0, 200, "NOOP")])
+    db_session.commit()
+
+    assert db_session.query(TokenLedgerEntry).count() == 1
@@ -0,0 +1,159 @@
+"""Tests for batched notification claiming, WebSocket push and long-poll."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.models import Notification, User
+from app.routers import notification as notification_router
+from app.services.notification_dispatcher import NotificationDispatcher
+from app.services.notification_service import NotificationService
+from app.websockets.chat import WebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self, code=1000):
+        pass
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    session = session_factory()
+    session.add_all([
+        User(id=1, nickname="notify_a", invite_code="NTF001"),
+        User(id=2, nickname="notify_b", invite_code="NTF002"),
+    ])
+    base = datetime.utcnow() - timedelta(hours=1)
+    session.add_all(
+        [Notification(user_id=1, message=f"a{i}", created_at=base + timedelta(minutes=i)) for i in range(5)]
+        + [Notification(user_id=2, message="b0", created_at=base)]
+        + [Notification(user_id=1, message="old", created_at=base, is_sent=True)]
+    )
+    session.commit()
+    session.close()
+    return session_factory
+
+
+def test_claim_pending_marks_batch_sent_oldest_first(session_factory):
+    db = session_factory()
+    service = NotificationService(db)
+
+    first = service.claim_pending([1], limit=3)
+    second = service.claim_pending([1], limit=3)
+
+    assert [n.message for n in first] == ["a0", "a1", "a2"]
+    assert [n.message for n in second] == ["a3", "a4"]
+    assert all(n.is_sent and n.sent_at is not None for n in first + second)
+    assert service.claim_pending([1]) == []
+    assert db.query(Notification).filter_by(user_id=2, is_sent=False).count() == 1
+
+
+def test_release_returns_rows_to_pending(session_factory):
+    db = session_factory()
+    service = NotificationService(db)
+    claimed = service.claim_pending([1, 2])
+
+    assert service.release([n.id for n in claimed if n.user_id == 2]) == 1
+    assert [n.message for n in service.claim_pending([1, 2])] == ["b0"]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_pushes_one_frame_per_user(session_factory):
+    manager = WebSocketManager()
+    dispatcher = NotificationDispatcher(manager, session_factory, batch_size=2)
+    socket = FakeWebSocket()
+    await manager.connect(socket, 1)
+
+    # user 2 has no socket on this worker, so its notification stays pending
+    assert await dispatcher.dispatch([1, 2]) == 5
+    await asyncio.sleep(0.01)
+
+    messages = [item["message"] for frame in socket.sent for item in frame["items"]]
+    assert messages == ["a0", "a1", "a2", "a3", "a4"]
+    assert all(frame["type"] == "notifications" for frame in socket.sent)
+    db = session_factory()
+    assert db.query(Notification).filter_by(user_id=2, is_sent=False).count() == 1
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_frames_dropped_from_the_send_queue_are_released(session_factory):
+    manager = WebSocketManager()
+    dispatcher = NotificationDispatcher(manager, session_factory)
+    socket = FakeWebSocket()
+    await manager.connect(socket, 1)
+
+    # 큐에 넣었지만 작성자 태스크가 보내기 전에 연결이 끊김
+    assert await dispatcher.dispatch([1]) == 5
+    manager.disconnect(socket)
+    await dispatcher.close()
+
+    assert socket.sent == [] and dispatcher.stats["released"] == 5
+    db = session_factory()
+    assert db.query(Notification).filter_by(user_id=1, is_sent=False).count() == 5
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_wake_triggers_background_dispatch(session_factory):
+    manager = WebSocketManager()
+    dispatcher = NotificationDispatcher(manager, session_factory, interval=60)
+    socket = FakeWebSocket()
+    await manager.connect(socket, 2)
+    await dispatcher.start()
+
+    dispatcher.wake(2)
+    await asyncio.sleep(0.1)
+
+    assert [item["message"] for item in socket.sent[0]["items"]] == ["b0"]
+    await dispatcher.close()
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_returns_on_wake():
+    dispatcher = NotificationDispatcher(WebSocketManager())
+    waiting = asyncio.create_task(dispatcher.wait_for(1, timeout=5))
+    await asyncio.sleep(0)
+
+    dispatcher.wake(1)
+
+    assert await waiting is True
+    assert await dispatcher.wait_for(1, timeout=0.01) is False
+
+
+def test_batch_endpoint_returns_all_pending(session_factory):
+    app = FastAPI()
+    app.include_router(notification_router.router, prefix="/api")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    response = client.get("/api/notification/pending/1/batch", params={"limit": 10})
+    assert response.status_code == 200
+    assert [n["message"] for n in response.json()["notifications"]] == ["a0", "a1", "a2", "a3", "a4"]
+
+    empty = client.get("/api/notification/pending/1/batch", params={"wait": 0.05})
+    assert empty.json() == {"notifications": []}
+    assert client.get("/api/notification/pending/99/batch").status_code == 404
@@ -0,0 +1,52 @@
+"""Tests for the KLL quantile sketch."""
+
+import bisect
+import random
+
+from app.utils.quantile_sketch import KLLSketch
+
+
+def _rank(sorted_values, value):
+    return bisect.bisect_left(sorted_values, value) / len(sorted_values)
+
+
+def test_quantiles_within_rank_error():
+    rng = random.Random(3)
+    values = [rng.expovariate(0.05) for _ in range(50_000)]
+    sketch = KLLSketch(seed=1)
+    sketch.extend(values)
+
+    ordered = sorted(values)
+    for q in (0.1, 0.2, 0.5, 0.8, 0.95):
+        assert abs(_rank(ordered, sketch.quantile(q)) - q) < 0.02
+    assert len(sketch) == 50_000
+    assert sum(len(c) for c in sketch.compactors) < 1_000
+
+
+def test_merged_shards_match_single_stream():
+    rng = random.Random(5)
+    values = [rng.randint(0, 10_000) for _ in range(40_000)]
+    shards = [KLLSketch(seed=i) for i in range(4)]
+    for i, value in enumerate(values):
+        shards[i % 4].update(value)
+
+    merged = shards[0]
+    for shard in shards[1:]:
+        merged.merge(shard)
+
+    ordered = sorted(values)
+    assert merged.n == len(values)
+    for q in (0.2, 0.5, 0.8):
+        assert abs(_rank(ordered, merged.quantile(q)) - q) < 0.02
+
+
+def test_round_trip_and_small_inputs():
+    sketch = KLLSketch(k=50, seed=0)
+    assert sketch.quantile(0.5) is None
+
+    sketch.extend([3, 1, 2])
+    restored = KLLSketch.from_dict(sketch.to_dict())
+
+    assert restored.quantile(0.5) == 2
+    assert restored.quantile(1.0) == 3
+    assert restored.n == 3
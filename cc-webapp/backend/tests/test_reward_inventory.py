@@ -0,0 +1,122 @@
+"""Tests for the shared gacha reward inventory."""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, GachaRewardStock
+from app.repositories.game_repository import GameRepository
+from app.repositories.reward_inventory import InMemoryRewardInventory, SQLRewardInventory
+from app.services.gacha_service import GachaService
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    # 스레드마다 별도 연결이 필요하므로 파일 DB 사용
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'stock.db'}", connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    finally:
+        engine.dispose()
+
+
+def sequential_draw(service, pulls, count, history, stock):
+    """Reference: take stock pull by pull, as ``GachaService`` did before batching."""
+
+    def claim(rarity):
+        if stock.get(rarity, 0) <= 0:
+            return False
+        stock[rarity] -= 1
+        return True
+
+    return service.pull_many(pulls, count, history, claim=claim)
+
+
+def test_memory_inventory_reserves_atomically():
+    inventory = InMemoryRewardInventory()
+    assert not inventory.limited()
+    assert inventory.reserve({"Legendary": 3}) == {"Legendary": 3}
+
+    inventory.set_stock({"Legendary": 2, "Common": 5})
+    assert inventory.reserve({"Legendary": 3, "Common": 1, "Epic": 1}) == {"Legendary": 2, "Common": 1, "Epic": 0}
+    inventory.release({"Common": 1})
+    assert inventory.stock() == {"Legendary": 0, "Common": 5}
+    assert all(row["drift"] == 0 and not row["oversold"] for row in inventory.reconcile())
+
+
+def test_sql_inventory_spreads_stock_over_shards(session_factory):
+    inventory = SQLRewardInventory(session_factory, shards=4, ttl=0)
+    assert not inventory.limited()
+    inventory.set_stock({"Legendary": 2, "Rare": 10})
+
+    with session_factory() as db:
+        rows = db.query(GachaRewardStock).filter_by(rarity="Rare").order_by(GachaRewardStock.shard).all()
+        assert [row.allocated for row in rows] == [3, 3, 2, 2]
+
+    # 한 shard로는 모자라 여러 shard에서 나눠 가져온다
+    assert inventory.reserve({"Rare": 7, "Legendary": 3, "Common": 1}) == {"Rare": 7, "Legendary": 2, "Common": 0}
+    assert inventory.stock() == {"Legendary": 0, "Rare": 3}
+
+    # 호출자 트랜잭션이 롤백되면 예약도 되돌아간다
+    with session_factory() as db:
+        assert inventory.reserve({"Rare": 2}, db) == {"Rare": 2}
+        db.rollback()
+    inventory.release({"Rare": 1})
+    assert inventory.stock() == {"Legendary": 0, "Rare": 4}
+
+    report = {row["rarity"]: row for row in inventory.reconcile()}
+    assert report["Rare"] == {
+        "rarity": "Rare", "allocated": 10, "remaining": 4, "granted": 6, "shards": 4, "drift": 0, "oversold": False,
+    }
+    with session_factory() as db:
+        db.query(GachaRewardStock).filter_by(rarity="Legendary", shard=0).update({"remaining": -1})
+        db.commit()
+    legendary = {row["rarity"]: row for row in inventory.reconcile()}["Legendary"]
+    assert legendary["drift"] == 1 and legendary["oversold"]
+
+
+def test_concurrent_pulls_never_oversell(session_factory):
+    inventory = SQLRewardInventory(session_factory, shards=4, ttl=60)
+    inventory.set_stock({"Legendary": 5, "Epic": 40})
+
+    def pull(seed):
+        rng = random.Random(seed)
+        wanted = {"Legendary": rng.randint(0, 2), "Epic": rng.randint(0, 3)}
+        with session_factory() as db:
+            granted = inventory.reserve(wanted, db)
+            db.commit()
+        return granted
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        grants = list(pool.map(pull, range(64)))
+
+    assert sum(g["Legendary"] for g in grants) == 5
+    assert sum(g["Epic"] for g in grants) == 40
+    assert inventory.stock() == {"Legendary": 0, "Epic": 0}
+    assert all(row["drift"] == 0 and not row["oversold"] for row in inventory.reconcile())
+
+
+def test_batched_draw_matches_pull_by_pull_stock():
+    repo = MagicMock(spec=GameRepository)
+    for seed in range(200):
+        rng = random.Random(seed)
+        pool = {"Legendary": rng.randint(0, 1), "Epic": rng.randint(0, 2), "Rare": rng.randint(0, 4), "Common": 6}
+        history = [rng.choice(["Rare", "Common"]) for _ in range(rng.randint(0, 10))]
+        count = rng.randint(0, 89)
+        service = GachaService(repository=repo, inventory=InMemoryRewardInventory(pool))
+
+        random.seed(seed)
+        draw = service.draw(10, count, history)
+        random.seed(seed)
+        expected_stock = dict(pool)
+        expected = sequential_draw(service, 10, count, history, expected_stock)
+
+        assert (draw.results, draw.count, draw.history) == (expected.results, expected.count, expected.history)
+        assert service.reward_pool == expected_stock
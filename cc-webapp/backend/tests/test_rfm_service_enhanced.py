@@ -12,11 +12,15 @@ Following docs/09-testing-guide.md standards for:
 
 import json
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 from sqlalchemy.orm import Session
 
 from app.services.rfm_service import RFMService, RFMScore
+from app.repositories.activity_repository import ActivitySummary
 from app.repositories.game_repository import GameRepository
+from app.services.rfm_threshold_service import RFMThresholdService
+from app.utils.segment_utils import DEFAULT_RFM_THRESHOLDS
 
 
 class TestRFMService:
@@ -26,10 +30,13 @@ class TestRFMService:
         """각 테스트 전 실행되는 설정"""
         self.mock_db = Mock(spec=Session)
         self.mock_repository = Mock(spec=GameRepository)
+        self.mock_thresholds = Mock(spec=RFMThresholdService)
+        self.mock_thresholds.get_current.return_value = (None, DEFAULT_RFM_THRESHOLDS)
         
         self.service = RFMService(
             db=self.mock_db,
-            repository=self.mock_repository
+            repository=self.mock_repository,
+            threshold_service=self.mock_thresholds
         )
 
     def test_service_initialization(self):
@@ -57,9 +64,6 @@ class TestRFMService:
 
     def test_compute_dynamic_thresholds_success(self):
         """동적 임계값 계산 성공 테스트"""
-        # set_gacha_history 호출 성공
-        self.mock_repository.set_gacha_history.return_value = None
-        
         result = self.service.compute_dynamic_thresholds()
         
         # 예상되는 임계값 구조 확인
@@ -70,20 +74,39 @@ class TestRFMService:
         ]
         
         assert all(key in result for key in expected_keys)
-        assert result["recency_high"] == 30.0
-        assert result["recency_medium"] == 60.0
+        # 게시된 버전이 없으면 정적 기본값
+        assert result["recency_high"] == 7.0
+        assert result["recency_medium"] == 30.0
         assert result["frequency_high"] == 10.0
-        assert result["frequency_medium"] == 5.0
-        assert result["monetary_high"] == 500.0
-        assert result["monetary_medium"] == 250.0
+        assert result["frequency_medium"] == 3.0
+        assert result["monetary_high"] == 100.0
+        assert result["monetary_medium"] == 20.0
+        
+        # 스케치 재계산 후 현재 임계값 조회, user 0 가챠 히스토리는 사용하지 않음
+        self.mock_thresholds.refresh.assert_called_once_with(self.mock_db)
+        self.mock_repository.set_gacha_history.assert_not_called()
+
+    def test_compute_dynamic_thresholds_uses_published_version(self):
+        """게시된 임계값 버전 사용 테스트"""
+        published = {
+            "recency": {"high": 2, "mid": 9},
+            "frequency": {"high": 40, "mid": 12},
+            "monetary": {"high": 900.0, "mid": 150.0},
+        }
+        self.mock_thresholds.get_current.return_value = (4, published)
+        
+        result = self.service.compute_dynamic_thresholds()
         
-        # repository 호출 확인
-        self.mock_repository.set_gacha_history.assert_called_once_with(0, [json.dumps(result)])
+        assert result == {
+            "recency_high": 2.0, "recency_medium": 9.0,
+            "frequency_high": 40.0, "frequency_medium": 12.0,
+            "monetary_high": 900.0, "monetary_medium": 150.0,
+        }
 
     def test_compute_dynamic_thresholds_exception_handling(self):
         """동적 임계값 계산 예외 처리 테스트"""
-        # repository에서 예외 발생하도록 설정
-        self.mock_repository.set_gacha_history.side_effect = Exception("Database error")
+        # 스케치 계산에서 예외 발생하도록 설정
+        self.mock_thresholds.refresh.side_effect = Exception("Database error")
         
         with patch('app.services.rfm_service.logger') as mock_logger:
             result = self.service.compute_dynamic_thresholds()
@@ -149,79 +172,53 @@ class TestRFMService:
         """RFM 계산 성공 테스트"""
         user_id = 1
         
-        # 가짜 가챠 히스토리 설정
-        gacha_history = [
-            '{"value": 100}',
-            '{"value": 200}',
-            '{"value": 150}'
-        ]
-        
-        self.mock_repository.get_gacha_history.return_value = gacha_history
-        self.mock_repository.get_user_segment.return_value = "High-Value"
+        # 일별 활동 집계 요약 설정
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(
+            last_action_at=datetime.utcnow() - timedelta(days=5, hours=1),
+            frequency=3,
+            monetary=450.0,
+        )
         
         result = self.service.calculate_rfm(user_id)
         
         # RFMScore 객체 확인
         assert isinstance(result, RFMScore)
         assert result.user_id == 1
-        assert result.recency == 45  # 고정값
-        assert result.frequency == 3  # gacha_history 길이
-        assert result.monetary == 450.0  # 100 + 200 + 150
+        assert result.recency == 5  # 마지막 활동 후 경과일
+        assert result.frequency == 3
+        assert result.monetary == 450.0
+        self.mock_repository.get_activity_summary.assert_called_once_with(self.mock_db, user_id)
         
         # RFM 점수 계산 확인 (recency * 0.3 + frequency * 0.3 + monetary * 0.4)
-        expected_score = (45 * 0.3) + (3 * 0.3) + (450.0 * 0.4)
+        expected_score = (5 * 0.3) + (3 * 0.3) + (450.0 * 0.4)
         assert result.rfm_score == expected_score
-          # 세그먼트 확인 (점수에 따라)
-        if expected_score > 0.8:
-            assert result.segment == "High-Value"
-        elif expected_score > 0.5:
-            assert result.segment == "Medium-Value"
-        else:
-            assert result.segment == "Low-Value"
+        assert result.segment == "High-Value"
 
     def test_calculate_rfm_no_history(self):
-        """가챠 히스토리가 없는 경우 RFM 계산 테스트"""
+        """활동 기록이 없는 경우 RFM 계산 테스트"""
         user_id = 1
         
-        self.mock_repository.get_gacha_history.return_value = []
-        self.mock_repository.get_user_segment.return_value = "Low-Value"
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(None, 0, 0.0)
         
         result = self.service.calculate_rfm(user_id)
         
         assert result.user_id == 1
-        assert result.recency == 45
+        assert result.recency == 31  # 집계 기간(30일) 밖
         assert result.frequency == 0
         assert result.monetary == 0.0
         
-        # RFM 점수 계산: (45 * 0.3) + (0 * 0.3) + (0.0 * 0.4) = 13.5
-        expected_score = (45 * 0.3) + (0 * 0.3) + (0.0 * 0.4)
+        # RFM 점수 계산: (31 * 0.3) + (0 * 0.3) + (0.0 * 0.4) = 9.3
+        expected_score = (31 * 0.3) + (0 * 0.3) + (0.0 * 0.4)
         assert result.rfm_score == expected_score
         
-        # 13.5 > 0.8 이므로 "High-Value"로 분류됨
+        # 9.3 > 0.8 이므로 "High-Value"로 분류됨
         assert result.segment == "High-Value"
 
-    def test_calculate_rfm_none_history(self):
-        """가챠 히스토리가 None인 경우 RFM 계산 테스트"""
-        user_id = 1
-        
-        self.mock_repository.get_gacha_history.return_value = None
-        self.mock_repository.get_user_segment.return_value = "Low-Value"
-        
-        result = self.service.calculate_rfm(user_id)
-        
-        assert result.user_id == 1
-        assert result.frequency == 0
-        assert result.monetary == 0.0
-
-    def test_calculate_rfm_invalid_json(self):
-        """잘못된 JSON 데이터로 RFM 계산 테스트"""
+    def test_calculate_rfm_none_summary(self):
+        """집계 요약이 None인 경우 RFM 계산 테스트"""
         user_id = 1
         
-        # 잘못된 JSON 데이터
-        gacha_history = ['invalid_json', 'not_json_either']
-        
-        self.mock_repository.get_gacha_history.return_value = gacha_history
-        self.mock_repository.get_user_segment.return_value = "Low-Value"
+        self.mock_repository.get_activity_summary.return_value = None
         
         with patch('app.services.rfm_service.logger') as mock_logger:
             result = self.service.calculate_rfm(user_id)
@@ -231,17 +228,24 @@ class TestRFMService:
             assert result.recency == 0
             assert result.frequency == 0
             assert result.monetary == 0.0
-            assert result.rfm_score == 0.0
             assert result.segment == "Low-Value"
             
             mock_logger.error.assert_called_once()
             assert "RFM calculation failed for user 1" in mock_logger.error.call_args[0][0]
 
+    def test_calculate_rfm_does_not_read_gacha_history(self):
+        """가챠 히스토리 대신 활동 집계를 사용하는지 테스트"""
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(None, 0, 0.0)
+        
+        self.service.calculate_rfm(1)
+        
+        self.mock_repository.get_gacha_history.assert_not_called()
+
     def test_calculate_rfm_repository_exception(self):
         """repository 예외 발생 시 RFM 계산 테스트"""
         user_id = 1
         
-        self.mock_repository.get_gacha_history.side_effect = Exception("Database error")
+        self.mock_repository.get_activity_summary.side_effect = Exception("Database error")
         
         with patch('app.services.rfm_service.logger') as mock_logger:
             result = self.service.calculate_rfm(user_id)
@@ -257,6 +261,7 @@ class TestRFMService:
             )
             
             mock_logger.error.assert_called_once()
+            assert "RFM calculation failed for user 1" in mock_logger.error.call_args[0][0]
 
     def test_calculate_user_rfm_success(self):
         """calculate_user_rfm 래퍼 메서드 성공 테스트"""
@@ -321,36 +326,35 @@ class TestRFMService:
         """RFM 세그먼테이션 로직 테스트"""
         user_id = 1
         
+        now = datetime.utcnow()
+        
         # High-Value 시나리오 (rfm_score > 0.8)
-        gacha_history_high = ['{"value": 1000}'] * 10
-        self.mock_repository.get_gacha_history.return_value = gacha_history_high
-        self.mock_repository.get_user_segment.return_value = "High-Value"
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(now, 10, 10000.0)
         
         result_high = self.service.calculate_rfm(user_id)
         
         # 높은 점수 확인 (monetary 값이 높아서)
-        assert result_high.monetary == 10000.0  # 1000 * 10
+        assert result_high.monetary == 10000.0
+        assert result_high.segment == "High-Value"
         
         # Medium-Value 시나리오 (0.5 < rfm_score <= 0.8)
-        gacha_history_medium = ['{"value": 50}'] * 3
-        self.mock_repository.get_gacha_history.return_value = gacha_history_medium
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(now, 2, 0.0)
         
         result_medium = self.service.calculate_rfm(user_id)
-        assert result_medium.monetary == 150.0  # 50 * 3
+        assert result_medium.rfm_score == 2 * 0.3
+        assert result_medium.segment == "Medium-Value"
         
         # Low-Value 시나리오 (rfm_score <= 0.5)
-        gacha_history_low = ['{"value": 10}']
-        self.mock_repository.get_gacha_history.return_value = gacha_history_low
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(now, 1, 0.0)
         
         result_low = self.service.calculate_rfm(user_id)
-        assert result_low.monetary == 10.0
+        assert result_low.segment == "Low-Value"
 
     def test_boundary_values(self):
         """경계값 테스트"""
         # 최소 사용자 ID
         user_id_min = 1
-        self.mock_repository.get_gacha_history.return_value = []
-        self.mock_repository.get_user_segment.return_value = "Low-Value"
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(None, 0, 0.0)
         
         result_min = self.service.calculate_rfm(user_id_min)
         assert result_min.user_id == 1
@@ -368,10 +372,13 @@ class TestRFMServiceIntegration:
         """각 테스트 전 실행되는 설정"""
         self.mock_db = Mock(spec=Session)
         self.mock_repository = Mock(spec=GameRepository)
+        self.mock_thresholds = Mock(spec=RFMThresholdService)
+        self.mock_thresholds.get_current.return_value = (None, DEFAULT_RFM_THRESHOLDS)
         
         self.service = RFMService(
             db=self.mock_db,
-            repository=self.mock_repository
+            repository=self.mock_repository,
+            threshold_service=self.mock_thresholds
         )
 
     def test_complete_rfm_workflow(self):
@@ -382,10 +389,9 @@ class TestRFMServiceIntegration:
         
         # 2. 사용자 RFM 계산
         user_id = 1
-        gacha_history = ['{"value": 300}', '{"value": 200}']
-        
-        self.mock_repository.get_gacha_history.return_value = gacha_history
-        self.mock_repository.get_user_segment.return_value = "Medium-Value"
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(
+            datetime.utcnow(), 2, 500.0
+        )
         
         rfm_score = self.service.calculate_rfm(user_id)
         assert rfm_score.user_id == user_id
@@ -415,11 +421,10 @@ class TestRFMServiceIntegration:
         all_scores = []
         
         for user_id in users:
-            # 각 사용자별 다른 히스토리 설정
-            gacha_history = [f'{{"value": {100 * user_id}}}'] * user_id
-            
-            self.mock_repository.get_gacha_history.return_value = gacha_history
-            self.mock_repository.get_user_segment.return_value = f"Segment-{user_id}"
+            # 각 사용자별 다른 활동 집계 설정
+            self.mock_repository.get_activity_summary.return_value = ActivitySummary(
+                datetime.utcnow(), user_id, 100.0 * user_id * user_id
+            )
             
             rfm_score = self.service.calculate_rfm(user_id)
             all_scores.append({
@@ -433,7 +438,9 @@ class TestRFMServiceIntegration:
         
         # 각 사용자별 세그먼트 확인
         for user_id in users:
-            self.mock_repository.get_gacha_history.return_value = [f'{{"value": {100 * user_id}}}'] * user_id
+            self.mock_repository.get_activity_summary.return_value = ActivitySummary(
+                datetime.utcnow(), user_id, 100.0 * user_id * user_id
+            )
             segment = self.service.get_user_segment(user_id)
             assert segment in ["High-Value", "Medium-Value", "Low-Value"]
 
@@ -442,28 +449,29 @@ class TestRFMServiceIntegration:
         user_id = 1
         
         # 1. 임계값 계산 실패 후 복구
-        self.mock_repository.set_gacha_history.side_effect = Exception("Threshold calc failed")
+        self.mock_thresholds.refresh.side_effect = Exception("Threshold calc failed")
         
         with patch('app.services.rfm_service.logger'):
             thresholds = self.service.compute_dynamic_thresholds()
             assert thresholds == {}
         
         # 복구
-        self.mock_repository.set_gacha_history.side_effect = None
+        self.mock_thresholds.refresh.side_effect = None
         thresholds_recovered = self.service.compute_dynamic_thresholds()
         assert len(thresholds_recovered) == 6
         
         # 2. RFM 계산 실패 후 복구
-        self.mock_repository.get_gacha_history.side_effect = Exception("RFM calc failed")
+        self.mock_repository.get_activity_summary.side_effect = Exception("RFM calc failed")
         
         with patch('app.services.rfm_service.logger'):
             rfm_failed = self.service.calculate_rfm(user_id)
             assert rfm_failed.segment == "Low-Value"
         
         # 복구
-        self.mock_repository.get_gacha_history.side_effect = None
-        self.mock_repository.get_gacha_history.return_value = ['{"value": 100}']
-        self.mock_repository.get_user_segment.return_value = "Medium-Value"
+        self.mock_repository.get_activity_summary.side_effect = None
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(
+            datetime.utcnow(), 1, 100.0
+        )
         
         rfm_recovered = self.service.calculate_rfm(user_id)
         assert rfm_recovered.user_id == user_id
@@ -473,11 +481,11 @@ class TestRFMServiceIntegration:
         """대량 데이터 성능 테스트"""
         user_id = 1
         
-        # 대량 가챠 히스토리 시뮬레이션 (1000개)
-        large_history = [f'{{"value": {i * 10}}}' for i in range(1000)]
-        
-        self.mock_repository.get_gacha_history.return_value = large_history
-        self.mock_repository.get_user_segment.return_value = "High-Value"
+        # 대량 활동 집계 시뮬레이션 (1000회)
+        expected_monetary = sum(i * 10 for i in range(1000))
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(
+            datetime.utcnow(), 1000, float(expected_monetary)
+        )
         
         # 성능 측정
         import time
@@ -491,7 +499,6 @@ class TestRFMServiceIntegration:
         # 결과 검증
         assert result.user_id == user_id
         assert result.frequency == 1000
-        expected_monetary = sum(i * 10 for i in range(1000))
         assert result.monetary == float(expected_monetary)
         
         # 성능 검증 (5초 이내)
@@ -502,10 +509,9 @@ class TestRFMServiceIntegration:
         user_id = 1
         
         # 동일한 입력에 대해 일관된 결과 확인
-        gacha_history = ['{"value": 100}', '{"value": 200}']
-        
-        self.mock_repository.get_gacha_history.return_value = gacha_history
-        self.mock_repository.get_user_segment.return_value = "Medium-Value"
+        self.mock_repository.get_activity_summary.return_value = ActivitySummary(
+            datetime.utcnow() - timedelta(days=3), 2, 300.0
+        )
         
         # 여러 번 계산
         results = []
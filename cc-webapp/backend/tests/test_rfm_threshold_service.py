@@ -0,0 +1,99 @@
+"""Tests for sketch-based RFM thresholds."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import RFMThresholdVersion, User, UserActivityDaily, UserSegment
+from app.repositories.game_repository import GameRepository
+from app.repositories.game_state import InMemoryGameStateBackend
+from app.services.rfm_threshold_service import RFMSketches, RFMThresholdService
+from app.utils.segment_utils import (
+    DEFAULT_RFM_THRESHOLDS,
+    compute_rfm_and_update_segments,
+    get_rfm_score,
+    load_rfm_thresholds,
+)
+
+USERS = 200
+
+
+@pytest.fixture()
+def db_session(db_session):
+    now = datetime.utcnow()
+    for uid in range(1, USERS + 1):
+        db_session.add(User(id=uid, nickname=f"thr_{uid}", invite_code="THR001"))
+        # user N: 마지막 활동 N % 20일 전, N회, N*10 금액
+        at = now - timedelta(days=uid % 20, minutes=1)
+        db_session.add(
+            UserActivityDaily(user_id=uid, day=at.date(), action_count=uid, monetary=uid * 10.0, last_action_at=at)
+        )
+    db_session.commit()
+    return db_session
+
+
+def test_publish_versions_and_quantiles(db_session):
+    service = RFMThresholdService()
+    assert service.get_current(db_session) == (None, DEFAULT_RFM_THRESHOLDS)
+
+    first = service.refresh(db_session)
+    second = service.refresh(db_session)
+
+    assert (first.version, second.version) == (1, 2)
+    version, thresholds = service.get_current(db_session)
+    assert version == 2
+    assert thresholds["frequency"] == {"high": 160, "mid": 100}
+    assert thresholds["monetary"] == {"high": 1600.0, "mid": 1000.0}
+    assert thresholds["recency"] == {"high": 3, "mid": 9}
+    assert service.get_sketches(db_session, version=1).sample_size == USERS
+
+
+def test_sharded_sketches_merge_to_full_result(db_session):
+    service = RFMThresholdService()
+    shards = [service.build_sketches(db_session, shard=i, shards=3) for i in range(3)]
+    assert sum(s.sample_size for s in shards) == USERS
+
+    payloads = [RFMSketches.from_dict(s.to_dict()) for s in shards]
+    published = service.publish(db_session, *payloads)
+
+    assert published.sample_size == USERS
+    assert published.thresholds == service.derive_thresholds(service.build_sketches(db_session))
+
+
+def test_small_samples_are_not_published(db_session):
+    service = RFMThresholdService()
+    service.MIN_SAMPLE_SIZE = USERS + 1
+
+    assert service.refresh(db_session) is None
+    assert db_session.query(RFMThresholdVersion).count() == 0
+
+
+def test_segment_job_and_get_rfm_score_use_published_thresholds(db_session):
+    RFMThresholdService().refresh(db_session)
+    version, thresholds = load_rfm_thresholds(db_session)
+
+    stats = compute_rfm_and_update_segments(db_session)
+
+    assert stats.thresholds_version == version
+    segments = {s.user_id: s for s in db_session.query(UserSegment).all()}
+    # user 180: 180회(>= p80), 0일 전 -> 모든 점수 상위
+    assert segments[180].rfm_group == "Whale"
+    assert segments[180].frequency_score == get_rfm_score(180, "frequency", table=thresholds) == 5
+    # 정적 임계값이라면 frequency 50은 최고 점수
+    assert get_rfm_score(50, "frequency") == 5
+    assert segments[50].frequency_score == get_rfm_score(50, "frequency", table=thresholds) == 1
+    assert get_rfm_score(3, "recency", table=thresholds) == 5
+
+
+def test_heavy_spender_outranks_light_spender(db_session):
+    # 게임 행동은 -bet으로 기록되므로 금액 점수는 베팅 규모를 따라야 한다
+    repo = GameRepository(state=InMemoryGameStateBackend())
+    for _ in range(5):
+        repo.record_action(db_session, 1, "GACHA_PULL", -1_000)
+        repo.record_action(db_session, 2, "SLOT_SPIN", -2)
+    RFMThresholdService().refresh(db_session)
+
+    compute_rfm_and_update_segments(db_session)
+
+    segments = {s.user_id: s for s in db_session.query(UserSegment).all()}
+    assert (segments[1].monetary_score, segments[2].monetary_score) == (5, 1)
@@ -28,7 +28,7 @@ class TestRouletteService:
     def test_spin_with_insufficient_tokens(self):
         """Test roulette spin with insufficient tokens."""
         # Arrange
-        self.token_service.deduct_tokens.return_value = None
+        self.token_service.debit.return_value = None
         
         # Act & Assert
         with pytest.raises(ValueError, match="토큰이 부족합니다"):
@@ -41,8 +41,8 @@ class TestRouletteService:
         bet_type = "number"
         bet_value = "17"
         mock_randint.return_value = 17  # Force spin to land on 17
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -53,7 +53,7 @@ class TestRouletteService:
         assert result.winning_number == 17
         assert result.result == "win"
         assert result.tokens_change > 0
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
 
     @patch('random.randint')
     def test_spin_color_win_red(self, mock_randint):
@@ -62,8 +62,8 @@ class TestRouletteService:
         bet_type = "color"
         bet_value = "red"
         mock_randint.return_value = 1  # Red number (assuming odd numbers are red)
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -74,7 +74,7 @@ class TestRouletteService:
         assert result.winning_number == 1
         assert result.result == "win"
         assert result.tokens_change > 0
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
 
     @patch('random.randint')
     def test_spin_color_win_black(self, mock_randint):
@@ -83,8 +83,8 @@ class TestRouletteService:
         bet_type = "color"
         bet_value = "black"
         mock_randint.return_value = 2  # Black number (assuming even numbers are black)
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -95,7 +95,7 @@ class TestRouletteService:
         assert result.winning_number == 2
         assert result.result == "win"
         assert result.tokens_change > 0
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
 
     @patch('random.randint')
     def test_spin_odd_even_win_odd(self, mock_randint):
@@ -104,8 +104,8 @@ class TestRouletteService:
         bet_type = "odd_even"
         bet_value = "odd"
         mock_randint.return_value = 35  # Odd number
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -116,7 +116,7 @@ class TestRouletteService:
         assert result.winning_number == 35
         assert result.result == "win"
         assert result.tokens_change > 0
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
 
     @patch('random.randint')
     def test_spin_odd_even_win_even(self, mock_randint):
@@ -125,8 +125,8 @@ class TestRouletteService:
         bet_type = "odd_even"
         bet_value = "even"
         mock_randint.return_value = 10  # Even number
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -137,15 +137,15 @@ class TestRouletteService:
         assert result.winning_number == 10
         assert result.result == "win"
         assert result.tokens_change > 0
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
         
     @patch('random.randint')
     def test_spin_zero_always_loses(self, mock_randint):
         """Test that zero causes all normal bets to lose."""
         # Arrange
         mock_randint.return_value = 0  # Force spin to land on zero
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000 - self.bet
+        self.token_service.debit.return_value = 1000 - self.bet
+        self.token_service.credit.return_value = 1000 - self.bet
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -166,8 +166,8 @@ class TestRouletteService:
         bet_type = "number"
         bet_value = "0"
         mock_randint.return_value = 0  # Force spin to land on zero
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -179,13 +179,13 @@ class TestRouletteService:
         assert result.result == "jackpot"
         assert result.tokens_change > 0
         assert result.animation == "jackpot"
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
         
     def test_bet_amount_limits(self):
         """Test bet amount is clamped to valid range."""
         # Arrange - bet below minimum
-        self.token_service.deduct_tokens.return_value = 1  # Min bet
-        self.token_service.get_token_balance.return_value = 999
+        self.token_service.debit.return_value = 999
+        self.token_service.credit.return_value = 999
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -194,27 +194,27 @@ class TestRouletteService:
             result = self.service.spin(self.user_id, -5, "color", "red", self.db)
             
             # Assert
-            self.token_service.deduct_tokens.assert_called_once_with(self.user_id, 1)
+            self.token_service.debit.assert_called_once_with(self.user_id, 1, db=self.db)
         
         # Reset mocks
         self.token_service.reset_mock()
         
         # Arrange - bet above maximum
-        self.token_service.deduct_tokens.return_value = 50  # Max bet
-        self.token_service.get_token_balance.return_value = 950
+        self.token_service.debit.return_value = 950
+        self.token_service.credit.return_value = 950
         
         with patch('random.randint', return_value=1):
             # Act with bet above maximum (should be clamped to 50)
             result = self.service.spin(self.user_id, 100, "color", "red", self.db)
             
             # Assert
-            self.token_service.deduct_tokens.assert_called_once_with(self.user_id, 50)
+            self.token_service.debit.assert_called_once_with(self.user_id, 50, db=self.db)
 
     def test_streak_handling(self):
         """Test streak counter updates correctly."""
         # Arrange
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 3
         
@@ -251,8 +251,8 @@ class TestRoulettePayouts:
         self.bet = 10
         
         # Setup basic mocks
-        self.token_service.deduct_tokens.return_value = self.bet
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_streak.return_value = 0
 
     def test_segment_adjusted_house_edge(self):
@@ -269,7 +269,7 @@ class TestRoulettePayouts:
             # Setup for this case
             self.repo.get_user_segment.return_value = case["segment"]
             
-            # Reset add_tokens to check payout
+            # Reset credit to check payout
             self.token_service.reset_mock()
             
             # Act - with guaranteed win on number bet (35x payout)
@@ -278,4 +278,4 @@ class TestRoulettePayouts:
             
             # Assert
             expected_payout = int(self.bet * 35 * (1 - case["expected_edge"]))
-            self.token_service.add_tokens.assert_called_once_with(self.user_id, expected_payout)
+            self.token_service.credit.assert_called_once_with(self.user_id, expected_payout, db=self.db)
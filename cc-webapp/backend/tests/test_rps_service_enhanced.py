@@ -74,12 +74,12 @@ class TestRPSService:
         bet_amount = 100
         
         # Mock 설정
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Standard"
-        self.mock_token_service.get_token_balance.return_value = 600
+        self.mock_token_service.debit.return_value = 600
+        self.mock_token_service.credit.return_value = 600
         
         # 컴퓨터가 가위 선택하도록 패치 (사용자 승리)
-        with patch('app.services.rps_service.random.choice', return_value="scissors"):
+        with patch('random.choice', return_value="scissors"):
             result = self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 검증
@@ -90,10 +90,10 @@ class TestRPSService:
         assert result.balance == 600
         
         # 서비스 호출 검증
-        self.mock_token_service.deduct_tokens.assert_called_once_with(user_id, bet_amount)
-        self.mock_token_service.add_tokens.assert_called_once_with(user_id, 200)  # 2배 보상
+        self.mock_token_service.debit.assert_called_once_with(user_id, bet_amount, db=self.mock_db)
+        self.mock_token_service.credit.assert_called_once_with(user_id, 200, db=self.mock_db)  # 2배 보상
         self.mock_repository.record_action.assert_called_once_with(
-            self.mock_db, user_id, "RPS_PLAY", -bet_amount
+            self.mock_db, user_id, "RPS_PLAY", -bet_amount, commit=False
         )
     
     def test_play_win_scenario_whale_user(self):
@@ -103,12 +103,12 @@ class TestRPSService:
         bet_amount = 100
         
         # Mock 설정
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Whale"
-        self.mock_token_service.get_token_balance.return_value = 800
+        self.mock_token_service.debit.return_value = 800
+        self.mock_token_service.credit.return_value = 800
         
         # 컴퓨터가 바위 선택하도록 패치 (사용자 승리)
-        with patch('app.services.rps_service.random.choice', return_value="rock"):
+        with patch('random.choice', return_value="rock"):
             result = self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 검증
@@ -116,7 +116,7 @@ class TestRPSService:
         assert result.tokens_change == 200  # 3배 보상(300) - 베팅(100) = 200
         
         # 고래 사용자는 3배 보상
-        self.mock_token_service.add_tokens.assert_called_once_with(user_id, 300)
+        self.mock_token_service.credit.assert_called_once_with(user_id, 300, db=self.mock_db)
     
     def test_play_win_scenario_low_user(self):
         """저소비 사용자 승리 시나리오 테스트 (1.5배 보상)"""
@@ -125,12 +125,12 @@ class TestRPSService:
         bet_amount = 100
         
         # Mock 설정
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Low"
-        self.mock_token_service.get_token_balance.return_value = 650
+        self.mock_token_service.debit.return_value = 650
+        self.mock_token_service.credit.return_value = 650
         
         # 컴퓨터가 종이 선택하도록 패치 (사용자 승리)
-        with patch('app.services.rps_service.random.choice', return_value="paper"):
+        with patch('random.choice', return_value="paper"):
             result = self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 검증
@@ -138,7 +138,7 @@ class TestRPSService:
         assert result.tokens_change == 50  # 1.5배 보상(150) - 베팅(100) = 50
         
         # 저소비 사용자는 1.5배 보상
-        self.mock_token_service.add_tokens.assert_called_once_with(user_id, 150)
+        self.mock_token_service.credit.assert_called_once_with(user_id, 150, db=self.mock_db)
     
     def test_play_lose_scenario(self):
         """패배 시나리오 테스트"""
@@ -147,12 +147,12 @@ class TestRPSService:
         bet_amount = 100
         
         # Mock 설정
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Standard"
-        self.mock_token_service.get_token_balance.return_value = 400
+        self.mock_token_service.debit.return_value = 400
+        self.mock_token_service.credit.return_value = 400
         
         # 컴퓨터가 종이 선택하도록 패치 (사용자 패배)
-        with patch('app.services.rps_service.random.choice', return_value="paper"):
+        with patch('random.choice', return_value="paper"):
             result = self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 검증
@@ -160,7 +160,7 @@ class TestRPSService:
         assert result.tokens_change == -100  # 베팅 금액만큼 손실
         
         # 패배 시 추가 토큰 지급 없음
-        self.mock_token_service.add_tokens.assert_not_called()
+        self.mock_token_service.credit.assert_not_called()
     
     def test_play_draw_scenario(self):
         """무승부 시나리오 테스트"""
@@ -169,12 +169,12 @@ class TestRPSService:
         bet_amount = 100
         
         # Mock 설정
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Standard"
-        self.mock_token_service.get_token_balance.return_value = 500
+        self.mock_token_service.debit.return_value = 500
+        self.mock_token_service.credit.return_value = 500
         
         # 컴퓨터가 바위 선택하도록 패치 (무승부)
-        with patch('app.services.rps_service.random.choice', return_value="rock"):
+        with patch('random.choice', return_value="rock"):
             result = self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 검증
@@ -182,7 +182,7 @@ class TestRPSService:
         assert result.tokens_change == 0  # 베팅 금액 환불로 변화 없음
         
         # 무승부 시 베팅 금액 환불
-        self.mock_token_service.add_tokens.assert_called_once_with(user_id, bet_amount)
+        self.mock_token_service.credit.assert_called_once_with(user_id, bet_amount, db=self.mock_db)
     
     def test_play_invalid_choice(self):
         """잘못된 선택 입력 테스트"""
@@ -194,7 +194,7 @@ class TestRPSService:
             self.service.play(user_id, invalid_choice, bet_amount, self.mock_db)
         
         # 토큰 차감이 일어나지 않아야 함
-        self.mock_token_service.deduct_tokens.assert_not_called()
+        self.mock_token_service.debit.assert_not_called()
     
     def test_play_zero_bet_amount(self):
         """0 베팅 금액 테스트"""
@@ -206,7 +206,7 @@ class TestRPSService:
             self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 토큰 차감이 일어나지 않아야 함
-        self.mock_token_service.deduct_tokens.assert_not_called()
+        self.mock_token_service.debit.assert_not_called()
     
     def test_play_negative_bet_amount(self):
         """음수 베팅 금액 테스트"""
@@ -218,7 +218,7 @@ class TestRPSService:
             self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 토큰 차감이 일어나지 않아야 함
-        self.mock_token_service.deduct_tokens.assert_not_called()
+        self.mock_token_service.debit.assert_not_called()
     
     def test_play_insufficient_tokens(self):
         """토큰 부족 시나리오 테스트"""
@@ -227,7 +227,7 @@ class TestRPSService:
         bet_amount = 1000
         
         # 토큰 차감 실패
-        self.mock_token_service.deduct_tokens.return_value = None
+        self.mock_token_service.debit.return_value = None
         
         with pytest.raises(ValueError, match="Insufficient tokens"):
             self.service.play(user_id, user_choice, bet_amount, self.mock_db)
@@ -255,11 +255,11 @@ class TestRPSService:
             bet_amount = 100
             
             # Mock 설정
-            self.mock_token_service.deduct_tokens.return_value = 100
             self.mock_repository.get_user_segment.return_value = "Standard"
-            self.mock_token_service.get_token_balance.return_value = 500
+            self.mock_token_service.debit.return_value = 500
+            self.mock_token_service.credit.return_value = 500
             
-            with patch('app.services.rps_service.random.choice', return_value=computer_choice):
+            with patch('random.choice', return_value=computer_choice):
                 result = self.service.play(user_id, user_choice, bet_amount, self.mock_db)
                 assert result.result == expected_result, f"Failed for {user_choice} vs {computer_choice}"
     
@@ -270,20 +270,20 @@ class TestRPSService:
         
         # 최소 베팅 금액
         min_bet = 1
-        self.mock_token_service.deduct_tokens.return_value = min_bet
         self.mock_repository.get_user_segment.return_value = "Standard"
-        self.mock_token_service.get_token_balance.return_value = 100
+        self.mock_token_service.debit.return_value = 100
+        self.mock_token_service.credit.return_value = 100
         
-        with patch('app.services.rps_service.random.choice', return_value="scissors"):
+        with patch('random.choice', return_value="scissors"):
             result = self.service.play(user_id, user_choice, min_bet, self.mock_db)
             assert result.tokens_change == 1  # 2배 보상(2) - 베팅(1) = 1
         
         # 높은 베팅 금액
         high_bet = 10000
-        self.mock_token_service.deduct_tokens.return_value = high_bet
-        self.mock_token_service.get_token_balance.return_value = 20000
+        self.mock_token_service.debit.return_value = 20000
+        self.mock_token_service.credit.return_value = 20000
         
-        with patch('app.services.rps_service.random.choice', return_value="scissors"):
+        with patch('random.choice', return_value="scissors"):
             result = self.service.play(user_id, user_choice, high_bet, self.mock_db)
             assert result.tokens_change == 10000  # 2배 보상(20000) - 베팅(10000) = 10000
 
@@ -310,11 +310,11 @@ class TestRPSServiceIntegration:
         bet_amount = 100
         
         # Mock 설정 - 모든 단계 성공
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Whale"
-        self.mock_token_service.get_token_balance.return_value = 800
+        self.mock_token_service.debit.return_value = 800
+        self.mock_token_service.credit.return_value = 800
         
-        with patch('app.services.rps_service.random.choice', return_value="scissors"):
+        with patch('random.choice', return_value="scissors"):
             result = self.service.play(user_id, user_choice, bet_amount, self.mock_db)
         
         # 전체 워크플로우 검증
@@ -324,10 +324,10 @@ class TestRPSServiceIntegration:
         assert result.result == "win"
         
         # 모든 서비스 호출 확인
-        self.mock_token_service.deduct_tokens.assert_called_once()
+        self.mock_token_service.debit.assert_called_once()
         self.mock_repository.get_user_segment.assert_called_once()
-        self.mock_token_service.add_tokens.assert_called_once()
-        self.mock_token_service.get_token_balance.assert_called_once()
+        self.mock_token_service.credit.assert_called_once()
+        self.mock_db.commit.assert_called_once()
         self.mock_repository.record_action.assert_called_once()
     
     def test_multiple_games_consistency(self):
@@ -337,15 +337,15 @@ class TestRPSServiceIntegration:
         games_count = 3
         
         # 각 게임에 대한 Mock 설정
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Standard"
-        self.mock_token_service.get_token_balance.return_value = 500
+        self.mock_token_service.debit.return_value = 500
+        self.mock_token_service.credit.return_value = 500
         
         results = []
         choices = ["rock", "paper", "scissors"]
         
         for i, choice in enumerate(choices):
-            with patch('app.services.rps_service.random.choice', return_value="rock"):
+            with patch('random.choice', return_value="rock"):
                 result = self.service.play(user_id, choice, bet_amount, self.mock_db)
                 results.append(result)
         
@@ -356,7 +356,7 @@ class TestRPSServiceIntegration:
             assert result.computer_choice == "rock"
         
         # 서비스 호출 횟수 확인
-        assert self.mock_token_service.deduct_tokens.call_count == games_count
+        assert self.mock_token_service.debit.call_count == games_count
         assert self.mock_repository.record_action.call_count == games_count
     
     def test_edge_case_random_computer_choice(self):
@@ -366,9 +366,9 @@ class TestRPSServiceIntegration:
         bet_amount = 100
         
         # Mock 설정
-        self.mock_token_service.deduct_tokens.return_value = 100
         self.mock_repository.get_user_segment.return_value = "Standard"
-        self.mock_token_service.get_token_balance.return_value = 500
+        self.mock_token_service.debit.return_value = 500
+        self.mock_token_service.credit.return_value = 500
         
         # 실제 랜덤을 사용하여 여러 번 실행
         computer_choices = set()
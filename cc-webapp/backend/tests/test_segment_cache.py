@@ -0,0 +1,99 @@
+"""Tests for the read-through user segment cache."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.models import User, UserSegment
+from app.repositories import segment_cache as segment_cache_module
+from app.repositories.activity_repository import ActivityRepository
+from app.repositories.game_repository import GameRepository
+from app.repositories.game_state import InMemoryGameStateBackend
+from app.repositories.segment_cache import SegmentCache, segment_cache
+from app.utils.segment_utils import compute_rfm_and_update_segments
+
+
+@pytest.fixture()
+def db_session(db_session, engine):
+    db_session.add_all([User(id=i, nickname=f"seg_{i}", invite_code=f"SEG00{i}") for i in (1, 2)])
+    db_session.add(UserSegment(user_id=1, rfm_group="Medium", risk_profile="Low"))
+    db_session.commit()
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    db_session.info["statements"] = statements
+    return db_session
+
+
+def segment_reads(db):
+    return sum("FROM user_segments" in statement for statement in db.info["statements"])
+
+
+class DictTier:
+    """Stands in for the Redis tier."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, user_id):
+        return (user_id in self.values), self.values.get(user_id)
+
+    def set(self, user_id, rfm_group):
+        self.values[user_id] = rfm_group
+
+    def delete(self, user_ids=None):
+        for user_id in list(self.values) if user_ids is None else user_ids:
+            self.values.pop(user_id, None)
+
+
+def test_repository_reads_segment_once(db_session):
+    cache = SegmentCache()
+    repo = GameRepository(state=InMemoryGameStateBackend(), segments=cache)
+
+    labels = [repo.get_user_segment(db_session, user_id) for user_id in (1, 2, 1, 2, 1)]
+
+    assert labels == ["Medium", "Low", "Medium", "Low", "Medium"]
+    assert segment_reads(db_session) == 2
+    assert (cache.stats["hits"], cache.stats["misses"]) == (3, 2)
+
+
+def test_entries_expire_and_are_bounded(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(segment_cache_module.time, "monotonic", lambda: now[0])
+    cache = SegmentCache(ttl=10, max_entries=2)
+    for user_id in (1, 2, 3):
+        cache.set(user_id, "Whale")
+
+    assert cache.get(1) == (False, None)
+    assert cache.get(3) == (True, "Whale")
+    now[0] += 11
+    assert cache.get(3) == (False, None)
+    assert len(cache) == 2
+
+
+def test_shared_tier_serves_other_workers():
+    shared = DictTier()
+    SegmentCache(shared=shared).set(7, None)
+    other = SegmentCache(shared=shared)
+
+    assert other.get(7) == (True, None)
+    assert other.stats["shared_hits"] == 1
+    other.invalidate([7])
+    assert shared.values == {}
+
+
+def test_rfm_job_invalidates_rewritten_users(db_session):
+    repo = GameRepository(state=InMemoryGameStateBackend())
+    assert repo.get_user_segment(db_session, 2) == "Low"
+    for _ in range(12):
+        ActivityRepository().record(db_session, 2, 50.0, datetime.utcnow())
+    db_session.commit()
+
+    compute_rfm_and_update_segments(db_session)
+
+    assert segment_cache.get(2) == (False, None)
+    assert repo.get_user_segment(db_session, 2) == "Whale"
@@ -0,0 +1,89 @@
+"""Tests for the set-based RFM segmentation job."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import User, UserActivityDaily, UserSegment
+from app.repositories.activity_repository import ActivityRepository
+from app.utils.segment_utils import (
+    FREQUENCY_THRESHOLDS,
+    MONETARY_THRESHOLDS,
+    RECENCY_THRESHOLDS,
+    compute_rfm_and_update_segments,
+    get_rfm_score,
+)
+
+
+@pytest.fixture()
+def db_session(db_session):
+    db_session.add_all(User(id=i, nickname=f"rfm_{i}", invite_code="RFM001") for i in range(1, 8))
+    db_session.commit()
+    return db_session
+
+
+def _actions(db, user_id, count, value, days_ago):
+    at = datetime.utcnow() - timedelta(days=days_ago)
+    for _ in range(count):
+        ActivityRepository().record(db, user_id, value, at)
+
+
+def _expected_group(days, frequency, monetary):
+    r = get_rfm_score(days, RECENCY_THRESHOLDS, higher_is_better=False)
+    f = get_rfm_score(frequency, FREQUENCY_THRESHOLDS)
+    m = get_rfm_score(monetary, MONETARY_THRESHOLDS)
+    if r >= 4 and f >= 4 and m >= 4:
+        return "Whale"
+    if r >= 3 and f >= 3:
+        return "Medium"
+    return "Low"
+
+
+def test_sql_scoring_matches_python_rules(db_session):
+    profiles = {
+        1: (12, 10.0, 1),   # Whale
+        2: (4, 1.0, 2),     # Medium
+        3: (12, 10.0, 8),   # 8일 전: recency 3
+        4: (1, 500.0, 0),   # Low frequency
+        5: (3, 5.0, 29),    # Medium, 오래된 활동
+    }
+    for user_id, (count, value, days) in profiles.items():
+        _actions(db_session, user_id, count, value, days)
+    _actions(db_session, 6, 5, 50.0, 45)  # 30일 창 밖
+    db_session.commit()
+
+    stats = compute_rfm_and_update_segments(db_session, chunk_size=2)
+
+    assert (stats.total, stats.processed, stats.chunks) == (5, 5, 3)
+    segments = {s.user_id: s for s in db_session.query(UserSegment).all()}
+    assert set(segments) == set(profiles)
+    for user_id, (count, value, days) in profiles.items():
+        assert segments[user_id].rfm_group == _expected_group(days, count, count * value)
+        assert segments[user_id].name == segments[user_id].rfm_group
+    assert segments[1].rfm_group == "Whale"
+    assert (segments[3].recency_score, segments[3].frequency_score, segments[3].monetary_score) == (3, 5, 5)
+
+
+def test_existing_segments_are_updated_in_place(db_session):
+    db_session.add(UserSegment(user_id=1, rfm_group="Low", name="Low", risk_profile="High-Risk"))
+    _actions(db_session, 1, 12, 10.0, 0)
+    _actions(db_session, 2, 1, 1.0, 0)
+    db_session.commit()
+
+    compute_rfm_and_update_segments(db_session)
+
+    db_session.expire_all()
+    rows = {s.user_id: (s.rfm_group, s.risk_profile) for s in db_session.query(UserSegment).all()}
+    assert rows == {1: ("Whale", "High-Risk"), 2: ("Low", "Unknown")}
+
+
+def test_no_recent_actions_prunes_old_buckets(db_session):
+    _actions(db_session, 1, 3, 1.0, 60)
+    _actions(db_session, 2, 1, 1.0, 33)
+    db_session.commit()
+
+    stats = compute_rfm_and_update_segments(db_session)
+
+    assert stats.processed == 0
+    assert db_session.query(UserSegment).count() == 0
+    assert [b.user_id for b in db_session.query(UserActivityDaily).all()] == [2]
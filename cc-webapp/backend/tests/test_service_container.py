@@ -0,0 +1,46 @@
+"""Tests for the application-scoped service container."""
+
+from unittest.mock import MagicMock
+
+from fastapi.testclient import TestClient
+
+from app.routers import games
+from app.services.container import ServiceContainer, get_service_container
+from app.services.game_config import GameConfigRegistry
+from app.services.game_service import GameService
+from app.services.slot_service import SlotService
+
+
+def test_game_service_is_shared_until_the_config_changes():
+    registry = GameConfigRegistry()
+    container = ServiceContainer(config=registry, use_async=False)
+    service = container.game_service
+    assert isinstance(service, GameService)
+    assert container.game_service is service
+    assert service.slot_service.token_service is service.gacha_service.token_service
+    assert service.slot_service.token_service.db is None  # 세션은 호출마다 전달
+
+    registry.update({"slot": {"JACKPOT_PROB": 0.5}})
+    rebuilt = container.game_service
+    assert rebuilt is not service
+    assert rebuilt.slot_service.rules.JACKPOT_PROB == 0.5
+    assert service.slot_service.rules.JACKPOT_PROB == SlotService.JACKPOT_PROB
+
+
+def test_request_scoped_services_share_the_repository():
+    container = ServiceContainer(config=GameConfigRegistry(), use_async=False)
+    db1, db2 = MagicMock(), MagicMock()
+    first, second = container.rfm_service(db1), container.rfm_service(db2)
+    assert (first.db, second.db) == (db1, db2)
+    assert first.repository is second.repository is container.game_repository
+    assert first.threshold_service is container.rfm_thresholds
+    assert container.ltv_service(db1).repository is container.game_repository
+
+
+def test_lifespan_wires_the_container():
+    from app.main import app
+
+    with TestClient(app) as client:
+        services = client.app.state.services
+        assert services is get_service_container()
+        assert games.get_game_service(services) is games.get_game_service(services) is services.game_service
@@ -0,0 +1,124 @@
+"""Tests for single-transaction game settlement."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+from app.models import User, UserAction
+from app.repositories.game_repository import GameRepository
+from app.repositories.game_state import InMemoryGameStateBackend
+from app.repositories.reward_inventory import InMemoryRewardInventory
+from app.services.gacha_service import GachaService
+from app.services.ledger_service import LedgerService
+from app.services.settlement_service import GameOutcome, SettlementService
+from app.services.slot_service import SlotService
+from app.services.token_service import TokenService
+
+
+@pytest.fixture()
+def db_session(db_session):
+    db_session.add(User(id=1, nickname="settle_user", invite_code="SETL01", cyber_token_balance=100))
+    db_session.commit()
+    return db_session
+
+
+def _balance(db, user_id=1):
+    db.expire_all()
+    return db.query(User).filter(User.id == user_id).one().cyber_token_balance
+
+
+def test_settle_applies_debit_credit_and_action_in_one_commit(db_session):
+    service = SettlementService(GameRepository(), TokenService(db_session))
+
+    with patch.object(db_session, "commit", wraps=db_session.commit) as commit:
+        settled = service.settle(
+            db_session, 1, "SLOT_SPIN", 10, lambda: GameOutcome(payout=25, streak=0)
+        )
+
+    commit.assert_called_once()
+    assert settled.balance == 115
+    assert settled.payout == 25
+    assert _balance(db_session) == 115
+    actions = db_session.query(UserAction).filter(UserAction.user_id == 1).all()
+    assert [(a.action_type, a.value) for a in actions] == [("SLOT_SPIN", -10)]
+
+
+def test_settle_insufficient_tokens_skips_resolution(db_session):
+    service = SettlementService(GameRepository(), TokenService(db_session))
+    resolve = MagicMock()
+
+    settled = service.settle(db_session, 1, "GACHA_PULL", 450, resolve)
+
+    assert settled is None
+    resolve.assert_not_called()
+    assert _balance(db_session) == 100
+    assert db_session.query(UserAction).count() == 0
+
+
+def test_settle_rolls_back_debit_when_resolution_fails(db_session):
+    service = SettlementService(GameRepository(), TokenService(db_session))
+
+    def resolve():
+        raise ValueError("invalid bet value")
+
+    with pytest.raises(ValueError):
+        service.settle(db_session, 1, "ROULETTE_SPIN", 10, resolve)
+
+    assert _balance(db_session) == 100
+    assert db_session.query(UserAction).count() == 0
+
+
+def test_audit_record_is_written_only_after_commit(db_session):
+    service = SettlementService(GameRepository(), TokenService(db_session))
+    outcome = GameOutcome(payout=5, audit={"game": "slot", "nonce": 1})
+
+    with patch("app.services.settlement_service.write_audit") as write_audit:
+        with patch.object(db_session, "commit", side_effect=SQLAlchemyError("commit failed")):
+            with pytest.raises(SQLAlchemyError):
+                service.settle(db_session, 1, "SLOT_SPIN", 10, lambda: outcome)
+        write_audit.assert_not_called()
+
+        service.settle(db_session, 1, "SLOT_SPIN", 10, lambda: outcome)
+        write_audit.assert_called_once_with({"game": "slot", "nonce": 1})
+
+
+def test_failed_commit_leaves_game_state_unchanged(db_session):
+    repo = GameRepository(state=InMemoryGameStateBackend())
+    repo.set_streak(1, 3)
+    repo.set_gacha_count(1, 0)
+    repo.set_gacha_history(1, ["Common", "Rare"])
+    token_service = TokenService(db_session, repo)
+    ledger = LedgerService()
+    settlement = SettlementService(repo, token_service, ledger=ledger)
+    slot = SlotService(repository=repo, token_service=token_service, settlement=settlement)
+    gacha = GachaService(
+        repository=repo, token_service=token_service, settlement=settlement, inventory=InMemoryRewardInventory()
+    )
+
+    with patch.object(ledger, "append", side_effect=OperationalError("INSERT", {}, Exception("disk I/O error"))):
+        with pytest.raises(OperationalError):
+            slot.spin(1, db_session)
+        with pytest.raises(OperationalError):
+            gacha.pull(1, 1, db_session)
+
+    assert _balance(db_session) == 100
+    assert repo.get_streak(1) == 3
+    assert repo.get_gacha_count(1) == 0
+    assert repo.get_gacha_history(1) == ["Common", "Rare"]
+
+    with patch("random.random", return_value=0.99):
+        slot.spin(1, db_session)
+    assert repo.get_streak(1) == 4
+
+
+def test_slot_spin_settles_against_database(db_session):
+    repo = GameRepository()
+    service = SlotService(repository=repo, token_service=TokenService(db_session, repo))
+
+    with patch("random.random", return_value=0.005):
+        result = service.spin(1, db_session)
+
+    assert result.result == "jackpot"
+    assert result.balance == 100 - 2 + 100
+    assert _balance(db_session) == result.balance
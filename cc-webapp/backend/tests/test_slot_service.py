@@ -25,8 +25,8 @@ class TestSlotService:
         """Test successful slot spin."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 100
+        self.token_service.debit.return_value = 100
+        self.token_service.credit.return_value = 100
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -34,7 +34,7 @@ class TestSlotService:
         result = self.service.spin(user_id, self.db)
         
         # Assert
-        self.token_service.deduct_tokens.assert_called_once_with(user_id, 2)
+        self.token_service.debit.assert_called_once_with(user_id, 2, db=self.db)
         self.repo.get_user_segment.assert_called_once_with(self.db, user_id)
         self.repo.get_streak.assert_called_once_with(user_id)
         self.repo.record_action.assert_called_once()
@@ -49,7 +49,7 @@ class TestSlotService:
         """Test slot spin with insufficient tokens."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = None
+        self.token_service.debit.return_value = None
         
         # Act & Assert
         with pytest.raises(ValueError, match="토큰이 부족합니다"):
@@ -60,8 +60,8 @@ class TestSlotService:
         """Test slot spin with a win result."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 110
+        self.token_service.debit.return_value = 110
+        self.token_service.credit.return_value = 110
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -75,15 +75,15 @@ class TestSlotService:
         # Assert
         assert result.result == "win"
         assert result.tokens_change > 0
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
 
     @patch('random.random')
     def test_spin_result_jackpot(self, mock_random):
         """Test slot spin with a jackpot result."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 200
+        self.token_service.debit.return_value = 200
+        self.token_service.credit.return_value = 200
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -97,15 +97,15 @@ class TestSlotService:
         # Assert
         assert result.result == "jackpot"
         assert result.tokens_change >= 98  # 100 - 2 (bet)
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
 
     @patch('random.random')
     def test_spin_result_lose(self, mock_random):
         """Test slot spin with a loss result."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 98
+        self.token_service.debit.return_value = 98
+        self.token_service.credit.return_value = 98
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
@@ -119,14 +119,14 @@ class TestSlotService:
         # Assert
         assert result.result == "lose"
         assert result.tokens_change == -2
-        self.token_service.add_tokens.assert_not_called()
+        self.token_service.credit.assert_not_called()
 
     def test_streak_counter_increments_on_loss(self):
         """Test that streak counter increments on loss."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 98
+        self.token_service.debit.return_value = 98
+        self.token_service.credit.return_value = 98
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 3
         
@@ -142,8 +142,8 @@ class TestSlotService:
         """Test that streak counter resets on win."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 108
+        self.token_service.debit.return_value = 108
+        self.token_service.credit.return_value = 108
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 3
         
@@ -159,8 +159,8 @@ class TestSlotService:
         """Test that streak of 7 or more forces a win."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 108
+        self.token_service.debit.return_value = 108
+        self.token_service.credit.return_value = 108
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 7
         
@@ -171,23 +171,23 @@ class TestSlotService:
         assert result.result == "win"
         assert result.animation == "force_win"
         assert result.streak == 0
-        self.token_service.add_tokens.assert_called_once()
+        self.token_service.credit.assert_called_once()
 
     def test_spin_low_segment(self):
         """Test slot spin for Low segment user."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 100
+        self.token_service.debit.return_value = 100
+        self.token_service.credit.return_value = 100
         self.repo.get_user_segment.return_value = "Low"  # Low segment user
         self.repo.get_streak.return_value = 0
 
         # Mock random to force specific result
-        with patch('app.services.slot_service.random.random', return_value=0.95):  # Force lose
+        with patch('random.random', return_value=0.95):  # Force lose
             # Act
             result = self.service.spin(user_id, self.db)        # Assert        assert isinstance(result, SlotSpinResult)
         assert result.result == "lose"
-        self.token_service.deduct_tokens.assert_called_once_with(user_id, 2)
+        self.token_service.debit.assert_called_once_with(user_id, 2, db=self.db)
         self.repo.get_user_segment.assert_called_once_with(self.db, user_id)
         self.repo.get_streak.assert_called_once_with(user_id)
 
@@ -195,19 +195,19 @@ class TestSlotService:
         """Test slot spin for different segment with specific lose condition."""
         # Arrange
         user_id = 1
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 100
+        self.token_service.debit.return_value = 100
+        self.token_service.credit.return_value = 100
         self.repo.get_user_segment.return_value = "High"
         self.repo.get_streak.return_value = 5
 
         # Mock random to hit the line 41 condition (after win_prob adjustment)
-        with patch('app.services.slot_service.random.random', return_value=0.12):  # Just above win threshold
+        with patch('random.random', return_value=0.12):  # Just above win threshold
             # Act
             result = self.service.spin(user_id, self.db)
 
         # Assert        assert isinstance(result, SlotSpinResult)
         # The result depends on the exact probability calculation
-        self.token_service.deduct_tokens.assert_called_once_with(user_id, 2)
+        self.token_service.debit.assert_called_once_with(user_id, 2, db=self.db)
         self.repo.get_user_segment.assert_called_once_with(self.db, user_id)
         self.repo.get_streak.assert_called_once_with(user_id)
 
@@ -233,18 +233,18 @@ class TestRTPFairness:
         spins = 1000
         
         # Setup mocks
-        self.token_service.deduct_tokens.return_value = 2
-        self.token_service.get_token_balance.return_value = 1000
+        self.token_service.debit.return_value = 1000
+        self.token_service.credit.return_value = 1000
         self.repo.get_user_segment.return_value = "Medium"
         self.repo.get_streak.return_value = 0
         
-        # Track how many times add_tokens was called and with what amounts
-        def add_tokens_side_effect(user_id, amount):
+        # Track how many times credit was called and with what amounts
+        def credit_side_effect(user_id, amount):
             nonlocal total_returns
             total_returns += amount
             return amount
             
-        self.token_service.add_tokens.side_effect = add_tokens_side_effect
+        self.token_service.credit.side_effect = credit_side_effect
         
         # Simulate many spins
         for _ in range(spins):
@@ -62,32 +62,27 @@ class TestTokenService(unittest.TestCase):
 
     def test_add_tokens_success(self):
         """Test successful token addition."""
-        # Mock user with initial balance
-        mock_user = MagicMock()
-        mock_user.cyber_token_balance = 100
-        
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        self.mock_db.execute.return_value.scalar_one_or_none.return_value = 150
         
         new_balance = self.token_service.add_tokens(user_id=123, amount=50)
         
-        # Check that balance was updated
-        assert mock_user.cyber_token_balance == 150
+        # Balance is updated by a single atomic UPDATE plus a ledger insert, then committed
         assert new_balance == 150
+        assert self.mock_db.execute.call_count == 2
+        self.mock_db.query.assert_not_called()
         self.mock_db.commit.assert_called_once()
 
     def test_add_tokens_no_user(self):
         """Test token addition when user doesn't exist."""
-        self.mock_db.query.return_value.filter.return_value.first.return_value = None
+        self.mock_db.execute.return_value.scalar_one_or_none.return_value = None
         
         new_balance = self.token_service.add_tokens(user_id=123, amount=50)
         assert new_balance == 0
+        self.mock_db.commit.assert_not_called()
 
     def test_add_tokens_exception(self):
         """Test token addition with exception."""
-        mock_user = MagicMock()
-        mock_user.cyber_token_balance = 100
-        
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        self.mock_db.execute.return_value.scalar_one_or_none.return_value = 150
         self.mock_db.commit.side_effect = Exception("Database error")
         
         with patch('app.services.token_service.logger') as mock_logger:
@@ -95,48 +90,66 @@ class TestTokenService(unittest.TestCase):
             with patch.object(self.token_service, 'get_token_balance', return_value=100):
                 result = self.token_service.add_tokens(user_id=123, amount=50)
                 assert result == 100  # Should return original balance
+        self.mock_db.rollback.assert_called_once()
 
     def test_deduct_tokens_success(self):
         """Test successful token deduction."""
-        mock_user = MagicMock()
-        mock_user.cyber_token_balance = 100
-        
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        self.mock_db.execute.return_value.scalar_one_or_none.return_value = 50
         
         new_balance = self.token_service.deduct_tokens(user_id=123, amount=50)
         
-        assert mock_user.cyber_token_balance == 50
         assert new_balance == 50
+        assert self.mock_db.execute.call_count == 2
+        self.mock_db.query.assert_not_called()
         self.mock_db.commit.assert_called_once()
 
     def test_deduct_tokens_insufficient(self):
         """Test token deduction with insufficient tokens."""
-        mock_user = MagicMock()
-        mock_user.cyber_token_balance = 30  # Less than required
-        
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        # The conditional UPDATE matches no row when the balance is too low
+        self.mock_db.execute.return_value.scalar_one_or_none.return_value = None
         
         result = self.token_service.deduct_tokens(user_id=123, amount=50)
         assert result is None
+        self.mock_db.commit.assert_not_called()
+        self.mock_db.rollback.assert_called_once()
 
     def test_deduct_tokens_no_user(self):
         """Test token deduction when user doesn't exist."""
-        self.mock_db.query.return_value.filter.return_value.first.return_value = None
+        self.mock_db.execute.return_value.scalar_one_or_none.return_value = None
         
         result = self.token_service.deduct_tokens(user_id=123, amount=50)
         assert result is None
 
     def test_deduct_tokens_exception(self):
         """Test token deduction with exception."""
-        mock_user = MagicMock()
-        mock_user.cyber_token_balance = 100
-        
-        self.mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+        self.mock_db.execute.return_value.scalar_one_or_none.return_value = 50
         self.mock_db.commit.side_effect = Exception("Database error")
         
         with patch('app.services.token_service.logger') as mock_logger:
             result = self.token_service.deduct_tokens(user_id=123, amount=50)
             assert result is None
+        self.mock_db.rollback.assert_called_once()
+
+    def test_deduct_tokens_without_update_returning(self):
+        """Test deduction falls back to re-reading the balance when RETURNING is unsupported."""
+        self.mock_db.get_bind.return_value.dialect.update_returning = False
+        self.mock_db.execute.return_value.rowcount = 1
+        self.mock_db.query.return_value.filter.return_value.scalar.return_value = 70
+        
+        new_balance = self.token_service.deduct_tokens(user_id=123, amount=30)
+        
+        assert new_balance == 70
+        self.mock_db.commit.assert_called_once()
+
+    def test_deduct_tokens_without_update_returning_insufficient(self):
+        """Test fallback path reports insufficient tokens when no row was updated."""
+        self.mock_db.get_bind.return_value.dialect.update_returning = False
+        self.mock_db.execute.return_value.rowcount = 0
+        
+        result = self.token_service.deduct_tokens(user_id=123, amount=30)
+        
+        assert result is None
+        self.mock_db.query.assert_not_called()
 
 
 # Pytest-style tests for integration scenarios
@@ -163,24 +176,22 @@ def test_token_service_full_flow(token_service_with_mocks):
     assert balance == 100
 
     # Add tokens
+    mock_db.execute.return_value.scalar_one_or_none.return_value = 150
     new_balance = service.add_tokens(user_id=123, amount=50)
     assert new_balance == 150
-    assert mock_user.cyber_token_balance == 150
 
     # Deduct tokens
+    mock_db.execute.return_value.scalar_one_or_none.return_value = 125
     new_balance = service.deduct_tokens(user_id=123, amount=25)
     assert new_balance == 125
-    assert mock_user.cyber_token_balance == 125
+    assert mock_db.commit.call_count == 2
 
 
 def test_token_service_error_recovery(token_service_with_mocks):
     """Test error recovery in token operations."""
     service, mock_repo, mock_db = token_service_with_mocks
 
-    # Setup mock user
-    mock_user = MagicMock()
-    mock_user.cyber_token_balance = 100
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalar_one_or_none.return_value = 150
 
     # Simulate commit error
     mock_db.commit.side_effect = Exception("Database error")
@@ -193,3 +204,37 @@ def test_token_service_error_recovery(token_service_with_mocks):
     # Try to deduct tokens - should fail and return None
     result = service.deduct_tokens(user_id=123, amount=50)
     assert result is None
+
+
+def test_concurrent_deductions_conserve_balance(tmp_path):
+    """Parallel deductions against one user never lose or double-spend tokens."""
+    from concurrent.futures import ThreadPoolExecutor
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models import Base
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'tokens.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        db.add(User(id=1, nickname="racer", invite_code="RACE01", cyber_token_balance=300))
+        db.commit()
+
+    def deduct(_):
+        with SessionLocal() as db:
+            return TokenService(db).deduct_tokens(1, 7)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(deduct, range(200)))
+
+    succeeded = [r for r in results if r is not None]
+    with SessionLocal() as db:
+        final = db.query(User).filter(User.id == 1).one().cyber_token_balance
+    engine.dispose()
+
+    assert len(succeeded) == 300 // 7
+    assert final == 300 - 7 * len(succeeded)
+    assert sorted(succeeded, reverse=True) == [300 - 7 * n for n in range(1, len(succeeded) + 1)]
@@ -0,0 +1,52 @@
+"""Tests for the per-user content unlock state."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.models import AdultContent, User, UserUnlockState
+from app.repositories.unlock_repository import UnlockRepository, parse_unlock_stage
+from app.services.reward_service import RewardService
+from app.utils.reward_utils import _check_eligibility_for_next_unlock_stage, spin_gacha
+
+
+@pytest.fixture()
+def db_session(db_session):
+    db_session.add_all([User(id=i, nickname=f"unlock_{i}", invite_code=f"UNL00{i}") for i in (1, 2)])
+    db_session.add_all(AdultContent(stage=stage, name=f"Stage {stage}") for stage in (1, 2, 3))
+    db_session.commit()
+    return db_session
+
+
+def test_parse_unlock_stage_accepts_both_formats():
+    assert parse_unlock_stage("3") == 3
+    assert parse_unlock_stage("101_2") == 2
+    assert parse_unlock_stage("101_Full") is None
+    assert parse_unlock_stage(None) is None
+
+
+def test_record_unlock_only_raises_the_stage(db_session):
+    repo = UnlockRepository()
+    assert repo.get_highest_stage(db_session, 1) == 0
+
+    repo.record_unlock(db_session, 1, 2, datetime(2024, 5, 2))
+    repo.record_unlock(db_session, 1, 1, datetime(2024, 5, 1))
+    db_session.commit()
+
+    state = db_session.get(UserUnlockState, 1)
+    assert (state.highest_stage, state.last_unlocked_at) == (2, datetime(2024, 5, 2))
+    repo.record_unlock(db_session, 1, 3)
+    assert repo.get_highest_stage(db_session, 1) == 3
+
+
+def test_reward_service_and_gacha_share_the_state(db_session):
+    RewardService(db_session).grant_content_unlock(1, 101, "2", "test")
+
+    assert UnlockRepository().get_highest_stage(db_session, 1) == 2
+    assert _check_eligibility_for_next_unlock_stage(1, db_session) == 3
+    assert _check_eligibility_for_next_unlock_stage(2, db_session) == 1
+    with patch("app.utils.reward_utils.GACHA_ITEM_SAMPLER.draw") as draw:
+        draw.return_value = {"item_type": "CONTENT_UNLOCK", "details": {"stage": 2}, "weight": 1}
+        assert spin_gacha(1, db_session)["type"] == "COIN"
+        assert spin_gacha(2, db_session)["type"] == "CONTENT_UNLOCK"
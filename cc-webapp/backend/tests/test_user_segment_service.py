@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import MagicMock
 import os
 
+from app.services.game_config import GameConfigRegistry
 from app.services.user_segment_service import UserSegmentService
 from app.models import UserSegment
 
@@ -44,7 +45,7 @@ class TestUserSegmentServiceEnv(unittest.TestCase):
     def test_env_overrides_defaults(self):
         os.environ["SEGMENT_PROB_ADJUST_JSON"] = '{"Whale": 0.5}'
         os.environ["HOUSE_EDGE_JSON"] = '{"Whale": 0.2}'
-        service = UserSegmentService(db=self.mock_db)
+        service = UserSegmentService(db=self.mock_db, config=GameConfigRegistry.from_env())
         self.assertEqual(service.SEGMENT_PROB_ADJUST["Whale"], 0.5)
         self.assertEqual(service.HOUSE_EDGE["Whale"], 0.2)
 
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from app.websockets.chat import SLOW_CONSUMER_CLOSE_CODE, WebSocketManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.accepted = False
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_text(self, message):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def drain():
+    # 작성자 태스크가 큐를 비울 시간을 준다
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_send_to_user_routes_only_to_that_user():
+    manager = WebSocketManager()
+    alice_phone, alice_web, bob = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await manager.connect(alice_phone, 1)
+    await manager.connect(alice_web, 1)
+    await manager.connect(bob, 2)
+
+    delivered = await manager.send_to_user(1, "spin result")
+    await drain()
+
+    assert delivered == 2
+    assert alice_phone.sent == ["spin result"]
+    assert alice_web.sent == ["spin result"]
+    assert bob.sent == []
+    assert await manager.send_to_user(3, "nobody") == 0
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_not_blocked_by_slow_client():
+    manager = WebSocketManager(send_timeout=10)
+    slow, fast = FakeWebSocket(delay=1.0), FakeWebSocket()
+    await manager.connect(slow, 1)
+    await manager.connect(fast, 2)
+
+    assert await manager.broadcast("hello") == 2
+    await drain()
+
+    assert fast.sent == ["hello"]
+    assert slow.sent == []
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_evicts_slow_consumer():
+    manager = WebSocketManager(queue_size=2, send_timeout=10)
+    slow = FakeWebSocket(delay=1.0)
+    await manager.connect(slow, 1)
+
+    results = [await manager.send_to_user(1, f"m{i}") for i in range(5)]
+    await drain()
+
+    assert 0 in results
+    assert slow not in manager
+    assert not manager.is_connected(1)
+    assert slow.close_code == SLOW_CONSUMER_CLOSE_CODE
+    assert manager.metrics()["evicted"] == 1
+    assert manager.metrics()["dropped"] >= 1
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_send_timeout_and_errors_evict():
+    manager = WebSocketManager(send_timeout=0.01)
+    stuck, broken, healthy = FakeWebSocket(delay=1.0), FakeWebSocket(fail=True), FakeWebSocket()
+    for user_id, ws in enumerate((stuck, broken, healthy)):
+        await manager.connect(ws, user_id)
+
+    await manager.broadcast("ping")
+    await asyncio.sleep(0.05)
+
+    assert manager.active_connections == [healthy]
+    assert healthy.sent == ["ping"]
+    assert manager.metrics()["evicted"] == 2
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_on_dropped_runs_only_when_no_connection_sent():
+    manager = WebSocketManager(send_timeout=0.01)
+    healthy, broken, stuck = FakeWebSocket(), FakeWebSocket(fail=True), FakeWebSocket(delay=1.0)
+    await manager.connect(healthy, 1)
+    await manager.connect(broken, 1)
+    await manager.connect(stuck, 2)
+    dropped = []
+
+    await manager.send_to_user(1, "kept", on_dropped=lambda: dropped.append("kept"))
+    await manager.send_to_user(2, "lost", on_dropped=lambda: dropped.append("lost"))
+    await asyncio.sleep(0.05)
+
+    assert healthy.sent == ["kept"]
+    assert dropped == ["lost"]
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_and_close_clean_up_registry():
+    manager = WebSocketManager()
+    first, second = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(first, 7)
+    await manager.connect(second, 7)
+    assert first.accepted and manager.connection_count == 2
+
+    manager.disconnect(first)
+    assert manager.user_connections(7) == [second]
+    manager.disconnect(first)  # 중복 해제는 무시
+
+    await manager.close()
+    assert manager.connection_count == 0
+    assert manager.metrics()["users"] == 0
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from app.websockets.bus import InMemoryBroker, InMemoryBus, LocalPubSubServer, RespBus, create_bus
+from app.websockets.chat import WebSocketManager
+from app.websockets.relay import AT_LEAST_ONCE, ClusterRelay
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        pass
+
+
+class LossyBus(InMemoryBus):
+    """Drops the first ``drop`` deliver batches to exercise retries."""
+
+    def __init__(self, broker, drop=1):
+        super().__init__(broker)
+        self.drop = drop
+
+    async def publish(self, channel, payload):
+        if self.drop and b'"deliver"' in payload:
+            self.drop -= 1
+            return
+        await super().publish(channel, payload)
+
+
+async def settle(seconds=0.05):
+    await asyncio.sleep(seconds)
+
+
+async def make_worker(bus, name, **options):
+    relay = ClusterRelay(bus, worker_id=name, batch_interval=0, **options)
+    manager = WebSocketManager(relay=relay)
+    await manager.start()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_send_reaches_user_on_other_worker():
+    broker = InMemoryBroker()
+    worker_a = await make_worker(InMemoryBus(broker), "a")
+    worker_b = await make_worker(InMemoryBus(broker), "b")
+    socket = FakeWebSocket()
+    await worker_b.connect(socket, 42)
+    await settle()
+
+    assert worker_a.is_connected(42)
+    assert await worker_a.send_to_user(42, "jackpot") == 1
+    assert await worker_a.send_to_user(7, "nobody") == 0
+    await settle()
+
+    assert socket.sent == ["jackpot"]
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_presence_snapshot_and_leave():
+    broker = InMemoryBroker()
+    worker_b = await make_worker(InMemoryBus(broker), "b")
+    await worker_b.connect(FakeWebSocket(), 5)
+    # 나중에 뜬 워커도 기존 접속자를 알아야 한다
+    worker_a = await make_worker(InMemoryBus(broker), "a")
+    await settle()
+    assert worker_a.is_connected(5)
+
+    await worker_b.close()
+    await settle()
+    assert not worker_a.is_connected(5)
+    await worker_a.close()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_fans_out_to_every_worker():
+    broker = InMemoryBroker()
+    workers = [await make_worker(InMemoryBus(broker), name) for name in "abc"]
+    sockets = [FakeWebSocket() for _ in workers]
+    for user_id, (worker, socket) in enumerate(zip(workers, sockets)):
+        await worker.connect(socket, user_id)
+    await settle()
+
+    await workers[0].broadcast("maintenance")
+    await settle()
+
+    assert [s.sent for s in sockets] == [["maintenance"]] * 3
+    for worker in workers:
+        await worker.close()
+
+
+@pytest.mark.asyncio
+async def test_at_least_once_retries_lost_message_without_duplicates():
+    broker = InMemoryBroker()
+    sender = await make_worker(LossyBus(broker), "a", delivery=AT_LEAST_ONCE, ack_timeout=0.02)
+    receiver = await make_worker(InMemoryBus(broker), "b", delivery=AT_LEAST_ONCE)
+    socket = FakeWebSocket()
+    await receiver.connect(socket, 9)
+    await settle()
+
+    await sender.send_to_user(9, "reward")
+    await settle(0.2)
+
+    assert socket.sent == ["reward"]
+    metrics = sender.metrics()
+    assert metrics["relay_retried"] >= 1
+    assert metrics["relay_acked"] == 1
+    assert metrics["relay_pending_acks"] == 0
+    await sender.close()
+    await receiver.close()
+
+
+@pytest.mark.asyncio
+async def test_at_most_once_loses_dropped_message():
+    broker = InMemoryBroker()
+    sender = await make_worker(LossyBus(broker), "a")
+    receiver = await make_worker(InMemoryBus(broker), "b")
+    socket = FakeWebSocket()
+    await receiver.connect(socket, 9)
+    await settle()
+
+    await sender.send_to_user(9, "reward")
+    await settle()
+
+    assert socket.sent == []
+    await sender.close()
+    await receiver.close()
+
+
+@pytest.mark.asyncio
+async def test_resp_bus_round_trip_through_local_server():
+    server = await LocalPubSubServer().start()
+    worker_a = await make_worker(RespBus(server.url), "a")
+    worker_b = await make_worker(RespBus(server.url), "b")
+    socket = FakeWebSocket()
+    await worker_b.connect(socket, 3)
+    await settle(0.1)
+
+    assert await worker_a.send_to_user(3, "over the wire") == 1
+    await settle(0.1)
+
+    assert socket.sent == ["over the wire"]
+    await worker_a.close()
+    await worker_b.close()
+    await server.close()
+
+
+def test_create_bus_from_url():
+    assert create_bus(None) is None
+    assert isinstance(create_bus("memory://"), InMemoryBus)
+    bus = create_bus("redis://:secret@cache:6380")
+    assert (bus.host, bus.port, bus.password) == ("cache", 6380, "secret")
+    assert create_bus("unix:///tmp/ws.sock").path == "/tmp/ws.sock"
+    with pytest.raises(ValueError):
+        create_bus("http://nope")
@@ -73,10 +73,10 @@ def test_spin_gacha_success(mock_db):
     with patch('app.utils.reward_utils.models') as mock_models:
         mock_models.UserReward = MagicMock()
         
-        with patch('app.utils.reward_utils.random.choices') as mock_choices:
+        with patch('app.utils.reward_utils.GACHA_ITEM_SAMPLER.draw') as mock_draw:
             # Mock choosing a COIN item
             mock_item = {"item_type": "COIN", "details": {"min_amount": 10, "max_amount": 50}, "weight": 400}
-            mock_choices.return_value = [mock_item]
+            mock_draw.return_value = mock_item
             
             with patch('app.utils.reward_utils.random.randint') as mock_randint:
                 mock_randint.return_value = 25
@@ -101,9 +101,9 @@ def test_spin_gacha_insufficient_tokens(mock_db):
     with patch('app.utils.reward_utils.models') as mock_models:
         mock_models.UserReward = MagicMock()
         
-        with patch('app.utils.reward_utils.random.choices') as mock_choices:
+        with patch('app.utils.reward_utils.GACHA_ITEM_SAMPLER.draw') as mock_draw:
             mock_item = {"item_type": "COIN", "details": {"min_amount": 1, "max_amount": 5}, "weight": 50}
-            mock_choices.return_value = [mock_item]
+            mock_draw.return_value = mock_item
             
             with patch('app.utils.reward_utils.random.randint') as mock_randint:
                 mock_randint.return_value = 3
@@ -153,9 +153,9 @@ def test_spin_gacha_exception_handling(mock_db):
     with patch('app.utils.reward_utils.models') as mock_models:
         mock_models.UserReward = MagicMock()
         
-        with patch('app.utils.reward_utils.random.choices') as mock_choices:
+        with patch('app.utils.reward_utils.GACHA_ITEM_SAMPLER.draw') as mock_draw:
             mock_item = {"item_type": "COIN", "details": {"min_amount": 1, "max_amount": 5}, "weight": 50}
-            mock_choices.return_value = [mock_item]
+            mock_draw.return_value = mock_item
             
             with patch('app.utils.reward_utils.random.randint') as mock_randint:
                 mock_randint.return_value = 2